@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Temporal worker and workflow payloads.
+"""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Measure how much the payload codecs save on ``MutationFlowResult`` payloads.
+
+Without arguments the results are synthetic, shaped like real runs: a matrix
+of checks, a failing junit check with tracebacks for every failed test, and
+the summary. Persisted summaries (``mutation_results/*.json``) can be passed
+instead to measure real runs.
+
+    python -m scripts.bench.payload_codecs
+    python -m scripts.bench.payload_codecs mutation_results/*.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from temporalio.converter import DataConverter
+
+from models.mutation.context import MutationContext
+from models.mutation.result import MutationResult
+from temporal.workflows.codecs import CompressionCodec
+from temporal.workflows.mutation_flow import MutationFlowResult
+
+ROUNDS = 20
+
+
+def synthetic_flow_result(checks: int, failed_tests: int) -> MutationFlowResult:
+    """A killed mutant with ``checks`` checks and ``failed_tests`` junit failures."""
+    link = "https://github.com/org/cli/actions/runs/1234567890/job/{}"
+    check_list = [
+        {
+            "name": f"test (ubuntu-latest, 3.{8 + n % 5})",
+            "state": "FAILURE" if n == 0 else "SUCCESS",
+            "bucket": "fail" if n == 0 else "pass",
+            "link": link.format(9000 + n),
+            "workflow": "Tests",
+            "started_at": "2025-10-18T18:44:37Z",
+            "completed_at": "2025-10-18T18:49:12Z",
+        }
+        for n in range(checks)
+    ]
+    tests: List[Dict[str, Any]] = [
+        {
+            "id": f"tests/test_cli.py::TestDownloads::test_resume_{n}",
+            "name": f"test_resume_{n}",
+            "classname": "tests.test_cli.TestDownloads",
+            "status": "failed",
+            "message": "AssertionError: assert 206 == 200",
+            "output": (
+                "self = <tests.test_cli.TestDownloads object>\n"
+                f"    def test_resume_{n}(self, httpbin):\n"
+                "        r = http('--download', '--continue', httpbin + '/range/1024')\n"
+                ">       assert r.exit_status == ExitStatus.SUCCESS\n"
+                "E       AssertionError: assert 206 == 200\n"
+                "tests/test_cli.py:412: AssertionError"
+            ),
+            "duration": f"0.{n % 900:03d}",
+            "source_artifact": "junit-ubuntu-3.11",
+            "source_file": "junit.xml",
+        }
+        for n in range(failed_tests)
+    ]
+    tests.append({
+        "id": "junit.xml (1480 passed)",
+        "status": "passed",
+        "count": 1480,
+        "duration": 84.2,
+        "max_duration": 3.1,
+        "source_artifact": "junit-ubuntu-3.11",
+        "source_file": "junit.xml",
+    })
+    failure = {
+        "check_name": check_list[0]["name"],
+        "failure_reason": f"due to {failed_tests} failed test case(s)",
+        "failed_tests": [test["id"] for test in tests if test["status"] == "failed"],
+        "tests": tests,
+        "tests_summary": {"total": 1480 + failed_tests, "failed": failed_tests},
+        "log_available": False,
+    }
+    return MutationFlowResult(
+        context=MutationContext(
+            repo_url="https://github.com/org/cli",
+            branch_name="mutation-test-demo-20251018-184437",
+            pr_title="Mutation Test: flip range check",
+            mutation_description="Flip range check",
+            repo_id="org/cli",
+        ),
+        outcome=MutationResult(
+            mutation_applied=True,
+            pr_results={"status": {"number": 42}, "checks": check_list, "completed": True},
+            analysis={
+                "checks": check_list,
+                "test_failures": [failure],
+                "summary": {"mutation_killed": True, "failed_checks": 1},
+            },
+        ),
+    )
+
+
+async def _timed(step: Callable[[Any], Awaitable[Any]], payloads: Any) -> Tuple[Any, float]:
+    """Run a codec step ``ROUNDS`` times; return its result and mean milliseconds."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = await step(payloads)
+    return result, (time.perf_counter() - started) * 1000 / ROUNDS
+
+
+def measure(name: str, value: Any, codecs: Dict[str, CompressionCodec]) -> List[Tuple]:
+    """Encode ``value`` once per codec; return (payload, codec, bytes, ratio, enc ms, dec ms)."""
+    payload = asyncio.run(DataConverter.default.encode([value]))[0]
+    raw = payload.ByteSize()
+    rows = [(name, "none", raw, 1.0, 0.0, 0.0)]
+    for codec_name, codec in codecs.items():
+        encoded, encode_ms = asyncio.run(_timed(codec.encode, [payload]))
+        decoded, decode_ms = asyncio.run(_timed(codec.decode, encoded))
+        assert decoded[0] == payload
+        size = encoded[0].ByteSize()
+        rows.append((name, codec_name, size, raw / size, encode_ms, decode_ms))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("results", nargs="*", help="Persisted flow result JSON files")
+    args = parser.parse_args()
+
+    if args.results:
+        values = [
+            (Path(path).name, json.loads(Path(path).read_text(encoding="utf-8")))
+            for path in args.results
+        ]
+    else:
+        values = [
+            ("4 checks, 5 failed tests", synthetic_flow_result(4, 5)),
+            ("12 checks, 50 failed tests", synthetic_flow_result(12, 50)),
+            ("24 checks, 500 failed tests", synthetic_flow_result(24, 500)),
+        ]
+
+    codecs = {"zlib": CompressionCodec("zlib", threshold_bytes=0)}
+    try:
+        codecs["zstd"] = CompressionCodec("zstd", threshold_bytes=0)
+    except RuntimeError:
+        print("zstandard not installed; skipping zstd")
+
+    print(f"{'payload':<30} {'codec':<6} {'bytes':>10} {'ratio':>7} {'enc ms':>8} {'dec ms':>8}")
+    for name, value in values:
+        for row in measure(name, value, codecs):
+            print("{:<30} {:<6} {:>10,} {:>6.1f}x {:>8.2f} {:>8.2f}".format(*row))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,17 @@ GitHub integration helpers for Temporal-based automation workloads.
 """
 
 from temporal.github.check_utils import CheckProcessor
+from temporal.github.client import GitHubAPIError, GitHubClient, RateLimitExceeded
 from temporal.github.pr_manager import PRManager
 from temporal.github.repo_manager import RepoManager
 from temporal.github.test_analyzer import TestAnalyzer
 
 __all__ = [
     "CheckProcessor",
+    "GitHubAPIError",
+    "GitHubClient",
     "PRManager",
+    "RateLimitExceeded",
     "RepoManager",
     "TestAnalyzer",
 ]
@@ -0,0 +1,151 @@
+"""
+Helpers for reading failing tests from check-run annotations and output.
+
+Many repos already report test failures on the check run itself, through
+pytest-github-actions-annotate-failures, problem matchers or a test reporter
+writing the check's output summary. Both are small JSON documents, so the
+analyzer consults them before downloading artifacts or logs.
+
+GitHub keeps at most 10 error annotations per step (50 per job), so the
+annotations are only taken as the full list of failures while they stay under
+that cap and agree with the failure count in the check's output.
+
+Calls go through the pooled API client when credentials are available and fall
+back to ``gh api`` otherwise.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from temporal.github.artifact_utils import resolve_api_client, run_gh_command
+from temporal.github.client import GitHubClient
+from temporal.github.log_parser import parse_failures
+
+# GitHub drops error annotations past this many per step.
+ANNOTATIONS_PER_STEP_CAP = 10
+
+# ``3 failed``, ``1 error``, ``2 failing tests`` in an output title or summary.
+_FAILURE_COUNT = re.compile(r'\b(\d+)\s+(?:failed|failing|failures?|errors?)\b', re.IGNORECASE)
+# ``path/to/test_x.py::TestCase::test_name[param]`` anywhere in a line.
+_NODE_ID = re.compile(r'[\w/.-]+\.py::[^\s]+')
+# pytest report head lines: ``test_name``, ``TestCase.test_name[param]``.
+_HEAD_LINE = re.compile(r'^((?:[A-Za-z_]\w*\.)*test\w*)(\[[^\]]*\])?$', re.IGNORECASE)
+
+
+def list_check_run_annotations(
+    check_run_id: str,
+    repo_path: Path,
+    repo: Optional[str] = None,
+    client: Optional[GitHubClient] = None,
+) -> List[Dict[str, Any]]:
+    """Return the annotations of a check run."""
+    api_client, repo_slug = resolve_api_client(repo, repo_path, client)
+    if api_client is not None:
+        return api_client.list_check_run_annotations(repo_slug, check_run_id)
+
+    endpoint = f"{_gh_repo_path(repo)}/check-runs/{check_run_id}/annotations"
+    result = run_gh_command(["api", "--paginate", "--jq", ".[]", endpoint], repo_path)
+    return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+
+
+def get_check_run_output(
+    check_run_id: str,
+    repo_path: Path,
+    repo: Optional[str] = None,
+    client: Optional[GitHubClient] = None,
+) -> Dict[str, Any]:
+    """Return a check run's ``output`` (title, summary and text)."""
+    api_client, repo_slug = resolve_api_client(repo, repo_path, client)
+    if api_client is not None:
+        check_run = api_client.get_check_run(repo_slug, check_run_id)
+    else:
+        result = run_gh_command(
+            ["api", f"{_gh_repo_path(repo)}/check-runs/{check_run_id}"],
+            repo_path,
+        )
+        check_run = json.loads(result.stdout or "{}")
+    return check_run.get("output") or {}
+
+
+def failed_tests_from_annotations(annotations: Iterable[Mapping[str, Any]]) -> List[str]:
+    """Test ids named by failure-level annotations, in order and without duplicates."""
+    failed_tests: List[str] = []
+    for annotation in annotations:
+        if annotation.get("annotation_level") != "failure":
+            continue
+        test_id = annotation_test_id(annotation)
+        if test_id and test_id not in failed_tests:
+            failed_tests.append(test_id)
+    return failed_tests
+
+
+def annotations_are_complete(
+    annotations: Iterable[Mapping[str, Any]],
+    failed_tests: List[str],
+    output: Mapping[str, Any],
+) -> bool:
+    """
+    Whether ``failed_tests`` read from annotations can be the whole failure list.
+
+    Not when the failure annotations reach GitHub's per-step cap, nor when the
+    output reports a different number of failures. An output without a count
+    does not contradict annotations under the cap.
+    """
+    failures = [
+        annotation for annotation in annotations if annotation.get("annotation_level") == "failure"
+    ]
+    if len(failures) >= ANNOTATIONS_PER_STEP_CAP:
+        return False
+    reported = failure_count_from_output(output)
+    return reported is None or reported == len(failed_tests)
+
+
+def failure_count_from_output(output: Mapping[str, Any]) -> Optional[int]:
+    """Failed plus errored tests on the first output line that counts them."""
+    for field_name in ("title", "summary", "text"):
+        for line in (output.get(field_name) or "").splitlines():
+            counts = _FAILURE_COUNT.findall(line)
+            if counts:
+                return sum(int(count) for count in counts)
+    return None
+
+
+def annotation_test_id(annotation: Mapping[str, Any]) -> Optional[str]:
+    """
+    Identify the test an annotation reports, or None for non-test annotations.
+
+    A node id in the title or first message line wins; otherwise a pytest
+    head line (``TestCase.test_name``) is joined with the annotated file.
+    """
+    title = (annotation.get("title") or "").strip()
+    message = (annotation.get("message") or "").strip()
+    first_line = message.splitlines()[0].strip() if message else ""
+    for text in (title, first_line):
+        match = _NODE_ID.search(text)
+        if match:
+            return match.group(0)
+
+    path = annotation.get("path") or ""
+    if not path.endswith(".py"):
+        return None
+    for text in (title, first_line):
+        match = _HEAD_LINE.match(text)
+        if match:
+            return f"{path}::{match.group(1).replace('.', '::')}{match.group(2) or ''}"
+    return None
+
+
+def failed_tests_from_output(output: Mapping[str, Any]) -> List[str]:
+    """Test ids listed as ``FAILED`` in a check run's output summary or text."""
+    lines: List[str] = []
+    for field_name in ("summary", "text"):
+        lines.extend((output.get(field_name) or "").splitlines())
+    return parse_failures(lines)
+
+
+def _gh_repo_path(repo: Optional[str]) -> str:
+    # gh fills the placeholders from the checkout's remote.
+    return f"repos/{repo}" if repo else "repos/{owner}/{repo}"
@@ -0,0 +1,286 @@
+"""
+Content-addressed on-disk cache of workflow artifacts and their parsed reports.
+
+Entries are keyed by the artifact's digest (or its repository and id when the
+listing carries no digest), so a retried activity or a re-run analysis finds
+the archive, and the junit results parsed from it, without downloading or
+parsing again. The cache is bounded by a byte quota and a TTL; the least
+recently used entries go first.
+
+Each entry is a directory ``<root>/<key[:2]>/<key>/`` holding ``archive.zip``,
+``junit.json`` and, when requested, the ``extracted/`` archive; all of it
+counts against the quota. Files are written atomically, and an ``flock`` per
+entry (where available) keeps concurrent workers from downloading the same
+artifact twice or evicting an entry another worker is using.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:  # POSIX only; without it the cache is safe within a process only.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+DEFAULT_CACHE_DIR_NAME = "artifact_cache"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_EVICT_INTERVAL_SECONDS = 600
+
+ARCHIVE_FILE = "archive.zip"
+PARSED_FILE = "junit.json"
+LOCK_FILE = ".lock"
+
+
+class ArtifactCache:
+    """Disk cache of artifact archives and parsed junit results."""
+
+    def __init__(
+        self,
+        base_dir: Optional[Path] = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        evict_interval_seconds: float = DEFAULT_EVICT_INTERVAL_SECONDS,
+    ):
+        self.base_dir = Path(base_dir) if base_dir else _default_cache_dir()
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evict_interval_seconds = evict_interval_seconds
+        self._last_evict = 0.0
+        self._thread_locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @staticmethod
+    def key_for(
+        repo: Optional[str],
+        artifact: Mapping[str, Any],
+        *,
+        run_id: Optional[str] = None,
+    ) -> str:
+        """
+        Content key for an artifact listing entry.
+
+        The digest identifies the content itself; artifact ids are immutable
+        too (a re-upload gets a new id). Listings without either (older gh
+        versions) fall back to the run id and artifact name.
+        """
+        digest = artifact.get("digest")
+        repo_part = (repo or "").lower()
+        if digest:
+            source = str(digest)
+        elif artifact.get("id") is not None:
+            source = f"{repo_part}:id:{artifact['id']}"
+        else:
+            source = f"{repo_part}:run:{run_id}:{artifact.get('name')}"
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def entry_dir(self, key: str) -> Path:
+        return self.base_dir / key[:2] / key
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[Path]:
+        """Hold the entry exclusively (across threads and processes) and yield its dir."""
+        with self._guard:
+            thread_lock = self._thread_locks.setdefault(key, threading.Lock())
+        with thread_lock:
+            while True:
+                entry = self.entry_dir(key)
+                entry.mkdir(parents=True, exist_ok=True)
+                lock_path = entry / LOCK_FILE
+                with _file_lock(lock_path) as handle:
+                    if _still_linked(handle, lock_path):
+                        yield entry
+                        return
+                # Evicted while we waited for the lock; recreate the entry.
+
+    def archive(self, key: str) -> Optional[Path]:
+        """Return the cached archive if present and fresh, marking it recently used."""
+        path = self.entry_dir(key) / ARCHIVE_FILE
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if time.time() - _created_at(path.parent, stat.st_mtime) > self.ttl_seconds:
+            return None
+        _touch(path.parent)
+        return path
+
+    def store_archive(self, key: str, source: Path) -> Path:
+        """Move a downloaded archive into the entry (call while holding ``lock``)."""
+        target = self.entry_dir(key) / ARCHIVE_FILE
+        temp = target.with_name(f"{ARCHIVE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.move(str(source), temp)
+        os.replace(temp, target)
+        (target.parent / PARSED_FILE).unlink(missing_ok=True)
+        _touch(target.parent, created=True)
+        return target
+
+    def parsed(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the junit results parsed from this artifact earlier, if any."""
+        path = self.entry_dir(key) / PARSED_FILE
+        if self.archive(key) is None:
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                tests = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return tests if isinstance(tests, list) else None
+
+    def store_parsed(self, key: str, tests: List[Dict[str, Any]]) -> None:
+        entry = self.entry_dir(key)
+        if not entry.exists():
+            return
+        path = entry / PARSED_FILE
+        temp = path.with_name(f"{PARSED_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with temp.open("w", encoding="utf-8") as handle:
+            json.dump(tests, handle)
+        os.replace(temp, path)
+
+    def maybe_evict(self) -> None:
+        """Run ``evict`` at most once per ``evict_interval_seconds``."""
+        now = time.time()
+        with self._guard:
+            if now - self._last_evict < self.evict_interval_seconds:
+                return
+            self._last_evict = now
+        self.evict()
+
+    def evict(self) -> Dict[str, int]:
+        """Drop expired entries, then least recently used ones until under quota."""
+        now = time.time()
+        entries: List[Tuple[float, int, Path]] = []
+        removed = 0
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            size = _dir_size(entry)
+            created = _created_at(entry, stat.st_mtime)
+            if now - created > self.ttl_seconds or not (entry / ARCHIVE_FILE).exists():
+                removed += self._remove(entry)
+                continue
+            entries.append((stat.st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        kept = len(entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove(entry):
+                removed += 1
+                kept -= 1
+                total -= size
+        return {"entries": kept, "bytes": total, "removed": removed}
+
+    def _entries(self) -> Iterator[Path]:
+        if not self.base_dir.exists():
+            return
+        for shard in self.base_dir.iterdir():
+            if shard.is_dir():
+                yield from (entry for entry in shard.iterdir() if entry.is_dir())
+
+    def _remove(self, entry: Path) -> int:
+        """Delete an entry unless another thread or worker holds it; return 1 if removed."""
+        with self._guard:
+            thread_lock = self._thread_locks.setdefault(entry.name, threading.Lock())
+        if not thread_lock.acquire(blocking=False):
+            return 0
+        try:
+            with _file_lock(entry / LOCK_FILE, blocking=False):
+                shutil.rmtree(entry, ignore_errors=True)
+        except OSError:  # BlockingIOError: another worker holds the entry
+            return 0
+        finally:
+            thread_lock.release()
+        return 1
+
+
+def _default_cache_dir() -> Path:
+    """Compute the default directory for cached artifacts."""
+    return Path.cwd() / DEFAULT_CACHE_DIR_NAME
+
+
+@contextmanager
+def _file_lock(path: Path, *, blocking: bool = True) -> Iterator[Optional[IO[str]]]:
+    if fcntl is None:
+        yield None
+        return
+    with open(path, "a+") as handle:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        fcntl.flock(handle.fileno(), flags)
+        try:
+            yield handle
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _still_linked(handle: Optional[IO[str]], path: Path) -> bool:
+    """Whether the locked file is still the one at ``path`` (not removed by eviction)."""
+    if handle is None:
+        return True
+    try:
+        return os.stat(path).st_ino == os.fstat(handle.fileno()).st_ino
+    except OSError:
+        return False
+
+
+def _touch(entry: Path, *, created: bool = False) -> None:
+    """Record use on the entry dir mtime; the TTL runs from the ``created`` marker."""
+    now = time.time()
+    try:
+        if created:
+            (entry / ".created").write_text(str(now), encoding="utf-8")
+        os.utime(entry, (now, now))
+    except OSError:
+        pass
+
+
+def _created_at(entry: Path, fallback: float) -> float:
+    try:
+        return float((entry / ".created").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return fallback
+
+
+def _dir_size(entry: Path) -> int:
+    """Bytes under the entry, including the extracted archive."""
+    total = 0
+    for directory, _, files in os.walk(entry):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+_shared_cache: Optional[ArtifactCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artifact cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ArtifactCache()
+        return _shared_cache
+
+
+def set_artifact_cache(cache: Optional[ArtifactCache]) -> None:
+    """Install the process-wide artifact cache (None restores the default)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = cache
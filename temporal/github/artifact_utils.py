@@ -1,28 +1,152 @@
 """
-Helpers for interacting with GitHub Actions workflow artifacts via the gh CLI.
+Helpers for interacting with GitHub Actions workflow artifacts.
+
+Calls go through the pooled API client when credentials are available and fall
+back to the gh CLI otherwise.
 """
 from __future__ import annotations
 
+import fnmatch
 import json
+import shutil
 import subprocess
 import tempfile
 import zipfile
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from temporal.github.artifact_cache import ArtifactCache, get_artifact_cache
+from temporal.github.client import GitHubClient, get_shared_client, resolve_repo_slug
+from temporal.github.known_repos import KNOWN_REPOS
 
 GH_TIMEOUT_SECONDS = 60
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_MAX_ARTIFACT_BYTES = 100 * 1024 * 1024
+# Artifacts that never carry junit reports but can be hundreds of MB.
+DEFAULT_EXCLUDE_PATTERNS = (
+    "*coverage*",
+    "*wheel*",
+    "*.whl",
+    "dist",
+    "*-dist",
+    "*sdist*",
+)
 
 
+@dataclass
+class ArtifactFilter:
+    """
+    Selects the artifacts worth downloading from a run's artifact listing.
+
+    Patterns are case-insensitive ``fnmatch`` globs on the artifact name; with
+    ``include`` set only matching artifacts pass. ``max_bytes`` of None
+    disables the size cap.
+    """
+
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = field(default_factory=lambda: DEFAULT_EXCLUDE_PATTERNS)
+    max_bytes: Optional[int] = DEFAULT_MAX_ARTIFACT_BYTES
+
+    def accepts(self, artifact: Mapping[str, Any]) -> bool:
+        name = str(artifact.get("name") or "").lower()
+        if not name or artifact.get("expired"):
+            return False
+        if self.include and not _matches_any(name, self.include):
+            return False
+        if _matches_any(name, self.exclude):
+            return False
+        size = _artifact_size(artifact)
+        return self.max_bytes is None or size is None or size <= self.max_bytes
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> "ArtifactFilter":
+        """Build a filter from a ``KNOWN_REPOS`` ``artifact_filter`` entry."""
+        if not config:
+            return cls()
+        max_size_mb = config.get("max_size_mb", DEFAULT_MAX_ARTIFACT_BYTES // (1024 * 1024))
+        return cls(
+            include=tuple(config.get("include") or ()),
+            exclude=tuple(config.get("exclude", DEFAULT_EXCLUDE_PATTERNS)),
+            max_bytes=None if max_size_mb is None else int(max_size_mb * 1024 * 1024),
+        )
+
+
+def artifact_filter_for_repo(repo: Optional[str]) -> ArtifactFilter:
+    """Return the artifact filter configured for a repository slug, or the default."""
+    for config in KNOWN_REPOS.values():
+        if repo and str(config.get("repo_id", "")).lower() == repo.lower():
+            return ArtifactFilter.from_config(config.get("artifact_filter"))
+    return ArtifactFilter()
+
+
+JUNIT_HEADER_BYTES = 256
+# Raised by a zip member whose header or compressed data is corrupt.
+ZIP_MEMBER_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
 @dataclass
 class ArtifactDownload:
-    """Materialized artifact contents plus discovered junit report paths."""
+    """
+    A downloaded artifact archive plus the junit reports found in it.
+
+    Reports are normally read straight from the zip (``junit_members``); an
+    extracted artifact has an ``extract_path`` and on-disk ``junit_paths``.
+    """
 
     name: str
     archive_path: Path
-    extract_path: Path
-    junit_paths: List[Path]
+    extract_path: Optional[Path] = None
+    junit_paths: List[Path] = field(default_factory=list)
+    junit_members: List[str] = field(default_factory=list)
+    # Set when the archive lives in the artifact cache.
+    cache_key: Optional[str] = None
+
+    @property
+    def has_junit_reports(self) -> bool:
+        return bool(self.junit_paths or self.junit_members)
+
+    @property
+    def junit_files(self) -> List[str]:
+        """File names of the junit reports, for summaries."""
+        return [path.name for path in self.junit_paths] + [
+            PurePosixPath(member).name for member in self.junit_members
+        ]
+
+    def iter_junit_reports(self) -> Iterator[Tuple[str, Union[Path, IO[bytes]]]]:
+        """
+        Yield ``(file name, source)`` for each junit report.
+
+        Zip members are yielded as open binary streams that are only valid
+        until the next item is requested. A corrupt member is logged and
+        skipped; reading one can also raise ``ZIP_MEMBER_ERRORS``.
+        """
+        for path in self.junit_paths:
+            yield path.name, path
+        if not self.junit_members:
+            return
+        with zipfile.ZipFile(self.archive_path, "r") as archive:
+            for member in self.junit_members:
+                try:
+                    handle = archive.open(member)
+                except ZIP_MEMBER_ERRORS as exc:
+                    print(f"⚠️ Skipping junit report {member} of artifact '{self.name}': {exc}")
+                    continue
+                with handle:
+                    yield PurePosixPath(member).name, handle
 
 
 def _gh_repo_args(repo: Optional[str]) -> List[str]:
@@ -32,7 +156,22 @@ def _gh_repo_args(repo: Optional[str]) -> List[str]:
     return []
 
 
-def _run_gh_command(
+def resolve_api_client(
+    repo: Optional[str],
+    repo_path: Path,
+    client: Optional[GitHubClient] = None,
+) -> Tuple[Optional[GitHubClient], Optional[str]]:
+    """Return the API client and repo slug to use, or (None, None) for gh."""
+    client = client or get_shared_client(repo)
+    if client is None:
+        return None, None
+    repo_slug = resolve_repo_slug(repo, repo_path)
+    if not repo_slug:
+        return None, None
+    return client, repo_slug
+
+
+def run_gh_command(
     args: Sequence[str],
     repo_path: Path,
     timeout: int = GH_TIMEOUT_SECONDS,
@@ -57,15 +196,20 @@ def list_run_artifacts(
     run_id: str,
     repo_path: Path,
     repo: Optional[str] = None,
+    client: Optional[GitHubClient] = None,
 ) -> List[Dict[str, Any]]:
     """
     Return available artifacts for the provided workflow run.
 
-    Uses `gh run view --json artifacts` to avoid introducing a REST dependency.
+    Falls back to `gh run view --json artifacts` when no API client is configured.
     """
+    api_client, repo_slug = resolve_api_client(repo, repo_path, client)
+    if api_client is not None:
+        return api_client.list_run_artifacts(repo_slug, run_id)
+
     args: List[str] = ["run", "view", run_id, "--json", "artifacts"]
     args.extend(_gh_repo_args(repo))
-    result = _run_gh_command(args, repo_path)
+    result = run_gh_command(args, repo_path)
     try:
         payload = json.loads(result.stdout or "{}")
     except json.JSONDecodeError as exc:
@@ -83,19 +227,87 @@ def download_artifact_archive(
     repo_path: Path,
     repo: Optional[str] = None,
     base_temp_dir: Optional[Path] = None,
+    artifact_id: Optional[Any] = None,
+    client: Optional[GitHubClient] = None,
+    extract: bool = False,
+    cache: Optional[ArtifactCache] = None,
+    cache_key: Optional[str] = None,
 ) -> ArtifactDownload:
     """
-    Download and extract a workflow artifact archive into an isolated temp dir.
+    Download a workflow artifact archive and locate its junit reports.
+
+    Junit reports are identified by member name and header and read straight
+    from the zip; pass ``extract`` to also unpack the archive to disk. Without
+    ``base_temp_dir`` the archive goes to the artifact cache and is reused from
+    there. The API path needs the artifact id; it is looked up by name when
+    omitted.
     """
-    if base_temp_dir is None:
-        base_temp_dir = Path(tempfile.mkdtemp(prefix="artifact-download-"))
-    else:
+    if base_temp_dir is not None:
         base_temp_dir.mkdir(parents=True, exist_ok=True)
+        # One archive dir per artifact so concurrent gh downloads cannot mix up zips.
+        archive_dir = base_temp_dir / "archives" / artifact_name
+        archive_path = _fetch_archive(
+            run_id, artifact_name, repo_path, repo, archive_dir, artifact_id, client,
+        )
+        return _artifact_download(
+            artifact_name,
+            archive_path,
+            extract_root=base_temp_dir / "extracted" if extract else None,
+        )
+
+    cache = cache or get_artifact_cache()
+    if cache_key is None:
+        cache_key = cache.key_for(
+            resolve_repo_slug(repo, repo_path),
+            {"id": artifact_id, "name": artifact_name},
+            run_id=run_id,
+        )
+    with cache.lock(cache_key) as entry:
+        archive_path = cache.archive(cache_key)
+        if archive_path is None:
+            staging = entry / "staging"
+            try:
+                fetched = _fetch_archive(
+                    run_id, artifact_name, repo_path, repo, staging, artifact_id, client,
+                )
+                archive_path = cache.store_archive(cache_key, fetched)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        else:
+            print(f"📦 Using cached artifact '{artifact_name}' of run {run_id}")
+        download = _artifact_download(
+            artifact_name,
+            archive_path,
+            extract_root=entry / "extracted" if extract else None,
+        )
+    download.cache_key = cache_key
+    cache.maybe_evict()
+    return download
 
-    archive_dir = base_temp_dir / "archives"
+
+def _fetch_archive(
+    run_id: str,
+    artifact_name: str,
+    repo_path: Path,
+    repo: Optional[str],
+    archive_dir: Path,
+    artifact_id: Optional[Any],
+    client: Optional[GitHubClient],
+) -> Path:
+    """Download one artifact zip into ``archive_dir`` via the API or gh."""
     archive_dir.mkdir(parents=True, exist_ok=True)
-    extract_root = base_temp_dir / "extracted"
-    extract_root.mkdir(parents=True, exist_ok=True)
+    api_client, repo_slug = resolve_api_client(repo, repo_path, client)
+    if api_client is not None:
+        if artifact_id is None:
+            artifact_id = _find_artifact_id(
+                api_client.list_run_artifacts(repo_slug, run_id),
+                artifact_name,
+            )
+        return api_client.download_artifact(
+            repo_slug,
+            artifact_id,
+            archive_dir / f"{artifact_name}.zip",
+        )
 
     download_args: List[str] = [
         "run",
@@ -109,11 +321,28 @@ def download_artifact_archive(
         str(archive_dir),
     ]
     download_args.extend(_gh_repo_args(repo))
-    _run_gh_command(download_args, repo_path)
+    run_gh_command(download_args, repo_path)
+    return _resolve_archive_path(archive_dir, artifact_name)
 
-    archive_path = _resolve_archive_path(archive_dir, artifact_name)
-    extract_path = Path(tempfile.mkdtemp(prefix=f"{artifact_name}-", dir=extract_root))
 
+def _artifact_download(
+    artifact_name: str,
+    archive_path: Path,
+    *,
+    extract_root: Optional[Path] = None,
+) -> ArtifactDownload:
+    """Describe an archive's junit reports, extracting it under ``extract_root`` if given."""
+    if extract_root is None:
+        with zipfile.ZipFile(archive_path, "r") as zip_file:
+            junit_members = list(_discover_junit_members(zip_file))
+        return ArtifactDownload(
+            name=artifact_name,
+            archive_path=archive_path,
+            junit_members=junit_members,
+        )
+
+    extract_root.mkdir(parents=True, exist_ok=True)
+    extract_path = Path(tempfile.mkdtemp(prefix=f"{artifact_name}-", dir=extract_root))
     with zipfile.ZipFile(archive_path, "r") as zip_file:
         zip_file.extractall(path=extract_path)
 
@@ -131,29 +360,77 @@ def download_all_junit_artifacts(
     repo_path: Path,
     repo: Optional[str] = None,
     base_temp_dir: Optional[Path] = None,
+    client: Optional[GitHubClient] = None,
+    artifact_filter: Optional[ArtifactFilter] = None,
+    max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    cache: Optional[ArtifactCache] = None,
 ) -> List[ArtifactDownload]:
     """
-    Download all artifacts for a run and return ones that contain junit reports.
+    Download a run's candidate artifacts and return ones that contain junit reports.
+
+    Artifacts are first filtered by name and size using the listing metadata
+    (the repo's ``artifact_filter`` by default), then fetched concurrently by
+    at most ``max_workers`` threads. The result keeps the listing order.
+    Without ``base_temp_dir`` archives are kept in (and reused from) the
+    artifact cache, keyed by the listing's digest or id.
     """
-    artifacts = list_run_artifacts(run_id, repo_path, repo)
-    junit_downloads: List[ArtifactDownload] = []
-    for artifact in artifacts:
-        name = artifact.get("name")
-        if not name:
-            continue
+    if artifact_filter is None:
+        artifact_filter = artifact_filter_for_repo(repo)
+    artifacts = list_run_artifacts(run_id, repo_path, repo, client=client)
+    candidates = [artifact for artifact in artifacts if artifact_filter.accepts(artifact)]
+    skipped = len([artifact for artifact in artifacts if artifact.get("name")]) - len(candidates)
+    if skipped:
+        print(f"📦 Skipping {skipped} artifact(s) of run {run_id} by name/size filter")
+    if not candidates:
+        return []
+    if base_temp_dir is None:
+        cache = cache or get_artifact_cache()
+        repo_slug = resolve_repo_slug(repo, repo_path)
+
+    def download(artifact: Dict[str, Any]) -> Optional[ArtifactDownload]:
+        cache_key = None
+        if base_temp_dir is None:
+            cache_key = cache.key_for(repo_slug, artifact, run_id=run_id)
         try:
-            download = download_artifact_archive(
+            return download_artifact_archive(
                 run_id=run_id,
-                artifact_name=name,
+                artifact_name=artifact["name"],
                 repo_path=repo_path,
                 repo=repo,
                 base_temp_dir=base_temp_dir,
+                artifact_id=artifact.get("id"),
+                client=client,
+                cache=cache,
+                cache_key=cache_key,
             )
         except Exception:
-            continue
-        if download.junit_paths:
-            junit_downloads.append(download)
-    return junit_downloads
+            return None
+
+    workers = max(1, min(max_workers, len(candidates)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-download") as pool:
+        downloads = list(pool.map(download, candidates))
+    return [item for item in downloads if item is not None and item.has_junit_reports]
+
+
+def _matches_any(name: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in patterns)
+
+
+def _artifact_size(artifact: Mapping[str, Any]) -> Optional[int]:
+    """Artifact size from the REST (``size_in_bytes``) or gh (``sizeInBytes``) listing."""
+    size = artifact.get("size_in_bytes", artifact.get("sizeInBytes"))
+    try:
+        return int(size) if size is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_artifact_id(artifacts: List[Dict[str, Any]], artifact_name: str) -> Any:
+    """Return the id of the named artifact from a run's artifact listing."""
+    for artifact in artifacts:
+        if artifact.get("name") == artifact_name and artifact.get("id") is not None:
+            return artifact["id"]
+    raise FileNotFoundError(f"Artifact '{artifact_name}' not found for run")
 
 
 def _resolve_archive_path(archive_dir: Path, artifact_name: str) -> Path:
@@ -171,6 +448,20 @@ def _resolve_archive_path(archive_dir: Path, artifact_name: str) -> Path:
     return zips[0]
 
 
+def _discover_junit_members(zip_file: zipfile.ZipFile) -> Iterable[str]:
+    """Yield zip members that look like junit XML reports, without extracting."""
+    for info in zip_file.infolist():
+        if info.is_dir() or not info.filename.lower().endswith(".xml"):
+            continue
+        try:
+            with zip_file.open(info) as handle:
+                snippet = handle.read(JUNIT_HEADER_BYTES).decode("utf-8", "ignore").lower()
+        except (OSError, zipfile.BadZipFile, RuntimeError):
+            continue
+        if "<testsuite" in snippet or "<testsuites" in snippet:
+            yield info.filename
+
+
 def _discover_junit_reports(root: Path) -> Iterable[Path]:
     """Search for junit XML reports within an extracted artifact directory."""
     if not root.exists():
@@ -178,7 +469,7 @@ def _discover_junit_reports(root: Path) -> Iterable[Path]:
     for xml_path in root.rglob("*.xml"):
         try:
             with xml_path.open("r", encoding="utf-8") as handle:
-                snippet = handle.read(256).lower()
+                snippet = handle.read(JUNIT_HEADER_BYTES).lower()
         except (OSError, UnicodeDecodeError):
             continue
         if "<testsuite" in snippet or "<testsuites" in snippet:
@@ -0,0 +1,233 @@
+"""
+Worker-wide poller that batches PR check fetches across in-flight mutations.
+
+Each waiting activity registers interest in its PR; a single background thread
+fetches every watched PR of a repository with one batched GraphQL query per
+interval and fans the snapshots out to the waiters. API calls therefore scale
+with the number of repositories, not the number of mutants in flight. Waiters
+may push their PR's next fetch out (see ``reschedule``) so PRs whose CI is
+known to run long are not fetched on every interval.
+
+Async activities wait with ``wait_for_update_async``, which parks a coroutine
+on the event loop instead of a thread on the poller's condition.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from temporal.github.client import GitHubClient, RateLimitExceeded, get_shared_client
+
+
+DEFAULT_POLL_INTERVAL_SECONDS = 15.0
+
+
+@dataclass
+class CheckWatch:
+    """Latest snapshot for one watched PR, shared by every waiter on it."""
+
+    repo: str
+    pr_number: str
+    snapshot: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    version: int = 0
+    watchers: int = 0
+    due_at: float = 0.0
+    rescheduled: bool = False
+    # Called (on the poller thread) after every new version; see wait_for_update_async.
+    listeners: List[Callable[[], None]] = field(default_factory=list, repr=False)
+
+
+class SharedCheckPoller:
+    """Polls all watched PRs of each repo in batched queries on one thread."""
+
+    def __init__(
+        self,
+        client: GitHubClient,
+        *,
+        interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ):
+        self.client = client
+        self.interval_seconds = interval_seconds
+        self._watches: Dict[Tuple[str, str], CheckWatch] = {}
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.batches_fetched = 0
+
+    def watch(self, repo: str, pr_number: str) -> CheckWatch:
+        """Register interest in a PR and return its shared watch."""
+        key = (repo.lower(), str(pr_number))
+        with self._condition:
+            watch = self._watches.get(key)
+            if watch is None:
+                watch = CheckWatch(repo=repo, pr_number=str(pr_number))
+                self._watches[key] = watch
+            watch.watchers += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="shared-check-poller",
+                    daemon=True,
+                )
+                self._thread.start()
+        # Fetch new PRs right away rather than at the next interval.
+        self._wake.set()
+        return watch
+
+    def unwatch(self, watch: CheckWatch) -> None:
+        """Drop one waiter's interest; the PR stops being polled after the last."""
+        key = (watch.repo.lower(), watch.pr_number)
+        with self._condition:
+            watch.watchers -= 1
+            if watch.watchers <= 0:
+                self._watches.pop(key, None)
+
+    def reschedule(self, watch: CheckWatch, delay_seconds: float) -> None:
+        """
+        Set when the PR is next fetched, relative to now.
+
+        The earliest request since the last fetch wins, so one waiter cannot
+        starve another watching the same PR.
+        """
+        due_at = time.monotonic() + max(delay_seconds, 0.0)
+        with self._condition:
+            if watch.rescheduled:
+                due_at = min(due_at, watch.due_at)
+            watch.due_at = due_at
+            watch.rescheduled = True
+        self._wake.set()
+
+    def wait_for_update(
+        self,
+        watch: CheckWatch,
+        seen_version: int,
+        timeout: float,
+    ) -> Optional[CheckWatch]:
+        """Block until the watch has a version newer than ``seen_version``."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while watch.version <= seen_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            return watch
+
+    async def wait_for_update_async(
+        self,
+        watch: CheckWatch,
+        seen_version: int,
+        timeout: float,
+    ) -> Optional[CheckWatch]:
+        """Await a version newer than ``seen_version`` without holding a thread."""
+        loop = asyncio.get_running_loop()
+        updated = asyncio.Event()
+
+        def notify() -> None:
+            try:
+                loop.call_soon_threadsafe(updated.set)
+            except RuntimeError:
+                pass  # The waiter's loop is already closed.
+
+        with self._condition:
+            if watch.version > seen_version:
+                return watch
+            watch.listeners.append(notify)
+        try:
+            await asyncio.wait_for(updated.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                watch.listeners.remove(notify)
+        return watch if watch.version > seen_version else None
+
+    def poll_once(self) -> None:
+        """Fetch every watched PR that is due, one batched query per repository."""
+        now = time.monotonic()
+        with self._condition:
+            due_repos = {
+                watch.repo.lower() for watch in self._watches.values() if watch.due_at <= now
+            }
+            by_repo: Dict[str, List[CheckWatch]] = {}
+            for watch in self._watches.values():
+                # PRs due within the next interval ride along in the same query.
+                if watch.repo.lower() not in due_repos:
+                    continue
+                if watch.due_at > now + self.interval_seconds:
+                    continue
+                watch.due_at = now + self.interval_seconds
+                watch.rescheduled = False
+                by_repo.setdefault(watch.repo.lower(), []).append(watch)
+
+        for watches in by_repo.values():
+            repo = watches[0].repo
+            snapshots: Dict[str, Dict[str, Any]] = {}
+            error: Optional[Exception] = None
+            try:
+                snapshots = self.client.get_pr_snapshots(
+                    repo,
+                    [watch.pr_number for watch in watches],
+                )
+                self.batches_fetched += 1
+            except Exception as exc:  # surfaced to waiters, retried next interval
+                error = exc
+
+            with self._condition:
+                for watch in watches:
+                    if isinstance(error, RateLimitExceeded):
+                        # Back off the whole repo until the budget is restored.
+                        watch.due_at = max(watch.due_at, time.monotonic() + error.retry_after)
+                    snapshot = snapshots.get(watch.pr_number)
+                    watch.snapshot = snapshot if snapshot is not None else watch.snapshot
+                    watch.error = error or (
+                        None if snapshot is not None else LookupError(
+                            f"PR #{watch.pr_number} not found in {repo}"
+                        )
+                    )
+                    watch.version += 1
+                    for listener in watch.listeners:
+                        listener()
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            # Cleared before computing the next due time so a concurrent
+            # watch()/reschedule() is never missed.
+            self._wake.clear()
+            with self._condition:
+                if not self._watches:
+                    self._thread = None
+                    return
+                next_due = min(watch.due_at for watch in self._watches.values())
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+                continue
+            self.poll_once()
+
+
+_shared_pollers: Dict[int, SharedCheckPoller] = {}
+_shared_poller_lock = threading.Lock()
+
+
+def get_shared_poller(repo: Optional[str] = None) -> Optional[SharedCheckPoller]:
+    """
+    Return the process-wide poller for ``repo``'s API client.
+
+    Repos with their own credential pool get their own poller. Returns None
+    when no API client is available.
+    """
+    with _shared_poller_lock:
+        client = get_shared_client(repo)
+        if client is None:
+            return None
+        poller = _shared_pollers.get(id(client))
+        if poller is None or poller.client is not client:
+            poller = SharedCheckPoller(client)
+            _shared_pollers[id(client)] = poller
+        return poller
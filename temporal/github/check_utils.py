@@ -3,11 +3,19 @@ Shared utilities for processing GitHub check results.
 """
 import subprocess
 import re
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
-from temporal.github import artifact_utils
+from temporal.github import annotation_utils, artifact_utils
 from temporal.github.artifact_utils import ArtifactDownload
+from temporal.github.client import GitHubAPIError, get_shared_client, resolve_repo_slug
+from temporal.github.log_parser import FailedLogIndex, JobFailures, parse_failures
+
+
+# Upper bound on fetching one run's failed-job log with gh.
+LOG_FETCH_TIMEOUT_SECONDS = 30
 
 
 class CheckProcessor:
@@ -40,7 +48,8 @@ class CheckProcessor:
             'started_at': check.get('startedAt'),
             'completed_at': check.get('completedAt'),
             'description': check.get('description', ''),
-            'workflow': check.get('workflow', '')
+            'workflow': check.get('workflow', ''),
+            'run_id': check.get('run_id') or check.get('runId'),
         }
     
     @staticmethod
@@ -130,6 +139,16 @@ class CheckProcessor:
         
         return False
     
+    @staticmethod
+    def get_first_failed_test_check(checks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return the first failed test check (normalized), or None."""
+        for check in checks or []:
+            normalized_check = CheckProcessor.normalize_check(check)
+            is_failed = normalized_check.get('bucket') == CheckProcessor.STATUS_FAIL
+            if is_failed and CheckProcessor.is_test_check(normalized_check):
+                return normalized_check
+        return None
+    
     @staticmethod
     def get_failed_test_checks(
         checks: List[Dict[str, Any]],
@@ -225,12 +244,59 @@ class CheckProcessor:
         """Resolve the workflow run identifier associated with a check."""
         if not isinstance(check, dict):
             return None
+        run_id = check.get('run_id') or check.get('runId')
+        if run_id:
+            return str(run_id)
         check_url = check.get('url') or check.get('link')
         if not check_url:
             normalized = CheckProcessor.normalize_check(check)
             check_url = normalized.get('url')
         return CheckProcessor.extract_run_id_from_url(check_url or "")
 
+    @staticmethod
+    def get_check_job_id(check: Dict[str, Any]) -> Optional[str]:
+        """
+        Resolve the check run id of a check; for Actions it is the job id.
+
+        Actions links look like ``.../actions/runs/<run>/job/<job>``; other
+        check runs link to ``https://github.com/<owner>/<repo>/runs/<id>``.
+        """
+        if not isinstance(check, dict):
+            return None
+        check_run_id = check.get('check_run_id') or check.get('checkRunId')
+        if check_run_id:
+            return str(check_run_id)
+        check_url = check.get('url') or check.get('link') or ''
+        match = (
+            re.search(r'/job/(\d+)', check_url)
+            or re.search(r'github\.com/[^/]+/[^/]+/runs/(\d+)', check_url)
+        )
+        return match.group(1) if match else None
+
+    @staticmethod
+    def get_check_run_annotations(
+        check: Dict[str, Any],
+        repo_path: Optional[str] = None,
+        repo: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the annotations of a check's check run, if it can be resolved."""
+        check_run_id = CheckProcessor.get_check_job_id(check)
+        if not check_run_id or not repo_path:
+            return []
+        return annotation_utils.list_check_run_annotations(check_run_id, Path(repo_path), repo)
+
+    @staticmethod
+    def get_check_run_output(
+        check: Dict[str, Any],
+        repo_path: Optional[str] = None,
+        repo: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the output (title, summary, text) of a check's check run."""
+        check_run_id = CheckProcessor.get_check_job_id(check)
+        if not check_run_id or not repo_path:
+            return {}
+        return annotation_utils.get_check_run_output(check_run_id, Path(repo_path), repo)
+
     @staticmethod
     def list_check_artifacts(
         check: Dict[str, Any],
@@ -274,8 +340,17 @@ class CheckProcessor:
         check: Dict[str, Any],
         repo_path: str,
         repo: str = None,
+        run_logs: Optional[Dict[str, FailedLogIndex]] = None,
     ) -> Dict[str, Any]:
-        """Get detailed failure information for a failed check."""
+        """
+        Get detailed failure information for a failed check.
+
+        The failed-job log is parsed line by line as it streams in, so memory
+        stays bounded by the failures found. ``run_logs`` memoizes the parsed
+        log by run id, so matrix jobs of one run fetch it once; each check
+        reads its own job's failures from the index, and a job that finished
+        after the memo was taken refreshes it.
+        """
         check_details = {
             'check_name': check.get('name', 'Unknown'),
             'failure_reason': 'due to reasons other than test case failure',
@@ -294,52 +369,75 @@ class CheckProcessor:
             )
             return check_details
         
+        # A matrix job that had not failed yet when the run's log was memoized
+        # is missing from it; fetch the log again rather than guess.
+        if run_logs is not None and run_id in run_logs and run_logs[run_id].covers(
+            check_details['check_name']
+        ):
+            check_details['log_available'] = True
+            CheckProcessor._apply_log_failures(
+                check_details,
+                run_logs[run_id].for_job(check_details['check_name']),
+            )
+            return check_details
+        
+        client = get_shared_client(repo)
+        api_repo = resolve_repo_slug(repo, Path(repo_path)) if client else None
+        if api_repo:
+            try:
+                index = FailedLogIndex().feed_lines(
+                    client.iter_failed_run_log_lines(api_repo, run_id)
+                )
+            except (GitHubAPIError, OSError) as e:
+                check_details['failure_reason'] = (
+                    "due to unknown reasons "
+                    f"(failed to fetch logs: {str(e)[:200]})"
+                )
+                return check_details
+            if run_logs is not None:
+                run_logs[run_id] = index
+            check_details['log_available'] = True
+            CheckProcessor._apply_log_failures(
+                check_details,
+                index.for_job(check_details['check_name']),
+            )
+            return check_details
+
         try:
             # Get the failed logs for this run
             cmd = ["gh", "run", "view", run_id, "--log-failed"]
             if repo:
                 cmd.extend(["--repo", repo])
 
-            result = subprocess.run(
+            index = FailedLogIndex()
+            returncode, stderr = CheckProcessor._stream_command_lines(
                 cmd,
                 cwd=repo_path,
-                capture_output=True,
-                text=True,
-                timeout=30,
+                on_line=index.feed,
+                timeout=LOG_FETCH_TIMEOUT_SECONDS,
             )
             
-            if result.returncode == 0:
+            if returncode == 0:
+                if run_logs is not None:
+                    run_logs[run_id] = index
                 check_details['log_available'] = True
-                log_output = result.stdout
-                
-                # Parse the log output to extract test failures
-                failed_tests = CheckProcessor.parse_test_failures_from_log(
-                    log_output
+                CheckProcessor._apply_log_failures(
+                    check_details,
+                    index.for_job(check_details['check_name']),
                 )
-                if failed_tests:
-                    check_details['failed_tests'] = failed_tests
-                    check_details['failure_reason'] = (
-                        f"due to {len(failed_tests)} failed test case(s)"
-                    )
-                else:
-                    # Look for other common failure patterns
-                    if "error" in log_output.lower() or "failed" in log_output.lower():
-                        check_details['failure_reason'] = (
-                            "due to build or runtime errors"
-                        )
             else:
                 # If command failed, add debug info (truncate stderr to avoid too much output)
                 stderr_msg = (
-                    result.stderr[:200] + "..."
-                    if len(result.stderr) > 200
-                    else result.stderr
+                    stderr[:200] + "..."
+                    if len(stderr) > 200
+                    else stderr
                 )
                 check_details['failure_reason'] = (
                     "due to unknown reasons "
                     f"(failed to fetch logs: {stderr_msg})"
                 )
                     
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError) as e:
             # If we can't get the logs, just return the basic info
             check_details['failure_reason'] = (
                 "due to unknown reasons "
@@ -347,46 +445,67 @@ class CheckProcessor:
             )
         
         return check_details
-    
+
     @staticmethod
-    def parse_test_failures_from_log(log_output: str) -> List[str]:
-        """Parse test failure information from log output."""
-        failed_tests = []
-        
-        # Look for pytest short test summary info block (most reliable)
-        summary_match = re.search(
-            r'=+ short test summary info =+\s*\n(.*?)\n=+.*?=+', 
-            log_output, 
-            re.DOTALL | re.IGNORECASE
-        )
-        
-        if summary_match:
-            summary_block = summary_match.group(1)
-            # Extract FAILED lines from the summary - be more specific
-            failed_lines = re.findall(r'FAILED\s+([^\n\r]+)', summary_block)
-            for line in failed_lines:
-                line = line.strip()
-                # Only include lines that look like proper test paths
-                if line and '::' in line and line not in failed_tests:
-                    # Filter out obvious noise patterns
-                    if not re.match(r'^[\[\]:()]+$', line) and len(line) > 5:
-                        failed_tests.append(line)
-        
-        # If no short summary found, look for individual FAILED patterns (fallback)
-        if not failed_tests:
-            # Only look for well-formed test paths
-            pattern = (
-                r'FAILED\s+((?:tests?/)?[a-zA-Z0-9_/.-]+\.py::[a-zA-Z0-9_]+'
-                r'(?:\s+-\s+[^\n\r]+)?)'
+    def _stream_command_lines(
+        cmd: List[str],
+        *,
+        cwd: str,
+        on_line: Callable[[str], None],
+        timeout: float,
+    ) -> Tuple[int, str]:
+        """
+        Run a command, handing each stdout line to ``on_line`` as it arrives.
+
+        Returns the exit code and stderr; raises ``TimeoutExpired`` (after
+        killing the process) if it runs longer than ``timeout`` seconds.
+        """
+        with tempfile.TemporaryFile(mode="w+") as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
             )
-            matches = re.findall(
-                pattern,
-                log_output,
-                re.IGNORECASE | re.MULTILINE,
+            timed_out = threading.Event()
+
+            def _kill() -> None:
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    on_line(line)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+                process.stdout.close()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            stderr_file.seek(0)
+            return returncode, stderr_file.read()
+    
+    @staticmethod
+    def _apply_log_failures(check_details: Dict[str, Any], job_failures: JobFailures) -> None:
+        """Record failures parsed from a failed-job log onto check details."""
+        failed_tests = job_failures.failed_tests
+        if failed_tests:
+            check_details['failed_tests'] = failed_tests
+            check_details['failure_reason'] = (
+                f"due to {len(failed_tests)} failed test case(s)"
             )
-            for match in matches:
-                test_info = match.strip()
-                if test_info and test_info not in failed_tests:
-                    failed_tests.append(test_info)
-        
-        return failed_tests[:10]  # Limit to first 10 failures to avoid overwhelming output
+        elif job_failures.saw_error_keyword:
+            # Look for other common failure patterns
+            check_details['failure_reason'] = "due to build or runtime errors"
+
+    @staticmethod
+    def parse_test_failures_from_log(log_output: str) -> List[str]:
+        """
+        Parse test failure information from log output.
+
+        Every failure is returned; callers that print them truncate for display.
+        """
+        return parse_failures(log_output.splitlines())
@@ -0,0 +1,206 @@
+"""
+Per-repository CI duration history and the polling schedule derived from it.
+
+Completed waits record how long the repo's checks ran (from the normalized
+``started_at``/``completed_at`` timestamps) and how long it took for the first
+check to appear. The wait loop then sleeps until shortly before the expected
+completion and polls with jittered exponential backoff from there.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from temporal.github.check_utils import CheckProcessor
+
+
+DEFAULT_DURATIONS_DIR_NAME = "ci_durations"
+DEFAULT_POLL_INTERVAL_SECONDS = 15.0
+DEFAULT_NO_CHECKS_CUTOFF_SECONDS = 120
+MIN_NO_CHECKS_CUTOFF_SECONDS = 60
+MAX_SAMPLES = 50
+
+_write_lock = threading.Lock()
+
+
+@dataclass
+class PollSchedule:
+    """
+    Decides how long to sleep between polls of one PR.
+
+    Without history this is the historical fixed 15 s interval. With an
+    expected duration the first sleep runs until ``lead_seconds`` before the
+    expected completion, then delays double from ``base_interval`` up to
+    ``max_interval`` with +/- ``jitter`` randomization so mutants started
+    together do not poll in lockstep.
+    """
+
+    expected_seconds: Optional[float] = None
+    no_checks_cutoff: int = DEFAULT_NO_CHECKS_CUTOFF_SECONDS
+    lead_seconds: float = 10.0
+    base_interval: float = 5.0
+    max_interval: float = 60.0
+    jitter: float = 0.2
+    _backoff_attempts: int = field(default=0, repr=False)
+
+    def next_delay(self, elapsed_seconds: float, checks_seen: bool = True) -> float:
+        """Return the number of seconds to sleep before the next poll."""
+        if self.expected_seconds is None:
+            return DEFAULT_POLL_INTERVAL_SECONDS
+
+        wake_at = self.expected_seconds - self.lead_seconds
+        if elapsed_seconds < wake_at:
+            delay = wake_at - elapsed_seconds
+            if not checks_seen:
+                # Keep polling often enough to notice a repo with no CI at all.
+                delay = min(delay, max(self.no_checks_cutoff - elapsed_seconds, 0) + 1)
+            return max(delay, 1.0)
+
+        delay = min(self.max_interval, self.base_interval * (2 ** self._backoff_attempts))
+        self._backoff_attempts += 1
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class CIDurationModel:
+    """Stores recent CI durations per repository as small JSON files."""
+
+    def __init__(self, base_dir: Optional[Union[str, Path]] = None):
+        self.base_dir = Path(base_dir) if base_dir else _default_durations_dir()
+
+    def _path(self, repo: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", repo.strip()).strip("-") or "repo"
+        return self.base_dir / f"{slug}.json"
+
+    def load(self, repo: str) -> Dict[str, List[float]]:
+        """Return the stored samples for a repository."""
+        try:
+            with self._path(repo).open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        return {
+            "durations": list(data.get("durations") or []),
+            "first_check_delays": list(data.get("first_check_delays") or []),
+        }
+
+    def record(self, repo: str, pr_results: Mapping[str, Any]) -> Optional[float]:
+        """
+        Add samples from a finished wait and return the CI duration recorded.
+
+        Timeouts and repos without checks are ignored so they cannot skew the
+        expected duration; early verdicts only contribute the first-check delay.
+        """
+        if not repo or not pr_results.get("completed") or pr_results.get("timeout"):
+            return None
+        if pr_results.get("no_checks_configured"):
+            return None
+
+        # An early verdict stops waiting mid-run, so its duration is partial.
+        duration = None
+        if not pr_results.get("early_verdict"):
+            duration = run_duration_seconds(pr_results.get("checks") or [])
+        first_check_delay = pr_results.get("checks_first_seen_seconds")
+        if duration is None and first_check_delay is None:
+            return None
+
+        with _write_lock:
+            samples = self.load(repo)
+            if duration is not None:
+                samples["durations"] = (samples["durations"] + [duration])[-MAX_SAMPLES:]
+            if first_check_delay is not None:
+                samples["first_check_delays"] = (
+                    samples["first_check_delays"] + [float(first_check_delay)]
+                )[-MAX_SAMPLES:]
+            self._write(repo, samples)
+        return duration
+
+    def _write(self, repo: str, samples: Dict[str, List[float]]) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(repo)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(samples, handle)
+        os.replace(temp_path, path)
+
+    def expected_duration(self, repo: Optional[str]) -> Optional[float]:
+        """Median CI duration (plus first-check delay) or None without history."""
+        if not repo:
+            return None
+        samples = self.load(repo)
+        if not samples["durations"]:
+            return None
+        delay = _percentile(samples["first_check_delays"], 0.5) or 0.0
+        return _percentile(samples["durations"], 0.5) + delay
+
+    def no_checks_cutoff(self, repo: Optional[str], configured: Optional[int] = None) -> int:
+        """
+        Seconds without any checks after which the repo is assumed to have no CI.
+
+        An explicit per-repo setting wins; otherwise twice the p90 delay before
+        the first check appeared, never below ``MIN_NO_CHECKS_CUTOFF_SECONDS``.
+        """
+        if configured:
+            return int(configured)
+        if not repo:
+            return DEFAULT_NO_CHECKS_CUTOFF_SECONDS
+        delays = self.load(repo)["first_check_delays"]
+        if not delays:
+            return DEFAULT_NO_CHECKS_CUTOFF_SECONDS
+        return max(MIN_NO_CHECKS_CUTOFF_SECONDS, int(2 * _percentile(delays, 0.9)))
+
+    def poll_schedule(
+        self,
+        repo: Optional[str],
+        no_checks_cutoff: Optional[int] = None,
+    ) -> PollSchedule:
+        """Build the polling schedule for a new wait on ``repo``."""
+        return PollSchedule(
+            expected_seconds=self.expected_duration(repo),
+            no_checks_cutoff=self.no_checks_cutoff(repo, no_checks_cutoff),
+        )
+
+
+def run_duration_seconds(checks: List[Dict[str, Any]]) -> Optional[float]:
+    """Wall time from the first check start to the last check completion."""
+    started: List[datetime] = []
+    completed: List[datetime] = []
+    for check in checks:
+        normalized = CheckProcessor.normalize_check(check)
+        start = _parse_timestamp(normalized.get('started_at'))
+        end = _parse_timestamp(normalized.get('completed_at'))
+        if start and end:
+            started.append(start)
+            completed.append(end)
+    if not started:
+        return None
+    duration = (max(completed) - min(started)).total_seconds()
+    return duration if duration >= 0 else None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value or not isinstance(value, str) or value.startswith("0001-"):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _default_durations_dir() -> Path:
+    """Compute the default directory for CI duration history."""
+    return Path.cwd() / DEFAULT_DURATIONS_DIR_NAME
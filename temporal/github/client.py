@@ -0,0 +1,1304 @@
+"""
+Pooled HTTP client for the GitHub REST and GraphQL APIs.
+
+Every ``gh`` invocation starts a Go runtime, re-reads its auth config and opens
+a fresh TLS connection. This module talks to the API directly over keep-alive
+connections that are shared by all PR and artifact helpers in a worker process.
+"""
+from __future__ import annotations
+
+import copy
+import http.client
+import json
+import os
+import re
+import shutil
+import ssl
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from temporal.github.credentials import (
+    Credential,
+    CredentialPool,
+    TokenCredential,
+    load_credentials,
+    repo_credential_references,
+)
+from temporal.github.http_cache import ConditionalCache
+from temporal.github.rate_limit import (
+    PRIORITY_BULK,
+    PRIORITY_DEFAULT,
+    PRIORITY_POLL,
+    RateLimitDeferred,
+    RateLimitScheduler,
+    get_shared_scheduler,
+)
+
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_POOL_SIZE = 8
+USER_AGENT = "tinybug-mutation-worker"
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_ACTIONS_RUN_URL = re.compile(r"/actions/runs/(\d+)")
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+# gh maps check conclusions onto coarse buckets; mirror that so downstream
+# CheckProcessor logic works unchanged for both code paths.
+_BUCKET_BY_STATE = {
+    "SUCCESS": "pass",
+    "SKIPPED": "skipping",
+    "NEUTRAL": "skipping",
+    "ERROR": "fail",
+    "FAILURE": "fail",
+    "TIMED_OUT": "fail",
+    "ACTION_REQUIRED": "fail",
+    "STARTUP_FAILURE": "fail",
+    "CANCELLED": "cancel",
+    # GitHub marks a check stale after it sat incomplete for 14 days; it will
+    # never finish, so it must not keep the wait pending.
+    "STALE": "skipping",
+}
+
+_CHECK_CONTEXT_FIELDS = """
+            __typename
+            ... on CheckRun {
+              name
+              status
+              conclusion
+              startedAt
+              completedAt
+              detailsUrl
+              title
+              checkSuite { workflowRun { databaseId workflow { name } } }
+            }
+            ... on StatusContext {
+              context
+              state
+              targetUrl
+              description
+              createdAt
+            }
+"""
+
+PR_CHECKS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      commits(last: 1) {
+        nodes {
+          commit {
+            statusCheckRollup {
+              contexts(first: 100, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                nodes {%s}
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % _CHECK_CONTEXT_FIELDS
+
+
+# PR state, rollup and the first page of check contexts in one selection; used
+# for single-PR snapshots and aliased many-PR batches.
+_PR_SNAPSHOT_FRAGMENT = """
+fragment PullRequestSnapshot on PullRequest {
+  number
+  title
+  state
+  mergeable
+  url
+  commits(last: 1) {
+    nodes {
+      commit {
+        statusCheckRollup {
+          state
+          contexts(first: 100) {
+            pageInfo { hasNextPage endCursor }
+            nodes {%s}
+          }
+        }
+      }
+    }
+  }
+}
+""" % _CHECK_CONTEXT_FIELDS
+
+PR_SNAPSHOT_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) { ...PullRequestSnapshot }
+  }
+}
+""" + _PR_SNAPSHOT_FRAGMENT
+
+# Workflow run states that can still be cancelled.
+ACTIVE_RUN_STATUSES = frozenset({"queued", "in_progress", "waiting", "requested", "pending"})
+
+# GitHub caps GraphQL queries at 500k nodes; 20 PRs x 100 contexts stays far below.
+MAX_PRS_PER_QUERY = 20
+
+
+class GitHubAPIError(RuntimeError):
+    """Raised when the GitHub API returns an error response."""
+
+    def __init__(
+        self,
+        status: int,
+        message: str,
+        *,
+        method: str = "",
+        url: str = "",
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(f"{method} {url} failed ({status}): {message}")
+        self.status = status
+        self.message = message
+        self.method = method
+        self.url = url
+        self.headers = dict(headers or {})
+
+
+class RateLimitExceeded(GitHubAPIError):
+    """Raised when GitHub rate-limits a call for longer than the client will wait."""
+
+    def __init__(self, status: int, message: str, *, retry_after: float, **kwargs: Any):
+        super().__init__(status, message, **kwargs)
+        self.retry_after = retry_after
+
+
+@dataclass
+class GitHubResponse:
+    """Fully-read HTTP response with lower-cased header names."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    _parsed: Any = field(default=None, repr=False, compare=False)
+
+    def json(self) -> Any:
+        """
+        Decode the body once; later calls return the same object.
+
+        Responses served from the conditional cache are shared, so callers
+        must treat the decoded JSON as read-only.
+        """
+        if not self.body:
+            return None
+        if self._parsed is None:
+            self._parsed = json.loads(self.body.decode("utf-8"))
+        return self._parsed
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections to a single host."""
+
+    def __init__(
+        self,
+        scheme: str,
+        netloc: str,
+        *,
+        max_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection (reused=True) or open a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        if self.scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(
+                self.netloc,
+                timeout=self.timeout,
+                context=ssl.create_default_context(),
+            )
+        else:
+            conn = http.client.HTTPConnection(self.netloc, timeout=self.timeout)
+        return conn, False
+
+    def release(self, conn: http.client.HTTPConnection, *, reusable: bool = True) -> None:
+        """Return a connection to the pool, closing it if it cannot be reused."""
+        if reusable:
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class GitHubClient:
+    """
+    Minimal GitHub API client covering the calls made by the mutation workflow.
+
+    The client authenticates with a single token, or with a ``CredentialPool``
+    from which every call takes the credential with the most remaining budget.
+    ``for_key`` returns a view pinned to one pooled credential.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        *,
+        credentials: Optional[CredentialPool] = None,
+        api_url: str = DEFAULT_API_URL,
+        graphql_url: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        max_rate_limit_wait: float = 60.0,
+        cache: Optional[ConditionalCache] = None,
+    ):
+        if token is None and credentials is None:
+            raise ValueError("GitHubClient needs a token or a credential pool")
+        self.credential: Optional[Credential] = TokenCredential(token) if token else None
+        self.credentials = credentials
+        self.rate_limiter = rate_limiter or (
+            credentials.scheduler if credentials else get_shared_scheduler()
+        )
+        # Rate-limit pauses up to this long are waited out inside the call;
+        # longer ones surface as RateLimitExceeded so callers can reschedule.
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.cache = cache or ConditionalCache()
+        self.api_url = api_url.rstrip("/")
+        self.graphql_url = graphql_url or _default_graphql_url(self.api_url)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pools: Dict[Tuple[str, str], ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Transport
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def for_key(self, key: str) -> "GitHubClient":
+        """
+        Return a client pinned to the pooled credential chosen for ``key``.
+
+        The view shares this client's connection pools. Without a credential
+        pool the client itself is returned.
+        """
+        if self.credentials is None:
+            return self
+        view = copy.copy(self)
+        view.credential = self.credentials.select(key)
+        view.credentials = None
+        return view
+
+    def _credential_for_call(self) -> Credential:
+        if self.credential is not None:
+            return self.credential
+        return self.credentials.select()
+
+    def rate_limit_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Remaining budget per resource for this client's credential.
+
+        A pooled client reports every pooled credential, keyed by credential id.
+        """
+        metrics = self.rate_limiter.metrics()
+        if self.credential is not None:
+            return metrics.get(self.credential.credential_id, {})
+        return {
+            credential.credential_id: metrics.get(credential.credential_id, {})
+            for credential in self.credentials.credentials
+        }
+
+    def connections_opened(self) -> int:
+        """Return the number of TCP connections opened so far (all hosts)."""
+        with self._pools_lock:
+            return sum(pool.connections_opened for pool in self._pools.values())
+
+    def _pool_for(self, scheme: str, netloc: str) -> ConnectionPool:
+        key = (scheme, netloc)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    scheme,
+                    netloc,
+                    max_size=self.pool_size,
+                    timeout=self.timeout,
+                )
+                self._pools[key] = pool
+            return pool
+
+    def _build_url(self, path_or_url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        if path_or_url.startswith(("http://", "https://")):
+            url = path_or_url
+        else:
+            url = f"{self.api_url}/{path_or_url.lstrip('/')}"
+        if params:
+            separator = "&" if "?" in url else "?"
+            url = f"{url}{separator}{urlencode(params)}"
+        return url
+
+    def _default_headers(self, url: str, credential: Credential) -> Dict[str, str]:
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": USER_AGENT,
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        # Never leak the token to redirect targets such as signed blob URLs.
+        if _same_origin(url, self.api_url) or _same_origin(url, self.graphql_url):
+            headers["Authorization"] = f"Bearer {credential.get_token(self)}"
+        return headers
+
+    def _resource_for(self, url: str) -> Optional[str]:
+        """Rate-limit resource charged for ``url``; None for unauthenticated hosts."""
+        if _same_origin(url, self.graphql_url) and urlsplit(url).path == urlsplit(
+            self.graphql_url
+        ).path:
+            return "graphql"
+        if _same_origin(url, self.api_url):
+            return "core"
+        return None
+
+    def _open(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Mapping[str, str],
+    ) -> Tuple[ConnectionPool, http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request over a pooled connection, retrying once on a stale socket."""
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        pool = self._pool_for(parts.scheme, parts.netloc)
+
+        while True:
+            conn, reused = pool.acquire()
+            try:
+                conn.request(method, target, body=body, headers=dict(headers))
+                return pool, conn, conn.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def _send(
+        self,
+        method: str,
+        path_or_url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json_body: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        priority: int = PRIORITY_DEFAULT,
+        credential: Optional[Credential] = None,
+    ) -> Tuple[ConnectionPool, http.client.HTTPConnection, http.client.HTTPResponse, str]:
+        """Open a response, following redirects; the caller must drain it."""
+        url = self._build_url(path_or_url, params)
+        credential = credential or self._credential_for_call()
+        body = None
+        for _ in range(5):
+            request_headers = self._default_headers(url, credential)
+            if json_body is not None:
+                body = json.dumps(json_body).encode("utf-8")
+                request_headers["Content-Type"] = "application/json"
+            request_headers.update(headers or {})
+
+            resource = self._resource_for(url)
+            if resource:
+                try:
+                    self.rate_limiter.acquire(
+                        credential.credential_id,
+                        resource,
+                        priority,
+                        max_wait=self.max_rate_limit_wait,
+                    )
+                except RateLimitDeferred as exc:
+                    raise RateLimitExceeded(
+                        429,
+                        f"GitHub rate limit: {exc}",
+                        retry_after=exc.delay,
+                        method=method,
+                        url=url,
+                    ) from None
+            pool, conn, response = self._open(method, url, body, request_headers)
+            if resource and response.status == 304:
+                # Conditional hits do not count against the rate limit.
+                self.rate_limiter.refund(credential.credential_id, resource)
+            if resource:
+                self.rate_limiter.update(
+                    credential.credential_id,
+                    resource,
+                    {key.lower(): value for key, value in response.getheaders()},
+                )
+            if response.status not in _REDIRECT_STATUSES:
+                return pool, conn, response, url
+
+            location = response.getheader("Location")
+            _drain(pool, conn, response)
+            if not location:
+                raise GitHubAPIError(
+                    response.status,
+                    "redirect without location",
+                    method=method,
+                    url=url,
+                )
+            url = urljoin(url, location)
+            if response.status == 303:
+                method, json_body = "GET", None
+        raise GitHubAPIError(310, "too many redirects", method=method, url=url)
+
+    def request(
+        self,
+        method: str,
+        path_or_url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json_body: Any = None,
+        headers: Optional[Mapping[str, str]] = None,
+        priority: int = PRIORITY_DEFAULT,
+        credential: Optional[Credential] = None,
+        conditional: bool = False,
+    ) -> GitHubResponse:
+        """
+        Perform a request and return the fully-read response.
+
+        Rate-limited responses are retried once the scheduler lets the call
+        through again, as long as that is within ``max_rate_limit_wait``. A
+        pooled client may retry on a different credential.
+
+        With ``conditional`` (GET only) the request carries the validators of
+        the cached response and a ``304 Not Modified`` returns the cached
+        response object itself.
+        """
+        waited = 0.0
+        while True:
+            call_credential = credential or self._credential_for_call()
+            cache_key = None
+            request_headers = dict(headers or {})
+            if conditional and method == "GET":
+                cache_key = (call_credential.credential_id, self._build_url(path_or_url, params))
+                request_headers.update(self.cache.validators(cache_key))
+            pool, conn, response, url = self._send(
+                method,
+                path_or_url,
+                params=params,
+                json_body=json_body,
+                headers=request_headers,
+                priority=priority,
+                credential=call_credential,
+            )
+            body = _drain(pool, conn, response)
+            result = GitHubResponse(
+                status=response.status,
+                headers={key.lower(): value for key, value in response.getheaders()},
+                body=body,
+            )
+            if result.status == 304 and cache_key is not None:
+                cached = self.cache.hit(cache_key)
+                if cached is not None:
+                    return cached
+                # Evicted since the validators were sent: fetch it in full.
+                conditional = False
+                continue
+            if result.status < 400:
+                if cache_key is not None:
+                    self.cache.store(cache_key, result)
+                return result
+
+            retry_after = self._throttle(url, result, call_credential)
+            if retry_after is not None and waited + retry_after <= self.max_rate_limit_wait:
+                print(f"⏳ GitHub rate limit hit; retrying in {retry_after:.0f} seconds")
+                waited += retry_after
+                continue
+            raise self._api_error(method, url, result, retry_after)
+
+    def _throttle(
+        self,
+        url: str,
+        response: GitHubResponse,
+        credential: Credential,
+    ) -> Optional[float]:
+        """Report a rate-limited response to the scheduler and return the wait."""
+        resource = self._resource_for(url)
+        if resource is None:
+            return None
+        return self.rate_limiter.throttle(
+            credential.credential_id,
+            resource,
+            response.status,
+            response.headers,
+            response.text(),
+        )
+
+    @staticmethod
+    def _api_error(
+        method: str,
+        url: str,
+        response: GitHubResponse,
+        retry_after: Optional[float],
+    ) -> GitHubAPIError:
+        if retry_after is not None:
+            return RateLimitExceeded(
+                response.status,
+                _error_message(response),
+                retry_after=retry_after,
+                method=method,
+                url=url,
+                headers=response.headers,
+            )
+        return GitHubAPIError(
+            response.status,
+            _error_message(response),
+            method=method,
+            url=url,
+            headers=response.headers,
+        )
+
+    def stream(
+        self,
+        method: str,
+        path_or_url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        chunk_size: int = 64 * 1024,
+        priority: int = PRIORITY_BULK,
+    ) -> Iterator[bytes]:
+        """Yield the response body in chunks without buffering it in memory."""
+        credential = self._credential_for_call()
+        pool, conn, response, url = self._send(
+            method,
+            path_or_url,
+            params=params,
+            priority=priority,
+            credential=credential,
+        )
+        if response.status >= 400:
+            body = _drain(pool, conn, response)
+            result = GitHubResponse(
+                response.status,
+                {key.lower(): value for key, value in response.getheaders()},
+                body,
+            )
+            raise self._api_error(method, url, result, self._throttle(url, result, credential))
+        completed = False
+        try:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            completed = True
+        finally:
+            pool.release(conn, reusable=completed and not response.will_close)
+
+    def paginate(
+        self,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        item_key: Optional[str] = None,
+        priority: int = PRIORITY_DEFAULT,
+        conditional: bool = False,
+    ) -> List[Any]:
+        """Collect every page of a REST listing by following ``Link: rel=next``."""
+        items: List[Any] = []
+        page_params = {"per_page": 100, **(params or {})}
+        next_url: Optional[str] = self._build_url(path, page_params)
+        while next_url:
+            response = self.request(
+                "GET",
+                next_url,
+                priority=priority,
+                conditional=conditional,
+            )
+            payload = response.json()
+            if item_key:
+                payload = (payload or {}).get(item_key) or []
+            items.extend(payload or [])
+            next_url = _next_link(response.headers.get("link", ""))
+        return items
+
+    def graphql(
+        self,
+        query: str,
+        variables: Optional[Mapping[str, Any]] = None,
+        *,
+        priority: int = PRIORITY_DEFAULT,
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query and return its ``data`` object."""
+        credential = self._credential_for_call()
+        response = self.request(
+            "POST",
+            self.graphql_url,
+            json_body={"query": query, "variables": dict(variables or {})},
+            priority=priority,
+            credential=credential,
+        )
+        payload = response.json() or {}
+        errors = payload.get("errors")
+        if errors:
+            messages = "; ".join(str(error.get("message", error)) for error in errors)
+            if any(error.get("type") == "RATE_LIMITED" for error in errors):
+                # GraphQL reports its limit with a 200; block until the reset.
+                retry_after = self.rate_limiter.throttle(
+                    credential.credential_id,
+                    "graphql",
+                    429,
+                    response.headers,
+                    messages,
+                )
+                raise RateLimitExceeded(
+                    response.status,
+                    messages,
+                    retry_after=retry_after or 60.0,
+                    method="POST",
+                    url=self.graphql_url,
+                )
+            raise GitHubAPIError(response.status, messages, method="POST", url=self.graphql_url)
+        return payload.get("data") or {}
+
+    # ------------------------------------------------------------------
+    # Pull requests
+
+    def create_pull_request(
+        self,
+        repo: str,
+        *,
+        title: str,
+        body: str,
+        head: str,
+        base: str,
+    ) -> Dict[str, Any]:
+        """Open a pull request and return its URL and number."""
+        payload = self.request(
+            "POST",
+            f"/repos/{repo}/pulls",
+            json_body={"title": title, "body": body, "head": head, "base": base},
+        ).json()
+        return {"url": payload.get("html_url", ""), "number": str(payload.get("number", ""))}
+
+    def close_pull_request(self, repo: str, pr_number: str) -> None:
+        """Close a pull request without merging."""
+        self.request("PATCH", f"/repos/{repo}/pulls/{pr_number}", json_body={"state": "closed"})
+
+    def get_pr_status(self, repo: str, pr_number: str) -> Dict[str, Any]:
+        """
+        Return PR metadata shaped like ``gh pr view --json ...statusCheckRollup``.
+
+        Built from conditional REST requests (the pull request and its head
+        commit's checks), so an unchanged PR is served from the response cache
+        without spending rate-limit budget.
+        """
+        pull_request = self._get_pull_request(repo, pr_number)
+        return _rest_pr_status(pull_request, self._head_commit_checks(repo, pull_request))
+
+    def get_pr_checks(self, repo: str, pr_number: str) -> List[Dict[str, Any]]:
+        """
+        Return checks shaped like ``gh pr checks --json name,state,bucket,...``.
+
+        Uses the same conditional REST requests as ``get_pr_status``.
+        """
+        return self._head_commit_checks(repo, self._get_pull_request(repo, pr_number))
+
+    def _get_pull_request(self, repo: str, pr_number: str) -> Dict[str, Any]:
+        return self.request(
+            "GET",
+            f"/repos/{repo}/pulls/{pr_number}",
+            priority=PRIORITY_POLL,
+            conditional=True,
+        ).json() or {}
+
+    def _head_commit_checks(
+        self,
+        repo: str,
+        pull_request: Mapping[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Check runs and commit statuses of the PR head, in the gh shape."""
+        sha = (pull_request.get("head") or {}).get("sha")
+        if not sha:
+            return []
+        check_runs = self.paginate(
+            f"/repos/{repo}/commits/{sha}/check-runs",
+            item_key="check_runs",
+            priority=PRIORITY_POLL,
+            conditional=True,
+        )
+        combined = self.request(
+            "GET",
+            f"/repos/{repo}/commits/{sha}/status",
+            priority=PRIORITY_POLL,
+            conditional=True,
+        ).json() or {}
+        workflow_names = self._workflow_names(repo, sha) if check_runs else {}
+        checks = [
+            format_check_context(_rest_check_run_node(run, workflow_names))
+            for run in check_runs
+        ]
+        checks.extend(
+            format_check_context(_rest_status_node(status))
+            for status in combined.get("statuses") or []
+        )
+        return checks
+
+    def _workflow_names(self, repo: str, sha: str) -> Dict[str, str]:
+        """Workflow name of each Actions run for ``sha``, keyed by run id."""
+        runs = self.paginate(
+            f"/repos/{repo}/actions/runs",
+            params={"head_sha": sha},
+            item_key="workflow_runs",
+            priority=PRIORITY_POLL,
+            conditional=True,
+        )
+        return {str(run["id"]): run.get("name") or "" for run in runs if run.get("id")}
+
+    def get_pr_snapshot(self, repo: str, pr_number: str) -> Dict[str, Any]:
+        """
+        Return ``{'status': ..., 'checks': [...]}`` from a single GraphQL query.
+
+        Checks carry a ``runId`` when they belong to a GitHub Actions run, so
+        artifact lookups need no further URL parsing. Only PRs with more than
+        100 check contexts cost extra round trips for the remaining pages.
+        """
+        owner, name = split_repo(repo)
+        data = self.graphql(
+            PR_SNAPSHOT_QUERY,
+            {"owner": owner, "name": name, "number": int(pr_number)},
+            priority=PRIORITY_POLL,
+        )
+        return self._snapshot_from_node(repo, pr_number, _pull_request_node(data, pr_number))
+
+    def get_pr_snapshots(self, repo: str, pr_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return snapshots for many PRs of one repository, keyed by PR number.
+
+        PRs are fetched as aliased selections, at most ``MAX_PRS_PER_QUERY`` per
+        query, so the number of calls scales with repos rather than PRs. PRs that
+        cannot be resolved are omitted from the result.
+        """
+        owner, name = split_repo(repo)
+        numbers = sorted({int(number) for number in pr_numbers})
+        snapshots: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(numbers), MAX_PRS_PER_QUERY):
+            batch = numbers[start:start + MAX_PRS_PER_QUERY]
+            selections = "\n".join(
+                f"    pr{number}: pullRequest(number: {number}) {{ ...PullRequestSnapshot }}"
+                for number in batch
+            )
+            query = (
+                "query($owner: String!, $name: String!) {\n"
+                "  repository(owner: $owner, name: $name) {\n"
+                f"{selections}\n"
+                "  }\n"
+                "}\n"
+            ) + _PR_SNAPSHOT_FRAGMENT
+            repository = self.graphql(
+                query,
+                {"owner": owner, "name": name},
+                priority=PRIORITY_POLL,
+            ).get("repository")
+            for number in batch:
+                node = (repository or {}).get(f"pr{number}")
+                if node:
+                    snapshots[str(number)] = self._snapshot_from_node(repo, str(number), node)
+        return snapshots
+
+    def _snapshot_from_node(
+        self,
+        repo: str,
+        pr_number: str,
+        pull_request: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        contexts = (_last_commit_rollup(pull_request) or {}).get("contexts") or {}
+        checks = [format_check_context(node) for node in contexts.get("nodes") or []]
+        page_info = contexts.get("pageInfo") or {}
+        if page_info.get("hasNextPage"):
+            checks.extend(
+                self._collect_checks(repo, pr_number, after=page_info.get("endCursor"))
+            )
+        return {"status": _format_pr_status(pull_request), "checks": checks}
+
+    def _collect_checks(
+        self,
+        repo: str,
+        pr_number: str,
+        *,
+        after: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        owner, name = split_repo(repo)
+        checks: List[Dict[str, Any]] = []
+        while True:
+            data = self.graphql(
+                PR_CHECKS_QUERY,
+                {"owner": owner, "name": name, "number": int(pr_number), "after": after},
+                priority=PRIORITY_POLL,
+            )
+            rollup = _last_commit_rollup(_pull_request_node(data, pr_number))
+            contexts = (rollup or {}).get("contexts") or {}
+            checks.extend(format_check_context(node) for node in contexts.get("nodes") or [])
+            page_info = contexts.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return checks
+            after = page_info.get("endCursor")
+
+    # ------------------------------------------------------------------
+    # Workflow runs, logs and artifacts
+
+    def get_failed_run_logs(self, repo: str, run_id: str) -> str:
+        """Return the logs of failed jobs in a run (see ``iter_failed_run_log_lines``)."""
+        return "\n".join(self.iter_failed_run_log_lines(repo, run_id))
+
+    def iter_failed_run_log_lines(self, repo: str, run_id: str) -> Iterator[str]:
+        """
+        Yield the log lines of failed jobs in a run as they are downloaded.
+
+        Lines mirror ``gh run view --log-failed``: ``job<TAB>step<TAB>line``,
+        with an empty step since the jobs API does not split logs by step.
+        Only one chunk of a job log is held in memory at a time.
+        """
+        jobs = self.paginate(
+            f"/repos/{repo}/actions/runs/{run_id}/jobs",
+            params={"filter": "latest"},
+            item_key="jobs",
+            priority=PRIORITY_BULK,
+        )
+        for job in jobs:
+            if job.get("conclusion") not in {"failure", "timed_out"}:
+                continue
+            job_name = job.get("name", "")
+            chunks = self.stream("GET", f"/repos/{repo}/actions/jobs/{job['id']}/logs")
+            for line in _iter_lines(chunks):
+                yield f"{job_name}\t\t{line}"
+
+    def list_active_workflow_runs(self, repo: str, branch: str) -> List[Dict[str, Any]]:
+        """Return the workflow runs for ``branch`` that have not completed yet."""
+        runs = self.paginate(
+            f"/repos/{repo}/actions/runs",
+            params={"branch": branch},
+            item_key="workflow_runs",
+        )
+        return [run for run in runs if run.get("status") in ACTIVE_RUN_STATUSES]
+
+    def cancel_workflow_run(self, repo: str, run_id: Any) -> bool:
+        """Cancel a workflow run; False if it had already finished."""
+        try:
+            self.request("POST", f"/repos/{repo}/actions/runs/{run_id}/cancel")
+        except GitHubAPIError as exc:
+            # 409 Conflict: the run completed between listing and cancelling.
+            if exc.status == 409:
+                return False
+            raise
+        return True
+
+    def list_run_artifacts(self, repo: str, run_id: str) -> List[Dict[str, Any]]:
+        """Return the artifacts uploaded by a workflow run."""
+        return self.paginate(
+            f"/repos/{repo}/actions/runs/{run_id}/artifacts",
+            item_key="artifacts",
+            priority=PRIORITY_BULK,
+            conditional=True,
+        )
+
+    def get_check_run(self, repo: str, check_run_id: Any) -> Dict[str, Any]:
+        """Return a check run, including its ``output`` title, summary and text."""
+        return self.request(
+            "GET",
+            f"/repos/{repo}/check-runs/{check_run_id}",
+            conditional=True,
+        ).json() or {}
+
+    def list_check_run_annotations(self, repo: str, check_run_id: Any) -> List[Dict[str, Any]]:
+        """Return the annotations attached to a check run."""
+        return self.paginate(
+            f"/repos/{repo}/check-runs/{check_run_id}/annotations",
+            conditional=True,
+        )
+
+    def download_artifact(self, repo: str, artifact_id: Any, destination: Path) -> Path:
+        """Stream an artifact zip archive to ``destination``."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with destination.open("wb") as handle:
+            for chunk in self.stream("GET", f"/repos/{repo}/actions/artifacts/{artifact_id}/zip"):
+                handle.write(chunk)
+        return destination
+
+
+# ----------------------------------------------------------------------
+# Shared client and repository helpers
+
+
+_shared_client: Optional[GitHubClient] = None
+_shared_client_resolved = False
+_shared_client_installed = False
+_repo_clients: Dict[str, Optional[GitHubClient]] = {}
+_shared_client_lock = threading.Lock()
+
+
+def resolve_token() -> Optional[str]:
+    """Find an API token from the environment or, once, from ``gh auth token``."""
+    for variable in ("GITHUB_TOKEN", "GH_TOKEN"):
+        token = os.environ.get(variable)
+        if token:
+            return token
+    if not shutil.which("gh"):
+        return None
+    try:
+        result = subprocess.run(
+            ["gh", "auth", "token"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    token = result.stdout.strip()
+    return token if result.returncode == 0 and token else None
+
+
+def _client_options() -> Dict[str, Any]:
+    return {
+        "api_url": os.environ.get("GITHUB_API_URL", DEFAULT_API_URL),
+        "graphql_url": os.environ.get("GITHUB_GRAPHQL_URL") or None,
+    }
+
+
+def get_shared_client(repo: Optional[str] = None) -> Optional[GitHubClient]:
+    """
+    Return the process-wide client, or None when no credentials are available.
+
+    When ``repo`` has a credential pool configured in ``KNOWN_REPOS``, the
+    client for that pool is returned instead. Callers fall back to the gh CLI
+    when this returns None.
+    """
+    global _shared_client, _shared_client_resolved
+    with _shared_client_lock:
+        if not _shared_client_resolved:
+            token = resolve_token()
+            if token:
+                _shared_client = GitHubClient(token, **_client_options())
+            _shared_client_resolved = True
+        if repo is None or _shared_client_installed:
+            return _shared_client
+
+        key = repo.lower()
+        if key not in _repo_clients:
+            references = repo_credential_references(repo)
+            credentials = load_credentials(references) if references else []
+            _repo_clients[key] = GitHubClient(
+                credentials=CredentialPool(credentials, get_shared_scheduler()),
+                **_client_options(),
+            ) if credentials else None
+        return _repo_clients[key] or _shared_client
+
+
+def rate_limit_budget(repo: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Remaining budget of the credentials used for ``repo``.
+
+    Keyed by credential id, then resource, with ``remaining``, ``limit`` and
+    ``reset_in_seconds`` each; empty when calls go through the gh CLI.
+    """
+    client = get_shared_client(repo)
+    if client is None:
+        return {}
+    metrics = client.rate_limit_metrics()
+    if client.credential is not None:
+        metrics = {client.credential.credential_id: metrics}
+    return {
+        credential_id: {
+            resource: {
+                field: budget.get(field)
+                for field in ("remaining", "limit", "reset_in_seconds")
+            }
+            for resource, budget in resources.items()
+        }
+        for credential_id, resources in metrics.items()
+    }
+
+
+def format_rate_limit_budget(budget: Mapping[str, Mapping[str, Mapping[str, Any]]]) -> str:
+    """One log line per credential, e.g. ``abc123: core 4980/5000, graphql 4990/5000``."""
+    lines = []
+    for credential_id, resources in sorted(budget.items()):
+        parts = [
+            f"{resource} {values.get('remaining', '?')}/{values.get('limit', '?')}"
+            for resource, values in sorted(resources.items())
+        ]
+        lines.append(f"{credential_id}: {', '.join(parts) or 'no calls yet'}")
+    return "\n".join(lines)
+
+
+def set_shared_client(client: Optional[GitHubClient]) -> None:
+    """Install the client used for every repo; None forces the gh CLI fallback."""
+    global _shared_client, _shared_client_resolved, _shared_client_installed
+    with _shared_client_lock:
+        _shared_client = client
+        _shared_client_resolved = True
+        _shared_client_installed = True
+        _repo_clients.clear()
+
+
+def split_repo(repo: str) -> Tuple[str, str]:
+    """Split an ``owner/name`` slug."""
+    owner, _, name = repo.partition("/")
+    if not owner or not name:
+        raise ValueError(f"Expected an 'owner/name' repository slug, got {repo!r}")
+    return owner, name
+
+
+def resolve_repo_slug(repo: Optional[str], repo_path: Optional[Path]) -> Optional[str]:
+    """Return ``repo`` or infer the slug from the checkout's origin remote."""
+    if repo:
+        return repo
+    if repo_path is None:
+        return None
+    return _origin_slug(str(repo_path))
+
+
+@lru_cache(maxsize=64)
+def _origin_slug(repo_path: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "remote", "get-url", "origin"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    match = re.search(r"github\.com[:/]([^/]+/[^/]+?)(?:\.git)?/?$", result.stdout.strip())
+    return match.group(1) if match else None
+
+
+def format_check_context(node: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert a GraphQL check context into the ``gh pr checks --json`` shape."""
+    if node.get("__typename") == "StatusContext":
+        state = (node.get("state") or "PENDING").upper()
+        bucket = _BUCKET_BY_STATE.get(state, "pending")
+        return {
+            "name": node.get("context", ""),
+            "state": state,
+            "bucket": bucket,
+            "startedAt": node.get("createdAt"),
+            "completedAt": node.get("createdAt") if bucket != "pending" else None,
+            "description": node.get("description") or "",
+            "link": node.get("targetUrl") or "",
+            "workflow": "",
+        }
+
+    status = (node.get("status") or "").upper()
+    conclusion = (node.get("conclusion") or "").upper()
+    state = conclusion if status == "COMPLETED" and conclusion else status or "PENDING"
+    workflow_run = ((node.get("checkSuite") or {}).get("workflowRun")) or {}
+    check = {
+        "name": node.get("name", ""),
+        "state": state,
+        "bucket": _BUCKET_BY_STATE.get(state, "pending"),
+        "startedAt": node.get("startedAt"),
+        "completedAt": node.get("completedAt"),
+        "description": node.get("title") or "",
+        "link": node.get("detailsUrl") or "",
+        "workflow": (workflow_run.get("workflow") or {}).get("name", ""),
+    }
+    if workflow_run.get("databaseId") is not None:
+        check["runId"] = str(workflow_run["databaseId"])
+    return check
+
+
+def _rest_pr_status(
+    pull_request: Mapping[str, Any],
+    checks: List[Mapping[str, Any]],
+) -> Dict[str, Any]:
+    """PR metadata shaped like ``gh pr view --json ...`` from a REST pull request."""
+    merged = bool(pull_request.get("merged_at"))
+    mergeable = pull_request.get("mergeable")
+    status = {
+        "number": pull_request.get("number"),
+        "title": pull_request.get("title"),
+        "state": "MERGED" if merged else str(pull_request.get("state", "")).upper(),
+        "mergeable": (
+            "UNKNOWN" if mergeable is None else "MERGEABLE" if mergeable else "CONFLICTING"
+        ),
+        "url": pull_request.get("html_url"),
+        "statusCheckRollup": None,
+    }
+    rollup_state = _rollup_state(checks)
+    if rollup_state:
+        status["statusCheckRollup"] = {"state": rollup_state}
+    return status
+
+
+def _rest_check_run_node(
+    check_run: Mapping[str, Any],
+    workflow_names: Optional[Mapping[str, str]] = None,
+) -> Dict[str, Any]:
+    """Express a REST check run as the GraphQL ``CheckRun`` node it mirrors."""
+    details_url = check_run.get("details_url") or ""
+    run_match = _ACTIONS_RUN_URL.search(details_url)
+    run_id = run_match.group(1) if run_match else None
+    workflow_name = (workflow_names or {}).get(run_id or "")
+    return {
+        "__typename": "CheckRun",
+        "name": check_run.get("name", ""),
+        "status": check_run.get("status"),
+        "conclusion": check_run.get("conclusion"),
+        "startedAt": check_run.get("started_at"),
+        "completedAt": check_run.get("completed_at"),
+        "detailsUrl": details_url,
+        "title": (check_run.get("output") or {}).get("title"),
+        # REST check runs only link their run; its workflow name comes from the run.
+        "checkSuite": {"workflowRun": {
+            "databaseId": run_id,
+            "workflow": {"name": workflow_name} if workflow_name else None,
+        }},
+    }
+
+
+def _rest_status_node(status: Mapping[str, Any]) -> Dict[str, Any]:
+    """Express a REST commit status as the GraphQL ``StatusContext`` node it mirrors."""
+    return {
+        "__typename": "StatusContext",
+        "context": status.get("context", ""),
+        "state": status.get("state"),
+        "targetUrl": status.get("target_url"),
+        "description": status.get("description"),
+        "createdAt": status.get("created_at"),
+    }
+
+
+def _rollup_state(checks: List[Mapping[str, Any]]) -> Optional[str]:
+    """Combine check buckets the way GitHub's ``statusCheckRollup`` does."""
+    if not checks:
+        return None
+    buckets = {check.get("bucket") for check in checks}
+    if "pending" in buckets:
+        return "PENDING"
+    if buckets & {"fail", "cancel"}:
+        return "FAILURE"
+    return "SUCCESS"
+
+
+def _format_pr_status(pull_request: Mapping[str, Any]) -> Dict[str, Any]:
+    status = {
+        "number": pull_request.get("number"),
+        "title": pull_request.get("title"),
+        "state": pull_request.get("state"),
+        "mergeable": pull_request.get("mergeable"),
+        "url": pull_request.get("url"),
+        "statusCheckRollup": None,
+    }
+    rollup = _last_commit_rollup(pull_request)
+    if rollup and rollup.get("state"):
+        status["statusCheckRollup"] = {"state": rollup["state"]}
+    return status
+
+
+def _pull_request_node(data: Mapping[str, Any], pr_number: str) -> Dict[str, Any]:
+    pull_request = (data.get("repository") or {}).get("pullRequest")
+    if not pull_request:
+        raise GitHubAPIError(404, f"pull request #{pr_number} not found")
+    return pull_request
+
+
+def _last_commit_rollup(pull_request: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    nodes = ((pull_request.get("commits") or {}).get("nodes")) or []
+    if not nodes:
+        return None
+    return (nodes[-1].get("commit") or {}).get("statusCheckRollup")
+
+
+def _drain(
+    pool: ConnectionPool,
+    conn: http.client.HTTPConnection,
+    response: http.client.HTTPResponse,
+) -> bytes:
+    """Read the whole body and hand the connection back to its pool."""
+    try:
+        body = response.read()
+    except Exception:
+        pool.release(conn, reusable=False)
+        raise
+    pool.release(conn, reusable=not response.will_close)
+    return body
+
+
+def _error_message(response: GitHubResponse) -> str:
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = None
+    if isinstance(payload, dict) and payload.get("message"):
+        return str(payload["message"])
+    return response.text()[:200] or "unknown error"
+
+
+def _iter_lines(chunks: Iterator[bytes]) -> Iterator[str]:
+    """Split a chunked byte stream into decoded lines."""
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+    if pending:
+        yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _next_link(link_header: str) -> Optional[str]:
+    for part in link_header.split(","):
+        match = re.search(r'<([^>]+)>\s*;\s*rel="next"', part)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _same_origin(url: str, other: str) -> bool:
+    first, second = urlsplit(url), urlsplit(other)
+    return (first.scheme, first.netloc) == (second.scheme, second.netloc)
+
+
+def _default_graphql_url(api_url: str) -> str:
+    # GitHub Enterprise serves REST under /api/v3 and GraphQL under /api/graphql.
+    if api_url.endswith("/api/v3"):
+        return api_url[: -len("/v3")] + "/graphql"
+    return f"{api_url}/graphql"
@@ -0,0 +1,226 @@
+"""
+GitHub credentials and per-repository credential pools.
+
+A repo entry in ``KNOWN_REPOS`` may list several credentials; API calls for
+that repo are then spread across them so throughput grows with the number of
+tokens or GitHub App installations instead of being capped by one hourly
+limit. Each credential is accounted separately by the rate-limit scheduler,
+and all calls for one PR stick to the same credential so its view of the PR
+(and its conditional-request state) stays consistent.
+
+Credential references:
+
+* ``"env:NAME"`` - a token read from the environment variable ``NAME``
+* ``"file:/path"`` - a token read from a file
+* ``{"app_id": ..., "installation_id": ..., "private_key": "env:NAME"}`` - a
+  GitHub App installation (``private_key`` also accepts ``file:`` references);
+  requires the optional PyJWT package with its ``crypto`` extra
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Sequence, Union
+
+from temporal.github.known_repos import KNOWN_REPOS
+from temporal.github.rate_limit import (
+    DEFAULT_HOURLY_LIMIT,
+    RateLimitScheduler,
+    credential_fingerprint,
+)
+
+if TYPE_CHECKING:
+    from temporal.github.client import GitHubClient
+
+
+# Installation tokens live for an hour; refresh them this long before expiry.
+APP_TOKEN_REFRESH_MARGIN_SECONDS = 300
+MAX_STICKY_KEYS = 4096
+
+
+class TokenCredential:
+    """A personal access token or an already-minted installation token."""
+
+    def __init__(self, token: str, *, credential_id: Optional[str] = None):
+        self.token = token
+        self.credential_id = credential_id or credential_fingerprint(token)
+
+    def get_token(self, client: Optional["GitHubClient"] = None) -> str:
+        return self.token
+
+
+class AppInstallationCredential:
+    """A GitHub App installation; installation tokens are minted on demand."""
+
+    def __init__(self, app_id: Union[int, str], installation_id: Union[int, str], private_key: str):
+        self.app_id = str(app_id)
+        self.installation_id = str(installation_id)
+        self.private_key = private_key
+        self.credential_id = f"app:{self.app_id}/{self.installation_id}"
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_token(self, client: Optional["GitHubClient"] = None) -> str:
+        with self._lock:
+            if self._token and time.time() < self._expires_at - APP_TOKEN_REFRESH_MARGIN_SECONDS:
+                return self._token
+            if client is None:
+                raise RuntimeError("Minting a GitHub App installation token needs an API client")
+            payload = client.request(
+                "POST",
+                f"/app/installations/{self.installation_id}/access_tokens",
+                credential=TokenCredential(
+                    self._app_jwt(),
+                    credential_id=f"app-jwt:{self.app_id}",
+                ),
+            ).json() or {}
+            self._token = payload["token"]
+            self._expires_at = _parse_expiry(payload.get("expires_at"))
+            return self._token
+
+    def _app_jwt(self) -> str:
+        try:
+            import jwt
+        except ImportError as exc:
+            raise RuntimeError(
+                "GitHub App credentials require PyJWT: pip install 'PyJWT[crypto]'"
+            ) from exc
+        now = int(time.time())
+        # Backdate iat for clock drift; GitHub caps the JWT lifetime at 10 minutes.
+        claims = {"iat": now - 60, "exp": now + 540, "iss": self.app_id}
+        return jwt.encode(claims, self.private_key, algorithm="RS256")
+
+
+Credential = Union[TokenCredential, AppInstallationCredential]
+
+
+class CredentialPool:
+    """Spreads calls over several credentials, sticking to one per key (PR)."""
+
+    def __init__(
+        self,
+        credentials: Sequence[Credential],
+        scheduler: RateLimitScheduler,
+        *,
+        max_sticky: int = MAX_STICKY_KEYS,
+    ):
+        if not credentials:
+            raise ValueError("A credential pool needs at least one credential")
+        self.credentials = list(credentials)
+        self.scheduler = scheduler
+        self.max_sticky = max_sticky
+        self._sticky: "OrderedDict[str, Credential]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def select(self, key: Optional[str] = None) -> Credential:
+        """
+        Return the credential for ``key``.
+
+        A key keeps its credential until that credential is blocked by a rate
+        limit; unkeyed calls always take the credential with the most budget.
+        """
+        metrics = self.scheduler.metrics()
+        with self._lock:
+            if key is not None:
+                credential = self._sticky.get(key)
+                if credential is not None and not _blocked(metrics.get(credential.credential_id)):
+                    self._sticky.move_to_end(key)
+                    return credential
+            credential = max(
+                self.credentials,
+                key=lambda candidate: _budget_score(metrics.get(candidate.credential_id)),
+            )
+            if key is not None:
+                self._sticky[key] = credential
+                self._sticky.move_to_end(key)
+                while len(self._sticky) > self.max_sticky:
+                    self._sticky.popitem(last=False)
+            return credential
+
+
+def load_credential(reference: Union[str, Mapping[str, Any]]) -> Optional[Credential]:
+    """Build a credential from a config reference; None if its secret is unset."""
+    if isinstance(reference, Mapping):
+        private_key = _resolve_secret(str(reference.get("private_key", "")))
+        if not private_key:
+            return None
+        return AppInstallationCredential(
+            reference["app_id"],
+            reference["installation_id"],
+            private_key,
+        )
+    token = _resolve_secret(reference)
+    return TokenCredential(token) if token else None
+
+
+def load_credentials(references: Sequence[Union[str, Mapping[str, Any]]]) -> List[Credential]:
+    """Resolve every reference, skipping (and reporting) unset ones."""
+    credentials: List[Credential] = []
+    for reference in references:
+        credential = load_credential(reference)
+        if credential is None:
+            print(f"⚠️  Skipping unavailable GitHub credential {_describe(reference)}")
+            continue
+        credentials.append(credential)
+    return credentials
+
+
+def repo_credential_references(repo: str) -> List[Union[str, Mapping[str, Any]]]:
+    """Credential references configured for a repository slug in ``KNOWN_REPOS``."""
+    for config in KNOWN_REPOS.values():
+        if str(config.get("repo_id", "")).lower() == repo.lower():
+            return list(config.get("credentials") or [])
+    return []
+
+
+def _resolve_secret(reference: str) -> Optional[str]:
+    if reference.startswith("env:"):
+        return os.environ.get(reference[4:]) or None
+    if reference.startswith("file:"):
+        try:
+            return Path(reference[5:]).expanduser().read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+    raise ValueError(
+        f"Unsupported credential reference {reference!r}; use 'env:NAME' or 'file:PATH'"
+    )
+
+
+def _describe(reference: Union[str, Mapping[str, Any]]) -> str:
+    if isinstance(reference, Mapping):
+        return f"app {reference.get('app_id')}/{reference.get('installation_id')}"
+    return reference
+
+
+def _blocked(metrics: Optional[Mapping[str, Mapping[str, Any]]]) -> bool:
+    return any(
+        (resource.get("blocked_for_seconds") or 0) > 0
+        for resource in (metrics or {}).values()
+    )
+
+
+def _budget_score(metrics: Optional[Mapping[str, Mapping[str, Any]]]) -> tuple:
+    """Higher is better: not blocked, most remaining budget, fewest requests."""
+    if not metrics:
+        return (1, DEFAULT_HOURLY_LIMIT, 0)
+    remaining = min(
+        resource["remaining"] if resource.get("remaining") is not None else resource["limit"]
+        for resource in metrics.values()
+    )
+    requests = sum(resource.get("requests", 0) for resource in metrics.values())
+    return (0 if _blocked(metrics) else 1, remaining, -requests)
+
+
+def _parse_expiry(value: Optional[str]) -> float:
+    if not value:
+        return time.time() + 3600
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time() + 3600
+
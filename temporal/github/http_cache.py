@@ -0,0 +1,94 @@
+"""
+Bounded LRU cache of GitHub responses for conditional requests.
+
+GitHub answers ``If-None-Match``/``If-Modified-Since`` with ``304 Not Modified``
+when a resource is unchanged, and 304s are not charged against the rate limit.
+The cache keeps the validators and the parsed response per credential and URL
+so an unchanged poll costs neither budget nor a JSON re-parse.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from temporal.github.client import GitHubResponse
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+CacheKey = Tuple[str, str]
+
+
+class ConditionalCache:
+    """LRU of validated responses, bounded by entry count and total body size."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, GitHubResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def validators(self, key: CacheKey) -> Dict[str, str]:
+        """Conditional request headers for a cached resource, if any."""
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is None:
+            return {}
+        headers = {}
+        if cached.headers.get("etag"):
+            headers["If-None-Match"] = cached.headers["etag"]
+        if cached.headers.get("last-modified"):
+            headers["If-Modified-Since"] = cached.headers["last-modified"]
+        return headers
+
+    def hit(self, key: CacheKey) -> Optional["GitHubResponse"]:
+        """Return the cached response after a 304 and mark it recently used."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+    def store(self, key: CacheKey, response: "GitHubResponse") -> None:
+        """Remember a 200 response that carries a validator."""
+        if not (response.headers.get("etag") or response.headers.get("last-modified")):
+            return
+        size = len(response.body)
+        with self._lock:
+            self.misses += 1
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = response
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,155 @@
+"""
+Analysis of failed test checks while the rest of CI is still running.
+
+Instead of downloading artifacts and parsing junit reports only after every
+check has finished, the check wait feeds each snapshot to an
+``IncrementalAnalysis``. Failed test checks are analyzed in the background as
+soon as they appear, so by the time the last check completes the analysis is
+nearly final and ``TestAnalyzer.analyze_pr_results`` reuses the precomputed
+failures instead of fetching them again.
+
+The state is a plain dict so it can travel between activities (webhook mode
+polls in separate activities) and be reported as partial progress. It keeps
+the finished failures keyed by check without their per-test ``tests`` lists,
+so heartbeats and poll results stay small; the failing test ids and the test
+counts are kept, and the final analysis reloads the lists from the artifact
+cache.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional
+
+from temporal.github.check_utils import CheckProcessor
+from temporal.github.test_analyzer import TestAnalyzer
+
+
+DEFAULT_MAX_WORKERS = 4
+# Per-test outcomes left out of the state; ``tests_summary`` keeps their counts.
+_OMITTED_FROM_STATE = ('tests',)
+
+
+class IncrementalAnalysis:
+    """Analyzes failed test checks as they appear in successive snapshots."""
+
+    def __init__(
+        self,
+        analyzer: TestAnalyzer,
+        *,
+        repo_path: Optional[str],
+        repo: Optional[str],
+        state: Optional[Mapping[str, Any]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.analyzer = analyzer
+        self.repo_path = repo_path
+        self.repo = repo
+        self.max_workers = max_workers
+        self._failures: Dict[str, Dict[str, Any]] = dict((state or {}).get('failures') or {})
+        self._checks: List[Dict[str, Any]] = list((state or {}).get('checks') or [])
+        self._running: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def observe(self, snapshot: Mapping[str, Any]) -> None:
+        """Start analyzing any failed test check not seen before."""
+        checks = snapshot.get('checks') or []
+        with self._lock:
+            self._checks = [CheckProcessor.normalize_check(check) for check in checks]
+            for check in checks:
+                normalized = CheckProcessor.normalize_check(check)
+                if normalized.get('bucket') != CheckProcessor.STATUS_FAIL:
+                    continue
+                if not CheckProcessor.is_test_check(normalized):
+                    continue
+                key = TestAnalyzer.failure_key(check)
+                if key in self._failures or key in self._running:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="incremental-analysis",
+                    )
+                print(f"🔬 Analyzing failed check '{normalized['name']}' while CI runs")
+                self._running[key] = self._executor.submit(
+                    self.analyzer.analyze_failed_check,
+                    check,
+                    self.repo_path,
+                    self.repo,
+                )
+            self._collect()
+
+    def finish(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for in-flight analyses and return the final state.
+
+        ``timeout`` bounds the whole wait. Analyses still running then are
+        left out of the state, so the next poll or the final analysis step
+        picks their checks up again.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._lock:
+            running = list(self._running.values())
+            executor, self._executor = self._executor, None
+        for future in running:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                # Left out of the state; the final analysis retries the check.
+                pass
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._collect()
+            self._running.clear()
+            return self.state()
+
+    def state(self) -> Dict[str, Any]:
+        """Serializable state: finished failure details (without ``tests``) keyed by check."""
+        return {
+            'failures': dict(self._failures),
+            'checks': list(self._checks),
+        }
+
+    def progress(self) -> Dict[str, Any]:
+        """Compact partial result, suitable for heartbeats and queries."""
+        with self._lock:
+            self._collect()
+            progress = summarize_state(self.state())
+            progress['analyzing'] = sorted(key.split('|', 1)[0] for key in self._running)
+            return progress
+
+    def _collect(self) -> None:
+        for key, future in list(self._running.items()):
+            if not future.done():
+                continue
+            del self._running[key]
+            if future.cancelled() or future.exception() is not None:
+                continue
+            self._failures[key] = {
+                field: value
+                for field, value in future.result().items()
+                if field not in _OMITTED_FROM_STATE
+            }
+
+
+def summarize_state(state: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Reduce an incremental analysis state to counts and failing tests."""
+    state = state or {}
+    check_summary = CheckProcessor.get_check_summary(list(state.get('checks') or []))
+    return {
+        'total_checks': check_summary['total_checks'],
+        'completed_checks': check_summary['completed_checks'],
+        'failed_checks': check_summary['failed_checks'],
+        'test_failures': [
+            {
+                'check_name': failure.get('check_name'),
+                'failure_reason': failure.get('failure_reason'),
+                'failed_tests': list(failure.get('failed_tests') or []),
+            }
+            for failure in (state.get('failures') or {}).values()
+        ],
+    }
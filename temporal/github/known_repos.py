@@ -6,7 +6,15 @@ from __future__ import annotations
 from typing import Any, Dict
 
 
-# Repository configuration keyed by canonical repo name.
+# Repository configuration keyed by canonical repo name. Optional keys:
+#   no_checks_timeout_seconds: seconds without any checks before assuming no CI.
+#   credentials: GitHub credentials to spread API calls over, e.g.
+#       ["env:GITHUB_TOKEN_1", "env:GITHUB_TOKEN_2",
+#        {"app_id": 1, "installation_id": 2, "private_key": "file:/secrets/app.pem"}]
+#     See temporal/github/credentials.py.
+#   artifact_filter: which run artifacts to download for junit reports, e.g.
+#       {"include": ["*junit*"], "exclude": ["*coverage*"], "max_size_mb": 50}
+#     See ArtifactFilter in temporal/github/artifact_utils.py.
 KNOWN_REPOS: Dict[str, Dict[str, Any]] = {
     "demo-httpie-cli": {
         "name": "demo-httpie-cli",
@@ -0,0 +1,179 @@
+"""
+Streaming parser for failed-job logs (``gh run view --log-failed``).
+
+Logs are consumed one line at a time, so memory is bounded by the number of
+failures found rather than by the size of the log. Recognized formats:
+
+* the pytest ``short test summary info`` block (``FAILED``/``ERROR`` lines)
+* unittest result headers (``FAIL: test_x (module.Class)``, or
+  ``FAIL: test_x (module.Class.test_x)`` from Python 3.11 on)
+* generic ``FAILED path/to/test.py::test_name`` lines anywhere in the log,
+  used only when neither of the above is present
+
+Lines may carry the ``job<TAB>step<TAB>timestamp`` prefix written by gh (the
+API client writes the same shape with an empty step); ``FailedLogIndex``
+splits a whole run's log into per-job results.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+_TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}T[\d:.]+Z\s?')
+_SECTION_RULE = re.compile(r'^=+ .* =+$|^=+$')
+_SUMMARY_HEADER = re.compile(r'^=+ short test summary info =+$', re.IGNORECASE)
+_SUMMARY_FAILURE = re.compile(r'^(?:FAILED|ERROR)\s+(.+)$')
+_NOISE = re.compile(r'^[\[\]:()]+$')
+# Generated test names may contain brackets or dashes (e.g. ``test_x[a-b]``).
+_UNITTEST_FAILURE = re.compile(r'^(?:FAIL|ERROR):\s+(\S+)\s+\(([^\s()]+)\)')
+_MATRIX_SUFFIX = re.compile(r'\(([^()]*)\)\s*$')
+_GENERIC_FAILURE = re.compile(
+    r'FAILED\s+((?:tests?/)?[a-zA-Z0-9_/.-]+\.py::[a-zA-Z0-9_]+(?:\s+-\s+[^\n\r]+)?)',
+    re.IGNORECASE,
+)
+
+
+class FailureLogParser:
+    """Line-by-line state machine collecting test failures from one log."""
+
+    def __init__(self) -> None:
+        self._in_summary = False
+        self._summary: List[str] = []
+        self._unittest: List[str] = []
+        self._generic: List[str] = []
+        self._seen = {'summary': set(), 'unittest': set(), 'generic': set()}
+        self.saw_error_keyword = False
+
+    def feed(self, line: str) -> None:
+        """Consume one log line (without its job/step/timestamp prefix)."""
+        line = line.rstrip('\r\n')
+        stripped = line.strip()
+        if not self.saw_error_keyword:
+            lowered = stripped.lower()
+            self.saw_error_keyword = 'error' in lowered or 'failed' in lowered
+
+        if _SUMMARY_HEADER.match(stripped):
+            self._in_summary = True
+            return
+        if self._in_summary:
+            if _SECTION_RULE.match(stripped):
+                self._in_summary = False
+                return
+            match = _SUMMARY_FAILURE.match(stripped)
+            if match:
+                failure = match.group(1).strip()
+                # Only well-formed test paths; skip progress noise.
+                if '::' in failure and len(failure) > 5 and not _NOISE.match(failure):
+                    self._add('summary', self._summary, failure)
+            return
+
+        match = _UNITTEST_FAILURE.match(stripped)
+        if match:
+            self._add('unittest', self._unittest, _unittest_id(match.group(1), match.group(2)))
+            return
+        match = _GENERIC_FAILURE.search(line)
+        if match:
+            self._add('generic', self._generic, match.group(1).strip())
+
+    def failures(self) -> List[str]:
+        """Every failure found: the pytest summary if any, else unittest/generic ones."""
+        if self._summary:
+            return list(self._summary)
+        return list(self._unittest) + [
+            failure for failure in self._generic if failure not in self._seen['unittest']
+        ]
+
+    def _add(self, kind: str, target: List[str], failure: str) -> None:
+        if failure not in self._seen[kind]:
+            self._seen[kind].add(failure)
+            target.append(failure)
+
+
+def _unittest_id(name: str, qualified: str) -> str:
+    """``module.Class::test_x`` from a header's test name and parenthesized id."""
+    # Python 3.11+ qualifies the id with the test name itself.
+    class_path = qualified[:-len(name) - 1] if qualified.endswith(f".{name}") else qualified
+    return f"{class_path}::{name}"
+
+
+class FailedLogIndex:
+    """Parses a whole run's failed-job log into one ``FailureLogParser`` per job."""
+
+    def __init__(self) -> None:
+        self.jobs: Dict[str, FailureLogParser] = {}
+
+    def feed(self, line: str) -> None:
+        job, text = split_log_line(line)
+        parser = self.jobs.get(job)
+        if parser is None:
+            parser = self.jobs[job] = FailureLogParser()
+        parser.feed(text)
+
+    def feed_lines(self, lines: Iterable[str]) -> "FailedLogIndex":
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def covers(self, job_name: Optional[str]) -> bool:
+        """Whether ``for_job`` can answer for this job from the lines seen so far."""
+        return (job_name or '') in self.jobs or self._may_fall_back(job_name)
+
+    def for_job(self, job_name: Optional[str]) -> "JobFailures":
+        """
+        Failures of one job, or of every job when its lines cannot be told apart.
+
+        A matrix job (``pytest (3.11)``) never borrows its siblings' failures:
+        when the log is split by job and it is missing, nothing is reported.
+        """
+        parser = self.jobs.get(job_name or '')
+        if parser is not None:
+            parsers = [parser]
+        elif self._may_fall_back(job_name):
+            parsers = list(self.jobs.values())
+        else:
+            parsers = []
+        failures: List[str] = []
+        for candidate in parsers:
+            failures.extend(f for f in candidate.failures() if f not in failures)
+        return JobFailures(
+            failed_tests=failures,
+            saw_error_keyword=any(candidate.saw_error_keyword for candidate in parsers),
+        )
+
+
+    def _may_fall_back(self, job_name: Optional[str]) -> bool:
+        return not matrix_values(job_name) or set(self.jobs) <= {''}
+
+
+@dataclass
+class JobFailures:
+    """Parsed outcome of a job's failed log."""
+
+    failed_tests: List[str]
+    saw_error_keyword: bool
+
+
+def matrix_values(job_name: Optional[str]) -> List[str]:
+    """Lower-cased matrix values of a job name, e.g. ``['3.11', 'ubuntu']``."""
+    match = _MATRIX_SUFFIX.search(job_name or '')
+    if not match:
+        return []
+    return [value.strip().lower() for value in match.group(1).split(',') if value.strip()]
+
+
+def split_log_line(line: str) -> Tuple[str, str]:
+    """Split ``job<TAB>[step<TAB>]timestamp text`` into the job name and the text."""
+    if '\t' not in line:
+        return '', _TIMESTAMP.sub('', line, count=1)
+    parts = line.split('\t', 2)
+    return parts[0], _TIMESTAMP.sub('', parts[-1], count=1)
+
+
+def parse_failures(lines: Iterable[str]) -> List[str]:
+    """Parse failures from an unprefixed log."""
+    parser = FailureLogParser()
+    for line in lines:
+        parser.feed(line)
+    return parser.failures()
@@ -1,16 +1,62 @@
 """
 Pull request management functionality for mutation testing PoC.
 """
+import asyncio
 import subprocess
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+from .check_poller import SharedCheckPoller
 from .check_utils import CheckProcessor
+from .ci_durations import DEFAULT_NO_CHECKS_CUTOFF_SECONDS, PollSchedule
+from .client import (
+    GitHubAPIError,
+    GitHubClient,
+    RateLimitExceeded,
+    get_shared_client,
+    resolve_repo_slug,
+)
+
+# Async waits report their position at least this often.
+DEFAULT_HEARTBEAT_INTERVAL_SECONDS = 30.0
 
 
 class PRManager:
-    def __init__(self, repo_path: Path):
+    def __init__(self, repo_path: Path, client: Optional[GitHubClient] = None):
         self.repo_path = repo_path
+        # None means the shared client (or the repo's credential pool) is used.
+        self.client = client
+
+    def _api(
+        self,
+        repo: Optional[str],
+        pr_number: Optional[str] = None,
+    ) -> Tuple[Optional[GitHubClient], Optional[str]]:
+        """
+        Return the API client and repo slug to use, or (None, None) to use gh.
+
+        Calls about one PR are pinned to a single pooled credential.
+        """
+        client = self.client or get_shared_client(repo)
+        if client is None:
+            return None, None
+        api_repo = resolve_repo_slug(repo, self.repo_path)
+        if api_repo is None:
+            return None, None
+        if pr_number is not None:
+            client = client.for_key(f"{api_repo.lower()}#{pr_number}")
+        return client, api_repo
+
+    def _current_branch(self) -> str:
+        """Return the branch currently checked out in the repository."""
+        result = subprocess.run(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
     
     def create_pull_request(
         self,
@@ -19,7 +65,17 @@ class PRManager:
         base_branch: str = "main",
         repo: str = None,
     ) -> Dict[str, Any]:
-        """Create a pull request using GitHub CLI."""
+        """Create a pull request for the current branch."""
+        client, api_repo = self._api(repo)
+        if client is not None:
+            return client.create_pull_request(
+                api_repo,
+                title=title,
+                body=body,
+                head=self._current_branch(),
+                base=base_branch,
+            )
+
         cmd = [
             "gh", "pr", "create",
             "--title", title,
@@ -50,6 +106,10 @@ class PRManager:
     
     def get_pr_status(self, pr_number: str, repo: str = None) -> Dict[str, Any]:
         """Get the status of a pull request."""
+        client, api_repo = self._api(repo, pr_number)
+        if client is not None:
+            return client.get_pr_status(api_repo, pr_number)
+
         cmd = [
             "gh", "pr", "view", pr_number, "--json", 
             "number,title,state,mergeable,statusCheckRollup,url"
@@ -70,6 +130,10 @@ class PRManager:
     
     def get_pr_checks(self, pr_number: str, repo: str = None) -> Dict[str, Any]:
         """Get the check results for a pull request."""
+        client, api_repo = self._api(repo, pr_number)
+        if client is not None:
+            return client.get_pr_checks(api_repo, pr_number)
+
         cmd = [
             "gh", "pr", "checks", pr_number, "--json", 
             "name,state,bucket,completedAt,startedAt,description,link,workflow"
@@ -104,8 +168,28 @@ class PRManager:
             print(f"DEBUG: stdout: {e.stdout}")
             raise  # Re-raise for other errors
     
+    def get_pr_snapshot(self, pr_number: str, repo: str = None) -> Dict[str, Any]:
+        """
+        Get PR status and checks together.
+
+        With the API client this is a single GraphQL round trip; the gh CLI has
+        no combined command, so the fallback still makes two calls.
+        """
+        client, api_repo = self._api(repo, pr_number)
+        if client is not None:
+            return client.get_pr_snapshot(api_repo, pr_number)
+        return {
+            'status': self.get_pr_status(pr_number, repo),
+            'checks': self.get_pr_checks(pr_number, repo),
+        }
+    
     def close_pull_request(self, pr_number: str, repo: str = None) -> None:
         """Close a pull request without merging."""
+        client, api_repo = self._api(repo, pr_number)
+        if client is not None:
+            client.close_pull_request(api_repo, pr_number)
+            return
+
         cmd = ["gh", "pr", "close", pr_number]
         
         # Add repo parameter if specified
@@ -114,133 +198,279 @@ class PRManager:
         
         subprocess.run(cmd, cwd=self.repo_path, check=True)
     
+    def cancel_workflow_runs(self, branch: str, repo: str = None) -> List[str]:
+        """Cancel queued or running workflow runs for a branch; return their ids."""
+        client, api_repo = self._api(repo)
+        if client is not None:
+            cancelled = []
+            for run in client.list_active_workflow_runs(api_repo, branch):
+                if client.cancel_workflow_run(api_repo, run['id']):
+                    cancelled.append(str(run['id']))
+            return cancelled
+
+        cmd = [
+            "gh", "run", "list", "--branch", branch,
+            "--json", "databaseId,status", "--limit", "100"
+        ]
+        if repo:
+            cmd.extend(["--repo", repo])
+        result = subprocess.run(
+            cmd,
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cancelled = []
+        for run in json.loads(result.stdout or "[]"):
+            if run.get('status') == 'completed':
+                continue
+            cancel_cmd = ["gh", "run", "cancel", str(run['databaseId'])]
+            if repo:
+                cancel_cmd.extend(["--repo", repo])
+            # A run may finish between listing and cancelling; that is fine.
+            cancel = subprocess.run(
+                cancel_cmd,
+                cwd=self.repo_path,
+                capture_output=True,
+                text=True,
+            )
+            if cancel.returncode == 0:
+                cancelled.append(str(run['databaseId']))
+        return cancelled
+    
+    @staticmethod
+    def evaluate_checks(
+        status: Dict[str, Any],
+        checks: List[Dict[str, Any]],
+        elapsed_time: int,
+        no_checks_cutoff: int = DEFAULT_NO_CHECKS_CUTOFF_SECONDS,
+        early_verdict: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the wait result if the checks are finished, otherwise None.
+
+        With ``early_verdict`` the wait also ends as soon as one test check
+        fails: the mutant is killed whatever the remaining checks report.
+        """
+        # Defensive programming: ensure status is a dict
+        if not isinstance(status, dict):
+            print(f"🔍 Unexpected status type: {type(status)}, retrying...")
+            return None
+        
+        # Analyze individual checks first to determine completion
+        checks_completed = False
+        try:
+            if checks and isinstance(checks, list) and len(checks) > 0:
+                # Use the shared utility for consistent processing
+                CheckProcessor.print_check_summary(checks)
+                check_summary = CheckProcessor.get_check_summary(checks)
+                
+                # Check if all checks are completed (no running checks)
+                all_checks_completed = (
+                    check_summary['running_checks'] == 0
+                    and check_summary['completed_checks']
+                    == check_summary['total_checks']
+                )
+                if all_checks_completed:
+                    checks_completed = True
+                elif early_verdict:
+                    failed_check = CheckProcessor.get_first_failed_test_check(checks)
+                    if failed_check:
+                        print(
+                            f"🎯 Test check '{failed_check['name']}' failed - "
+                            "mutation killed, not waiting for remaining checks"
+                        )
+                        return {
+                            'status': status,
+                            'checks': checks,
+                            'completed': True,
+                            'early_verdict': True,
+                            'killed_by': failed_check['name'],
+                        }
+            else:
+                print(
+                    "🔍 No checks available yet - "
+                    "GitHub Actions may still be starting up"
+                )
+                # If no checks are available, wait a bit longer for them to start
+                if elapsed_time > no_checks_cutoff:  # Give the repo's CI time to start
+                    print(
+                        f"🔍 No checks detected after {no_checks_cutoff} seconds - "
+                        "assuming no CI/CD is configured"
+                    )
+                    return {
+                        'status': status,
+                        'checks': checks,
+                        'completed': True,
+                        'no_checks_configured': True
+                    }
+        except Exception as e:
+            import traceback
+            print(f"ERROR: Exception in individual checks analysis: {e}")
+            traceback.print_exc()
+        
+        # Analyze rollup status
+        try:
+            if status.get('statusCheckRollup'):
+                rollup = status['statusCheckRollup']
+                
+                # Handle case where rollup is a dict
+                if isinstance(rollup, dict):
+                    rollup_state = rollup.get('state', 'UNKNOWN')
+                    print(f"📊 Overall status: {rollup_state}")
+                    
+                    if rollup.get('state') in ['SUCCESS', 'FAILURE', 'ERROR']:
+                        print(f"✅ All checks completed with status: {rollup_state}")
+                        return {
+                            'status': status,
+                            'checks': checks,
+                            'completed': True
+                        }
+                # Handle case where rollup is a list (unexpected but happens)
+                elif isinstance(rollup, list):
+                    if len(rollup) > 0 and isinstance(rollup[0], dict):
+                        rollup_state = rollup[0].get('state', 'UNKNOWN')
+                        print(
+                            f"📊 Overall status: {rollup_state} "
+                            "(from rollup list)"
+                        )
+                        
+                        if rollup[0].get('state') in ['SUCCESS', 'FAILURE', 'ERROR']:
+                            print(f"✅ All checks completed with status: {rollup_state}")
+                            return {
+                                'status': status,
+                                'checks': checks,
+                                'completed': True
+                            }
+                    else:
+                        print(
+                            "📊 Overall status: PENDING "
+                            "(rollup list is empty or invalid)"
+                        )
+                else:
+                    print(
+                        "📊 Overall status: UNKNOWN "
+                        f"(unexpected rollup type: {type(rollup)})"
+                    )
+            else:
+                print("📊 Overall status: PENDING (no rollup data yet)")
+        except Exception as e:
+            import traceback
+            print(f"ERROR: Exception in rollup status analysis: {e}")
+            traceback.print_exc()
+        
+        # If all individual checks are completed, exit even if rollup status is unclear
+        if checks_completed:
+            print("✅ All individual checks completed - exiting wait loop")
+            return {
+                'status': status,
+                'checks': checks,
+                'completed': True
+            }
+        
+        return None
+    
+    def poll_checks(
+        self,
+        pr_number: str,
+        repo: str = None,
+        elapsed_time: int = 0,
+        no_checks_cutoff: int = DEFAULT_NO_CHECKS_CUTOFF_SECONDS,
+        early_verdict: bool = False,
+    ) -> Dict[str, Any]:
+        """Fetch the checks once and report whether they have finished."""
+        snapshot = self.get_pr_snapshot(pr_number, repo)
+        result = self.evaluate_checks(
+            snapshot['status'],
+            snapshot['checks'],
+            elapsed_time,
+            no_checks_cutoff,
+            early_verdict,
+        )
+        if result is not None:
+            return result
+        return {
+            'status': snapshot['status'],
+            'checks': snapshot['checks'],
+            'completed': False
+        }
+    
     def wait_for_checks(
         self,
         pr_number: str,
         timeout_seconds: int = 300,
         repo: str = None,
+        poller: Optional[SharedCheckPoller] = None,
+        schedule: Optional[PollSchedule] = None,
+        early_verdict: bool = False,
+        on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
-        """Wait for PR checks to complete and return results."""
+        """
+        Wait for PR checks to complete and return results.
+
+        With a shared poller the snapshots come from its batched per-repo
+        queries instead of this PR being polled on its own. ``schedule``
+        decides the delay between polls and the no-checks cutoff; without one
+        the PR is polled every 15 seconds. ``early_verdict`` returns on the
+        first failed test check (see ``evaluate_checks``). ``on_snapshot`` is
+        called with every fetched snapshot, e.g. to analyze finished checks
+        while the rest are still running.
+        """
         import time
         
+        client, api_repo = self._api(repo)
+        if poller is not None and client is not None:
+            return self._wait_with_poller(
+                poller,
+                api_repo,
+                pr_number,
+                timeout_seconds,
+                schedule,
+                early_verdict,
+                on_snapshot,
+            )
+        
+        schedule = schedule or PollSchedule()
         start_time = time.time()
+        first_seen: Optional[int] = None
         
         while time.time() - start_time < timeout_seconds:
             try:
-                status = self.get_pr_status(pr_number, repo)
-                checks = self.get_pr_checks(pr_number, repo)
+                snapshot = self.get_pr_snapshot(pr_number, repo)
                 
                 # Print detailed status information
                 elapsed_time = int(time.time() - start_time)
                 print(f"⏱️  Waiting for checks... ({elapsed_time}s elapsed)")
+                if first_seen is None and snapshot['checks']:
+                    first_seen = elapsed_time
+                if on_snapshot is not None:
+                    on_snapshot(snapshot)
                 
-                # Defensive programming: ensure status is a dict
-                if not isinstance(status, dict):
-                    print(f"🔍 Unexpected status type: {type(status)}, retrying...")
-                    time.sleep(15)
-                    continue
-                
-                # Analyze individual checks first to determine completion
-                checks_completed = False
-                try:
-                    if checks and isinstance(checks, list) and len(checks) > 0:
-                        # Use the shared utility for consistent processing
-                        CheckProcessor.print_check_summary(checks)
-                        check_summary = CheckProcessor.get_check_summary(checks)
-                        
-                        # Check if all checks are completed (no running checks)
-                        all_checks_completed = (
-                            check_summary['running_checks'] == 0
-                            and check_summary['completed_checks']
-                            == check_summary['total_checks']
-                        )
-                        if all_checks_completed:
-                            checks_completed = True
-                    else:
-                        print(
-                            "🔍 No checks available yet - "
-                            "GitHub Actions may still be starting up"
-                        )
-                        # If no checks are available, wait a bit longer for them to start
-                        if elapsed_time > 120:  # Wait 2 minutes to see if checks start
-                            print(
-                                "🔍 No checks detected after 2 minutes - "
-                                "assuming no CI/CD is configured"
-                            )
-                            return {
-                                'status': status,
-                                'checks': checks,
-                                'completed': True,
-                                'no_checks_configured': True
-                            }
-                except Exception as e:
-                    import traceback
-                    print(f"ERROR: Exception in individual checks analysis: {e}")
-                    traceback.print_exc()
-                
-                # Analyze rollup status
-                try:
-                    if status.get('statusCheckRollup'):
-                        rollup = status['statusCheckRollup']
-                        
-                        # Handle case where rollup is a dict
-                        if isinstance(rollup, dict):
-                            rollup_state = rollup.get('state', 'UNKNOWN')
-                            print(f"📊 Overall status: {rollup_state}")
-                            
-                            if rollup.get('state') in ['SUCCESS', 'FAILURE', 'ERROR']:
-                                print(f"✅ All checks completed with status: {rollup_state}")
-                                return {
-                                    'status': status,
-                                    'checks': checks,
-                                    'completed': True
-                                }
-                        # Handle case where rollup is a list (unexpected but happens)
-                        elif isinstance(rollup, list):
-                            if len(rollup) > 0 and isinstance(rollup[0], dict):
-                                rollup_state = rollup[0].get('state', 'UNKNOWN')
-                                print(
-                                    f"📊 Overall status: {rollup_state} "
-                                    "(from rollup list)"
-                                )
-                                
-                                if rollup[0].get('state') in ['SUCCESS', 'FAILURE', 'ERROR']:
-                                    print(f"✅ All checks completed with status: {rollup_state}")
-                                    return {
-                                        'status': status,
-                                        'checks': checks,
-                                        'completed': True
-                                    }
-                            else:
-                                print(
-                                    "📊 Overall status: PENDING "
-                                    "(rollup list is empty or invalid)"
-                                )
-                        else:
-                            print(
-                                "📊 Overall status: UNKNOWN "
-                                f"(unexpected rollup type: {type(rollup)})"
-                            )
-                    else:
-                        print("📊 Overall status: PENDING (no rollup data yet)")
-                except Exception as e:
-                    import traceback
-                    print(f"ERROR: Exception in rollup status analysis: {e}")
-                    traceback.print_exc()
-                
-                # If all individual checks are completed, exit even if rollup status is unclear
-                if checks_completed:
-                    print("✅ All individual checks completed - exiting wait loop")
-                    return {
-                        'status': status,
-                        'checks': checks,
-                        'completed': True
-                    }
+                result = self.evaluate_checks(
+                    snapshot['status'],
+                    snapshot['checks'],
+                    elapsed_time,
+                    schedule.no_checks_cutoff,
+                    early_verdict,
+                )
+                if result is not None:
+                    return _with_first_seen(result, first_seen)
                 
                 print()  # Add blank line for readability
-                time.sleep(15)  # Wait 15 seconds before checking again
+                delay = schedule.next_delay(elapsed_time, checks_seen=first_seen is not None)
+                remaining = timeout_seconds - (time.time() - start_time)
+                print(f"   Next check in {int(delay)} seconds")
+                time.sleep(max(min(delay, remaining), 0))
                 
-            except subprocess.CalledProcessError as e:
+            except RateLimitExceeded as e:
+                # Sleep until GitHub lets us back in instead of burning retries.
+                remaining = timeout_seconds - (time.time() - start_time)
+                print(f"⏳ GitHub rate limit reached: {e.message}")
+                print(f"   Retrying in {int(e.retry_after)} seconds...")
+                time.sleep(max(min(e.retry_after, remaining), 0))
+                continue
+            except (subprocess.CalledProcessError, GitHubAPIError, OSError) as e:
                 print(f"⚠️  Error checking PR status: {e}")
                 print("   Retrying in 15 seconds...")
                 time.sleep(15)
@@ -248,9 +478,211 @@ class PRManager:
         
         # Timeout reached
         print(f"⏰ Timeout reached after {timeout_seconds} seconds")
+        snapshot = self.get_pr_snapshot(pr_number, repo)
         return {
-            'status': self.get_pr_status(pr_number, repo),
-            'checks': self.get_pr_checks(pr_number, repo),
+            'status': snapshot['status'],
+            'checks': snapshot['checks'],
+            'completed': False,
+            'timeout': True
+        }
+    
+    def _wait_with_poller(
+        self,
+        poller: SharedCheckPoller,
+        repo: str,
+        pr_number: str,
+        timeout_seconds: int,
+        schedule: Optional[PollSchedule] = None,
+        early_verdict: bool = False,
+        on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Wait on snapshots fanned out by the shared poller.
+
+        With a schedule the PR's next fetch is pushed out accordingly; without
+        one it is fetched on every poller interval.
+        """
+        import time
+        
+        start_time = time.time()
+        watch = poller.watch(repo, pr_number)
+        seen_version = 0
+        first_seen: Optional[int] = None
+        no_checks_cutoff = (
+            schedule.no_checks_cutoff if schedule else DEFAULT_NO_CHECKS_CUTOFF_SECONDS
+        )
+        try:
+            while True:
+                remaining = timeout_seconds - (time.time() - start_time)
+                if remaining <= 0:
+                    break
+                update = poller.wait_for_update(watch, seen_version, remaining)
+                if update is None:
+                    break
+                seen_version = update.version
+                elapsed_time = int(time.time() - start_time)
+                if update.error is not None:
+                    print(f"⚠️  Error checking PR status: {update.error}")
+                    continue
+                
+                print(f"⏱️  Waiting for checks... ({elapsed_time}s elapsed)")
+                if first_seen is None and update.snapshot['checks']:
+                    first_seen = elapsed_time
+                if on_snapshot is not None:
+                    on_snapshot(update.snapshot)
+                result = self.evaluate_checks(
+                    update.snapshot['status'],
+                    update.snapshot['checks'],
+                    elapsed_time,
+                    no_checks_cutoff,
+                    early_verdict,
+                )
+                if result is not None:
+                    return _with_first_seen(result, first_seen)
+                if schedule is not None:
+                    poller.reschedule(
+                        watch,
+                        schedule.next_delay(elapsed_time, checks_seen=first_seen is not None),
+                    )
+                print()  # Add blank line for readability
+        finally:
+            poller.unwatch(watch)
+        
+        print(f"⏰ Timeout reached after {timeout_seconds} seconds")
+        snapshot = watch.snapshot or self.get_pr_snapshot(pr_number, repo)
+        return {
+            'status': snapshot['status'],
+            'checks': snapshot['checks'],
+            'completed': False,
+            'timeout': True
+        }
+
+    async def wait_for_checks_async(
+        self,
+        pr_number: str,
+        timeout_seconds: int = 300,
+        repo: str = None,
+        poller: Optional[SharedCheckPoller] = None,
+        schedule: Optional[PollSchedule] = None,
+        early_verdict: bool = False,
+        on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_heartbeat: Optional[Callable[[Dict[str, Any]], None]] = None,
+        resume: Optional[Mapping[str, Any]] = None,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL_SECONDS,
+    ) -> Dict[str, Any]:
+        """
+        ``wait_for_checks`` for async activities: the delays are awaited, not slept.
+
+        Fetches run on a worker thread, or come from the shared poller without
+        occupying one. ``on_heartbeat`` is called at least every
+        ``heartbeat_interval`` seconds with the wait's position
+        (``elapsed_seconds``, ``checks_first_seen_seconds``); passing that dict
+        back as ``resume`` continues a retried wait instead of restarting its
+        timeout.
+        """
+        loop = asyncio.get_running_loop()
+        resume = resume or {}
+        start_time = loop.time() - float(resume.get('elapsed_seconds') or 0)
+        first_seen: Optional[int] = resume.get('checks_first_seen_seconds')
+        schedule = schedule or PollSchedule()
+
+        def elapsed() -> int:
+            return int(loop.time() - start_time)
+
+        def remaining() -> float:
+            return timeout_seconds - (loop.time() - start_time)
+
+        def heartbeat() -> None:
+            if on_heartbeat is not None:
+                on_heartbeat({
+                    'elapsed_seconds': elapsed(),
+                    'checks_first_seen_seconds': first_seen,
+                })
+
+        async def pause(seconds: float) -> None:
+            deadline = loop.time() + max(min(seconds, remaining()), 0)
+            while True:
+                heartbeat()
+                left = deadline - loop.time()
+                if left <= 0:
+                    return
+                await asyncio.sleep(min(left, heartbeat_interval))
+
+        client, api_repo = self._api(repo)
+        watch = None
+        if poller is not None and client is not None:
+            watch = poller.watch(api_repo, pr_number)
+        seen_version = 0
+        try:
+            while remaining() > 0:
+                if watch is not None:
+                    heartbeat()
+                    update = await poller.wait_for_update_async(
+                        watch,
+                        seen_version,
+                        min(remaining(), heartbeat_interval),
+                    )
+                    if update is None:
+                        continue
+                    seen_version = update.version
+                    if update.error is not None:
+                        print(f"⚠️  Error checking PR status: {update.error}")
+                        continue
+                    snapshot = update.snapshot
+                else:
+                    try:
+                        snapshot = await asyncio.to_thread(self.get_pr_snapshot, pr_number, repo)
+                    except RateLimitExceeded as e:
+                        print(f"⏳ GitHub rate limit reached: {e.message}")
+                        print(f"   Retrying in {int(e.retry_after)} seconds...")
+                        await pause(e.retry_after)
+                        continue
+                    except (subprocess.CalledProcessError, GitHubAPIError, OSError) as e:
+                        print(f"⚠️  Error checking PR status: {e}")
+                        print("   Retrying in 15 seconds...")
+                        await pause(15)
+                        continue
+
+                elapsed_time = elapsed()
+                print(f"⏱️  Waiting for checks... ({elapsed_time}s elapsed)")
+                if first_seen is None and snapshot['checks']:
+                    first_seen = elapsed_time
+                if on_snapshot is not None:
+                    on_snapshot(snapshot)
+                result = self.evaluate_checks(
+                    snapshot['status'],
+                    snapshot['checks'],
+                    elapsed_time,
+                    schedule.no_checks_cutoff,
+                    early_verdict,
+                )
+                if result is not None:
+                    return _with_first_seen(result, first_seen)
+
+                delay = schedule.next_delay(elapsed_time, checks_seen=first_seen is not None)
+                if watch is not None:
+                    poller.reschedule(watch, delay)
+                else:
+                    print(f"   Next check in {int(delay)} seconds")
+                    await pause(delay)
+        finally:
+            if watch is not None:
+                poller.unwatch(watch)
+
+        print(f"⏰ Timeout reached after {timeout_seconds} seconds")
+        snapshot = (watch and watch.snapshot) or await asyncio.to_thread(
+            self.get_pr_snapshot, pr_number, repo,
+        )
+        return {
+            'status': snapshot['status'],
+            'checks': snapshot['checks'],
             'completed': False,
             'timeout': True
         }
+
+
+def _with_first_seen(result: Dict[str, Any], first_seen: Optional[int]) -> Dict[str, Any]:
+    """Record how long the first check took to appear, for the CI duration model."""
+    if first_seen is not None:
+        result['checks_first_seen_seconds'] = first_seen
+    return result
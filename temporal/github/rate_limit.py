@@ -0,0 +1,298 @@
+"""
+Worker-wide scheduling of GitHub API calls against the primary and secondary
+rate limits.
+
+Each credential/resource pair (``core`` REST, ``graphql``) gets a token bucket
+that spreads the remaining hourly budget reported in ``X-RateLimit-*`` headers
+over the time left until reset. Calls carry a priority: latency-critical status
+polls may spend the whole budget, while default and bulk calls (artifact and
+log downloads) stop short of it so polls keep working when a large campaign
+drains the budget. ``Retry-After`` and exhausted-budget responses block the
+credential until GitHub allows requests again.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+PRIORITY_POLL = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BULK = 2
+
+# Fraction of the hourly limit each priority leaves untouched for higher ones.
+PRIORITY_RESERVE = {
+    PRIORITY_POLL: 0.0,
+    PRIORITY_DEFAULT: 0.02,
+    PRIORITY_BULK: 0.10,
+}
+
+DEFAULT_HOURLY_LIMIT = 5000
+DEFAULT_BURST = 100
+SECONDARY_LIMIT_BACKOFF_SECONDS = 60.0
+LOW_BUDGET_FRACTION = 0.1
+_WAIT_SLICE_SECONDS = 1.0
+
+
+class RateLimitDeferred(Exception):
+    """Raised by ``acquire`` when a call would have to wait longer than allowed."""
+
+    def __init__(self, resource: str, delay: float):
+        super().__init__(f"next {resource} call allowed in {delay:.0f} seconds")
+        self.resource = resource
+        self.delay = delay
+
+
+def credential_fingerprint(token: str) -> str:
+    """Stable identifier for a token that does not reveal it."""
+    return "token:" + hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class RateLimitBucket:
+    """Budget of one credential for one GitHub rate-limit resource."""
+
+    limit: int = DEFAULT_HOURLY_LIMIT
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+    blocked_until: float = 0.0
+    tokens: float = float(DEFAULT_BURST)
+    burst: int = DEFAULT_BURST
+    refilled_at: Optional[float] = None
+    requests: int = 0
+    not_modified: int = 0
+    throttled: int = 0
+    waited_seconds: float = 0.0
+    low_budget_warned: bool = False
+    waiting: Dict[int, int] = field(default_factory=dict)
+
+    def _refill(self, now: float) -> None:
+        if self.reset_at is not None and now >= self.reset_at:
+            # New window: GitHub restores the full limit.
+            self.remaining = self.limit
+            self.reset_at = None
+            self.low_budget_warned = False
+        if self.refilled_at is None:
+            self.refilled_at = now
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self._rate(now))
+        self.refilled_at = now
+
+    def _rate(self, now: float) -> float:
+        """Tokens per second: the remaining budget spread until reset."""
+        if self.remaining is not None and self.reset_at is not None:
+            return max(self.remaining, 1) / max(self.reset_at - now, 1.0)
+        return self.limit / 3600.0
+
+    def delay_for(self, priority: int, now: float) -> float:
+        """Seconds until a call of ``priority`` may be sent (0 = now)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.remaining is not None:
+            reserve = self.limit * PRIORITY_RESERVE.get(priority, 0.0)
+            if self.remaining <= reserve:
+                return max((self.reset_at or now + 60.0) - now, 1.0)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self._rate(now)
+
+    def take(self) -> None:
+        self.tokens -= 1
+        self.requests += 1
+        if self.remaining is not None:
+            self.remaining = max(self.remaining - 1, 0)
+
+    def refund(self) -> None:
+        """Give back the token of a call GitHub did not count (a 304)."""
+        self.tokens = min(self.burst, self.tokens + 1)
+        self.not_modified += 1
+        if self.remaining is not None:
+            self.remaining = min(self.remaining + 1, self.limit)
+
+
+class RateLimitScheduler:
+    """Admits GitHub API calls per credential according to the remaining budget."""
+
+    def __init__(
+        self,
+        *,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.burst = burst
+        self._clock = clock
+        self._buckets: Dict[tuple, RateLimitBucket] = {}
+        self._condition = threading.Condition()
+
+    def _bucket(self, credential: str, resource: str) -> RateLimitBucket:
+        key = (credential, resource)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = RateLimitBucket(tokens=float(self.burst), burst=self.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    def acquire(
+        self,
+        credential: str,
+        resource: str = "core",
+        priority: int = PRIORITY_DEFAULT,
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """
+        Block until the call may be sent; return the seconds spent waiting.
+
+        Raises ``RateLimitDeferred`` instead of blocking when the call could
+        not be sent within ``max_wait`` seconds.
+        """
+        started = self._clock()
+        with self._condition:
+            bucket = self._bucket(credential, resource)
+            bucket.waiting[priority] = bucket.waiting.get(priority, 0) + 1
+            try:
+                while True:
+                    now = self._clock()
+                    delay = bucket.delay_for(priority, now)
+                    higher_waiting = any(
+                        count for level, count in bucket.waiting.items()
+                        if level < priority
+                    )
+                    if delay <= 0 and not higher_waiting:
+                        bucket.take()
+                        waited = now - started
+                        bucket.waited_seconds += waited
+                        return waited
+                    if max_wait is not None and now - started + delay > max_wait:
+                        bucket.waited_seconds += now - started
+                        raise RateLimitDeferred(resource, delay)
+                    self._condition.wait(min(delay, _WAIT_SLICE_SECONDS) if delay > 0 else 0.05)
+            finally:
+                bucket.waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def refund(self, credential: str, resource: str = "core") -> None:
+        """Return the token of a conditional request answered with ``304``."""
+        with self._condition:
+            self._bucket(credential, resource).refund()
+            self._condition.notify_all()
+
+    def update(
+        self,
+        credential: str,
+        resource: str,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Record the ``X-RateLimit-*`` headers of a response."""
+        remaining = _int_header(headers, "x-ratelimit-remaining")
+        if remaining is None:
+            return
+        resource = headers.get("x-ratelimit-resource") or resource
+        with self._condition:
+            bucket = self._bucket(credential, resource)
+            bucket.limit = _int_header(headers, "x-ratelimit-limit") or bucket.limit
+            bucket.remaining = remaining
+            reset = _int_header(headers, "x-ratelimit-reset")
+            if reset is not None:
+                bucket.reset_at = float(reset)
+            if remaining < bucket.limit * LOW_BUDGET_FRACTION and not bucket.low_budget_warned:
+                bucket.low_budget_warned = True
+                print(
+                    f"⚠️  GitHub {resource} budget low for {credential}: "
+                    f"{remaining}/{bucket.limit} requests left"
+                )
+            self._condition.notify_all()
+
+    def throttle(
+        self,
+        credential: str,
+        resource: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: str = "",
+    ) -> Optional[float]:
+        """
+        Detect a rate-limited response and block the credential accordingly.
+
+        Returns the number of seconds to wait before retrying, or None when the
+        response was not caused by a rate limit.
+        """
+        delay = rate_limit_delay(status, headers, body, now=self._clock())
+        if delay is None:
+            return None
+        resource = headers.get("x-ratelimit-resource") or resource
+        with self._condition:
+            bucket = self._bucket(credential, resource)
+            bucket.throttled += 1
+            bucket.blocked_until = max(bucket.blocked_until, self._clock() + delay)
+            self._condition.notify_all()
+        return delay
+
+    def metrics(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Snapshot of every budget, keyed by credential then resource."""
+        now = self._clock()
+        snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._condition:
+            for (credential, resource), bucket in self._buckets.items():
+                snapshot.setdefault(credential, {})[resource] = {
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "reset_in_seconds": (
+                        max(bucket.reset_at - now, 0.0) if bucket.reset_at is not None else None
+                    ),
+                    "blocked_for_seconds": max(bucket.blocked_until - now, 0.0),
+                    "requests": bucket.requests,
+                    "not_modified": bucket.not_modified,
+                    "throttled": bucket.throttled,
+                    "waited_seconds": round(bucket.waited_seconds, 3),
+                }
+        return snapshot
+
+
+def rate_limit_delay(
+    status: int,
+    headers: Mapping[str, str],
+    body: str = "",
+    *,
+    now: Optional[float] = None,
+) -> Optional[float]:
+    """Seconds GitHub asks us to wait, or None if this is not a rate-limit response."""
+    if status not in (403, 429):
+        return None
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 1.0)
+        except ValueError:
+            pass
+    if headers.get("x-ratelimit-remaining") == "0":
+        reset = _int_header(headers, "x-ratelimit-reset")
+        current = time.time() if now is None else now
+        return max(reset - current, 1.0) if reset is not None else SECONDARY_LIMIT_BACKOFF_SECONDS
+    if "rate limit" in body.lower():
+        # Secondary limits without Retry-After: GitHub asks for at least a minute.
+        return SECONDARY_LIMIT_BACKOFF_SECONDS
+    return None
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_shared_scheduler: Optional[RateLimitScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_shared_scheduler() -> RateLimitScheduler:
+    """Return the worker-wide scheduler shared by every API client."""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RateLimitScheduler()
+        return _shared_scheduler
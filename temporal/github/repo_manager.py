@@ -1,35 +1,109 @@
 """
 Repository management functionality for mutation testing PoC.
 """
+import re
 import shutil
 import subprocess
 from pathlib import Path
+from typing import Optional
+
+# Bare mirrors kept by workers that advertise a repo as warm (see update_mirror).
+DEFAULT_MIRROR_DIR = "~/Repos/.mirrors"
+
+
+def _repo_name(repo_url: str) -> str:
+    repo_name = repo_url.rstrip("/").split("/")[-1]
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-4]
+    return repo_name
 
 
 class RepoManager:
-    def __init__(self, base_dir: str = "~/Repos"):
+    def __init__(self, base_dir: str = "~/Repos", mirror_dir: str = DEFAULT_MIRROR_DIR):
         self.base_dir = Path(base_dir).expanduser()
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.mirror_dir = Path(mirror_dir).expanduser()
     
-    def clone_repo(self, repo_url: str) -> Path:
-        """Clone a GitHub repository to the base directory."""
-        repo_name = repo_url.split("/")[-1]
-        if repo_name.endswith(".git"):
-            repo_name = repo_name[:-4]
-        
-        repo_path = self.base_dir / repo_name
+    def clone_repo(self, repo_url: str, dest_name: Optional[str] = None) -> Path:
+        """
+        Clone a GitHub repository to the base directory.
+
+        When this host keeps a mirror of the repo, its objects are borrowed
+        and only what the mirror is missing is fetched.
+        """
+        repo_path = self.base_dir / (dest_name or _repo_name(repo_url))
         
         # Remove existing clone if it exists
         if repo_path.exists():
             shutil.rmtree(repo_path)
         
         # Clone the repository
+        command = ["git", "clone"]
+        mirror_path = self.mirror_path(repo_url)
+        if mirror_path.exists():
+            command += ["--reference-if-able", str(mirror_path)]
+        subprocess.run(command + [repo_url, str(repo_path)], check=True)
+        
+        return repo_path
+
+    def mirror_path(self, repo_url: str) -> Path:
+        """Where this host's bare mirror of ``repo_url`` lives."""
+        parts = re.split(r"[/:]", repo_url.rstrip("/"))
+        owner = parts[-2] if len(parts) > 1 else ""
+        return self.mirror_dir / f"{owner}-{_repo_name(repo_url)}.git".lstrip("-")
+
+    def update_mirror(self, repo_url: str) -> Path:
+        """Create or refresh the bare mirror that later clones borrow objects from."""
+        mirror_path = self.mirror_path(repo_url)
+        if mirror_path.exists():
+            subprocess.run([
+                "git", "remote", "update", "--prune"
+            ], cwd=mirror_path, check=True, capture_output=True)
+        else:
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            subprocess.run([
+                "git", "clone", "--mirror", "--quiet", repo_url, str(mirror_path)
+            ], check=True)
+        return mirror_path
+    
+    def clone_from_local(
+        self,
+        source_path: Path,
+        repo_url: str,
+        dest_name: str,
+        revision: Optional[str] = None,
+    ) -> Path:
+        """
+        Clone an existing local checkout, sharing its git objects.
+
+        The copy needs no network access; origin is pointed back at the
+        remote so branches can still be pushed. With ``revision`` the copy is
+        checked out (detached) at that commit.
+        """
+        repo_path = self.base_dir / dest_name
+        if repo_path.exists():
+            shutil.rmtree(repo_path)
+
         subprocess.run([
-            "git", "clone", repo_url, str(repo_path)
+            "git", "clone", "--shared", "--quiet", str(source_path), str(repo_path)
         ], check=True)
-        
+        subprocess.run([
+            "git", "remote", "set-url", "origin", repo_url
+        ], cwd=repo_path, check=True)
+        if revision:
+            subprocess.run([
+                "git", "checkout", "--quiet", "--detach", revision
+            ], cwd=repo_path, check=True)
+
         return repo_path
     
+    def head_commit(self, repo_path: Path) -> str:
+        """Return the commit checked out in the repository."""
+        result = subprocess.run([
+            "git", "rev-parse", "HEAD"
+        ], cwd=repo_path, check=True, capture_output=True, text=True)
+        return result.stdout.strip()
+    
     def cleanup_repo(self, repo_path: Path) -> None:
         """Remove the cloned repository."""
         if repo_path.exists():
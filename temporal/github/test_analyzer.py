@@ -2,13 +2,19 @@
 Test result analysis functionality for mutation testing PoC.
 """
 import json
-import tempfile
+import threading
+import zipfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
 from xml.etree import ElementTree
 
+from temporal.github import annotation_utils
+from temporal.github.artifact_cache import get_artifact_cache
+from temporal.github.artifact_utils import ZIP_MEMBER_ERRORS, ArtifactDownload
 from temporal.github.check_utils import CheckProcessor
+from temporal.github.log_parser import FailedLogIndex, matrix_values
 
 
 class TestAnalyzer:
@@ -16,6 +22,11 @@ class TestAnalyzer:
         self.output_dir = output_dir or Path.home() / "Desktop"
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.repo_path = repo_path
+        # Per-run memos: matrix jobs of one workflow run share artifacts and logs.
+        self._junit_by_run: Dict[str, List[Dict[str, Any]]] = {}
+        self._logs_by_run: Dict[str, FailedLogIndex] = {}
+        self._run_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
     
     def analyze_pr_results(self, pr_data: Dict[str, Any], repo: str = None) -> Dict[str, Any]:
         """Analyze PR check results and extract test information."""
@@ -25,6 +36,9 @@ class TestAnalyzer:
             'timestamp': datetime.now().isoformat(),
             'completed': pr_data.get('completed', False),
             'timeout': pr_data.get('timeout', False),
+            'early_verdict': pr_data.get('early_verdict', False),
+            'killed_by': pr_data.get('killed_by'),
+            'cancelled_runs': pr_data.get('cancelled_runs', []),
             'overall_status': None,
             'checks': [],
             'test_failures': [],
@@ -46,6 +60,8 @@ class TestAnalyzer:
         
         # Process individual checks
         checks = pr_data.get('checks', [])
+        # Failures already analyzed while CI was still running (IncrementalAnalysis).
+        precomputed = (pr_data.get('incremental_analysis') or {}).get('failures') or {}
         
         try:
             # Normalize all checks using the shared utility
@@ -58,6 +74,7 @@ class TestAnalyzer:
                 checks=checks,
                 repo_path=repo_path_str,
                 repo=repo,
+                precomputed=precomputed,
             )
             
         except Exception as e:
@@ -111,9 +128,13 @@ class TestAnalyzer:
         checks: List[Dict[str, Any]],
         repo_path: Optional[str],
         repo: Optional[str],
+        precomputed: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Inspect failed test checks and prefer junit artifacts over log scraping.
+
+        ``precomputed`` maps ``failure_key`` to details that were already
+        gathered; those checks are not fetched again.
         """
         failures: List[Dict[str, Any]] = []
         for check in checks:
@@ -123,36 +144,125 @@ class TestAnalyzer:
             if not CheckProcessor.is_test_check(normalized):
                 continue
 
-            failure_detail: Dict[str, Any] = {
-                'check_name': normalized.get('name'),
-                'details': normalized.get('description', 'No details available'),
-            }
+            key = self.failure_key(check)
+            if precomputed and key in precomputed:
+                restored = self._with_cached_tests(precomputed[key])
+                if restored is not None:
+                    failures.append(restored)
+                    continue
+            failures.append(self.analyze_failed_check(check, repo_path, repo))
+        return failures
 
-            artifact_detail = self._extract_test_results_from_artifacts(
-                check=check,
-                repo_path=repo_path,
-                repo=repo,
-            )
-            if artifact_detail:
-                failure_detail.update(artifact_detail)
-            elif repo_path:
-                try:
+    @staticmethod
+    def _with_cached_tests(failure: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Restore the per-test ``tests`` that incremental state leaves out.
+
+        They are read back from the artifact cache, so the saved results match
+        a full analysis; returns None (analyze the check again) when an
+        artifact is no longer cached.
+        """
+        artifacts = failure.get('junit_artifacts')
+        if not artifacts or 'tests' in failure:
+            return failure
+        cache = get_artifact_cache()
+        tests: List[Dict[str, Any]] = []
+        for artifact in artifacts:
+            parsed = cache.parsed(artifact['cache_key']) if artifact.get('cache_key') else None
+            if parsed is None:
+                return None
+            tests.extend(parsed)
+        return {**failure, 'tests': tests}
+
+    @staticmethod
+    def failure_key(check: Dict[str, Any]) -> str:
+        """Identify a raw check across snapshots by its name and details link."""
+        return f"{check.get('name', 'Unknown')}|{check.get('link') or check.get('url') or ''}"
+
+    def analyze_failed_check(
+        self,
+        check: Dict[str, Any],
+        repo_path: Optional[str],
+        repo: Optional[str],
+    ) -> Dict[str, Any]:
+        """Gather the failure details of one failed test check."""
+        normalized = CheckProcessor.normalize_check(check)
+        failure_detail: Dict[str, Any] = {
+            'check_name': normalized.get('name'),
+            'details': normalized.get('description', 'No details available'),
+        }
+
+        # Cheapest source first: annotations and output on the check run, then
+        # junit artifacts, then scraping the failed-job log.
+        structured_detail = self._extract_test_results_from_check_run(
+            check=check,
+            repo_path=repo_path,
+            repo=repo,
+        ) or self._extract_test_results_from_artifacts(
+            check=check,
+            repo_path=repo_path,
+            repo=repo,
+        )
+        if structured_detail:
+            failure_detail.update(structured_detail)
+        elif repo_path:
+            try:
+                with self._run_lock(self._run_key(check, repo)):
                     log_details = CheckProcessor.get_failed_check_details(
                         normalized,
                         repo_path,
                         repo,
+                        run_logs=self._logs_by_run,
                     )
-                    failure_detail.update(log_details)
-                except Exception:
-                    failure_detail.setdefault(
-                        'failure_reason',
-                        'due to unknown reasons (failed to fetch logs)',
-                    )
+                failure_detail.update(log_details)
+            except Exception:
+                failure_detail.setdefault(
+                    'failure_reason',
+                    'due to unknown reasons (failed to fetch logs)',
+                )
 
-            failure_detail.setdefault('failed_tests', [])
-            failure_detail.setdefault('failure_reason', 'due to unknown reasons')
-            failures.append(failure_detail)
-        return failures
+        failure_detail.setdefault('failed_tests', [])
+        failure_detail.setdefault('failure_reason', 'due to unknown reasons')
+        return failure_detail
+
+    def _extract_test_results_from_check_run(
+        self,
+        check: Dict[str, Any],
+        repo_path: Optional[str],
+        repo: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read failing tests from the check run's annotations or output summary.
+
+        Returns None when neither names a failing test, when the annotations
+        may have been cut off at GitHub's cap, or when they cannot be fetched,
+        so the caller falls back to artifacts and logs.
+        """
+        if not repo_path:
+            return None
+        try:
+            annotations = CheckProcessor.get_check_run_annotations(check, repo_path, repo)
+            failing_tests = annotation_utils.failed_tests_from_annotations(annotations)
+            output = CheckProcessor.get_check_run_output(check, repo_path, repo)
+            source = 'annotations'
+            if failing_tests and not annotation_utils.annotations_are_complete(
+                annotations, failing_tests, output
+            ):
+                return None
+            if not failing_tests:
+                failing_tests = annotation_utils.failed_tests_from_output(output)
+                source = 'check_run_output'
+        except Exception:
+            return None
+        if not failing_tests:
+            return None
+
+        return {
+            'failure_reason': f"due to {len(failing_tests)} failed test case(s)",
+            'failed_tests': failing_tests,
+            'failure_source': source,
+            'log_available': False,
+        }
 
     def _extract_test_results_from_artifacts(
         self,
@@ -162,125 +272,267 @@ class TestAnalyzer:
     ) -> Optional[Dict[str, Any]]:
         """
         Attempt to gather structured junit outcomes from workflow artifacts.
+
+        A run's artifacts are downloaded and parsed once; matrix jobs of the
+        same run then pick the artifacts that belong to them.
         """
         if not repo_path:
             return None
 
-        with tempfile.TemporaryDirectory(prefix="test-analyzer-artifacts-") as temp_dir:
+        run_artifacts = self._run_junit_artifacts(check, repo_path, repo)
+        if not run_artifacts:
+            return None
+
+        artifacts = self._artifacts_for_check(check.get('name', ''), run_artifacts)
+        all_tests = [test for artifact in artifacts for test in artifact['tests']]
+        if not all_tests:
+            return None
+
+        tests_summary = self._summarize_tests(all_tests)
+        failing_tests = [
+            test['id']
+            for test in all_tests
+            if test['status'] in {'failed', 'error'}
+        ]
+
+        failure_reason = (
+            f"due to {len(failing_tests)} failed test case(s)"
+            if failing_tests
+            else "due to test results reported in junit artifacts"
+        )
+
+        return {
+            'failure_reason': failure_reason,
+            'failed_tests': failing_tests,
+            'tests': all_tests,
+            'tests_summary': tests_summary,
+            'junit_artifacts': [
+                {
+                    field: artifact[field]
+                    for field in ('artifact', 'files', 'cache_key')
+                    if artifact.get(field) is not None
+                }
+                for artifact in artifacts
+            ],
+            'truncated_files': sorted(
+                {test['source_file'] for test in all_tests if test.get('truncated')}
+            ),
+            'log_available': False,
+        }
+
+    def _run_junit_artifacts(
+        self,
+        check: Dict[str, Any],
+        repo_path: str,
+        repo: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Download and parse a run's junit artifacts, once per run id.
+
+        A matrix job that finished after the memo was taken has no artifact
+        in it yet, so the run's artifacts are listed again; archives already
+        downloaded and parsed come from the artifact cache.
+        """
+        run_key = self._run_key(check, repo)
+        with self._run_lock(run_key):
+            memo = self._junit_by_run.get(run_key)
+            if memo is not None and (
+                not matrix_values(check.get('name'))
+                or self._artifacts_for_check(check.get('name', ''), memo)
+            ):
+                return memo
+
+            run_artifacts: List[Dict[str, Any]] = []
             try:
+                # Archives land in the artifact cache, so retries skip the download.
                 downloads = CheckProcessor.download_check_junit_artifacts(
                     check,
                     repo_path=repo_path,
                     repo=repo,
-                    base_temp_dir=Path(temp_dir),
                 )
             except Exception:
-                return None
-
-            if not downloads:
-                return None
+                # Not memoized: a later check of the run may try again.
+                return []
 
-            all_tests: List[Dict[str, Any]] = []
-            artifact_sources: List[Dict[str, Any]] = []
-
-            for download in downloads:
-                artifact_sources.append(
+            for download in downloads or []:
+                tests = self._parse_artifact_reports(download)
+                if tests is None:
+                    continue
+                run_artifacts.append(
                     {
                         'artifact': download.name,
-                        'files': [path.name for path in download.junit_paths],
+                        'files': download.junit_files,
+                        'tests': tests,
+                        'cache_key': download.cache_key,
                     }
                 )
-                for junit_path in download.junit_paths:
-                    all_tests.extend(
-                        self._parse_junit_file(junit_path, artifact_name=download.name)
+
+            self._junit_by_run[run_key] = run_artifacts
+            return run_artifacts
+
+    def _parse_artifact_reports(self, download: ArtifactDownload) -> Optional[List[Dict[str, Any]]]:
+        """Parse an artifact's junit reports, reusing results cached with the archive."""
+        cache = get_artifact_cache() if download.cache_key else None
+        if cache is not None:
+            cached = cache.parsed(download.cache_key)
+            if cached is not None:
+                return cached
+        tests: List[Dict[str, Any]] = []
+        try:
+            for file_name, source in download.iter_junit_reports():
+                try:
+                    tests.extend(
+                        self._parse_junit_file(
+                            source,
+                            artifact_name=download.name,
+                            source_file=file_name,
+                        )
                     )
+                except ZIP_MEMBER_ERRORS as exc:
+                    # Keep the reports read from earlier members.
+                    print(f"⚠️ Skipping junit report {file_name} of '{download.name}': {exc}")
+        except (OSError, zipfile.BadZipFile):
+            return None
+        if cache is not None:
+            try:
+                cache.store_parsed(download.cache_key, tests)
+            except OSError:
+                pass
+        return tests
 
-            if not all_tests:
-                return None
+    @staticmethod
+    def _artifacts_for_check(
+        check_name: str,
+        run_artifacts: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the artifacts of a matrix job, e.g. ``junit-3.11`` for ``pytest (3.11)``.
 
-            tests_summary = self._summarize_tests(all_tests)
-            failing_tests = [
-                test['id']
-                for test in all_tests
-                if test['status'] in {'failed', 'error'}
-            ]
-
-            failure_reason = (
-                f"due to {len(failing_tests)} failed test case(s)"
-                if failing_tests
-                else "due to test results reported in junit artifacts"
-            )
+        Without a matrix suffix every artifact of the run is attributed to the
+        check; a matrix job with no artifact of its own gets none, never a
+        sibling's.
+        """
+        values = matrix_values(check_name)
+        if not values:
+            return run_artifacts
+        return [
+            artifact
+            for artifact in run_artifacts
+            if all(value in artifact['artifact'].lower() for value in values)
+        ]
 
-            return {
-                'failure_reason': failure_reason,
-                'failed_tests': failing_tests,
-                'tests': all_tests,
-                'tests_summary': tests_summary,
-                'junit_artifacts': artifact_sources,
-                'log_available': False,
-            }
+    @staticmethod
+    def _run_key(check: Dict[str, Any], repo: Optional[str]) -> str:
+        run_id = CheckProcessor.get_check_run_id(check)
+        if not run_id:
+            return f"check:{TestAnalyzer.failure_key(check)}"
+        return f"{repo or ''}#{run_id}"
+
+    @contextmanager
+    def _run_lock(self, run_key: str) -> Iterator[None]:
+        """Serialize work on one run so concurrent checks share a single fetch."""
+        with self._locks_guard:
+            lock = self._run_locks.setdefault(run_key, threading.Lock())
+        with lock:
+            yield
 
     def _parse_junit_file(
         self,
-        junit_path: Path,
+        junit_path: Union[Path, IO[bytes]],
         *,
         artifact_name: str,
+        source_file: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Return per-test outcomes from a junit XML document."""
-        try:
-            tree = ElementTree.parse(junit_path)
-        except (ElementTree.ParseError, OSError):
-            return []
+        """
+        Return per-test outcomes from a junit XML file or stream.
 
-        root = tree.getroot()
+        The document is streamed with ``iterparse`` and every testcase is
+        discarded once read, so memory does not grow with the suite. Failed,
+        errored and skipped cases keep full detail; passed cases are folded
+        into one ``passed`` entry with a ``count`` and their durations. A file
+        cut off partway (e.g. a cancelled upload) keeps the testcases read
+        before the break, each marked ``truncated``.
+        """
+        file_name = source_file or getattr(junit_path, 'name', '')
         tests: List[Dict[str, Any]] = []
-        for testcase in root.iter():
-            if self._strip_xml_namespace(testcase.tag) != "testcase":
-                continue
+        passed = {'count': 0, 'duration': 0.0, 'max_duration': 0.0}
+        stack: List[ElementTree.Element] = []
+        truncated = False
+        try:
+            for event, element in ElementTree.iterparse(junit_path, events=('start', 'end')):
+                if event == 'start':
+                    stack.append(element)
+                    continue
+                stack.pop()
+                if self._strip_xml_namespace(element.tag) != 'testcase':
+                    continue
+
+                test = self._testcase_outcome(element)
+                if test['status'] == 'passed':
+                    duration = _as_seconds(test['duration'])
+                    passed['count'] += 1
+                    passed['duration'] += duration
+                    passed['max_duration'] = max(passed['max_duration'], duration)
+                else:
+                    test.update(source_artifact=artifact_name, source_file=file_name)
+                    tests.append(test)
 
-            name = testcase.get('name') or 'unknown'
-            classname = testcase.get('classname') or ''
-            duration = testcase.get('time')
-
-            status = 'passed'
-            message: Optional[str] = None
-            output: Optional[str] = None
-
-            for child in list(testcase):
-                tag = self._strip_xml_namespace(child.tag)
-                child_text = (child.text or '').strip() or None
-                child_message = child.get('message') or child_text
-                if tag == 'failure':
-                    status = 'failed'
-                    message = child_message
-                    output = child_text
-                    break
-                if tag == 'error':
-                    status = 'error'
-                    message = child_message
-                    output = child_text
-                    break
-                if tag == 'skipped':
-                    status = 'skipped'
-                    message = child_message
-                    output = child_text
-                    break
+                # Drop the finished testcase so the tree never holds more than one.
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+        except ElementTree.ParseError as exc:
+            truncated = True
+            print(f"⚠️ Junit report {file_name} in {artifact_name} is truncated ({exc})")
+        except OSError:
+            return []
 
+        if passed['count']:
             tests.append(
                 {
-                    'id': self._format_test_identifier(classname, name),
-                    'name': name,
-                    'classname': classname,
-                    'status': status,
-                    'message': message,
-                    'output': output,
-                    'duration': duration,
+                    'id': f"{file_name} ({passed['count']} passed)",
+                    'status': 'passed',
+                    'count': passed['count'],
+                    'duration': round(passed['duration'], 6),
+                    'max_duration': round(passed['max_duration'], 6),
                     'source_artifact': artifact_name,
-                    'source_file': junit_path.name,
+                    'source_file': file_name,
                 }
             )
+        if truncated:
+            for test in tests:
+                test['truncated'] = True
         return tests
 
+    def _testcase_outcome(self, testcase: ElementTree.Element) -> Dict[str, Any]:
+        """Read the outcome of one ``<testcase>`` element."""
+        name = testcase.get('name') or 'unknown'
+        classname = testcase.get('classname') or ''
+
+        status = 'passed'
+        message: Optional[str] = None
+        output: Optional[str] = None
+
+        for child in list(testcase):
+            tag = self._strip_xml_namespace(child.tag)
+            if tag not in {'failure', 'error', 'skipped'}:
+                continue
+            child_text = (child.text or '').strip() or None
+            status = {'failure': 'failed', 'error': 'error', 'skipped': 'skipped'}[tag]
+            message = child.get('message') or child_text
+            output = child_text
+            break
+
+        return {
+            'id': self._format_test_identifier(classname, name),
+            'name': name,
+            'classname': classname,
+            'status': status,
+            'message': message,
+            'output': output,
+            'duration': testcase.get('time'),
+        }
+
     @staticmethod
     def _strip_xml_namespace(tag: str) -> str:
         """Remove XML namespace from a tag name if present."""
@@ -297,9 +549,9 @@ class TestAnalyzer:
 
     @staticmethod
     def _summarize_tests(tests: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Return aggregate counts for junit test outcomes."""
+        """Return aggregate counts for junit test outcomes (folded entries carry ``count``)."""
         summary = {
-            'total': len(tests),
+            'total': 0,
             'passed': 0,
             'failed': 0,
             'errors': 0,
@@ -307,12 +559,21 @@ class TestAnalyzer:
         }
         for test in tests:
             status = test.get('status')
+            count = test.get('count', 1)
+            summary['total'] += count
             if status == 'passed':
-                summary['passed'] += 1
+                summary['passed'] += count
             elif status == 'failed':
-                summary['failed'] += 1
+                summary['failed'] += count
             elif status == 'error':
-                summary['errors'] += 1
+                summary['errors'] += count
             elif status == 'skipped':
-                summary['skipped'] += 1
+                summary['skipped'] += count
         return summary
+
+
+def _as_seconds(value: Optional[str]) -> float:
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
@@ -0,0 +1,158 @@
+"""
+Parsing and routing helpers for GitHub check webhooks.
+
+The receiver service in ``temporal.workflows.webhook_receiver`` uses these to
+turn ``check_suite``/``check_run``/``workflow_run`` deliveries into signals for
+the mutation workflows that are waiting on the matching branch or PR.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+SUPPORTED_EVENTS = ("check_suite", "check_run", "workflow_run")
+
+
+@dataclass(frozen=True)
+class CheckWebhookEvent:
+    """The routing-relevant subset of a check-related webhook delivery."""
+
+    event: str
+    action: str
+    repo: str
+    branch: Optional[str] = None
+    pr_numbers: Tuple[str, ...] = field(default_factory=tuple)
+    head_sha: Optional[str] = None
+    name: Optional[str] = None
+    status: Optional[str] = None
+    conclusion: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        """True when the delivery reports a finished suite, run or workflow."""
+        return self.action == "completed" or self.status == "completed"
+
+    def to_signal_payload(self) -> Dict[str, Any]:
+        """Return a JSON-serializable payload for the workflow signal."""
+        payload = asdict(self)
+        payload["pr_numbers"] = list(self.pr_numbers)
+        return payload
+
+
+def verify_signature(secret: str, body: bytes, signature_header: Optional[str]) -> bool:
+    """Validate an ``X-Hub-Signature-256`` header against the shared secret."""
+    if not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len("sha256="):])
+
+
+def infer_event_name(payload: Mapping[str, Any]) -> Optional[str]:
+    """Guess the ``X-GitHub-Event`` name of a recorded payload from its keys."""
+    for event_name in SUPPORTED_EVENTS:
+        if isinstance(payload.get(event_name), Mapping):
+            return event_name
+    return None
+
+
+def parse_check_event(
+    event_name: str,
+    payload: Mapping[str, Any],
+) -> Optional[CheckWebhookEvent]:
+    """Extract routing information from a webhook payload, or None if unsupported."""
+    if event_name not in SUPPORTED_EVENTS:
+        return None
+    subject = payload.get(event_name)
+    repo = (payload.get("repository") or {}).get("full_name")
+    if not isinstance(subject, Mapping) or not repo:
+        return None
+
+    if event_name == "check_run":
+        branch = (subject.get("check_suite") or {}).get("head_branch")
+        name = subject.get("name")
+    elif event_name == "check_suite":
+        branch = subject.get("head_branch")
+        name = (subject.get("app") or {}).get("name")
+    else:
+        branch = subject.get("head_branch")
+        name = subject.get("name")
+
+    pr_numbers = tuple(
+        str(pull_request["number"])
+        for pull_request in subject.get("pull_requests") or []
+        if isinstance(pull_request, Mapping) and pull_request.get("number") is not None
+    )
+    return CheckWebhookEvent(
+        event=event_name,
+        action=str(payload.get("action") or ""),
+        repo=repo,
+        branch=branch,
+        pr_numbers=pr_numbers,
+        head_sha=subject.get("head_sha"),
+        name=name,
+        status=subject.get("status"),
+        conclusion=subject.get("conclusion"),
+    )
+
+
+def watch_keys(
+    repo: str,
+    *,
+    branch: Optional[str] = None,
+    pr_number: Optional[str] = None,
+) -> List[str]:
+    """Return the index keys under which a waiting workflow can be found."""
+    repo_key = repo.lower()
+    keys: List[str] = []
+    if pr_number:
+        keys.append(f"{repo_key}#{pr_number}")
+    if branch:
+        keys.append(f"{repo_key}@{branch}")
+    return keys
+
+
+class WatchIndex:
+    """Maps repo/branch and repo/PR keys to the ids of waiting workflows."""
+
+    def __init__(self) -> None:
+        self._workflows_by_key: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len({wf for ids in self._workflows_by_key.values() for wf in ids})
+
+    def add(
+        self,
+        workflow_id: str,
+        repo: str,
+        *,
+        branch: Optional[str] = None,
+        pr_number: Optional[str] = None,
+    ) -> None:
+        for key in watch_keys(repo, branch=branch, pr_number=pr_number):
+            self._workflows_by_key.setdefault(key, set()).add(workflow_id)
+
+    def replace(self, watches: Iterable[Mapping[str, Any]]) -> None:
+        """Rebuild the index from ``{'workflow_id', 'repo', 'branch', 'pr_number'}`` rows."""
+        self._workflows_by_key = {}
+        for watch in watches:
+            if not watch.get("workflow_id") or not watch.get("repo"):
+                continue
+            self.add(
+                watch["workflow_id"],
+                watch["repo"],
+                branch=watch.get("branch"),
+                pr_number=watch.get("pr_number"),
+            )
+
+    def match(self, event: CheckWebhookEvent) -> List[str]:
+        """Return workflow ids waiting on the event's PRs or branch."""
+        matched: Set[str] = set()
+        keys = watch_keys(event.repo, branch=event.branch)
+        for pr_number in event.pr_numbers:
+            keys.extend(watch_keys(event.repo, pr_number=pr_number))
+        for key in keys:
+            matched.update(self._workflows_by_key.get(key, ()))
+        return sorted(matched)
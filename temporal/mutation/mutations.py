@@ -121,3 +121,15 @@ def get_mutation(repo_name: str, mutation_id: Optional[str] = None) -> Dict[str,
         f"Unknown mutation '{mutation_id}' for repository '{repo_name}'. "
         f"Available mutations: {available_mutations or 'none'}"
     )
+
+
+def list_mutations(repo_name: str) -> List[Dict[str, object]]:
+    """Return every mutation configured for a repository."""
+    mutations = MUTATIONS.get(repo_name)
+    if not mutations:
+        available = ", ".join(sorted(MUTATIONS.keys()))
+        raise ValueError(
+            f"No mutations configured for repository '{repo_name}'. "
+            f"Available repositories: {available or 'none'}"
+        )
+    return list(mutations)
@@ -40,10 +40,32 @@ _EXPORTS: Dict[str, Tuple[str, str]] = {
         "temporal.workflows.activities",
         "create_pull_request",
     ),
+    "poll_checks": (
+        "temporal.workflows.activities",
+        "poll_checks",
+    ),
+    "prepare_campaign_clone": (
+        "temporal.workflows.activities",
+        "prepare_campaign_clone",
+    ),
+    "stage_mutant": (
+        "temporal.workflows.activities",
+        "stage_mutant",
+    ),
     "wait_for_checks": (
         "temporal.workflows.activities",
         "wait_for_checks",
     ),
+    "wait_for_checks_async": (
+        "temporal.workflows.activities",
+        "wait_for_checks_async",
+    ),
+    # Campaign data structures
+    "CampaignResult": ("temporal.workflows.campaign", "CampaignResult"),
+    "MutationCampaignParams": (
+        "temporal.workflows.campaign",
+        "MutationCampaignParams",
+    ),
     # Cleanup utilities
     "CleanupManager": ("temporal.workflows.cleanup", "CleanupManager"),
     # Mutation workflow data structures
@@ -62,6 +84,10 @@ _EXPORTS: Dict[str, Tuple[str, str]] = {
     # Persistence & summary helpers
     "persist_flow_result": ("temporal.workflows.storage", "persist_flow_result"),
     "render_summary_lines": ("temporal.workflows.summary", "render_summary_lines"),
+    "render_campaign_summary_lines": (
+        "temporal.workflows.summary",
+        "render_campaign_summary_lines",
+    ),
     # Temporal worker utilities
     "MutationWorkflowParams": (
         "temporal.workflows.temporal_worker",
@@ -75,7 +101,24 @@ _EXPORTS: Dict[str, Tuple[str, str]] = {
         "temporal.workflows.temporal_worker",
         "RunSingleMutationWorkflow",
     ),
+    "RunMutationCampaignWorkflow": (
+        "temporal.workflows.temporal_worker",
+        "RunMutationCampaignWorkflow",
+    ),
     "run_worker": ("temporal.workflows.temporal_worker", "run_worker"),
+    # Payload codecs and claim-check storage
+    "ClaimCheckCodec": ("temporal.workflows.codecs", "ClaimCheckCodec"),
+    "CompressionCodec": ("temporal.workflows.codecs", "CompressionCodec"),
+    "build_data_converter": ("temporal.workflows.codecs", "build_data_converter"),
+    "LocalBlobStore": ("temporal.workflows.blob_store", "LocalBlobStore"),
+    "S3BlobStore": ("temporal.workflows.blob_store", "S3BlobStore"),
+    "open_blob_store": ("temporal.workflows.blob_store", "open_blob_store"),
+    # Worker task queues and concurrency
+    "WorkerOptions": ("temporal.workflows.worker_config", "WorkerOptions"),
+    "activity_task_queue": (
+        "temporal.workflows.worker_config",
+        "activity_task_queue",
+    ),
 }
 
 __all__ = list(_EXPORTS.keys())
@@ -7,10 +7,16 @@ them small and idempotent makes them suitable for reuse as Temporal activities.
 """
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from temporal.workflows.cleanup import CleanupManager
+from temporal.github.check_poller import get_shared_poller
+from temporal.github.ci_durations import CIDurationModel
+from temporal.github.client import format_rate_limit_budget, rate_limit_budget
+from temporal.github.incremental_analysis import IncrementalAnalysis
 from temporal.github.pr_manager import PRManager
 from temporal.github.repo_manager import RepoManager
 from temporal.github.test_analyzer import TestAnalyzer
@@ -18,10 +24,43 @@ from mutators.mutator import Mutator
 from models.mutation import MutationSpec
 
 
-def clone_repository(repo_url: str, base_dir: Optional[str] = None) -> Path:
-    """Clone the target repository and return the local path."""
+def clone_repository(
+    repo_url: str,
+    base_dir: Optional[str] = None,
+    *,
+    source_path: Optional[str] = None,
+    revision: Optional[str] = None,
+    dest_name: Optional[str] = None,
+) -> Path:
+    """
+    Clone the target repository and return the local path.
+
+    With ``source_path`` the clone is a cheap local copy of an existing
+    checkout (a campaign's shared clone) pinned to ``revision``.
+    """
     repo_manager = RepoManager(base_dir=base_dir or "~/Repos")
-    return repo_manager.clone_repo(repo_url)
+    if source_path:
+        return repo_manager.clone_from_local(
+            Path(source_path),
+            repo_url,
+            dest_name or Path(source_path).name,
+            revision=revision,
+        )
+    return repo_manager.clone_repo(repo_url, dest_name=dest_name)
+
+
+def prepare_campaign_clone(
+    repo_url: str,
+    base_dir: Optional[str] = None,
+    *,
+    dest_name: Optional[str] = None,
+) -> Dict[str, str]:
+    """Clone the repository once for a campaign and record its baseline commit."""
+    repo_path = clone_repository(repo_url, base_dir, dest_name=dest_name)
+    return {
+        "repo_path": str(repo_path),
+        "baseline_sha": RepoManager(base_dir=base_dir or "~/Repos").head_commit(repo_path),
+    }
 
 
 def create_branch(repo_path: Path, branch_name: str) -> None:
@@ -49,6 +88,46 @@ def commit_and_push_changes(repo_path: Path, branch_name: str, commit_message: s
     repo_manager.push_branch(repo_path, branch_name)
 
 
+def stage_mutant(
+    repo_url: str,
+    branch_name: str,
+    mutation_config: Mapping[str, Any],
+    commit_message: str,
+    *,
+    base_dir: Optional[str] = None,
+    source_path: Optional[str] = None,
+    revision: Optional[str] = None,
+    dest_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Clone, branch, mutate, commit and push in one step.
+
+    Returns the checkout path, whether the mutation changed anything and the
+    pushed commit. A failure removes the checkout before re-raising, since
+    the caller never learns its path.
+    """
+    repo_path = clone_repository(
+        repo_url,
+        base_dir,
+        source_path=source_path,
+        revision=revision,
+        dest_name=dest_name,
+    )
+    try:
+        create_branch(repo_path, branch_name)
+        mutation_applied = apply_mutation(repo_path, mutation_config)
+        commit_and_push_changes(repo_path, branch_name, commit_message)
+        commit_sha = RepoManager(base_dir=base_dir or "~/Repos").head_commit(repo_path)
+    except Exception:
+        RepoManager(base_dir=base_dir or "~/Repos").cleanup_repo(repo_path)
+        raise
+    return {
+        "repo_path": str(repo_path),
+        "mutation_applied": mutation_applied,
+        "commit_sha": commit_sha,
+    }
+
+
 def create_pull_request(
     repo_path: Path,
     title: str,
@@ -68,10 +147,189 @@ def wait_for_checks(
     *,
     timeout_seconds: int = 600,
     repo_id: Optional[str] = None,
+    no_checks_timeout_seconds: Optional[int] = None,
+    early_verdict: bool = False,
+    output_dir: Optional[Path] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    analysis_deadline: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Poll GitHub checks for the pull request until completion or timeout.
+
+    Polling follows the repo's CI duration history, and the finished run is
+    added to that history. With ``early_verdict`` the wait ends on the first
+    failed test check. Failed test checks are analyzed while the others are
+    still running; ``on_progress`` receives the partial result after each poll.
+    Analyses still running at ``analysis_deadline`` are left to the final
+    analysis step.
+    """
+    durations = CIDurationModel()
+    pr_manager = PRManager(repo_path)
+    incremental = IncrementalAnalysis(
+        TestAnalyzer(output_dir=output_dir, repo_path=repo_path),
+        repo_path=str(repo_path),
+        repo=repo_id,
+    )
+
+    def observe(snapshot: Dict[str, Any]) -> None:
+        incremental.observe(snapshot)
+        if on_progress is not None:
+            on_progress(incremental.progress())
+
+    pr_results = pr_manager.wait_for_checks(
+        pr_number,
+        timeout_seconds=timeout_seconds,
+        repo=repo_id,
+        poller=get_shared_poller(repo_id),
+        schedule=durations.poll_schedule(repo_id, no_checks_timeout_seconds),
+        early_verdict=early_verdict,
+        on_snapshot=observe,
+    )
+    pr_results['incremental_analysis'] = incremental.finish(_seconds_until(analysis_deadline))
+    _report_rate_limit(pr_results, repo_id)
+    if repo_id:
+        try:
+            durations.record(repo_id, pr_results)
+        except OSError as exc:
+            print(f"⚠️  Could not record CI duration for {repo_id}: {exc}")
+    return pr_results
+
+
+async def wait_for_checks_async(
+    repo_path: Path,
+    pr_number: str,
+    *,
+    timeout_seconds: int = 600,
+    repo_id: Optional[str] = None,
+    no_checks_timeout_seconds: Optional[int] = None,
+    early_verdict: bool = False,
+    output_dir: Optional[Path] = None,
+    resume: Optional[Mapping[str, Any]] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    analysis_deadline: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Async ``wait_for_checks`` that holds no thread between polls.
+
+    ``on_progress`` receives the partial result together with the wait's
+    position and the incremental analysis state; passing the last one back as
+    ``resume`` picks a retried wait up where it left off. Analyses still
+    running at ``analysis_deadline`` are left to the final analysis step.
+    """
+    resume = resume or {}
+    durations = CIDurationModel()
+    pr_manager = PRManager(repo_path)
+    incremental = IncrementalAnalysis(
+        TestAnalyzer(output_dir=output_dir, repo_path=repo_path),
+        repo_path=str(repo_path),
+        repo=repo_id,
+        state=resume.get('incremental_analysis'),
+    )
+    position = {
+        'elapsed_seconds': resume.get('elapsed_seconds') or 0,
+        'checks_first_seen_seconds': resume.get('checks_first_seen_seconds'),
+    }
+
+    def report(wait_position: Optional[Dict[str, Any]] = None) -> None:
+        position.update(wait_position or {})
+        if on_progress is not None:
+            progress = incremental.progress()
+            on_progress({**progress, **position, 'incremental_analysis': incremental.state()})
+
+    def observe(snapshot: Dict[str, Any]) -> None:
+        incremental.observe(snapshot)
+        report()
+
+    schedule = await asyncio.to_thread(
+        durations.poll_schedule, repo_id, no_checks_timeout_seconds,
+    )
+    pr_results = await pr_manager.wait_for_checks_async(
+        pr_number,
+        timeout_seconds=timeout_seconds,
+        repo=repo_id,
+        poller=get_shared_poller(repo_id),
+        schedule=schedule,
+        early_verdict=early_verdict,
+        on_snapshot=observe,
+        on_heartbeat=report,
+        resume=position,
+    )
+    pr_results['incremental_analysis'] = await asyncio.to_thread(
+        incremental.finish, _seconds_until(analysis_deadline),
+    )
+    _report_rate_limit(pr_results, repo_id)
+    if repo_id:
+        try:
+            await asyncio.to_thread(durations.record, repo_id, pr_results)
+        except OSError as exc:
+            print(f"⚠️  Could not record CI duration for {repo_id}: {exc}")
+    return pr_results
+
+
+def poll_checks(
+    repo_path: Path,
+    pr_number: str,
+    *,
+    elapsed_seconds: int = 0,
+    repo_id: Optional[str] = None,
+    no_checks_timeout_seconds: Optional[int] = None,
+    early_verdict: bool = False,
+    incremental_state: Optional[Mapping[str, Any]] = None,
+    output_dir: Optional[Path] = None,
+    analysis_deadline: Optional[datetime] = None,
 ) -> Dict[str, Any]:
-    """Poll GitHub checks for the pull request until completion or timeout."""
+    """
+    Fetch the pull request checks once and report whether they finished.
+
+    Newly failed test checks are analyzed before returning, until
+    ``analysis_deadline``; the updated ``incremental_state`` comes back as
+    ``pr_results['incremental_analysis']`` for the next poll, which retries
+    the checks whose analysis did not finish in time.
+    """
+    pr_manager = PRManager(repo_path)
+    pr_results = pr_manager.poll_checks(
+        pr_number,
+        repo=repo_id,
+        elapsed_time=elapsed_seconds,
+        no_checks_cutoff=CIDurationModel().no_checks_cutoff(repo_id, no_checks_timeout_seconds),
+        early_verdict=early_verdict,
+    )
+    incremental = IncrementalAnalysis(
+        TestAnalyzer(output_dir=output_dir, repo_path=repo_path),
+        repo_path=str(repo_path),
+        repo=repo_id,
+        state=incremental_state,
+    )
+    incremental.observe(pr_results)
+    pr_results['incremental_analysis'] = incremental.finish(_seconds_until(analysis_deadline))
+    _report_rate_limit(pr_results, repo_id)
+    return pr_results
+
+
+def _report_rate_limit(pr_results: Dict[str, Any], repo_id: Optional[str]) -> None:
+    """Log the remaining GitHub budget and return it with the poll result."""
+    budget = rate_limit_budget(repo_id)
+    if not budget:
+        return
+    pr_results['rate_limit'] = budget
+    print(f"📊 GitHub rate-limit budget:\n{format_rate_limit_budget(budget)}")
+
+
+def _seconds_until(deadline: Optional[datetime]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max((deadline - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def cancel_workflow_runs(
+    repo_path: Path,
+    branch_name: str,
+    *,
+    repo_id: Optional[str] = None,
+) -> List[str]:
+    """Cancel the CI runs still going for the branch and return their ids."""
     pr_manager = PRManager(repo_path)
-    return pr_manager.wait_for_checks(pr_number, timeout_seconds=timeout_seconds, repo=repo_id)
+    return pr_manager.cancel_workflow_runs(branch_name, repo=repo_id)
 
 
 def analyze_test_results(
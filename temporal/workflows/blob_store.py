@@ -0,0 +1,165 @@
+"""
+Content-addressed blob storage for payloads too large to carry in history.
+
+The claim-check codec (``temporal.workflows.codecs``) writes large Temporal
+payloads here and leaves only their SHA-256 in the workflow history. A blob
+is written once per content and never changes, so stores need no locking and
+a retried write is a no-op.
+
+``LocalBlobStore`` keeps blobs under a directory, which must be shared (e.g. a
+network mount) when workers, the starter or the webhook receiver run on
+several hosts; ``S3BlobStore`` works with
+any S3-compatible service and needs ``pip install boto3``.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_BLOB_DIR_NAME = "blob_store"
+# Selects the store when no --blob-store is given: a directory or s3://bucket/prefix.
+BLOB_STORE_ENV = "MUTATION_BLOB_STORE"
+
+
+def blob_key(data: bytes) -> str:
+    """Content hash used as the blob's key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Interface of the blob stores: immutable blobs addressed by content hash."""
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """Where the blobs live, as given to ``open_blob_store``."""
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (if not already present) and return its key."""
+        key = blob_key(data)
+        if not self.exists(key):
+            self._write(key, data)
+        return key
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Return the blob stored under ``key``; raise KeyError if it is missing."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether a blob is stored under ``key``."""
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Store ``data`` under ``key`` so that readers never see a partial blob."""
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files ``<root>/<key[:2]>/<key>``, written atomically."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else Path.cwd() / DEFAULT_BLOB_DIR_NAME
+
+    @property
+    def location(self) -> str:
+        return str(self.root)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.path_for(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+
+
+class S3BlobStore(BlobStore):
+    """Blobs as objects ``<prefix><key>`` in an S3-compatible bucket."""
+
+    def __init__(self, bucket: str, prefix: str = "", client: Any = None):
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        self._client = client
+
+    @property
+    def location(self) -> str:
+        return f"s3://{self.bucket}/{self.prefix}"
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError as exc:
+                raise RuntimeError("S3 blob stores require boto3: pip install boto3") from exc
+            # Endpoint and credentials come from the usual AWS_* settings, so
+            # MinIO or other S3-compatible services work as well.
+            self._client = boto3.client("s3")
+        return self._client
+
+    def get(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception as exc:
+            if _is_not_found(exc):
+                raise KeyError(key) from None
+            raise
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception as exc:
+            if _is_not_found(exc):
+                return False
+            raise
+        return True
+
+    def _write(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+
+
+def _is_not_found(exc: Exception) -> bool:
+    error = getattr(exc, "response", {}).get("Error", {})
+    return str(error.get("Code")) in ("404", "NoSuchKey", "NotFound")
+
+
+def open_blob_store(location: Optional[str] = None) -> Optional[BlobStore]:
+    """
+    Open the store at ``location`` (a directory or ``s3://bucket/prefix``).
+
+    Without a location, ``MUTATION_BLOB_STORE`` is used; returns None when
+    neither is set, which leaves claim checks disabled.
+    """
+    location = location or os.environ.get(BLOB_STORE_ENV)
+    if not location:
+        return None
+    if location.startswith("s3://"):
+        bucket, _, prefix = location[len("s3://"):].partition("/")
+        return S3BlobStore(bucket, prefix)
+    return LocalBlobStore(Path(location).expanduser())
+
+
+__all__ = [
+    "BLOB_STORE_ENV",
+    "BlobStore",
+    "LocalBlobStore",
+    "S3BlobStore",
+    "blob_key",
+    "open_blob_store",
+]
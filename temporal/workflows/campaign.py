@@ -0,0 +1,223 @@
+"""
+Structures for mutation campaigns: many mutants of one repository.
+
+``RunMutationCampaignWorkflow`` runs each mutant as a child
+``RunSingleMutationWorkflow`` and folds the child results into a
+``CampaignResult`` with kill/survive counts and a mutation score.
+
+Long campaigns continue as new before their event history grows large; the
+``CampaignCheckpoint`` carries the counters, the shared clone and the position
+in the mutant set, while per-mutant outcomes (survivors included) are flushed
+to a JSONL file; only a capped sample of survivors stays in the result.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+
+from temporal.workflows.mutation_flow import MutationFlowResult
+
+STATUS_KILLED = "killed"
+STATUS_SURVIVED = "survived"
+STATUS_TIMED_OUT = "timed_out"
+STATUS_NOT_APPLIED = "not_applied"
+STATUS_ERRORED = "errored"
+
+DEFAULT_MAX_HISTORY_EVENTS = 10_000
+DEFAULT_MAX_HISTORY_BYTES = 10 * 1024 * 1024
+# Survivors kept in the result (and checkpoint); the outcomes file has them all.
+MAX_SURVIVOR_SAMPLE = 20
+
+
+@dataclass
+class MutationCampaignParams:
+    """Parameters supplied when starting a mutation campaign."""
+
+    repo_config: Mapping[str, Any]
+    # Mutation configs to run; defaults to every mutation configured for the repo.
+    mutations: Optional[List[Dict[str, Any]]] = None
+    # Child workflows in flight at once; bounded by how much CI the repo can take.
+    max_concurrent: int = 4
+    timeout_seconds: int = 600
+    output_dir: Optional[str] = None
+    base_clone_dir: Optional[str] = None
+    timestamp: Optional[str] = None
+    summary_output_dir: Optional[str] = None
+    wait_mode: str = "poll"
+    webhook_fallback_seconds: int = 120
+    early_verdict: bool = False
+    # Route activities to per-mode task queues; children inherit the setting.
+    split_task_queues: bool = False
+    # Offer the campaign clone to hosts with a warm mirror of the repo first.
+    repo_affinity: bool = False
+    # Continue as new once this run's history reaches either bound.
+    max_history_events: int = DEFAULT_MAX_HISTORY_EVENTS
+    max_history_bytes: int = DEFAULT_MAX_HISTORY_BYTES
+    # Set on continued runs; ``mutations`` then holds only the remaining mutants.
+    checkpoint: Optional[CampaignCheckpoint] = None
+
+
+@dataclass
+class MutantOutcome:
+    """Compact result of one mutant in a campaign."""
+
+    mutation_id: str
+    status: str
+    description: Optional[str] = None
+    pr_url: Optional[str] = None
+    killed_by: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CampaignResult:
+    """Aggregated outcome of a mutation campaign."""
+
+    repo_url: str
+    timestamp: str
+    total: int = 0
+    repo_id: Optional[str] = None
+    baseline_sha: Optional[str] = None
+    killed: int = 0
+    survived: int = 0
+    timed_out: int = 0
+    not_applied: int = 0
+    errored: int = 0
+    mutation_score: Optional[float] = None
+    # Outcomes not yet flushed to ``outcomes_file``.
+    outcomes: List[MutantOutcome] = field(default_factory=list)
+    # The first ``MAX_SURVIVOR_SAMPLE`` survivors; ``survived`` counts them all.
+    survivors: List[MutantOutcome] = field(default_factory=list)
+    outcomes_file: Optional[str] = None
+    continued_runs: int = 0
+    error: Optional[str] = None
+
+    @property
+    def completed(self) -> int:
+        return self.killed + self.survived + self.timed_out + self.not_applied + self.errored
+
+    def record(self, outcome: MutantOutcome) -> None:
+        """Add a mutant's outcome and update the counters and score."""
+        self.outcomes.append(outcome)
+        if outcome.status == STATUS_SURVIVED and len(self.survivors) < MAX_SURVIVOR_SAMPLE:
+            self.survivors.append(outcome)
+        counter = {
+            STATUS_KILLED: "killed",
+            STATUS_SURVIVED: "survived",
+            STATUS_TIMED_OUT: "timed_out",
+            STATUS_NOT_APPLIED: "not_applied",
+        }.get(outcome.status, "errored")
+        setattr(self, counter, getattr(self, counter) + 1)
+        self.mutation_score = mutation_score(self.killed, self.survived)
+
+    def progress(self) -> Dict[str, Any]:
+        """Counters only, suitable for queries while the campaign runs."""
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "killed": self.killed,
+            "survived": self.survived,
+            "timed_out": self.timed_out,
+            "not_applied": self.not_applied,
+            "errored": self.errored,
+            "mutation_score": self.mutation_score,
+            "continued_runs": self.continued_runs,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation of the campaign."""
+        data = asdict(self)
+        data["metadata"] = {"timestamp": self.timestamp, "repo_id": self.repo_id}
+        return data
+
+
+@dataclass
+class CampaignCheckpoint:
+    """State handed to the next run when a campaign continues as new."""
+
+    # Campaign-wide index of the first mutant in the continued run's ``mutations``.
+    start_index: int
+    clone: Dict[str, str]
+    result: CampaignResult
+
+
+def mutation_score(killed: int, survived: int) -> Optional[float]:
+    """Killed share of the mutants CI gave a verdict on; None before any verdict."""
+    decided = killed + survived
+    if not decided:
+        return None
+    return killed / decided
+
+
+def compact_flow_result(flow_result: MutationFlowResult) -> MutationFlowResult:
+    """
+    Drop the bulky check and analysis details from a child's result.
+
+    The full result is already persisted by the child; the campaign only
+    needs what ``classify_flow_result`` reads, and every byte returned lands
+    in the campaign's event history.
+    """
+    outcome = flow_result.outcome
+    pr_results = outcome.pr_results or {}
+    analysis = outcome.analysis or {}
+    outcome.pr_results = {
+        key: pr_results[key]
+        for key in ("completed", "timeout", "early_verdict", "killed_by")
+        if key in pr_results
+    }
+    if outcome.analysis is not None:
+        outcome.analysis = {
+            "summary": analysis.get("summary") or {},
+            "test_failures": [
+                {"check_name": failure.get("check_name")}
+                for failure in analysis.get("test_failures") or []
+            ],
+        }
+    outcome.traceback = None
+    return flow_result
+
+
+def classify_flow_result(
+    mutation_config: Mapping[str, Any],
+    flow_result: MutationFlowResult,
+) -> MutantOutcome:
+    """Reduce a single-mutation workflow result to a campaign outcome."""
+    outcome = flow_result.outcome
+    summary = (outcome.analysis or {}).get("summary") or {}
+    pr_results = outcome.pr_results or {}
+    if not outcome.mutation_applied:
+        status = STATUS_NOT_APPLIED
+    elif summary.get("mutation_killed"):
+        status = STATUS_KILLED
+    elif summary.get("mutation_survived"):
+        status = STATUS_SURVIVED
+    elif pr_results.get("timeout"):
+        status = STATUS_TIMED_OUT
+    else:
+        status = STATUS_ERRORED
+
+    killed_by = pr_results.get("killed_by")
+    if status == STATUS_KILLED and not killed_by:
+        failures = (outcome.analysis or {}).get("test_failures") or []
+        killed_by = failures[0].get("check_name") if failures else None
+
+    return MutantOutcome(
+        mutation_id=str(mutation_config.get("id")),
+        status=status,
+        description=mutation_config.get("description"),
+        pr_url=outcome.pr_url,
+        killed_by=killed_by,
+        error=outcome.error,
+    )
+
+
+__all__ = [
+    "MAX_SURVIVOR_SAMPLE",
+    "CampaignCheckpoint",
+    "CampaignResult",
+    "MutantOutcome",
+    "MutationCampaignParams",
+    "classify_flow_result",
+    "compact_flow_result",
+    "mutation_score",
+]
@@ -0,0 +1,207 @@
+"""
+Payload codecs shared by the worker and the workflow starter.
+
+Check results, analyses and flow results can reach megabytes on large suites.
+Every one of them lands in the event history, slows replay and risks the
+payload size limit. ``CompressionCodec`` compresses payloads above a small
+threshold with zlib or zstd; zlib shrinks the synthetic check and analysis
+results of ``scripts.bench.payload_codecs`` 5.8x, 18.6x and 33.8x (small,
+medium and large runs).
+``ClaimCheckCodec`` then moves payloads that are still large into a
+``BlobStore`` and leaves a reference carrying the content hash in their
+place; the payload is fetched again only when a workflow, activity or client
+decodes it.
+
+Both codecs mark what they produce in the payload's ``encoding`` metadata and
+pass every other payload through, so histories written before a codec was
+enabled still decode. Compression is off by default: a worker or client
+without the codec (including the Temporal UI and CLI, unless they use a codec
+server) cannot read compressed payloads, so it is enabled only once every
+worker, starter and webhook receiver runs a release that decompresses. Every
+one of them must use the same store: a client without it sees claim-checked
+results as bare ``binary/claim-check`` references. See ``build_data_converter``.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import zlib
+from typing import List, Optional, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+
+from temporal.workflows.blob_store import BlobStore, open_blob_store
+
+# Marks a payload whose content lives in the blob store.
+CLAIM_CHECK_ENCODING = b"binary/claim-check"
+# Payloads at least this large (serialized) are moved to the blob store.
+DEFAULT_CLAIM_CHECK_BYTES = 64 * 1024
+
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSION_NONE = "none"
+COMPRESSIONS = (COMPRESSION_ZLIB, COMPRESSION_ZSTD, COMPRESSION_NONE)
+# Off until the whole fleet decompresses; see the module docstring.
+DEFAULT_COMPRESSION = COMPRESSION_NONE
+# Smaller payloads are left alone; the codec overhead would outweigh the gain.
+DEFAULT_COMPRESS_BYTES = 1024
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class CompressionCodec(PayloadCodec):
+    """
+    Compresses payloads above a size threshold, marked ``binary/<algorithm>``.
+
+    Decoding handles both algorithms whatever ``algorithm`` is; with ``none``
+    the codec only decompresses what other workers or clients wrote.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = COMPRESSION_ZLIB,
+        *,
+        threshold_bytes: int = DEFAULT_COMPRESS_BYTES,
+    ):
+        if algorithm not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{algorithm}'")
+        self.algorithm = algorithm
+        self.threshold_bytes = threshold_bytes
+        self.encoding = f"binary/{algorithm}".encode("ascii")
+        if algorithm == COMPRESSION_ZSTD:
+            _zstd()  # fail at startup rather than on the first large payload
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._encode_one(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [_decompress(payload) for payload in payloads]
+
+    def _encode_one(self, payload: Payload) -> Payload:
+        if self.algorithm == COMPRESSION_NONE or payload.ByteSize() < self.threshold_bytes:
+            return payload
+        data = payload.SerializeToString()
+        if self.algorithm == COMPRESSION_ZSTD:
+            compressed = _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            compressed = zlib.compress(data, ZLIB_LEVEL)
+        if len(compressed) >= len(data):
+            return payload
+        return Payload(metadata={"encoding": self.encoding}, data=compressed)
+
+
+def _decompress(payload: Payload) -> Payload:
+    """Undo either algorithm, whichever the payload is marked with."""
+    encoding = payload.metadata.get("encoding")
+    if encoding == b"binary/" + COMPRESSION_ZLIB.encode("ascii"):
+        return Payload.FromString(zlib.decompress(payload.data))
+    if encoding == b"binary/" + COMPRESSION_ZSTD.encode("ascii"):
+        return Payload.FromString(_zstd().ZstdDecompressor().decompress(payload.data))
+    return payload
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("zstd compression requires zstandard: pip install zstandard") from exc
+    return zstandard
+
+
+class CodecChain(PayloadCodec):
+    """Applies codecs in order when encoding and in reverse when decoding."""
+
+    def __init__(self, codecs: Sequence[PayloadCodec]):
+        self.codecs = list(codecs)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        encoded = list(payloads)
+        for codec in self.codecs:
+            encoded = await codec.encode(encoded)
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        decoded = list(payloads)
+        for codec in reversed(self.codecs):
+            decoded = await codec.decode(decoded)
+        return decoded
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """Replaces large payloads with references into a blob store."""
+
+    def __init__(self, store: BlobStore, *, threshold_bytes: int = DEFAULT_CLAIM_CHECK_BYTES):
+        self.store = store
+        self.threshold_bytes = threshold_bytes
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._encode_one(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [await self._decode_one(payload) for payload in payloads]
+
+    async def _encode_one(self, payload: Payload) -> Payload:
+        if payload.ByteSize() < self.threshold_bytes:
+            return payload
+        # The whole payload is stored so its own metadata (encoding) survives.
+        key = await asyncio.to_thread(self.store.put, payload.SerializeToString())
+        return Payload(
+            metadata={"encoding": CLAIM_CHECK_ENCODING},
+            data=key.encode("ascii"),
+        )
+
+    async def _decode_one(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != CLAIM_CHECK_ENCODING:
+            return payload
+        key = payload.data.decode("ascii")
+        try:
+            data = await asyncio.to_thread(self.store.get, key)
+        except KeyError:
+            # Every replay decodes the history again, so a pruned blob fails the
+            # workflow task until the blob is restored.
+            raise RuntimeError(
+                f"Claim-checked payload {key} is missing from blob store "
+                f"{self.store.location}; was it pruned while its workflow was still open?"
+            ) from None
+        return Payload.FromString(data)
+
+
+def build_data_converter(
+    blob_store: Optional[str] = None,
+    *,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+    compress_bytes: int = DEFAULT_COMPRESS_BYTES,
+) -> DataConverter:
+    """
+    Data converter for Temporal clients and workers of the mutation workflows.
+
+    Payloads of at least ``compress_bytes`` are compressed unless
+    ``compression`` is ``none``; compressed payloads decode either way.
+    ``blob_store`` (or ``MUTATION_BLOB_STORE``) enables claim checks for
+    payloads still at least ``claim_check_bytes`` after compression.
+    """
+    codecs: List[PayloadCodec] = [
+        CompressionCodec(compression, threshold_bytes=compress_bytes),
+    ]
+    store = open_blob_store(blob_store)
+    if store is not None:
+        codecs.append(ClaimCheckCodec(store, threshold_bytes=claim_check_bytes))
+    return dataclasses.replace(
+        DataConverter.default,
+        payload_codec=codecs[0] if len(codecs) == 1 else CodecChain(codecs),
+    )
+
+
+__all__ = [
+    "CLAIM_CHECK_ENCODING",
+    "COMPRESSIONS",
+    "ClaimCheckCodec",
+    "CodecChain",
+    "CompressionCodec",
+    "DEFAULT_CLAIM_CHECK_BYTES",
+    "DEFAULT_COMPRESSION",
+    "DEFAULT_COMPRESS_BYTES",
+    "build_data_converter",
+]
@@ -1,25 +1,35 @@
 """
-CLI utility to start the Temporal single-mutation demo workflow.
+CLI utility to start the Temporal single-mutation demo workflow or a campaign.
 """
 from __future__ import annotations
 
 import argparse
 import asyncio
+import json
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from temporalio.client import Client
 
 from temporal.github.known_repos import KNOWN_REPOS
-from temporal.mutation.mutations import get_mutation
+from temporal.mutation.mutations import get_mutation, list_mutations
 from models.mutation.context import MutationContext
 from models.mutation.result import MutationResult
+from temporal.workflows.campaign import CampaignResult, MutationCampaignParams
+from temporal.workflows.codecs import (
+    COMPRESSIONS,
+    DEFAULT_CLAIM_CHECK_BYTES,
+    DEFAULT_COMPRESSION,
+    build_data_converter,
+)
 from temporal.workflows.mutation_flow import MutationFlowResult, generate_mutation_metadata
 from temporal.workflows.temporal_worker import (
     MutationWorkflowParams,
+    RunMutationCampaignWorkflow,
     RunSingleMutationWorkflow,
 )
-from temporal.workflows.summary import render_summary_lines
+from temporal.workflows.summary import render_campaign_summary_lines, render_summary_lines
 
 
 async def start_workflow(
@@ -35,6 +45,14 @@ async def start_workflow(
     base_clone_dir: Optional[str],
     summary_output_dir: Optional[str],
     wait_for_result: bool,
+    wait_mode: str = "poll",
+    webhook_fallback_seconds: int = 120,
+    early_verdict: bool = False,
+    split_task_queues: bool = False,
+    repo_affinity: bool = False,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
 ) -> MutationFlowResult:
     repo_config = KNOWN_REPOS.get(repo_name)
     if not repo_config:
@@ -53,9 +71,22 @@ async def start_workflow(
         base_clone_dir=base_clone_dir,
         timestamp=timestamp,
         summary_output_dir=summary_output_dir,
+        wait_mode=wait_mode,
+        webhook_fallback_seconds=webhook_fallback_seconds,
+        early_verdict=early_verdict,
+        split_task_queues=split_task_queues,
+        repo_affinity=repo_affinity,
     )
 
-    client = await Client.connect(address, namespace=namespace)
+    client = await Client.connect(
+        address,
+        namespace=namespace,
+        data_converter=build_data_converter(
+            blob_store,
+            claim_check_bytes=claim_check_bytes,
+            compression=compression,
+        ),
+    )
     handle = await client.start_workflow(
         RunSingleMutationWorkflow.run,
         params,
@@ -99,6 +130,111 @@ async def start_workflow(
     return interim_result
 
 
+def select_mutations(
+    repo_name: str,
+    mutation_ids: Optional[str] = None,
+    mutations_file: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Resolve the campaign's mutant set.
+
+    ``mutations_file`` is a JSON list of mutation configs; ``mutation_ids`` is
+    a comma-separated subset of the configured mutations. Without either,
+    every mutation configured for the repository is used.
+    """
+    if mutations_file:
+        with Path(mutations_file).open("r", encoding="utf-8") as handle:
+            mutations = json.load(handle)
+        if not isinstance(mutations, list):
+            raise ValueError(f"{mutations_file} must contain a JSON list of mutations")
+        return mutations
+    if mutation_ids:
+        return [
+            dict(get_mutation(repo_name, mutation_id.strip()))
+            for mutation_id in mutation_ids.split(",")
+            if mutation_id.strip()
+        ]
+    return [dict(mutation) for mutation in list_mutations(repo_name)]
+
+
+async def start_campaign(
+    *,
+    repo_name: str,
+    mutations: List[Dict[str, Any]],
+    max_concurrent: int,
+    task_queue: str,
+    namespace: str,
+    address: str,
+    workflow_id: Optional[str],
+    timeout_seconds: int,
+    output_dir: Optional[str],
+    base_clone_dir: Optional[str],
+    summary_output_dir: Optional[str],
+    wait_for_result: bool,
+    wait_mode: str = "poll",
+    webhook_fallback_seconds: int = 120,
+    early_verdict: bool = False,
+    split_task_queues: bool = False,
+    repo_affinity: bool = False,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+) -> Optional[CampaignResult]:
+    repo_config = KNOWN_REPOS.get(repo_name)
+    if not repo_config:
+        available = ", ".join(sorted(KNOWN_REPOS.keys()))
+        raise ValueError(f"Unknown repository '{repo_name}'. Options: {available}")
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    params = MutationCampaignParams(
+        repo_config=repo_config,
+        mutations=mutations,
+        max_concurrent=max_concurrent,
+        timeout_seconds=timeout_seconds,
+        output_dir=output_dir,
+        base_clone_dir=base_clone_dir,
+        timestamp=timestamp,
+        summary_output_dir=summary_output_dir,
+        wait_mode=wait_mode,
+        webhook_fallback_seconds=webhook_fallback_seconds,
+        early_verdict=early_verdict,
+        split_task_queues=split_task_queues,
+        repo_affinity=repo_affinity,
+    )
+
+    client = await Client.connect(
+        address,
+        namespace=namespace,
+        data_converter=build_data_converter(
+            blob_store,
+            claim_check_bytes=claim_check_bytes,
+            compression=compression,
+        ),
+    )
+    handle = await client.start_workflow(
+        RunMutationCampaignWorkflow.run,
+        params,
+        id=workflow_id or f"mutation-campaign-{timestamp}",
+        task_queue=task_queue,
+    )
+
+    print(
+        f"Campaign started (id={handle.id}, run_id={handle.run_id}): "
+        f"{len(mutations)} mutants, {max_concurrent} at a time"
+    )
+
+    if not wait_for_result:
+        print(f"Follow progress with: temporal workflow query -w {handle.id} "
+              "--type campaign_progress")
+        return None
+
+    result = await handle.result()
+    print("Campaign completed.")
+    for line in render_campaign_summary_lines(repo_config, result):
+        print(line)
+    return result
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Start the Temporal demo mutation workflow"
@@ -146,6 +282,69 @@ def parse_args() -> argparse.Namespace:
         "--summary-dir",
         help="Directory to store workflow summary JSON",
     )
+    parser.add_argument(
+        "--wait-mode",
+        choices=["poll", "webhook"],
+        default="poll",
+        help="Poll GitHub for check completion or wait for webhook signals",
+    )
+    parser.add_argument(
+        "--webhook-fallback",
+        type=int,
+        default=120,
+        help="Seconds between fallback polls when waiting for webhooks",
+    )
+    parser.add_argument(
+        "--early-verdict",
+        action="store_true",
+        help="Stop at the first failed test check and cancel the remaining CI runs",
+    )
+    parser.add_argument(
+        "--split-task-queues",
+        action="store_true",
+        help="Route activities to per-mode task queues served by workers started with --mode",
+    )
+    parser.add_argument(
+        "--repo-affinity",
+        action="store_true",
+        help="Offer clones to workers with a warm mirror of the repo (--warm-repo) first",
+    )
+    parser.add_argument(
+        "--blob-store",
+        help="Directory or s3://bucket/prefix for claim-checked payloads; must match "
+        "the workers' (default: $MUTATION_BLOB_STORE; disabled when unset)",
+    )
+    parser.add_argument(
+        "--claim-check-bytes",
+        type=int,
+        default=DEFAULT_CLAIM_CHECK_BYTES,
+        help="Payloads at least this large go to the blob store",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=DEFAULT_COMPRESSION,
+        help="Payload compression; enable once every worker decompresses",
+    )
+    parser.add_argument(
+        "--campaign",
+        action="store_true",
+        help="Run a mutation campaign over many mutants instead of a single mutation",
+    )
+    parser.add_argument(
+        "--mutations",
+        help="Campaign: comma-separated mutation ids (default: all configured mutations)",
+    )
+    parser.add_argument(
+        "--mutations-file",
+        help="Campaign: JSON file with a list of mutation configs",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Campaign: mutants (PRs with CI running) in flight at once",
+    )
     parser.add_argument(
         "--wait",
         action="store_true",
@@ -156,6 +355,30 @@ def parse_args() -> argparse.Namespace:
 
 async def main() -> None:
     args = parse_args()
+    if args.campaign:
+        await start_campaign(
+            repo_name=args.repo,
+            mutations=select_mutations(args.repo, args.mutations, args.mutations_file),
+            max_concurrent=args.max_concurrent,
+            task_queue=args.task_queue,
+            namespace=args.namespace,
+            address=args.address,
+            workflow_id=args.workflow_id,
+            timeout_seconds=args.timeout,
+            output_dir=args.output_dir,
+            base_clone_dir=args.base_clone_dir,
+            summary_output_dir=args.summary_dir,
+            wait_for_result=args.wait,
+            wait_mode=args.wait_mode,
+            webhook_fallback_seconds=args.webhook_fallback,
+            early_verdict=args.early_verdict,
+            split_task_queues=args.split_task_queues,
+            repo_affinity=args.repo_affinity,
+            blob_store=args.blob_store,
+            claim_check_bytes=args.claim_check_bytes,
+            compression=args.compression,
+        )
+        return
     await start_workflow(
         repo_name=args.repo,
         mutation_id=args.mutation,
@@ -168,6 +391,14 @@ async def main() -> None:
         base_clone_dir=args.base_clone_dir,
         summary_output_dir=args.summary_dir,
         wait_for_result=args.wait,
+        wait_mode=args.wait_mode,
+        webhook_fallback_seconds=args.webhook_fallback,
+        early_verdict=args.early_verdict,
+        split_task_queues=args.split_task_queues,
+        repo_affinity=args.repo_affinity,
+        blob_store=args.blob_store,
+        claim_check_bytes=args.claim_check_bytes,
+        compression=args.compression,
     )
 
 
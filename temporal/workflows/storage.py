@@ -7,7 +7,7 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 DEFAULT_RESULTS_DIR_NAME = "mutation_results"
 
@@ -56,3 +56,50 @@ def persist_flow_result(
         json.dump(result_data, handle, indent=2, ensure_ascii=False)
 
     return output_path
+
+
+def append_campaign_outcomes(
+    metadata: Dict[str, Any],
+    outcomes: Iterable[Dict[str, Any]],
+    base_dir: Optional[Union[str, Path]] = None,
+) -> Path:
+    """
+    Append per-mutant campaign outcomes to the campaign's JSONL file.
+
+    The file name derives from the campaign ``metadata`` (timestamp and repo
+    id), so every run of a campaign that continued as new appends to the
+    same file.
+    """
+    timestamp = metadata.get("timestamp") or datetime.now().strftime("%Y%m%d-%H%M%S")
+    repo_slug = _sanitize_filename(str(metadata.get("repo_id") or "repo").split("/")[-1])
+    filename = f"{timestamp}_{repo_slug}_campaign_outcomes.jsonl"
+
+    target_dir = Path(base_dir) if base_dir else _default_results_dir()
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    output_path = target_dir / filename
+    with output_path.open("a", encoding="utf-8") as handle:
+        for outcome in outcomes:
+            handle.write(json.dumps(outcome, ensure_ascii=False) + "\n")
+
+    return output_path
+
+
+def load_campaign_outcomes(
+    outcomes_file: Union[str, Path],
+    status: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read a campaign's outcomes file, optionally only outcomes with ``status``.
+
+    A mutant written twice (a retried flush) is returned once, as last written.
+    """
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    with Path(outcomes_file).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            outcome = json.loads(line)
+            if status is None or outcome.get("status") == status:
+                outcomes[str(outcome.get("mutation_id"))] = outcome
+    return list(outcomes.values())
@@ -3,9 +3,16 @@ Utilities for rendering mutation workflow summaries.
 """
 from __future__ import annotations
 
+from dataclasses import fields
 from typing import Any, List, Mapping
 
+from temporal.workflows.campaign import STATUS_SURVIVED, CampaignResult, MutantOutcome
 from temporal.workflows.mutation_flow import MutationFlowResult
+from temporal.workflows.storage import load_campaign_outcomes
+
+
+# Failed tests listed per check; the analysis itself keeps every failure.
+MAX_FAILED_TESTS_SHOWN = 10
 
 
 def render_summary_lines(
@@ -27,6 +34,12 @@ def render_summary_lines(
         lines.append(f"  - Failed checks: {summary.get('failed_checks', 0)}")
         lines.append(f"  - Mutation killed: {summary.get('mutation_killed', False)}")
         lines.append(f"  - Mutation survived: {summary.get('mutation_survived', False)}")
+        if flow_result.outcome.analysis.get("early_verdict"):
+            analysis = flow_result.outcome.analysis
+            lines.append(
+                f"  - Early verdict: killed by {analysis.get('killed_by')}, "
+                f"{len(analysis.get('cancelled_runs') or [])} CI run(s) cancelled"
+            )
         lines.append(f"  - Results file: {flow_result.outcome.results_file}")
 
         if flow_result.outcome.summary_file:
@@ -43,8 +56,11 @@ def render_summary_lines(
                 failed_tests = failure.get("failed_tests") or []
                 if failed_tests:
                     lines.append("    Failed tests:")
-                    for test in failed_tests:
+                    for test in failed_tests[:MAX_FAILED_TESTS_SHOWN]:
                         lines.append(f"      - {test}")
+                    hidden = len(failed_tests) - MAX_FAILED_TESTS_SHOWN
+                    if hidden > 0:
+                        lines.append(f"      … and {hidden} more")
             lines.append("")
     else:
         lines.append("  - No analysis available")
@@ -61,3 +77,69 @@ def render_summary_lines(
     lines.append("")
     lines.append(f"Cleanup results: {flow_result.workflow.cleanup_details}")
     return lines
+
+
+def render_campaign_summary_lines(
+    repo_config: Mapping[str, Any],
+    result: CampaignResult,
+    *,
+    read_outcomes_file: bool = True,
+) -> List[str]:
+    """
+    Return formatted summary lines for a mutation campaign result.
+
+    Survivors are listed from the outcomes file; without it (or with
+    ``read_outcomes_file`` off, as inside a workflow) the result's sample is used.
+    """
+    score = result.mutation_score
+    lines: List[str] = []
+    lines.append("Mutation campaign summary:")
+    lines.append(f"  - Repository: {repo_config['url']}")
+    lines.append(f"  - Baseline commit: {result.baseline_sha or 'N/A'}")
+    lines.append(f"  - Mutants: {result.completed}/{result.total} completed")
+    lines.append(f"  - Killed: {result.killed}")
+    lines.append(f"  - Survived: {result.survived}")
+    lines.append(f"  - Timed out: {result.timed_out}")
+    lines.append(f"  - Not applied: {result.not_applied}")
+    lines.append(f"  - Errored: {result.errored}")
+    lines.append(f"  - Mutation score: {f'{score:.1%}' if score is not None else 'N/A'}")
+
+    if result.outcomes_file:
+        lines.append(f"  - Outcomes file: {result.outcomes_file}")
+    if result.continued_runs:
+        lines.append(f"  - Continued as new: {result.continued_runs} time(s)")
+
+    survivors = _campaign_survivors(result) if read_outcomes_file else result.survivors
+    if survivors:
+        lines.append("")
+        lines.append("Surviving mutants:")
+        for outcome in survivors:
+            lines.append(f"  • {outcome.mutation_id}: {outcome.description or ''}")
+            if outcome.pr_url:
+                lines.append(f"    {outcome.pr_url}")
+        if len(survivors) < result.survived:
+            lines.append(
+                f"  … {result.survived - len(survivors)} more in "
+                f"{result.outcomes_file or 'the outcomes file'}"
+            )
+
+    if result.error:
+        lines.append("")
+        lines.append("Errors encountered during campaign:")
+        lines.append(f"  - {result.error}")
+    return lines
+
+
+def _campaign_survivors(result: CampaignResult) -> List[MutantOutcome]:
+    """Every survivor from the outcomes file, or the result's sample if it cannot be read."""
+    if not result.outcomes_file:
+        return list(result.survivors)
+    try:
+        stored = load_campaign_outcomes(result.outcomes_file, STATUS_SURVIVED)
+    except (OSError, ValueError):
+        return list(result.survivors)
+    names = {field.name for field in fields(MutantOutcome)}
+    return [
+        MutantOutcome(**{key: value for key, value in outcome.items() if key in names})
+        for outcome in stored
+    ]
@@ -1,33 +1,47 @@
 """
-Temporal worker wiring for the single-mutation demo workflow.
+Temporal worker wiring for the mutation workflows.
 
 This module exposes activity wrappers around the demo helpers, the
-RunSingleMutationWorkflow definition, and utilities for starting a worker.
+RunSingleMutationWorkflow and RunMutationCampaignWorkflow definitions, and
+utilities for starting a worker.
 """
 from __future__ import annotations
 
 import asyncio
 import traceback
-from dataclasses import dataclass, replace
-from datetime import timedelta
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Set
 
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from temporalio import activity, workflow
 from temporalio.client import Client
-from temporalio.worker import Worker
-
-from temporal.workflows.storage import persist_flow_result
+from temporalio.exceptions import ActivityError, TimeoutType
+from temporalio.exceptions import TimeoutError as TemporalTimeoutError
+from temporalio.worker import SharedStateManager, Worker
+
+from temporal.workflows.codecs import (
+    COMPRESSIONS,
+    DEFAULT_CLAIM_CHECK_BYTES,
+    DEFAULT_COMPRESSION,
+    build_data_converter,
+)
+from temporal.workflows.storage import append_campaign_outcomes, persist_flow_result
 from temporal.workflows.activities import (
     analyze_test_results,
     apply_mutation,
+    cancel_workflow_runs,
     cleanup_pull_request_and_repo,
     clone_repository,
     commit_and_push_changes,
     create_branch,
     create_pull_request,
-    wait_for_checks,
+    poll_checks,
+    prepare_campaign_clone,
+    stage_mutant,
+    wait_for_checks_async,
 )
 from models.mutation.context import MutationContext
 from models.mutation.result import MutationResult
@@ -36,18 +50,79 @@ from temporal.workflows.mutation_flow import (
     WorkflowMutationRun,
     generate_mutation_metadata,
 )
-from temporal.workflows.summary import render_summary_lines
-from temporal.mutation.mutations import get_mutation
+from temporal.workflows.campaign import (
+    STATUS_ERRORED,
+    CampaignCheckpoint,
+    CampaignResult,
+    MutantOutcome,
+    MutationCampaignParams,
+    classify_flow_result,
+    compact_flow_result,
+)
+from temporal.workflows.summary import render_campaign_summary_lines, render_summary_lines
+from temporal.github.incremental_analysis import summarize_state
+from temporal.github.known_repos import KNOWN_REPOS
+from temporal.github.repo_manager import RepoManager
+from temporal.mutation.mutations import get_mutation, list_mutations
+from temporal.workflows.worker_config import (
+    MODE_ALL,
+    MODE_ANALYSIS,
+    MODE_GIT,
+    MODE_POLLING,
+    MODE_WORKFLOWS,
+    WORKER_MODES,
+    WorkerOptions,
+    activity_task_queue,
+    current_host_task_queue,
+    load_worker_config,
+    repo_task_queue,
+    set_host_task_queue,
+)
+
+# The wait activity heartbeats at least every 30 s; a crashed worker is noticed
+# after this long and the retry resumes from the last heartbeat.
+WAIT_HEARTBEAT_TIMEOUT = timedelta(minutes=2)
+# How long a clone waits for a host with a warm mirror before any git worker takes it.
+REPO_AFFINITY_WAIT = timedelta(seconds=30)
+# Clone, branch, mutation, commit and push of one mutant, retries included.
+STAGE_MUTANT_TIMEOUT = timedelta(minutes=12)
+# Workflows started before this patch stage mutants with one activity per step.
+STAGE_MUTANT_PATCH = "stage-mutant"
+# Left free at the end of a check activity to record CI durations and return.
+ANALYSIS_DEADLINE_MARGIN = timedelta(seconds=15)
 
 
 # ---------------------------------------------------------------------------
 # Activity input payload definitions
 
 
+@dataclass
+class StageMutantInput:
+    repo_url: str
+    branch_name: str
+    mutation_config: Mapping[str, Any]
+    commit_message: str
+    base_clone_dir: Optional[str] = None
+    # Campaign children copy the campaign's clone instead of cloning again.
+    source_repo_path: Optional[str] = None
+    revision: Optional[str] = None
+    dest_name: Optional[str] = None
+
+
+@dataclass
+class PrepareCampaignInput:
+    repo_url: str
+    base_clone_dir: Optional[str] = None
+    dest_name: Optional[str] = None
+
+
 @dataclass
 class CloneRepositoryInput:
     repo_url: str
     base_clone_dir: Optional[str] = None
+    source_repo_path: Optional[str] = None
+    revision: Optional[str] = None
+    dest_name: Optional[str] = None
 
 
 @dataclass
@@ -84,6 +159,28 @@ class WaitForChecksInput:
     pr_number: str
     repo_id: Optional[str]
     timeout_seconds: int
+    no_checks_timeout_seconds: Optional[int] = None
+    early_verdict: bool = False
+    output_dir: Optional[str] = None
+
+
+@dataclass
+class PollChecksInput:
+    repo_path: str
+    pr_number: str
+    repo_id: Optional[str]
+    elapsed_seconds: int = 0
+    no_checks_timeout_seconds: Optional[int] = None
+    early_verdict: bool = False
+    incremental_state: Optional[Dict[str, Any]] = None
+    output_dir: Optional[str] = None
+
+
+@dataclass
+class CancelRunsInput:
+    repo_path: str
+    branch_name: str
+    repo_id: Optional[str]
 
 
 @dataclass
@@ -107,6 +204,13 @@ class PersistResultInput:
     summary_output_dir: Optional[str] = None
 
 
+@dataclass
+class AppendOutcomesInput:
+    metadata: Dict[str, Any]
+    outcomes: List[Dict[str, Any]]
+    summary_output_dir: Optional[str] = None
+
+
 @dataclass
 class MutationWorkflowParams:
     """Parameters supplied when starting the Temporal workflow."""
@@ -118,6 +222,25 @@ class MutationWorkflowParams:
     base_clone_dir: Optional[str] = None
     timestamp: Optional[str] = None
     summary_output_dir: Optional[str] = None
+    # "poll" keeps the long-running wait activity; "webhook" waits for a
+    # checks_updated signal and falls back to a poll every N seconds.
+    wait_mode: str = "poll"
+    webhook_fallback_seconds: int = 120
+    # Stop waiting once a test check fails and cancel the branch's other CI runs.
+    early_verdict: bool = False
+    # Set by campaigns: the mutation to run (instead of looking up mutation_id),
+    # and the shared clone and commit to start from.
+    mutation_config: Optional[Dict[str, Any]] = None
+    source_repo_path: Optional[str] = None
+    baseline_sha: Optional[str] = None
+    # Return only what the campaign needs; the full result is persisted to disk.
+    compact_result: bool = False
+    # Route activities to per-mode task queues (see worker_config).
+    split_task_queues: bool = False
+    # Offer the clone to hosts with a warm mirror of the repo first.
+    repo_affinity: bool = False
+    # Set by campaigns: the host queue holding ``source_repo_path``.
+    host_task_queue: Optional[str] = None
 
 
 # ---------------------------------------------------------------------------
@@ -125,11 +248,61 @@ class MutationWorkflowParams:
 
 
 @activity.defn
-def clone_repository_activity(payload: CloneRepositoryInput) -> str:
-    """Clone the repository and return the local path."""
+def stage_mutant_activity(payload: StageMutantInput) -> Dict[str, Any]:
+    """
+    Clone, branch, mutate, commit and push the mutant in one activity.
+
+    Returns the checkout path, whether the mutation applied, the pushed commit
+    and, with host affinity, the host queue holding the checkout.
+    """
+    activity.logger.info("Staging %s on %s", payload.branch_name, payload.repo_url)
+    return _with_host_queue(stage_mutant(
+        payload.repo_url,
+        payload.branch_name,
+        payload.mutation_config,
+        payload.commit_message,
+        base_dir=payload.base_clone_dir,
+        source_path=payload.source_repo_path,
+        revision=payload.revision,
+        dest_name=payload.dest_name,
+    ))
+
+
+@activity.defn
+def prepare_campaign_clone_activity(payload: PrepareCampaignInput) -> Dict[str, str]:
+    """Clone the repository once for a campaign; return its path and baseline commit."""
+    activity.logger.info("Preparing campaign clone of %s", payload.repo_url)
+    return _with_host_queue(prepare_campaign_clone(
+        payload.repo_url,
+        base_dir=payload.base_clone_dir,
+        dest_name=payload.dest_name,
+    ))
+
+
+def _with_host_queue(clone: Dict[str, Any]) -> Dict[str, Any]:
+    """Tag a clone with the queue of the host holding it, if workers pin checkouts."""
+    host_queue = current_host_task_queue()
+    if host_queue:
+        clone["host_task_queue"] = host_queue
+    return clone
+
+
+# Per-step staging, still scheduled by workflows started before the
+# STAGE_MUTANT_PATCH. Keep them registered until those have drained.
+
+
+@activity.defn
+def clone_repository_activity(payload: CloneRepositoryInput) -> Dict[str, str]:
+    """Clone the repository; return the local path and, with host affinity, its host queue."""
     activity.logger.info("Cloning repository: %s", payload.repo_url)
-    repo_path = clone_repository(payload.repo_url, base_dir=payload.base_clone_dir)
-    return str(repo_path)
+    repo_path = clone_repository(
+        payload.repo_url,
+        base_dir=payload.base_clone_dir,
+        source_path=payload.source_repo_path,
+        revision=payload.revision,
+        dest_name=payload.dest_name,
+    )
+    return _with_host_queue({"repo_path": str(repo_path)})
 
 
 @activity.defn
@@ -167,14 +340,74 @@ def create_pull_request_activity(payload: CreatePullRequestInput) -> Dict[str, A
 
 
 @activity.defn
-def wait_for_checks_activity(payload: WaitForChecksInput) -> Dict[str, Any]:
-    """Poll GitHub checks until completion or timeout."""
-    activity.logger.info("Waiting for checks on PR #%s", payload.pr_number)
-    return wait_for_checks(
+async def wait_for_checks_activity(payload: WaitForChecksInput) -> Dict[str, Any]:
+    """
+    Poll GitHub checks until completion or timeout, heartbeating partial analysis.
+
+    Runs on the event loop rather than the activity thread pool. A retry
+    resumes from the last heartbeat: elapsed time, first-check delay and the
+    failures already analyzed.
+    """
+    details = activity.info().heartbeat_details
+    resume = details[0] if details else None
+    if resume:
+        activity.logger.info(
+            "Resuming wait for checks on PR #%s after %ss",
+            payload.pr_number,
+            resume.get("elapsed_seconds"),
+        )
+    else:
+        activity.logger.info("Waiting for checks on PR #%s", payload.pr_number)
+    return await wait_for_checks_async(
         Path(payload.repo_path),
         payload.pr_number,
         timeout_seconds=payload.timeout_seconds,
         repo_id=payload.repo_id,
+        no_checks_timeout_seconds=payload.no_checks_timeout_seconds,
+        early_verdict=payload.early_verdict,
+        output_dir=Path(payload.output_dir) if payload.output_dir else None,
+        resume=resume,
+        on_progress=activity.heartbeat,
+        analysis_deadline=_analysis_deadline(),
+    )
+
+
+def _analysis_deadline() -> Optional[datetime]:
+    """When the running check activity stops waiting for in-flight analyses."""
+    info = activity.info()
+    deadlines = []
+    if info.schedule_to_close_timeout:
+        deadlines.append(info.scheduled_time + info.schedule_to_close_timeout)
+    if info.start_to_close_timeout:
+        deadlines.append(info.started_time + info.start_to_close_timeout)
+    return min(deadlines) - ANALYSIS_DEADLINE_MARGIN if deadlines else None
+
+
+@activity.defn
+def poll_checks_activity(payload: PollChecksInput) -> Dict[str, Any]:
+    """Fetch the checks once and report whether they have finished."""
+    activity.logger.info("Polling checks on PR #%s", payload.pr_number)
+    return poll_checks(
+        Path(payload.repo_path),
+        payload.pr_number,
+        elapsed_seconds=payload.elapsed_seconds,
+        repo_id=payload.repo_id,
+        no_checks_timeout_seconds=payload.no_checks_timeout_seconds,
+        early_verdict=payload.early_verdict,
+        incremental_state=payload.incremental_state,
+        output_dir=Path(payload.output_dir) if payload.output_dir else None,
+        analysis_deadline=_analysis_deadline(),
+    )
+
+
+@activity.defn
+def cancel_runs_activity(payload: CancelRunsInput) -> List[str]:
+    """Cancel the CI runs still going for the mutated branch."""
+    activity.logger.info("Cancelling remaining CI runs on %s", payload.branch_name)
+    return cancel_workflow_runs(
+        Path(payload.repo_path),
+        payload.branch_name,
+        repo_id=payload.repo_id,
     )
 
 
@@ -214,18 +447,203 @@ def persist_result_activity(payload: PersistResultInput) -> str:
     return str(output_path)
 
 
+@activity.defn
+def append_campaign_outcomes_activity(payload: AppendOutcomesInput) -> str:
+    """Append campaign outcomes to the campaign's JSONL file."""
+    output_path = append_campaign_outcomes(
+        payload.metadata,
+        payload.outcomes,
+        payload.summary_output_dir,
+    )
+    activity.logger.info("Appended %d campaign outcomes to %s", len(payload.outcomes), output_path)
+    return str(output_path)
+
+
 # ---------------------------------------------------------------------------
 # Workflow definition
 
 
+def _activity_queue(split_task_queues: bool, mode: str) -> Optional[str]:
+    """Task queue for a ``mode`` activity; None keeps the workflow's own queue."""
+    if not split_task_queues:
+        return None
+    return activity_task_queue(workflow.info().task_queue, mode)
+
+
+async def _clone_on_host(
+    activity_fn: Any,
+    payload: Any,
+    *,
+    repo_name: str,
+    split_task_queues: bool,
+    repo_affinity: bool,
+    host_task_queue: Optional[str],
+    timeout: timedelta,
+) -> Dict[str, Any]:
+    """
+    Run a clone activity where its checkout should live.
+
+    A known host queue wins (campaign children copy the campaign's clone).
+    With repo affinity the clone is first offered to hosts with a warm mirror
+    of the repo, then to any git worker once ``REPO_AFFINITY_WAIT`` passes.
+    """
+    if host_task_queue:
+        return await workflow.execute_activity(
+            activity_fn,
+            payload,
+            schedule_to_close_timeout=timeout,
+            task_queue=host_task_queue,
+        )
+    if repo_affinity:
+        try:
+            return await workflow.execute_activity(
+                activity_fn,
+                payload,
+                schedule_to_start_timeout=REPO_AFFINITY_WAIT,
+                start_to_close_timeout=timeout,
+                task_queue=repo_task_queue(workflow.info().task_queue, repo_name),
+            )
+        except ActivityError as exc:
+            cause = exc.cause
+            if not (
+                isinstance(cause, TemporalTimeoutError)
+                and cause.type == TimeoutType.SCHEDULE_TO_START
+            ):
+                raise
+            workflow.logger.info("No warm host for %s; cloning on any git worker", repo_name)
+    return await workflow.execute_activity(
+        activity_fn,
+        payload,
+        schedule_to_close_timeout=timeout,
+        task_queue=_activity_queue(split_task_queues, MODE_GIT),
+    )
+
+
+async def _stage_per_step(
+    repo_path: str,
+    branch_name: str,
+    mutation_config: Mapping[str, Any],
+    commit_message: str,
+    git_queue: str,
+) -> bool:
+    """Branch, mutate, commit and push as separate activities (pre-patch histories)."""
+    await workflow.execute_activity(
+        create_branch_activity,
+        CreateBranchInput(repo_path=repo_path, branch_name=branch_name),
+        schedule_to_close_timeout=timedelta(minutes=2),
+        task_queue=git_queue,
+    )
+    mutation_applied = await workflow.execute_activity(
+        apply_mutation_activity,
+        ApplyMutationInput(repo_path=repo_path, mutation_config=mutation_config),
+        schedule_to_close_timeout=timedelta(minutes=2),
+        task_queue=git_queue,
+    )
+    await workflow.execute_activity(
+        commit_and_push_activity,
+        CommitAndPushInput(
+            repo_path=repo_path,
+            branch_name=branch_name,
+            commit_message=commit_message,
+        ),
+        schedule_to_close_timeout=timedelta(minutes=3),
+        task_queue=git_queue,
+    )
+    return mutation_applied
+
+
 @workflow.defn
 class RunSingleMutationWorkflow:
     """Temporal workflow entry point mirroring the demo mutation flow."""
 
+    MAX_RECORDED_CHECK_EVENTS = 20
+
+    def __init__(self) -> None:
+        self._watch: Dict[str, Any] = {}
+        self._checks_signalled = False
+        self._check_events: List[Dict[str, Any]] = []
+        self._incremental_analysis: Optional[Dict[str, Any]] = None
+
+    @workflow.signal
+    def checks_updated(self, event: Dict[str, Any]) -> None:
+        """Wake the webhook-mode wait when a check suite/run/workflow completes."""
+        self._checks_signalled = True
+        self._check_events.append(event)
+        del self._check_events[: -self.MAX_RECORDED_CHECK_EVENTS]
+
+    @workflow.query
+    def check_watch(self) -> Dict[str, Any]:
+        """Return the repo/branch/PR this workflow is waiting on, for webhook routing."""
+        return dict(self._watch)
+
+    @workflow.query
+    def partial_analysis(self) -> Dict[str, Any]:
+        """
+        Return the failures analyzed so far while CI is still running.
+
+        Webhook mode updates this after every poll; in poll mode the wait
+        activity reports progress in its heartbeat details instead.
+        """
+        return summarize_state(self._incremental_analysis)
+
+    async def _wait_for_checks_via_webhooks(
+        self,
+        params: MutationWorkflowParams,
+        repo_path: str,
+        pr_number: str,
+        repo_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Poll on each completion signal, or every fallback interval without one."""
+        self._watch.update(pr_number=pr_number, waiting=True)
+        started = workflow.now()
+        try:
+            while True:
+                # Reset before polling so a signal arriving mid-poll triggers another one.
+                self._checks_signalled = False
+                elapsed = int((workflow.now() - started).total_seconds())
+                pr_results = await workflow.execute_activity(
+                    poll_checks_activity,
+                    PollChecksInput(
+                        repo_path=repo_path,
+                        pr_number=pr_number,
+                        repo_id=repo_id,
+                        elapsed_seconds=elapsed,
+                        no_checks_timeout_seconds=params.repo_config.get(
+                            "no_checks_timeout_seconds"
+                        ),
+                        early_verdict=params.early_verdict,
+                        incremental_state=self._incremental_analysis,
+                        output_dir=params.output_dir,
+                    ),
+                    schedule_to_close_timeout=timedelta(minutes=2),
+                    task_queue=_activity_queue(params.split_task_queues, MODE_POLLING),
+                )
+                self._incremental_analysis = pr_results.get("incremental_analysis")
+                if pr_results.get("completed"):
+                    return pr_results
+
+                remaining = params.timeout_seconds - (workflow.now() - started).total_seconds()
+                if remaining <= 0:
+                    pr_results["timeout"] = True
+                    return pr_results
+                try:
+                    await workflow.wait_condition(
+                        lambda: self._checks_signalled,
+                        timeout=timedelta(
+                            seconds=min(params.webhook_fallback_seconds, remaining)
+                        ),
+                    )
+                except asyncio.TimeoutError:
+                    workflow.logger.info("No check webhook received; polling as fallback")
+        finally:
+            self._watch["waiting"] = False
+
     @workflow.run
     async def run(self, params: MutationWorkflowParams) -> MutationFlowResult:
         repo_config = params.repo_config
-        mutation_config = get_mutation(repo_config["name"], params.mutation_id)
+        mutation_config = params.mutation_config or get_mutation(
+            repo_config["name"], params.mutation_id
+        )
         repo_id = repo_config.get("repo_id")
 
         # Generate branch and PR metadata deterministically
@@ -255,44 +673,71 @@ class RunSingleMutationWorkflow:
 
         repo_path: Optional[str] = None
         pr_number: Optional[str] = None
-
+        git_queue = params.host_task_queue or _activity_queue(params.split_task_queues, MODE_GIT)
+        self._watch = {
+            "repo": repo_id,
+            "branch": branch_name,
+            "pr_number": None,
+            "wait_mode": params.wait_mode,
+            "waiting": False,
+        }
+
+        commit_message = f"Apply mutation: {mutation_config['description']}"
         try:
-            repo_path = await workflow.execute_activity(
-                clone_repository_activity,
-                CloneRepositoryInput(
-                    repo_url=repo_config["url"],
-                    base_clone_dir=params.base_clone_dir,
-                ),
-                schedule_to_close_timeout=timedelta(minutes=5),
-            )
-            result.workflow.repo_path = repo_path
-            workflow.logger.info("Repository cloned to %s", repo_path)
-
-            await workflow.execute_activity(
-                create_branch_activity,
-                CreateBranchInput(repo_path=repo_path, branch_name=branch_name),
-                schedule_to_close_timeout=timedelta(minutes=2),
-            )
-            workflow.logger.info("Branch %s created", branch_name)
-
-            mutation_applied = await workflow.execute_activity(
-                apply_mutation_activity,
-                ApplyMutationInput(repo_path=repo_path, mutation_config=mutation_config),
-                schedule_to_close_timeout=timedelta(minutes=2),
-            )
-            result.outcome.mutation_applied = mutation_applied
-            workflow.logger.info("Mutation applied: %s", mutation_applied)
-
-            await workflow.execute_activity(
-                commit_and_push_activity,
-                CommitAndPushInput(
-                    repo_path=repo_path,
-                    branch_name=branch_name,
-                    commit_message=f"Apply mutation: {mutation_config['description']}",
-                ),
-                schedule_to_close_timeout=timedelta(minutes=3),
-            )
-            workflow.logger.info("Branch pushed to origin")
+            if workflow.patched(STAGE_MUTANT_PATCH):
+                staged = await _clone_on_host(
+                    stage_mutant_activity,
+                    StageMutantInput(
+                        repo_url=repo_config["url"],
+                        branch_name=branch_name,
+                        mutation_config=mutation_config,
+                        commit_message=commit_message,
+                        base_clone_dir=params.base_clone_dir,
+                        source_repo_path=params.source_repo_path,
+                        revision=params.baseline_sha,
+                        dest_name=branch_name if params.source_repo_path else None,
+                    ),
+                    repo_name=repo_config["name"],
+                    split_task_queues=params.split_task_queues,
+                    repo_affinity=params.repo_affinity,
+                    host_task_queue=params.host_task_queue,
+                    timeout=STAGE_MUTANT_TIMEOUT,
+                )
+                repo_path = staged["repo_path"]
+                # Cleanup follows the checkout to its host.
+                git_queue = staged.get("host_task_queue") or git_queue
+                result.workflow.repo_path = repo_path
+                result.workflow.metadata["commit_sha"] = staged["commit_sha"]
+                result.outcome.mutation_applied = staged["mutation_applied"]
+                workflow.logger.info(
+                    "Mutant staged in %s (applied: %s), pushed %s as %s",
+                    repo_path,
+                    staged["mutation_applied"],
+                    branch_name,
+                    staged["commit_sha"],
+                )
+            else:
+                clone = await _clone_on_host(
+                    clone_repository_activity,
+                    CloneRepositoryInput(
+                        repo_url=repo_config["url"],
+                        base_clone_dir=params.base_clone_dir,
+                        source_repo_path=params.source_repo_path,
+                        revision=params.baseline_sha,
+                        dest_name=branch_name if params.source_repo_path else None,
+                    ),
+                    repo_name=repo_config["name"],
+                    split_task_queues=params.split_task_queues,
+                    repo_affinity=params.repo_affinity,
+                    host_task_queue=params.host_task_queue,
+                    timeout=timedelta(minutes=5),
+                )
+                repo_path = clone["repo_path"]
+                git_queue = clone.get("host_task_queue") or git_queue
+                result.workflow.repo_path = repo_path
+                result.outcome.mutation_applied = await _stage_per_step(
+                    repo_path, branch_name, mutation_config, commit_message, git_queue,
+                )
 
             pr_info = await workflow.execute_activity(
                 create_pull_request_activity,
@@ -304,6 +749,7 @@ class RunSingleMutationWorkflow:
                     repo_id=repo_id,
                 ),
                 schedule_to_close_timeout=timedelta(minutes=3),
+                task_queue=_activity_queue(params.split_task_queues, MODE_POLLING),
             )
             pr_number = pr_info["number"]
             pr_url = pr_info.get("url")
@@ -312,16 +758,49 @@ class RunSingleMutationWorkflow:
             result.outcome.pr_url = pr_url
             workflow.logger.info("Pull request created: %s", pr_url)
 
-            pr_results = await workflow.execute_activity(
-                wait_for_checks_activity,
-                WaitForChecksInput(
-                    repo_path=repo_path,
-                    pr_number=pr_number,
-                    repo_id=repo_id,
-                    timeout_seconds=params.timeout_seconds,
-                ),
-                schedule_to_close_timeout=timedelta(seconds=params.timeout_seconds + 60),
-            )
+            if params.wait_mode == "webhook":
+                pr_results = await self._wait_for_checks_via_webhooks(
+                    params,
+                    repo_path,
+                    pr_number,
+                    repo_id,
+                )
+            else:
+                pr_results = await workflow.execute_activity(
+                    wait_for_checks_activity,
+                    WaitForChecksInput(
+                        repo_path=repo_path,
+                        pr_number=pr_number,
+                        repo_id=repo_id,
+                        timeout_seconds=params.timeout_seconds,
+                        no_checks_timeout_seconds=repo_config.get("no_checks_timeout_seconds"),
+                        early_verdict=params.early_verdict,
+                        output_dir=params.output_dir,
+                    ),
+                    schedule_to_close_timeout=timedelta(seconds=params.timeout_seconds + 60),
+                    task_queue=_activity_queue(params.split_task_queues, MODE_POLLING),
+                    heartbeat_timeout=WAIT_HEARTBEAT_TIMEOUT,
+                )
+                self._incremental_analysis = pr_results.get("incremental_analysis")
+            if pr_results.get("early_verdict"):
+                workflow.logger.info(
+                    "Mutation killed by %s; cancelling remaining CI runs",
+                    pr_results.get("killed_by"),
+                )
+                try:
+                    pr_results["cancelled_runs"] = await workflow.execute_activity(
+                        cancel_runs_activity,
+                        CancelRunsInput(
+                            repo_path=repo_path,
+                            branch_name=branch_name,
+                            repo_id=repo_id,
+                        ),
+                        schedule_to_close_timeout=timedelta(minutes=2),
+                        task_queue=_activity_queue(params.split_task_queues, MODE_POLLING),
+                    )
+                except Exception as cancel_exc:
+                    # Closing the PR during cleanup still stops the runs eventually.
+                    workflow.logger.warning("Could not cancel CI runs: %s", cancel_exc)
             result.outcome.pr_results = pr_results
             workflow.logger.info("GitHub checks completed")
 
@@ -334,6 +813,7 @@ class RunSingleMutationWorkflow:
                     output_dir=params.output_dir,
                 ),
                 schedule_to_close_timeout=timedelta(minutes=3),
+                task_queue=_activity_queue(params.split_task_queues, MODE_ANALYSIS),
             )
             result.outcome.analysis = analysis_payload["analysis"]
             result.outcome.results_file = analysis_payload["results_file"]
@@ -351,6 +831,7 @@ class RunSingleMutationWorkflow:
                     repo_id=repo_id,
                 ),
                 schedule_to_close_timeout=timedelta(minutes=5),
+                task_queue=git_queue,
             )
             result.workflow.cleanup_details = cleanup_details
             workflow.logger.info("Cleanup completed: %s", cleanup_details)
@@ -363,6 +844,7 @@ class RunSingleMutationWorkflow:
                         summary_output_dir=params.summary_output_dir,
                     ),
                     schedule_to_close_timeout=timedelta(minutes=2),
+                    task_queue=_activity_queue(params.split_task_queues, MODE_ANALYSIS),
                 )
                 result.outcome.summary_file = summary_path
                 result.workflow.metadata["summary_file"] = summary_path
@@ -373,6 +855,245 @@ class RunSingleMutationWorkflow:
         for line in render_summary_lines(repo_config, result):
             workflow.logger.info(line)
 
+        if params.compact_result:
+            return compact_flow_result(result)
+        return result
+
+
+@workflow.defn
+class RunMutationCampaignWorkflow:
+    """
+    Run many mutants of one repository as child workflows.
+
+    The repository is cloned once; each child copies that clone at the same
+    baseline commit. At most ``max_concurrent`` children are in flight, so
+    throughput is bounded by the CI capacity the campaign is given rather
+    than by running mutants one at a time.
+    """
+
+    def __init__(self) -> None:
+        self._result: Optional[CampaignResult] = None
+        self._in_flight: Dict[str, str] = {}
+
+    @workflow.query
+    def campaign_progress(self) -> Dict[str, Any]:
+        """Return the counters so far and the mutants currently running."""
+        progress = self._result.progress() if self._result else {}
+        progress["in_flight"] = sorted(self._in_flight.values())
+        return progress
+
+    async def _run_mutant(
+        self,
+        params: MutationCampaignParams,
+        clone: Mapping[str, str],
+        mutation_config: Dict[str, Any],
+        index: int,
+        timestamp: str,
+    ) -> None:
+        """Run one mutant as a child workflow and record its outcome."""
+        mutation_id = str(mutation_config.get("id", index))
+        child_id = f"{workflow.info().workflow_id}-{index:05d}"
+        self._in_flight[child_id] = mutation_id
+        try:
+            flow_result = await workflow.execute_child_workflow(
+                RunSingleMutationWorkflow.run,
+                MutationWorkflowParams(
+                    repo_config=params.repo_config,
+                    mutation_id=mutation_id,
+                    timeout_seconds=params.timeout_seconds,
+                    output_dir=params.output_dir,
+                    base_clone_dir=params.base_clone_dir,
+                    timestamp=f"{timestamp}-{index:05d}",
+                    summary_output_dir=params.summary_output_dir,
+                    wait_mode=params.wait_mode,
+                    webhook_fallback_seconds=params.webhook_fallback_seconds,
+                    early_verdict=params.early_verdict,
+                    mutation_config=mutation_config,
+                    source_repo_path=clone["repo_path"],
+                    baseline_sha=clone["baseline_sha"],
+                    compact_result=True,
+                    split_task_queues=params.split_task_queues,
+                    # Children copy the campaign's clone, so they run on its host.
+                    host_task_queue=clone.get("host_task_queue"),
+                ),
+                id=child_id,
+            )
+            outcome = classify_flow_result(mutation_config, flow_result)
+        except Exception as exc:
+            outcome = MutantOutcome(
+                mutation_id=mutation_id,
+                status=STATUS_ERRORED,
+                description=mutation_config.get("description"),
+                error=str(exc),
+            )
+        finally:
+            self._in_flight.pop(child_id, None)
+        self._result.record(outcome)
+        workflow.logger.info("Mutant %s: %s", mutation_id, outcome.status)
+
+    def _history_is_large(self, params: MutationCampaignParams) -> bool:
+        """Whether this run's event history is due for continue-as-new."""
+        info = workflow.info()
+        return (
+            info.is_continue_as_new_suggested()
+            or info.get_current_history_length() >= params.max_history_events
+            or info.get_current_history_size() >= params.max_history_bytes
+        )
+
+    async def _flush_outcomes(self, params: MutationCampaignParams) -> None:
+        """Move recorded outcomes out of workflow state into the outcomes file."""
+        result = self._result
+        if result is None or not result.outcomes:
+            return
+        try:
+            result.outcomes_file = await workflow.execute_activity(
+                append_campaign_outcomes_activity,
+                AppendOutcomesInput(
+                    metadata=result.to_dict()["metadata"],
+                    outcomes=[asdict(outcome) for outcome in result.outcomes],
+                    summary_output_dir=params.summary_output_dir,
+                ),
+                schedule_to_close_timeout=timedelta(minutes=2),
+                task_queue=_activity_queue(params.split_task_queues, MODE_ANALYSIS),
+            )
+            result.outcomes.clear()
+        except Exception as flush_exc:
+            # Kept in state; the next flush writes them.
+            workflow.logger.error("Failed to write campaign outcomes: %s", flush_exc)
+
+    @workflow.run
+    async def run(self, params: MutationCampaignParams) -> CampaignResult:
+        repo_config = params.repo_config
+        repo_id = repo_config.get("repo_id")
+        mutations = list(params.mutations or list_mutations(repo_config["name"]))
+        checkpoint = params.checkpoint
+        clone: Optional[Dict[str, str]] = None
+        start_index = 0
+        if checkpoint is not None:
+            result = checkpoint.result
+            clone = checkpoint.clone
+            start_index = checkpoint.start_index
+            timestamp = result.timestamp
+        else:
+            timestamp = params.timestamp or workflow.now().strftime("%Y%m%d-%H%M%S")
+            result = CampaignResult(
+                repo_url=repo_config["url"],
+                timestamp=timestamp,
+                total=len(mutations),
+                repo_id=repo_id,
+            )
+        self._result = result
+
+        # Offset into ``mutations`` where the next run picks up, once history is large.
+        continue_at: Optional[int] = None
+        running: Set[asyncio.Task] = set()
+        try:
+            if clone is None:
+                clone = await _clone_on_host(
+                    prepare_campaign_clone_activity,
+                    PrepareCampaignInput(
+                        repo_url=repo_config["url"],
+                        base_clone_dir=params.base_clone_dir,
+                        dest_name=f"mutation-campaign-{timestamp}",
+                    ),
+                    repo_name=repo_config["name"],
+                    split_task_queues=params.split_task_queues,
+                    repo_affinity=params.repo_affinity,
+                    host_task_queue=None,
+                    timeout=timedelta(minutes=10),
+                )
+                result.baseline_sha = clone["baseline_sha"]
+            workflow.logger.info(
+                "Campaign: %d of %d mutants left at %s, %d at a time",
+                len(mutations),
+                result.total,
+                clone["baseline_sha"],
+                params.max_concurrent,
+            )
+
+            for offset, mutation_config in enumerate(mutations):
+                while len(running) >= max(1, params.max_concurrent):
+                    _, pending = await workflow.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    running = set(pending)
+                if offset and self._history_is_large(params):
+                    # Let the children in flight finish here, then hand over. The
+                    # next run cannot await children this run started, so the
+                    # fan-out drains to zero once per handover (see README).
+                    continue_at = offset
+                    break
+                running.add(asyncio.create_task(self._run_mutant(
+                    params,
+                    clone,
+                    dict(mutation_config),
+                    start_index + offset,
+                    timestamp,
+                )))
+            if running:
+                await workflow.wait(running)
+        except Exception as exc:
+            continue_at = None
+            result.error = str(exc)
+            workflow.logger.error("Campaign encountered error: %s", exc)
+        finally:
+            # Children share the campaign clone's objects (``git clone --shared``),
+            # so none may still be running when it is removed.
+            in_flight = [task for task in running if not task.done()]
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await workflow.wait(in_flight)
+            await self._flush_outcomes(params)
+            if continue_at is None:
+                if clone is not None:
+                    await workflow.execute_activity(
+                        cleanup_activity,
+                        CleanupInput(
+                            repo_path=clone["repo_path"],
+                            pr_number=None,
+                            repo_id=repo_id,
+                        ),
+                        schedule_to_close_timeout=timedelta(minutes=5),
+                        task_queue=clone.get("host_task_queue") or _activity_queue(
+                            params.split_task_queues, MODE_GIT,
+                        ),
+                    )
+                try:
+                    await workflow.execute_activity(
+                        persist_result_activity,
+                        PersistResultInput(
+                            result_data=result.to_dict(),
+                            summary_output_dir=params.summary_output_dir,
+                        ),
+                        schedule_to_close_timeout=timedelta(minutes=2),
+                        task_queue=_activity_queue(params.split_task_queues, MODE_ANALYSIS),
+                    )
+                except Exception as persist_exc:
+                    workflow.logger.error("Failed to persist campaign result: %s", persist_exc)
+
+        if continue_at is not None and clone is not None:
+            result.continued_runs += 1
+            workflow.logger.info(
+                "Continuing campaign as new after %d mutants (%d events)",
+                result.completed,
+                workflow.info().get_current_history_length(),
+            )
+            workflow.continue_as_new(replace(
+                params,
+                mutations=mutations[continue_at:],
+                timestamp=timestamp,
+                checkpoint=CampaignCheckpoint(
+                    start_index=start_index + continue_at,
+                    clone=clone,
+                    result=result,
+                ),
+            ))
+
+        # No file reads in workflow code: survivors come from the result's sample.
+        for line in render_campaign_summary_lines(repo_config, result, read_outcomes_file=False):
+            workflow.logger.info(line)
+
         return result
 
 
@@ -380,36 +1101,154 @@ class RunSingleMutationWorkflow:
 # Worker bootstrap helper
 
 
+ACTIVITIES_BY_MODE: Dict[str, List[Any]] = {
+    MODE_POLLING: [
+        create_pull_request_activity,
+        wait_for_checks_activity,
+        poll_checks_activity,
+        cancel_runs_activity,
+    ],
+    MODE_GIT: [
+        stage_mutant_activity,
+        prepare_campaign_clone_activity,
+        cleanup_activity,
+        # Pre-STAGE_MUTANT_PATCH histories; drop once no such workflow is open.
+        clone_repository_activity,
+        create_branch_activity,
+        apply_mutation_activity,
+        commit_and_push_activity,
+    ],
+    MODE_ANALYSIS: [
+        analyze_results_activity,
+        persist_result_activity,
+        append_campaign_outcomes_activity,
+    ],
+}
+
+
+def activities_for_mode(mode: str) -> List[Any]:
+    """Activities a worker in ``mode`` registers; ``all`` registers every one."""
+    if mode == MODE_ALL:
+        return [item for activities in ACTIVITIES_BY_MODE.values() for item in activities]
+    return list(ACTIVITIES_BY_MODE.get(mode, []))
+
+
 async def run_worker(
     *,
     task_queue: str,
     temporal_address: str = "localhost:7233",
     namespace: str = "default",
+    mode: str = MODE_ALL,
+    max_concurrent_activities: Optional[int] = None,
+    max_concurrent_workflow_tasks: Optional[int] = None,
+    activity_threads: Optional[int] = None,
+    analysis_processes: int = 0,
+    host_affinity: bool = False,
+    host_id: Optional[str] = None,
+    warm_repos: Optional[List[str]] = None,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
 ) -> None:
-    """Connect to Temporal and start a worker for the demo workflow."""
-    client = await Client.connect(temporal_address, namespace=namespace)
-    activity_executor = ThreadPoolExecutor()
-    try:
-        worker = Worker(
+    """
+    Connect to Temporal and start a worker for the mutation workflows.
+
+    ``mode`` selects what the worker runs: everything on ``task_queue``
+    (``all``), only the workflows, or one class of activities on its own
+    queue (see ``worker_config``). With ``host_affinity`` or ``warm_repos``
+    the checkout activities are also served on this host's queue (warm repos
+    imply host affinity) and on the warm repos' queues; mirrors of the warm
+    repos are refreshed first.
+    Payloads are compressed with ``compression``, and ``blob_store`` enables
+    claim checks for large ones (see ``codecs``).
+    """
+    options = WorkerOptions(
+        task_queue=task_queue,
+        mode=mode,
+        max_concurrent_activities=max_concurrent_activities,
+        max_concurrent_workflow_tasks=max_concurrent_workflow_tasks,
+        activity_threads=activity_threads,
+        analysis_processes=analysis_processes,
+        host_affinity=host_affinity,
+        host_id=host_id,
+        warm_repos=list(warm_repos or []),
+        blob_store=blob_store,
+        claim_check_bytes=claim_check_bytes,
+        compression=compression,
+    )
+    activities = activities_for_mode(options.mode)
+    workflows = (
+        [RunSingleMutationWorkflow, RunMutationCampaignWorkflow]
+        if options.mode in (MODE_ALL, MODE_WORKFLOWS)
+        else []
+    )
+    worker_kwargs: Dict[str, Any] = {}
+    if options.activity_slots is not None:
+        worker_kwargs["max_concurrent_activities"] = options.activity_slots
+    if options.max_concurrent_workflow_tasks is not None:
+        worker_kwargs["max_concurrent_workflow_tasks"] = options.max_concurrent_workflow_tasks
+
+    activity_executor: Optional[Executor] = None
+    if options.analysis_processes:
+        # Junit parsing is CPU-bound; processes sidestep the GIL.
+        activity_executor = ProcessPoolExecutor(max_workers=options.analysis_processes)
+        worker_kwargs["shared_state_manager"] = SharedStateManager.create_from_multiprocessing(
+            multiprocessing.Manager()
+        )
+    elif activities:
+        # Host and warm-repo queues share the pool with the main queue.
+        pinned_queues = len(options.repo_queues) + (1 if options.host_queue else 0)
+        executor_size = options.executor_size
+        activity_executor = ThreadPoolExecutor(
+            max_workers=executor_size * (1 + pinned_queues) if executor_size else None
+        )
+
+    unknown_repos = [name for name in options.warm_repos if name not in KNOWN_REPOS]
+    if unknown_repos:
+        raise ValueError(f"Unknown warm repo(s): {', '.join(unknown_repos)}")
+    for repo_name in options.warm_repos:
+        repo_url = KNOWN_REPOS[repo_name]["url"]
+        print(f"🪞 Refreshing mirror of {repo_url}")
+        await asyncio.to_thread(RepoManager().update_mirror, repo_url)
+    set_host_task_queue(options.host_queue)
+
+    client = await Client.connect(
+        temporal_address,
+        namespace=namespace,
+        data_converter=build_data_converter(
+            options.blob_store,
+            claim_check_bytes=options.claim_check_bytes,
+            compression=options.compression,
+        ),
+    )
+    print(
+        f"👷 Worker ({options.mode}) polling {options.polled_task_queue}: "
+        f"{len(workflows)} workflows, {len(activities)} activities"
+    )
+    workers = [
+        Worker(
             client,
-            task_queue=task_queue,
-            workflows=[RunSingleMutationWorkflow],
-            activities=[
-                clone_repository_activity,
-                create_branch_activity,
-                apply_mutation_activity,
-                commit_and_push_activity,
-                create_pull_request_activity,
-                wait_for_checks_activity,
-                analyze_results_activity,
-                cleanup_activity,
-                persist_result_activity,
-            ],
+            task_queue=options.polled_task_queue,
+            workflows=workflows,
+            activities=activities,
             activity_executor=activity_executor,
+            **worker_kwargs,
         )
-        await worker.run()
+    ]
+    for pinned_queue in filter(None, [options.host_queue, *options.repo_queues]):
+        print(f"   Checkout activities also served on {pinned_queue}")
+        workers.append(Worker(
+            client,
+            task_queue=pinned_queue,
+            activities=ACTIVITIES_BY_MODE[MODE_GIT],
+            activity_executor=activity_executor,
+            **worker_kwargs,
+        ))
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
     finally:
-        activity_executor.shutdown(wait=True)
+        if activity_executor is not None:
+            activity_executor.shutdown(wait=True)
 
 
 def main() -> None:
@@ -421,8 +1260,7 @@ def main() -> None:
     )
     parser.add_argument(
         "--task-queue",
-        required=True,
-        help="Temporal task queue to poll",
+        help="Temporal task queue of the workflows (per-mode queues derive from it)",
     )
     parser.add_argument(
         "--address",
@@ -434,13 +1272,97 @@ def main() -> None:
         default="default",
         help="Temporal namespace",
     )
+    parser.add_argument(
+        "--mode",
+        choices=WORKER_MODES,
+        help="What this worker runs (default: all, on a single task queue)",
+    )
+    parser.add_argument(
+        "--max-concurrent-activities",
+        type=int,
+        help="Activity slots (defaults per mode: polling 1000, git 8, analysis CPU count)",
+    )
+    parser.add_argument(
+        "--max-concurrent-workflow-tasks",
+        type=int,
+        help="Workflow task slots (SDK default when unset)",
+    )
+    parser.add_argument(
+        "--activity-threads",
+        type=int,
+        help="Threads for sync activities (default: one per activity slot)",
+    )
+    parser.add_argument(
+        "--analysis-processes",
+        type=int,
+        help="Analysis mode: run the analysis activities in this many processes",
+    )
+    parser.add_argument(
+        "--host-affinity",
+        action="store_true",
+        default=None,
+        help="Git/all mode: keep each mutant's checkout work on this host's task queue",
+    )
+    parser.add_argument(
+        "--host-id",
+        help="Host queue suffix for --host-affinity (default: the hostname)",
+    )
+    parser.add_argument(
+        "--warm-repo",
+        action="append",
+        dest="warm_repos",
+        help="Git/all mode: keep a mirror of this KNOWN_REPOS entry and take its clones "
+        "first (repeatable; implies --host-affinity)",
+    )
+    parser.add_argument(
+        "--blob-store",
+        help="Directory or s3://bucket/prefix for claim-checked payloads "
+        "(default: $MUTATION_BLOB_STORE; disabled when unset)",
+    )
+    parser.add_argument(
+        "--claim-check-bytes",
+        type=int,
+        help="Payloads at least this large go to the blob store (default: 64 KiB)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        help="Payload compression; enable once every process decompresses (default: none)",
+    )
+    parser.add_argument(
+        "--config",
+        help="JSON file with worker options; command-line flags take precedence",
+    )
     args = parser.parse_args()
 
+    config = load_worker_config(args.config)
+    config.update({
+        key: value
+        for key, value in {
+            "task_queue": args.task_queue,
+            "mode": args.mode,
+            "max_concurrent_activities": args.max_concurrent_activities,
+            "max_concurrent_workflow_tasks": args.max_concurrent_workflow_tasks,
+            "activity_threads": args.activity_threads,
+            "analysis_processes": args.analysis_processes,
+            "host_affinity": args.host_affinity,
+            "host_id": args.host_id,
+            "warm_repos": args.warm_repos,
+            "blob_store": args.blob_store,
+            "claim_check_bytes": args.claim_check_bytes,
+            "compression": args.compression,
+        }.items()
+        if value is not None
+    })
+    if not config.get("task_queue"):
+        parser.error("--task-queue is required (on the command line or in --config)")
+    options = WorkerOptions.from_mapping(config)
+
     asyncio.run(
         run_worker(
-            task_queue=args.task_queue,
             temporal_address=args.address,
             namespace=args.namespace,
+            **asdict(options),
         )
     )
 
@@ -0,0 +1,343 @@
+"""
+GitHub webhook receiver that signals mutation workflows when their checks finish.
+
+Workflows started with ``wait_mode="webhook"`` expose the repo, branch and PR
+they are waiting on through the ``check_watch`` query. The receiver indexes
+running workflows by those keys, refreshing the index from Temporal visibility
+whenever a delivery matches nothing, and sends ``checks_updated`` to every
+workflow a completed ``check_suite``/``check_run``/``workflow_run`` belongs to.
+
+Recorded payloads can be replayed without GitHub:
+
+    python -m temporal.workflows.webhook_receiver --replay payload.json
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from temporalio.client import Client
+
+from temporal.github.webhooks import (
+    CheckWebhookEvent,
+    WatchIndex,
+    infer_event_name,
+    parse_check_event,
+    verify_signature,
+)
+from temporal.workflows.codecs import (
+    COMPRESSIONS,
+    DEFAULT_CLAIM_CHECK_BYTES,
+    DEFAULT_COMPRESSION,
+    build_data_converter,
+)
+from temporal.workflows.temporal_worker import RunSingleMutationWorkflow
+
+
+RUNNING_MUTATION_WORKFLOWS_QUERY = (
+    "WorkflowType='RunSingleMutationWorkflow' AND ExecutionStatus='Running'"
+)
+DISPATCH_TIMEOUT_SECONDS = 30
+
+
+class WorkflowWatchResolver:
+    """Resolves webhook events to the ids of the workflows waiting on them."""
+
+    def __init__(self, client: Client, *, refresh_interval_seconds: float = 5.0):
+        self.client = client
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.index = WatchIndex()
+        self._last_refresh: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> None:
+        """Rebuild the index by querying every running mutation workflow."""
+        executions = [
+            execution
+            async for execution in self.client.list_workflows(RUNNING_MUTATION_WORKFLOWS_QUERY)
+        ]
+        watches = await asyncio.gather(
+            *(self._query_watch(execution.id, execution.run_id) for execution in executions)
+        )
+        self.index.replace(watch for watch in watches if watch)
+        self._last_refresh = time.monotonic()
+
+    async def _query_watch(self, workflow_id: str, run_id: Optional[str]) -> Dict[str, Any]:
+        handle = self.client.get_workflow_handle(workflow_id, run_id=run_id)
+        try:
+            watch = await handle.query(RunSingleMutationWorkflow.check_watch)
+        except Exception:
+            return {}
+        if not watch or watch.get("wait_mode") != "webhook":
+            return {}
+        return {**watch, "workflow_id": workflow_id}
+
+    async def resolve(self, event: CheckWebhookEvent) -> List[str]:
+        matched = self.index.match(event)
+        if matched:
+            return matched
+        async with self._lock:
+            stale = (
+                self._last_refresh is None
+                or time.monotonic() - self._last_refresh >= self.refresh_interval_seconds
+            )
+            if stale:
+                await self.refresh()
+        return self.index.match(event)
+
+
+async def dispatch_event(
+    client: Client,
+    resolver: WorkflowWatchResolver,
+    event: CheckWebhookEvent,
+) -> List[str]:
+    """Signal every workflow waiting on a completed check event."""
+    if not event.completed:
+        return []
+    signalled: List[str] = []
+    for workflow_id in await resolver.resolve(event):
+        try:
+            await client.get_workflow_handle(workflow_id).signal(
+                RunSingleMutationWorkflow.checks_updated,
+                event.to_signal_payload(),
+            )
+        except Exception as exc:
+            print(f"⚠️  Failed to signal {workflow_id}: {exc}")
+            continue
+        signalled.append(workflow_id)
+    return signalled
+
+
+def _make_handler(
+    loop: asyncio.AbstractEventLoop,
+    client: Client,
+    resolver: WorkflowWatchResolver,
+    secret: Optional[str],
+) -> type:
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if secret and not verify_signature(
+                secret,
+                body,
+                self.headers.get("X-Hub-Signature-256"),
+            ):
+                self._reply(401, {"error": "invalid signature"})
+                return
+
+            event_name = self.headers.get("X-GitHub-Event", "")
+            if event_name == "ping":
+                self._reply(200, {"pong": True})
+                return
+            try:
+                payload = json.loads(body or b"{}")
+            except json.JSONDecodeError:
+                self._reply(400, {"error": "invalid JSON"})
+                return
+
+            event = parse_check_event(event_name, payload)
+            if event is None:
+                self._reply(202, {"ignored": event_name})
+                return
+            future = asyncio.run_coroutine_threadsafe(
+                dispatch_event(client, resolver, event),
+                loop,
+            )
+            try:
+                signalled = future.result(timeout=DISPATCH_TIMEOUT_SECONDS)
+            except Exception as exc:
+                self._reply(500, {"error": str(exc)})
+                return
+            self._reply(200, {"signalled": signalled})
+
+    return WebhookHandler
+
+
+async def connect_client(
+    temporal_address: str,
+    namespace: str,
+    *,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+) -> Client:
+    """
+    Connect with the workers' payload codecs.
+
+    Queries return and signals carry payloads like any workflow input, so the
+    receiver needs the same compression and blob store as the workers.
+    """
+    return await Client.connect(
+        temporal_address,
+        namespace=namespace,
+        data_converter=build_data_converter(
+            blob_store,
+            claim_check_bytes=claim_check_bytes,
+            compression=compression,
+        ),
+    )
+
+
+async def run_receiver(
+    *,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    temporal_address: str = "localhost:7233",
+    namespace: str = "default",
+    secret: Optional[str] = None,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+) -> None:
+    """Serve webhook deliveries until interrupted."""
+    client = await connect_client(
+        temporal_address,
+        namespace,
+        blob_store=blob_store,
+        claim_check_bytes=claim_check_bytes,
+        compression=compression,
+    )
+    resolver = WorkflowWatchResolver(client)
+    handler = _make_handler(asyncio.get_running_loop(), client, resolver, secret)
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Listening for GitHub webhooks on {host}:{port}")
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, server.serve_forever)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def replay_payloads(
+    paths: Sequence[Path],
+    *,
+    event_name: Optional[str] = None,
+    temporal_address: str = "localhost:7233",
+    namespace: str = "default",
+    dry_run: bool = False,
+    blob_store: Optional[str] = None,
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES,
+    compression: str = DEFAULT_COMPRESSION,
+) -> None:
+    """Dispatch recorded webhook payloads as if GitHub had just delivered them."""
+    client: Optional[Client] = None
+    resolver: Optional[WorkflowWatchResolver] = None
+    if not dry_run:
+        client = await connect_client(
+            temporal_address,
+            namespace,
+            blob_store=blob_store,
+            claim_check_bytes=claim_check_bytes,
+            compression=compression,
+        )
+        resolver = WorkflowWatchResolver(client)
+
+    for path in paths:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        name = event_name or infer_event_name(payload) or ""
+        event = parse_check_event(name, payload)
+        if event is None:
+            print(f"{path}: unsupported payload (event={name or 'unknown'})")
+            continue
+        if dry_run:
+            print(f"{path}: {event.to_signal_payload()}")
+            continue
+        signalled = await dispatch_event(client, resolver, event)
+        print(f"{path}: signalled {signalled or 'no workflows'}")
+
+
+def main() -> None:
+    """CLI entry point for the webhook receiver."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Receive GitHub check webhooks and signal waiting mutation workflows"
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--address",
+        default="localhost:7233",
+        help="Temporal frontend address (host:port)",
+    )
+    parser.add_argument("--namespace", default="default", help="Temporal namespace")
+    parser.add_argument(
+        "--secret",
+        default=os.environ.get("GITHUB_WEBHOOK_SECRET"),
+        help="Webhook secret (defaults to $GITHUB_WEBHOOK_SECRET)",
+    )
+    parser.add_argument(
+        "--blob-store",
+        help="Directory or s3://bucket/prefix for claim-checked payloads; must match "
+        "the workers' (default: $MUTATION_BLOB_STORE; disabled when unset)",
+    )
+    parser.add_argument(
+        "--claim-check-bytes",
+        type=int,
+        default=DEFAULT_CLAIM_CHECK_BYTES,
+        help="Payloads at least this large go to the blob store",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=DEFAULT_COMPRESSION,
+        help="Payload compression; must match the workers'",
+    )
+    parser.add_argument(
+        "--replay",
+        nargs="+",
+        type=Path,
+        help="Dispatch recorded payload files instead of serving HTTP",
+    )
+    parser.add_argument("--event", help="X-GitHub-Event name for replayed payloads")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --replay, print parsed events without signalling",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        asyncio.run(
+            replay_payloads(
+                args.replay,
+                event_name=args.event,
+                temporal_address=args.address,
+                namespace=args.namespace,
+                dry_run=args.dry_run,
+                blob_store=args.blob_store,
+                claim_check_bytes=args.claim_check_bytes,
+                compression=args.compression,
+            )
+        )
+        return
+
+    asyncio.run(
+        run_receiver(
+            host=args.host,
+            port=args.port,
+            temporal_address=args.address,
+            namespace=args.namespace,
+            secret=args.secret,
+            blob_store=args.blob_store,
+            claim_check_bytes=args.claim_check_bytes,
+            compression=args.compression,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Task queues and concurrency settings for mutation workers.
+
+By default one worker polls a single task queue and runs everything. With
+split task queues the workflows stay on the base queue and their activities
+are routed by the kind of work they do, each to ``<base queue>-<mode>``:
+
+- ``polling``: GitHub API calls and the async check waits; cheap and many.
+- ``git``: mutant staging (clone to push), campaign clones and cleanup; disk-bound.
+- ``analysis``: artifact/log parsing and result persistence; CPU-bound.
+
+Workers started with the matching ``--mode`` serve each queue, so every class
+of work can be scaled on its own.
+
+Checkouts live on the disk of the host that cloned them. Workers started with
+host affinity also poll ``<base queue>-host-<host id>``; the clone activities
+report that queue and the workflow sends the checkout's cleanup (and, for
+campaigns, the children's staging) there. Workers may also advertise repos
+they keep a warm mirror of (``<base queue>-repo-<name>``), and clones are
+offered to those first; since such a clone must be cleaned up on the host that
+made it, warm repos imply host affinity.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from temporal.workflows.codecs import DEFAULT_CLAIM_CHECK_BYTES, DEFAULT_COMPRESSION
+
+MODE_ALL = "all"
+MODE_WORKFLOWS = "workflows"
+MODE_POLLING = "polling"
+MODE_GIT = "git"
+MODE_ANALYSIS = "analysis"
+
+ACTIVITY_MODES = (MODE_POLLING, MODE_GIT, MODE_ANALYSIS)
+WORKER_MODES = (MODE_ALL, MODE_WORKFLOWS) + ACTIVITY_MODES
+# Modes that run the filesystem-bound activities and can pin them to a host.
+HOST_BOUND_MODES = (MODE_ALL, MODE_GIT)
+
+# Activity slots per worker when not configured. Check waits are async and
+# mostly asleep, clones and pushes contend for disk and network, and analysis
+# is bounded by the cores. None keeps the SDK default.
+DEFAULT_MAX_CONCURRENT_ACTIVITIES: Dict[str, Optional[int]] = {
+    MODE_ALL: None,
+    MODE_WORKFLOWS: None,
+    MODE_POLLING: 1000,
+    MODE_GIT: 8,
+    MODE_ANALYSIS: os.cpu_count() or 4,
+}
+
+
+def activity_task_queue(base_queue: str, mode: str) -> str:
+    """Task queue serving ``mode`` activities for workflows on ``base_queue``."""
+    return f"{base_queue}-{mode}"
+
+
+def host_task_queue(base_queue: str, host_id: str) -> str:
+    """Task queue of one host's checkouts."""
+    return f"{base_queue}-host-{host_id}"
+
+
+def repo_task_queue(base_queue: str, repo_name: str) -> str:
+    """Task queue served by hosts with a warm mirror of ``repo_name``."""
+    return f"{base_queue}-repo-{repo_name}"
+
+
+_host_task_queue: Optional[str] = None
+
+
+def set_host_task_queue(task_queue: Optional[str]) -> None:
+    """Record the host queue of this worker process (None without host affinity)."""
+    global _host_task_queue
+    _host_task_queue = task_queue
+
+
+def current_host_task_queue() -> Optional[str]:
+    """The host queue clone activities report, so later steps find the checkout."""
+    return _host_task_queue
+
+
+@dataclass
+class WorkerOptions:
+    """How one worker process polls Temporal and runs its activities."""
+
+    task_queue: str
+    mode: str = MODE_ALL
+    max_concurrent_activities: Optional[int] = None
+    max_concurrent_workflow_tasks: Optional[int] = None
+    # Threads for sync activities; defaults to one per activity slot.
+    activity_threads: Optional[int] = None
+    # Analysis workers only: run the analysis activities in this many processes.
+    analysis_processes: int = 0
+    # Git workers: pin each mutant's checkout work to this host's queue.
+    host_affinity: bool = False
+    host_id: Optional[str] = None
+    # Git workers: KNOWN_REPOS names this host keeps a mirror of (implies host affinity).
+    warm_repos: List[str] = field(default_factory=list)
+    # Blob store for claim-checked payloads (see codecs); must match the starter's.
+    blob_store: Optional[str] = None
+    claim_check_bytes: int = DEFAULT_CLAIM_CHECK_BYTES
+    # Payload compression (zlib, zstd or none); enable it only once every
+    # worker and starter can decompress.
+    compression: str = DEFAULT_COMPRESSION
+
+    def __post_init__(self) -> None:
+        if self.mode not in WORKER_MODES:
+            raise ValueError(
+                f"Unknown worker mode '{self.mode}'. Options: {', '.join(WORKER_MODES)}"
+            )
+        if self.analysis_processes and self.mode != MODE_ANALYSIS:
+            raise ValueError("analysis_processes only applies to analysis workers")
+        if (self.host_affinity or self.warm_repos) and self.mode not in HOST_BOUND_MODES:
+            raise ValueError("host affinity and warm repos only apply to git (or all) workers")
+
+    @property
+    def polled_task_queue(self) -> str:
+        """The queue this worker polls: the base queue, or its mode's queue."""
+        if self.mode in ACTIVITY_MODES:
+            return activity_task_queue(self.task_queue, self.mode)
+        return self.task_queue
+
+    @property
+    def host_queue(self) -> Optional[str]:
+        """This host's queue when host affinity is on (or warm repos are served)."""
+        if not (self.host_affinity or self.warm_repos):
+            return None
+        return host_task_queue(self.task_queue, self.host_id or socket.gethostname())
+
+    @property
+    def repo_queues(self) -> List[str]:
+        return [repo_task_queue(self.task_queue, name) for name in self.warm_repos]
+
+    @property
+    def activity_slots(self) -> Optional[int]:
+        if self.max_concurrent_activities is not None:
+            return self.max_concurrent_activities
+        return DEFAULT_MAX_CONCURRENT_ACTIVITIES[self.mode]
+
+    @property
+    def executor_size(self) -> Optional[int]:
+        return self.activity_threads or self.activity_slots
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "WorkerOptions":
+        """Build options from a config mapping, ignoring unset (None) values."""
+        known = {item.name for item in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown worker option(s): {', '.join(unknown)}")
+        return cls(**{key: value for key, value in data.items() if value is not None})
+
+
+def load_worker_config(path: Optional[str]) -> Dict[str, Any]:
+    """Read worker options from a JSON file; an empty dict without one."""
+    if not path:
+        return {}
+    with Path(path).open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a JSON object of worker options")
+    return data
+
+
+__all__ = [
+    "ACTIVITY_MODES",
+    "HOST_BOUND_MODES",
+    "MODE_ALL",
+    "MODE_ANALYSIS",
+    "MODE_GIT",
+    "MODE_POLLING",
+    "MODE_WORKFLOWS",
+    "WORKER_MODES",
+    "WorkerOptions",
+    "activity_task_queue",
+    "current_host_task_queue",
+    "host_task_queue",
+    "load_worker_config",
+    "repo_task_queue",
+    "set_host_task_queue",
+]
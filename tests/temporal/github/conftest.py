@@ -2,8 +2,70 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Iterator
+
+import pytest
 
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
+
+from temporal.github import client as client_module  # noqa: E402
+from temporal.github.artifact_cache import ArtifactCache, set_artifact_cache  # noqa: E402
+from temporal.github.client import GitHubClient  # noqa: E402
+from temporal.github.rate_limit import RateLimitScheduler  # noqa: E402
+from tests.temporal.github.fixtures.github_stub import GitHubStub  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_shared_client() -> Iterator[None]:
+    """Keep tests off real credentials; each test opts into a client explicitly."""
+    previous = (
+        client_module._shared_client,
+        client_module._shared_client_resolved,
+        client_module._shared_client_installed,
+    )
+    client_module.set_shared_client(None)
+    try:
+        yield
+    finally:
+        (
+            client_module._shared_client,
+            client_module._shared_client_resolved,
+            client_module._shared_client_installed,
+        ) = previous
+        client_module._repo_clients.clear()
+
+
+@pytest.fixture(autouse=True)
+def artifact_cache(tmp_path: Path) -> Iterator[ArtifactCache]:
+    """Keep cached artifacts inside the test's tmp dir."""
+    cache = ArtifactCache(tmp_path / "artifact-cache")
+    set_artifact_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_artifact_cache(None)
+
+
+@pytest.fixture
+def github_stub() -> Iterator[GitHubStub]:
+    stub = GitHubStub().start()
+    try:
+        yield stub
+    finally:
+        stub.stop()
+
+
+@pytest.fixture
+def github_client(github_stub: GitHubStub) -> Iterator[GitHubClient]:
+    client = GitHubClient(
+        "test-token",
+        api_url=github_stub.url,
+        rate_limiter=RateLimitScheduler(),
+    )
+    try:
+        yield client
+    finally:
+        client.close()
@@ -0,0 +1,124 @@
+"""
+Local stand-in for the GitHub API used by client tests.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+
+@dataclass
+class StubResponse:
+    status: int = 200
+    body: Union[bytes, str, Dict[str, Any], List[Any], None] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def encoded(self) -> bytes:
+        if self.body is None:
+            return b""
+        if isinstance(self.body, bytes):
+            return self.body
+        if isinstance(self.body, str):
+            return self.body.encode("utf-8")
+        return json.dumps(self.body).encode("utf-8")
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    path: str
+    query: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+
+Route = Union[StubResponse, Callable[[RecordedRequest], StubResponse]]
+
+
+def conditional(body: Any, etag: str) -> Route:
+    """Answer ``304`` when the request revalidates ``etag``, else ``body``."""
+    def handler(request: RecordedRequest) -> StubResponse:
+        if request.headers.get("if-none-match") == etag:
+            return StubResponse(status=304, headers={"ETag": etag})
+        return StubResponse(body=body, headers={"ETag": etag})
+
+    return handler
+
+
+class GitHubStub:
+    """Keep-alive HTTP server that answers canned responses per route."""
+
+    def __init__(self) -> None:
+        self.routes: Dict[Tuple[str, str], Route] = {}
+        self.requests: List[RecordedRequest] = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                stub.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                request = RecordedRequest(
+                    method=self.command,
+                    path=parts.path,
+                    query=parts.query,
+                    headers={key.lower(): value for key, value in self.headers.items()},
+                    body=body,
+                )
+                stub.requests.append(request)
+                route = stub.routes.get((self.command, parts.path))
+                if route is None:
+                    response = StubResponse(404, {"message": "Not Found"})
+                elif callable(route):
+                    response = route(request)
+                else:
+                    response = route
+                payload = response.encoded()
+                self.send_response(response.status)
+                for key, value in response.headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                if not any(key.lower() == "content-type" for key in response.headers):
+                    self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, method: str, path: str, route: Route) -> None:
+        self.routes[(method, path)] = route
+
+    def start(self) -> "GitHubStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
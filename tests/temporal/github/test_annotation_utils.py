@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+from temporal.github import annotation_utils, artifact_utils, check_utils
+from temporal.github.check_utils import CheckProcessor
+from temporal.github.client import GitHubClient
+from temporal.github.test_analyzer import TestAnalyzer
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+def _failed_check() -> dict:
+    return {
+        "name": "pytest",
+        "state": "FAILURE",
+        "bucket": CheckProcessor.STATUS_FAIL,
+        "link": "https://github.com/org/repo/actions/runs/55/job/66",
+        "workflow": "Tests",
+    }
+
+
+def _pr_data() -> dict:
+    return {
+        "status": {"number": 7, "url": "https://github.com/org/repo/pull/7"},
+        "checks": [_failed_check()],
+        "completed": True,
+    }
+
+
+def test_annotation_test_ids() -> None:
+    annotations = [
+        # pytest-github-actions-annotate-failures: head line, then the traceback.
+        {"annotation_level": "failure", "path": "tests/test_math.py",
+         "message": "TestAdd.test_carry[2-3]\n\nassert 5 == 6"},
+        {"annotation_level": "failure", "path": "tests/test_io.py", "title": "test_read",
+         "message": "OSError"},
+        # A problem matcher quoting the node id.
+        {"annotation_level": "failure", "path": ".github",
+         "message": "FAILED tests/test_io.py::test_write - assert False"},
+        {"annotation_level": "failure", "path": ".github",
+         "message": "Process completed with exit code 1."},
+        {"annotation_level": "warning", "path": "tests/test_math.py", "message": "test_slow"},
+    ]
+
+    assert annotation_utils.failed_tests_from_annotations(annotations) == [
+        "tests/test_math.py::TestAdd::test_carry[2-3]",
+        "tests/test_io.py::test_read",
+        "tests/test_io.py::test_write",
+    ]
+
+
+def test_analyzer_uses_annotations_before_artifacts(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/check-runs/66/annotations", StubResponse(body=[
+        {"annotation_level": "failure", "path": "tests/test_math.py",
+         "message": "test_add\n\nassert 1 == 2"},
+    ]))
+    github_stub.add("GET", "/repos/org/repo/check-runs/66", StubResponse(body={
+        "id": 66,
+        "output": {"title": "1 failed, 12 passed", "summary": ""},
+    }))
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+
+    with mock.patch.object(
+        artifact_utils, "get_shared_client", return_value=github_client,
+    ), mock.patch.object(
+        CheckProcessor, "download_check_junit_artifacts",
+    ) as download_mock:
+        analysis = analyzer.analyze_pr_results(_pr_data(), repo="org/repo")
+
+    download_mock.assert_not_called()
+    failure = analysis["test_failures"][0]
+    assert failure["failed_tests"] == ["tests/test_math.py::test_add"]
+    assert failure["failure_source"] == "annotations"
+    assert [request.path for request in github_stub.requests] == [
+        "/repos/org/repo/check-runs/66/annotations",
+        "/repos/org/repo/check-runs/66",
+    ]
+
+
+def test_capped_or_partial_annotations_fall_through_to_artifacts(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    capped = [
+        {"annotation_level": "failure", "path": "tests/test_math.py",
+         "message": f"test_case_{index}\n\nassert False"}
+        for index in range(annotation_utils.ANNOTATIONS_PER_STEP_CAP)
+    ]
+
+    with mock.patch.object(
+        artifact_utils, "get_shared_client", return_value=github_client,
+    ), mock.patch.object(
+        CheckProcessor, "download_check_junit_artifacts", return_value=[],
+    ) as download_mock, mock.patch.object(
+        CheckProcessor, "get_failed_check_details", return_value={},
+    ):
+        # Ten annotations: GitHub may have dropped the rest.
+        github_stub.add("GET", "/repos/org/repo/check-runs/66/annotations",
+                        StubResponse(body=capped))
+        github_stub.add("GET", "/repos/org/repo/check-runs/66", StubResponse(body={
+            "id": 66, "output": {"title": "", "summary": ""},
+        }))
+        TestAnalyzer(tmp_path, tmp_path).analyze_pr_results(_pr_data(), repo="org/repo")
+        # Under the cap, but the output reports more failures than are annotated.
+        github_stub.add("GET", "/repos/org/repo/check-runs/66/annotations",
+                        StubResponse(body=capped[:2]))
+        github_stub.add("GET", "/repos/org/repo/check-runs/66", StubResponse(body={
+            "id": 66, "output": {"title": "=== 3 failed, 1 error in 2.1s ===", "summary": ""},
+        }))
+        TestAnalyzer(tmp_path, tmp_path).analyze_pr_results(_pr_data(), repo="org/repo")
+
+    assert download_mock.call_count == 2
+    assert annotation_utils.failure_count_from_output(
+        {"title": "", "summary": "2 failing tests\n=== 5 failed ==="}
+    ) == 2
+
+
+def test_analyzer_reads_output_summary_then_falls_back(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/check-runs/66/annotations", StubResponse(body=[
+        {"annotation_level": "failure", "path": ".github",
+         "message": "Process completed with exit code 1."},
+    ]))
+    github_stub.add("GET", "/repos/org/repo/check-runs/66", StubResponse(body={
+        "id": 66,
+        "output": {"title": "1 failed", "summary": "FAILED tests/test_io.py::test_read"},
+    }))
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+
+    with mock.patch.object(
+        artifact_utils, "get_shared_client", return_value=github_client,
+    ), mock.patch.object(
+        check_utils, "get_shared_client", return_value=github_client,
+    ), mock.patch.object(
+        CheckProcessor, "download_check_junit_artifacts", return_value=[],
+    ) as download_mock:
+        analysis = analyzer.analyze_pr_results(_pr_data(), repo="org/repo")
+        assert analysis["test_failures"][0]["failure_source"] == "check_run_output"
+        download_mock.assert_not_called()
+
+        github_stub.add("GET", "/repos/org/repo/check-runs/66", StubResponse(body={
+            "id": 67,
+            "output": {"title": "Tests failed", "summary": ""},
+        }))
+        analyzer.analyze_pr_results(_pr_data(), repo="org/repo")
+
+    # Nothing identified a failing test, so the artifacts are consulted.
+    download_mock.assert_called_once()
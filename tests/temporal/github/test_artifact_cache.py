@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from temporal.github import artifact_utils
+from temporal.github.artifact_cache import ArtifactCache
+from temporal.github.client import GitHubClient
+from temporal.github.test_analyzer import TestAnalyzer
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+JUNIT_FIXTURE = FIXTURES_DIR / "pytest_sample_junit.xml"
+
+
+def _junit_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("junit.xml", JUNIT_FIXTURE.read_bytes())
+    return buffer.getvalue()
+
+
+def test_reanalysis_reuses_cached_archive_and_parsed_results(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/actions/runs/5/artifacts", StubResponse(
+        body={"artifacts": [{"id": 8, "name": "pytest-junit", "digest": "sha256:abc"}]},
+        headers={"ETag": '"artifacts-v1"'},
+    ))
+    github_stub.add("GET", "/repos/org/repo/actions/artifacts/8/zip", StubResponse(
+        body=_junit_zip(), headers={"Content-Type": "application/zip"},
+    ))
+    check = {
+        "name": "pytest",
+        "bucket": "fail",
+        "link": "https://github.com/org/repo/actions/runs/5/job/1",
+    }
+    pr_data = {"status": {"number": 1}, "checks": [check], "completed": True}
+
+    with mock.patch.object(artifact_utils, "get_shared_client", return_value=github_client):
+        first = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path).analyze_pr_results(
+            pr_data, repo="org/repo",
+        )
+        # A fresh analyzer (e.g. a retried activity) has no in-memory memo.
+        with mock.patch.object(TestAnalyzer, "_parse_junit_file") as parse_mock:
+            second = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path).analyze_pr_results(
+                pr_data, repo="org/repo",
+            )
+
+    parse_mock.assert_not_called()
+    assert second["test_failures"] == first["test_failures"]
+    assert first["test_failures"][0]["failed_tests"] == ["tests.test_example::test_fail"]
+    downloads = [r for r in github_stub.requests if r.path.endswith("/zip")]
+    assert len(downloads) == 1
+
+
+def test_evict_drops_expired_then_least_recently_used(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=150, ttl_seconds=3600)
+    keys = []
+    for index in range(3):
+        key = cache.key_for("org/repo", {"id": index})
+        source = tmp_path / f"{index}.zip"
+        source.write_bytes(b"x" * 100)
+        with cache.lock(key):
+            cache.store_archive(key, source)
+        keys.append(key)
+    old = time.time() - 60
+    os.utime(cache.entry_dir(keys[0]), (old, old))
+    (cache.entry_dir(keys[2]) / ".created").write_text(str(time.time() - 7200))
+
+    stats = cache.evict()
+
+    assert cache.archive(keys[2]) is None
+    assert cache.archive(keys[0]) is None
+    assert cache.archive(keys[1]) is not None
+    assert stats["removed"] == 2
+
+
+def test_evict_counts_extracted_files_and_skips_held_entries(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=700, ttl_seconds=3600)
+    keys = []
+    for index in range(3):
+        key = cache.key_for("org/repo", {"id": index})
+        source = tmp_path / f"{index}.zip"
+        source.write_bytes(b"x" * 100)
+        with cache.lock(key) as entry:
+            cache.store_archive(key, source)
+            (entry / "extracted" / "reports").mkdir(parents=True)
+            (entry / "extracted" / "reports" / "junit.xml").write_bytes(b"x" * 200)
+        os.utime(entry, (time.time() - 60 + index, time.time() - 60 + index))
+        keys.append(key)
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_oldest() -> None:
+        with cache.lock(keys[0]):
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_oldest)
+    holder.start()
+    held.wait()
+    try:
+        stats = cache.evict()
+    finally:
+        release.set()
+        holder.join()
+
+    # Over 900 bytes on disk against a 700 byte quota: the held oldest entry is
+    # skipped and the next least recently used one goes instead.
+    assert stats["removed"] == 1
+    assert cache.archive(keys[0]) is not None
+    assert not cache.entry_dir(keys[1]).exists()
+    assert cache.archive(keys[2]) is not None
+
+
+def test_download_without_temp_dir_does_not_leak(tmp_path: Path, monkeypatch) -> None:
+    archive = tmp_path / "src.zip"
+    archive.write_bytes(_junit_zip())
+    calls = []
+
+    def fake_fetch(run_id, name, repo_path, repo, archive_dir, artifact_id, client):
+        calls.append(name)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        target = archive_dir / f"{name}.zip"
+        target.write_bytes(archive.read_bytes())
+        return target
+
+    monkeypatch.setattr(artifact_utils, "_fetch_archive", fake_fetch)
+    temp_root = Path(os.environ.get("TMPDIR", "/tmp"))
+    before = set(temp_root.glob("artifact-download-*"))
+
+    for _ in range(2):
+        download = artifact_utils.download_artifact_archive(
+            "5", "pytest-junit", tmp_path, repo="org/repo", artifact_id=8,
+        )
+
+    assert calls == ["pytest-junit"]
+    assert download.junit_members == ["junit.xml"]
+    assert download.cache_key is not None
+    assert not (download.archive_path.parent / "staging").exists()
+    assert set(temp_root.glob("artifact-download-*")) == before
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
 from pathlib import Path
+from unittest import mock
 
 from temporal.github import artifact_utils
 
@@ -48,3 +50,58 @@ def test_resolve_archive_path_falls_back_to_latest_zip(tmp_path: Path) -> None:
 
     resolved = artifact_utils._resolve_archive_path(archive_dir, "missing-name")
     assert resolved == newer
+
+
+def test_artifact_filter_uses_listing_metadata() -> None:
+    artifact_filter = artifact_utils.ArtifactFilter()
+
+    assert artifact_filter.accepts({"name": "pytest-junit", "size_in_bytes": 2048})
+    assert not artifact_filter.accepts({"name": "Coverage-Report", "size_in_bytes": 10})
+    assert not artifact_filter.accepts({"name": "wheels", "size_in_bytes": 10})
+    assert not artifact_filter.accepts({"name": "junit", "sizeInBytes": 500 * 1024 * 1024})
+    assert not artifact_filter.accepts({"name": "junit", "expired": True})
+    only_junit = artifact_utils.ArtifactFilter.from_config({"include": ["*junit*"]})
+    assert not only_junit.accepts({"name": "test-logs"})
+
+
+def test_download_all_junit_artifacts_is_concurrent_and_ordered(tmp_path: Path) -> None:
+    artifacts = [
+        {"id": 1, "name": "junit-a", "size_in_bytes": 10},
+        {"id": 2, "name": "coverage", "size_in_bytes": 10},
+        {"id": 3, "name": "junit-b", "size_in_bytes": 10},
+        {"id": 4, "name": "logs", "size_in_bytes": 10},
+    ]
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_download(*, run_id, artifact_name, base_temp_dir, **kwargs):
+        with lock:
+            active.append(artifact_name)
+            peak.append(len(active))
+        # Finish out of order so the result order is not download order.
+        time.sleep(0.05 if artifact_name == "junit-a" else 0.01)
+        with lock:
+            active.remove(artifact_name)
+        junit_paths = [] if artifact_name == "logs" else [tmp_path / f"{artifact_name}.xml"]
+        return artifact_utils.ArtifactDownload(
+            name=artifact_name,
+            archive_path=base_temp_dir / f"{artifact_name}.zip",
+            extract_path=base_temp_dir,
+            junit_paths=junit_paths,
+        )
+
+    with mock.patch.object(
+        artifact_utils, "list_run_artifacts", return_value=artifacts,
+    ), mock.patch.object(
+        artifact_utils, "download_artifact_archive", side_effect=fake_download,
+    ) as download_mock:
+        downloads = artifact_utils.download_all_junit_artifacts(
+            "1", tmp_path, repo="org/repo", base_temp_dir=tmp_path / "work",
+        )
+
+    assert [download.name for download in downloads] == ["junit-a", "junit-b"]
+    assert sorted(call.kwargs["artifact_name"] for call in download_mock.call_args_list) == [
+        "junit-a", "junit-b", "logs",
+    ]
+    assert max(peak) > 1
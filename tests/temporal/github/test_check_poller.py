@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from temporal.github.check_poller import CheckWatch, SharedCheckPoller
+from temporal.github.client import GitHubClient
+from temporal.github.pr_manager import PRManager
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+def _pull_request(number: int, rollup_state: str) -> dict:
+    return {
+        "number": number,
+        "title": f"mutant {number}",
+        "state": "OPEN",
+        "mergeable": "MERGEABLE",
+        "url": f"https://github.com/org/repo/pull/{number}",
+        "commits": {"nodes": [{"commit": {"statusCheckRollup": {
+            "state": rollup_state,
+            "contexts": {"pageInfo": {"hasNextPage": False}, "nodes": []},
+        }}}]},
+    }
+
+
+def test_waiters_share_batched_queries(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    graphql_calls = []
+
+    def graphql(request):
+        graphql_calls.append(request)
+        numbers = [int(n) for n in re.findall(r"pr(\d+): pullRequest", request.json()["query"])]
+        # Stay pending until every waiter has had time to register.
+        state = "SUCCESS" if len(graphql_calls) >= 4 else "PENDING"
+        return StubResponse(body={"data": {"repository": {
+            f"pr{number}": _pull_request(number, state) for number in numbers
+        }}})
+
+    github_stub.add("POST", "/graphql", graphql)
+    poller = SharedCheckPoller(github_client, interval_seconds=0.05)
+    manager = PRManager(tmp_path, client=github_client)
+    results = {}
+
+    def wait(pr_number: str) -> None:
+        results[pr_number] = manager.wait_for_checks(
+            pr_number,
+            timeout_seconds=10,
+            repo="org/repo",
+            poller=poller,
+        )
+
+    threads = [threading.Thread(target=wait, args=(str(n),)) for n in (11, 12, 13)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=15)
+
+    assert {pr: result["completed"] for pr, result in results.items()} == {
+        "11": True,
+        "12": True,
+        "13": True,
+    }
+    final_query = graphql_calls[-1].json()["query"]
+    assert all(f"pr{n}: pullRequest" in final_query for n in (11, 12, 13))
+    # One batched query per interval, not one (or two) per waiting PR.
+    assert len(graphql_calls) == poller.batches_fetched
+
+
+def test_missing_pull_request_reports_error_to_waiter(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("POST", "/graphql", StubResponse(body={"data": {"repository": {}}}))
+    poller = SharedCheckPoller(github_client, interval_seconds=60)
+
+    watch = poller.watch("org/repo", "99")
+    try:
+        update = poller.wait_for_update(watch, 0, timeout=5)
+    finally:
+        poller.unwatch(watch)
+
+    assert update is not None
+    assert isinstance(update.error, LookupError)
+    assert update.snapshot is None
+
+
+def test_rescheduled_watch_is_skipped_until_due() -> None:
+    client = mock.Mock()
+    client.get_pr_snapshots.return_value = {"5": {"status": {}, "checks": []}}
+    poller = SharedCheckPoller(client, interval_seconds=1)
+    watch = CheckWatch(repo="org/repo", pr_number="5", watchers=1)
+    poller._watches[("org/repo", "5")] = watch
+
+    poller.poll_once()
+    poller.reschedule(watch, 300)
+    poller.reschedule(watch, 600)  # the earlier request wins
+    poller.poll_once()
+
+    assert client.get_pr_snapshots.call_count == 1
+    assert watch.version == 1
+    assert 290 < watch.due_at - time.monotonic() <= 300
+
+
+def test_async_waiters_are_woken_by_the_poller_thread() -> None:
+    client = mock.Mock()
+    client.get_pr_snapshots.return_value = {
+        "7": {"status": {}, "checks": []},
+        "8": {"status": {}, "checks": []},
+    }
+    poller = SharedCheckPoller(client, interval_seconds=0.05)
+
+    async def wait(pr_number: str):
+        watch = poller.watch("org/repo", pr_number)
+        try:
+            return await poller.wait_for_update_async(watch, 0, timeout=5)
+        finally:
+            poller.unwatch(watch)
+
+    async def main():
+        return await asyncio.gather(wait("7"), wait("8"))
+
+    updates = asyncio.run(main())
+
+    assert [update.pr_number for update in updates] == ["7", "8"]
+    assert all(update.version >= 1 and not update.listeners for update in updates)
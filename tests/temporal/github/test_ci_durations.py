@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+from temporal.github import ci_durations
+from temporal.github.ci_durations import (
+    DEFAULT_NO_CHECKS_CUTOFF_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    CIDurationModel,
+    PollSchedule,
+)
+from temporal.github.pr_manager import PRManager
+
+
+REPO = "org/repo"
+
+
+def _completed_run(duration_minutes: int, first_seen: int = 20) -> dict:
+    return {
+        "completed": True,
+        "checks_first_seen_seconds": first_seen,
+        "checks": [
+            {
+                "name": "lint",
+                "state": "SUCCESS",
+                "startedAt": "2025-10-18T10:00:00Z",
+                "completedAt": "2025-10-18T10:01:00Z",
+            },
+            {
+                "name": "tests",
+                "state": "FAILURE",
+                "startedAt": "2025-10-18T10:00:30Z",
+                "completedAt": f"2025-10-18T10:{duration_minutes:02d}:00Z",
+            },
+        ],
+    }
+
+
+def test_model_learns_expected_duration_and_cutoff(tmp_path: Path) -> None:
+    model = CIDurationModel(tmp_path)
+    assert model.expected_duration(REPO) is None
+    assert model.no_checks_cutoff(REPO) == DEFAULT_NO_CHECKS_CUTOFF_SECONDS
+
+    for minutes, first_seen in ((4, 20), (5, 30), (40, 90)):
+        model.record(REPO, _completed_run(minutes, first_seen))
+    model.record(REPO, {"completed": False, "timeout": True, "checks": []})
+    model.record(REPO, {"completed": True, "no_checks_configured": True, "checks": []})
+
+    # Median of 240/300/2400 seconds plus the median first-check delay.
+    assert model.expected_duration(REPO) == 300 + 30
+    assert model.no_checks_cutoff(REPO) == 180
+    assert model.no_checks_cutoff(REPO, configured=600) == 600
+    assert len(model.load(REPO)["durations"]) == 3
+
+
+def test_schedule_sleeps_until_expected_then_backs_off() -> None:
+    assert PollSchedule().next_delay(0) == DEFAULT_POLL_INTERVAL_SECONDS
+
+    schedule = PollSchedule(expected_seconds=300, jitter=0)
+    assert schedule.next_delay(0) == 290
+    # Without any checks yet, wake in time to apply the no-checks cutoff.
+    assert schedule.next_delay(0, checks_seen=False) == DEFAULT_NO_CHECKS_CUTOFF_SECONDS + 1
+    assert [schedule.next_delay(300) for _ in range(6)] == [5, 10, 20, 40, 60, 60]
+
+    jittered = PollSchedule(expected_seconds=10, jitter=0.2)
+    assert all(4 <= jittered.next_delay(100) <= 72 for _ in range(10))
+
+
+def test_wait_uses_schedule_delays(tmp_path: Path) -> None:
+    manager = PRManager(tmp_path)
+    pending = {"status": {"statusCheckRollup": {"state": "PENDING"}}, "checks": []}
+    done = _completed_run(4)
+    snapshots = [pending, pending, {"status": {"statusCheckRollup": {"state": "FAILURE"}},
+                                    "checks": done["checks"]}]
+    schedule = PollSchedule(expected_seconds=None, no_checks_cutoff=600)
+
+    with mock.patch.object(manager, "get_pr_snapshot", side_effect=snapshots), \
+            mock.patch.object(schedule, "next_delay", return_value=0) as next_delay, \
+            mock.patch.object(ci_durations.random, "uniform", return_value=1):
+        result = manager.wait_for_checks("7", timeout_seconds=60, schedule=schedule)
+
+    assert result["completed"] is True
+    assert "no_checks_configured" not in result
+    assert result["checks_first_seen_seconds"] == 0
+    assert next_delay.call_count == 2
+    assert next_delay.call_args.kwargs == {"checks_seen": False}
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from temporal.github import artifact_utils
+from temporal.github.check_utils import CheckProcessor
+from temporal.github.client import GitHubAPIError, GitHubClient
+from temporal.github.pr_manager import PRManager
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+JUNIT_FIXTURE = FIXTURES_DIR / "pytest_sample_junit.xml"
+
+
+def _checks_payload(nodes: list) -> dict:
+    return {
+        "data": {
+            "repository": {
+                "pullRequest": {
+                    "commits": {
+                        "nodes": [
+                            {
+                                "commit": {
+                                    "statusCheckRollup": {
+                                        "contexts": {
+                                            "pageInfo": {"hasNextPage": False},
+                                            "nodes": nodes,
+                                        }
+                                    }
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+
+
+def test_requests_reuse_one_keep_alive_connection(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/actions/runs/1/artifacts", StubResponse(
+        body={"artifacts": [{"id": 7, "name": "pytest-junit"}]},
+    ))
+
+    for _ in range(5):
+        artifacts = github_client.list_run_artifacts("org/repo", "1")
+
+    assert artifacts == [{"id": 7, "name": "pytest-junit"}]
+    assert github_stub.connections == 1
+    assert github_client.connections_opened() == 1
+    assert github_stub.requests[0].headers["authorization"] == "Bearer test-token"
+
+
+def test_pr_snapshot_maps_graphql_contexts_to_gh_shape(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("POST", "/graphql", StubResponse(body=_checks_payload([
+        {
+            "__typename": "CheckRun",
+            "name": "pytest (3.11)",
+            "status": "COMPLETED",
+            "conclusion": "FAILURE",
+            "startedAt": "2025-01-01T00:00:00Z",
+            "completedAt": "2025-01-01T00:02:00Z",
+            "detailsUrl": "https://github.com/org/repo/actions/runs/55/job/66",
+            "title": "1 failing test",
+            "checkSuite": {"workflowRun": {"databaseId": 55, "workflow": {"name": "Tests"}}},
+        },
+        {
+            "__typename": "CheckRun",
+            "name": "lint",
+            "status": "IN_PROGRESS",
+            "conclusion": None,
+            "startedAt": "2025-01-01T00:00:00Z",
+            "completedAt": None,
+            "detailsUrl": "",
+            "title": None,
+            "checkSuite": None,
+        },
+        {
+            "__typename": "CheckRun",
+            "name": "docs",
+            "status": "COMPLETED",
+            "conclusion": "STALE",
+            "startedAt": "2025-01-01T00:00:00Z",
+            "completedAt": "2025-01-15T00:00:00Z",
+            "detailsUrl": "",
+            "title": None,
+            "checkSuite": None,
+        },
+        {
+            "__typename": "StatusContext",
+            "context": "ci/legacy",
+            "state": "SUCCESS",
+            "targetUrl": "https://ci.example/1",
+            "description": "ok",
+            "createdAt": "2025-01-01T00:01:00Z",
+        },
+    ])))
+
+    checks = github_client.get_pr_snapshot("org/repo", "42")["checks"]
+
+    assert [check["bucket"] for check in checks] == ["fail", "pending", "skipping", "pass"]
+    assert checks[0]["workflow"] == "Tests"
+    assert checks[0]["link"].endswith("/runs/55/job/66")
+    assert checks[1]["state"] == "IN_PROGRESS"
+    assert checks[2]["state"] == "STALE"
+    variables = github_stub.requests[0].json()["variables"]
+    assert variables == {"owner": "org", "name": "repo", "number": 42}
+
+
+def test_graphql_errors_raise(github_stub: GitHubStub, github_client: GitHubClient) -> None:
+    github_stub.add("POST", "/graphql", StubResponse(body={"errors": [{"message": "bad"}]}))
+
+    with pytest.raises(GitHubAPIError, match="bad"):
+        github_client.get_pr_snapshot("org/repo", "1")
+
+
+def test_paginate_follows_link_headers(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    def artifacts(request):
+        if "page=2" in request.query:
+            return StubResponse(body={"artifacts": [{"id": 2}]})
+        return StubResponse(
+            body={"artifacts": [{"id": 1}]},
+            headers={"Link": f'<{github_stub.url}{request.path}?page=2>; rel="next"'},
+        )
+
+    github_stub.add("GET", "/repos/org/repo/actions/runs/9/artifacts", artifacts)
+
+    assert github_client.list_run_artifacts("org/repo", "9") == [{"id": 1}, {"id": 2}]
+
+
+def test_pr_manager_uses_client_for_pull_request_lifecycle(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("POST", "/repos/org/repo/pulls", StubResponse(
+        201, {"number": 12, "html_url": "https://github.com/org/repo/pull/12"},
+    ))
+    github_stub.add("PATCH", "/repos/org/repo/pulls/12", StubResponse(body={"state": "closed"}))
+    manager = PRManager(tmp_path, client=github_client)
+    manager._current_branch = lambda: "mutation-branch"
+
+    created = manager.create_pull_request("title", "body", base_branch="main", repo="org/repo")
+    manager.close_pull_request(created["number"], repo="org/repo")
+
+    assert created == {"url": "https://github.com/org/repo/pull/12", "number": "12"}
+    assert github_stub.requests[0].json() == {
+        "title": "title",
+        "body": "body",
+        "head": "mutation-branch",
+        "base": "main",
+    }
+    assert github_stub.requests[1].json() == {"state": "closed"}
+
+
+def test_early_verdict_stops_on_first_failed_test_check() -> None:
+    checks = [
+        {"name": "lint", "state": "FAILURE", "bucket": "fail"},
+        {"name": "unit-tests", "state": "FAILURE", "bucket": "fail"},
+        {"name": "integration-tests", "state": "IN_PROGRESS", "bucket": "pending"},
+    ]
+
+    assert PRManager.evaluate_checks({}, checks, elapsed_time=30) is None
+    result = PRManager.evaluate_checks({}, checks, elapsed_time=30, early_verdict=True)
+
+    assert result["completed"] is True
+    assert result["early_verdict"] is True
+    assert result["killed_by"] == "unit-tests"
+    # A failed non-test check alone is not a verdict.
+    assert PRManager.evaluate_checks({}, checks[::2], 30, early_verdict=True) is None
+
+
+def test_cancel_workflow_runs_skips_finished_runs(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/actions/runs", StubResponse(body={"workflow_runs": [
+        {"id": 1, "status": "in_progress"},
+        {"id": 2, "status": "completed"},
+        {"id": 3, "status": "queued"},
+    ]}))
+    github_stub.add("POST", "/repos/org/repo/actions/runs/1/cancel", StubResponse(202, {}))
+    github_stub.add("POST", "/repos/org/repo/actions/runs/3/cancel", StubResponse(
+        409, {"message": "Cannot cancel a workflow run that is completed."},
+    ))
+    manager = PRManager(tmp_path, client=github_client)
+
+    assert manager.cancel_workflow_runs("mutation-branch", repo="org/repo") == ["1"]
+    assert "branch=mutation-branch" in github_stub.requests[0].query
+    assert [request.path for request in github_stub.requests[1:]] == [
+        "/repos/org/repo/actions/runs/1/cancel",
+        "/repos/org/repo/actions/runs/3/cancel",
+    ]
+
+
+def test_artifact_download_follows_redirect_without_token(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("junit.xml", JUNIT_FIXTURE.read_text(encoding="utf-8"))
+
+    blob_client = GitHubClient("test-token", api_url=f"{github_stub.url}/api/v3")
+    github_stub.add("GET", "/api/v3/repos/org/repo/actions/runs/3/artifacts", StubResponse(
+        body={"artifacts": [{"id": 8, "name": "pytest-junit"}]},
+    ))
+    github_stub.add("GET", "/api/v3/repos/org/repo/actions/artifacts/8/zip", StubResponse(
+        302, headers={"Location": f"{github_stub.url.replace('127.0.0.1', 'localhost')}/blob"},
+    ))
+    github_stub.add("GET", "/blob", StubResponse(
+        body=buffer.getvalue(),
+        headers={"Content-Type": "application/zip"},
+    ))
+
+    try:
+        downloads = artifact_utils.download_all_junit_artifacts(
+            run_id="3",
+            repo_path=tmp_path,
+            repo="org/repo",
+            base_temp_dir=tmp_path / "work",
+            client=blob_client,
+        )
+    finally:
+        blob_client.close()
+
+    assert [download.name for download in downloads] == ["pytest-junit"]
+    # Reports are read from the zip; nothing is extracted to disk.
+    assert downloads[0].junit_members == ["junit.xml"]
+    assert downloads[0].extract_path is None
+    assert not (tmp_path / "work" / "extracted").exists()
+    blob_request = github_stub.requests[-1]
+    assert blob_request.path == "/blob"
+    assert "authorization" not in blob_request.headers
+
+
+def test_pr_snapshot_is_one_round_trip_and_feeds_check_summary(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    payload = _checks_payload([
+        {
+            "__typename": "CheckRun",
+            "name": "pytest (3.11)",
+            "status": "COMPLETED",
+            "conclusion": "SUCCESS",
+            "startedAt": "2025-01-01T00:00:00Z",
+            "completedAt": "2025-01-01T00:02:00Z",
+            "detailsUrl": "https://github.com/org/repo/actions/runs/55/job/66",
+            "title": "",
+            "checkSuite": {"workflowRun": {"databaseId": 55, "workflow": {"name": "Tests"}}},
+        },
+    ])
+    pull_request = payload["data"]["repository"]["pullRequest"]
+    pull_request.update(
+        {"number": 42, "title": "t", "state": "OPEN", "mergeable": "MERGEABLE", "url": "u"}
+    )
+    pull_request["commits"]["nodes"][0]["commit"]["statusCheckRollup"]["state"] = "SUCCESS"
+    github_stub.add("POST", "/graphql", StubResponse(body=payload))
+    manager = PRManager(tmp_path, client=github_client)
+
+    result = manager.wait_for_checks("42", timeout_seconds=30, repo="org/repo")
+    repeat = manager.get_pr_snapshot("42", repo="org/repo")
+
+    # One query per poll, status and checks together.
+    assert [request.path for request in github_stub.requests] == ["/graphql", "/graphql"]
+    assert repeat == {"status": result["status"], "checks": result["checks"]}
+    assert result["completed"] is True
+    assert result["status"]["statusCheckRollup"] == {"state": "SUCCESS"}
+    assert result["checks"][0]["runId"] == "55"
+    assert result["checks"][0]["workflow"] == "Tests"
+    summary = CheckProcessor.get_check_summary(result["checks"])
+    assert summary["passed_checks"] == 1
+    normalized = CheckProcessor.normalize_check(result["checks"][0])
+    assert CheckProcessor.get_check_run_id(normalized) == "55"
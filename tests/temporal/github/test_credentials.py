@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from temporal.github import client as client_module
+from temporal.github.client import GitHubClient
+from temporal.github.credentials import (
+    AppInstallationCredential,
+    CredentialPool,
+    TokenCredential,
+    load_credential,
+)
+from temporal.github.known_repos import KNOWN_REPOS
+from temporal.github.pr_manager import PRManager
+from temporal.github.rate_limit import RateLimitScheduler
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+def _status_payload(number: int) -> dict:
+    return {"data": {"repository": {"pullRequest": {
+        "number": number,
+        "title": "mutant",
+        "state": "OPEN",
+        "mergeable": "MERGEABLE",
+        "url": f"https://github.com/org/repo/pull/{number}",
+        "commits": {"nodes": []},
+    }}}}
+
+
+def test_pool_spreads_prs_and_sticks_per_pr(tmp_path: Path, github_stub: GitHubStub) -> None:
+    def graphql(request):
+        return StubResponse(body=_status_payload(request.json()["variables"]["number"]))
+
+    github_stub.add("POST", "/graphql", graphql)
+    scheduler = RateLimitScheduler()
+    pool = CredentialPool([TokenCredential("token-a"), TokenCredential("token-b")], scheduler)
+    client = GitHubClient(credentials=pool, api_url=github_stub.url, rate_limiter=scheduler)
+    manager = PRManager(tmp_path, client=client)
+
+    try:
+        for pr_number in ("1", "2", "1", "2", "1"):
+            manager.get_pr_snapshot(pr_number, repo="org/repo")
+    finally:
+        client.close()
+
+    tokens_by_pr: dict = {}
+    for request in github_stub.requests:
+        tokens_by_pr.setdefault(request.json()["variables"]["number"], set()).add(
+            request.headers["authorization"]
+        )
+    assert tokens_by_pr == {1: {"Bearer token-a"}, 2: {"Bearer token-b"}}
+    metrics = client.rate_limit_metrics()
+    assert sorted(credential["graphql"]["requests"] for credential in metrics.values()) == [2, 3]
+
+
+def test_blocked_credential_releases_sticky_prs() -> None:
+    scheduler = RateLimitScheduler()
+    first, second = TokenCredential("token-a"), TokenCredential("token-b")
+    pool = CredentialPool([first, second], scheduler)
+
+    assert pool.select("org/repo#1") is first
+    scheduler.throttle(first.credential_id, "core", 429, {"retry-after": "120"})
+
+    assert pool.select("org/repo#1") is second
+    assert pool.select() is second
+
+
+def test_load_credential_references(tmp_path: Path) -> None:
+    token_file = tmp_path / "token"
+    token_file.write_text("file-token\n", encoding="utf-8")
+
+    with mock.patch.dict("os.environ", {"POOL_TOKEN": "env-token", "APP_KEY": "pem"}):
+        assert load_credential("env:POOL_TOKEN").get_token() == "env-token"
+        assert load_credential("env:UNSET_POOL_TOKEN") is None
+        app = load_credential({"app_id": 1, "installation_id": 2, "private_key": "env:APP_KEY"})
+    assert load_credential(f"file:{token_file}").get_token() == "file-token"
+    assert isinstance(app, AppInstallationCredential)
+    assert app.credential_id == "app:1/2"
+    with pytest.raises(ValueError):
+        load_credential("plain-token")
+
+
+def test_app_installation_token_is_minted_once(github_stub: GitHubStub) -> None:
+    github_stub.add("POST", "/app/installations/2/access_tokens", StubResponse(
+        status=201,
+        body={"token": "ghs_installation", "expires_at": "2999-01-01T00:00:00Z"},
+    ))
+    github_stub.add("GET", "/repos/org/repo/actions/runs/1/artifacts", StubResponse(
+        body={"artifacts": []},
+    ))
+    scheduler = RateLimitScheduler()
+    app = AppInstallationCredential(1, 2, "pem")
+    client = GitHubClient(
+        credentials=CredentialPool([app], scheduler),
+        api_url=github_stub.url,
+        rate_limiter=scheduler,
+    )
+
+    try:
+        with mock.patch.object(AppInstallationCredential, "_app_jwt", return_value="app-jwt"):
+            for _ in range(2):
+                client.list_run_artifacts("org/repo", "1")
+    finally:
+        client.close()
+
+    assert [request.path for request in github_stub.requests] == [
+        "/app/installations/2/access_tokens",
+        "/repos/org/repo/actions/runs/1/artifacts",
+        "/repos/org/repo/actions/runs/1/artifacts",
+    ]
+    assert github_stub.requests[0].headers["authorization"] == "Bearer app-jwt"
+    assert github_stub.requests[-1].headers["authorization"] == "Bearer ghs_installation"
+
+
+def test_shared_client_uses_repo_credential_pool() -> None:
+    config = {
+        "name": "pooled",
+        "url": "https://github.com/org/pooled",
+        "base_branch": "main",
+        "repo_id": "org/pooled",
+        "credentials": ["env:POOL_TOKEN_A", "env:POOL_TOKEN_B", "env:POOL_TOKEN_UNSET"],
+    }
+    client_module._shared_client_installed = False
+    env = {"POOL_TOKEN_A": "a", "POOL_TOKEN_B": "b"}
+    with mock.patch.dict(KNOWN_REPOS, {"pooled": config}), mock.patch.dict("os.environ", env):
+        pooled = client_module.get_shared_client("org/pooled")
+        assert client_module.get_shared_client("ORG/pooled") is pooled
+        assert client_module.get_shared_client("org/other") is None
+
+    assert pooled is not None
+    assert [c.get_token() for c in pooled.credentials.credentials] == ["a", "b"]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from temporal.github.client import GitHubClient, GitHubResponse
+from temporal.github.http_cache import ConditionalCache
+from tests.temporal.github.fixtures.github_stub import GitHubStub, conditional
+
+
+SHA = "abc123"
+
+
+def test_unchanged_pr_status_is_served_from_cache(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/pulls/7", conditional({
+        "number": 7,
+        "title": "mutant",
+        "state": "open",
+        "mergeable": True,
+        "html_url": "https://github.com/org/repo/pull/7",
+        "head": {"sha": SHA},
+    }, '"pr-v1"'))
+    github_stub.add("GET", f"/repos/org/repo/commits/{SHA}/check-runs", conditional({
+        "total_count": 1,
+        "check_runs": [{
+            "name": "pytest",
+            "status": "completed",
+            "conclusion": "failure",
+            "started_at": "2025-01-01T00:00:00Z",
+            "completed_at": "2025-01-01T00:02:00Z",
+            "details_url": "https://github.com/org/repo/actions/runs/55/job/66",
+            "output": {"title": "1 failing test"},
+        }],
+    }, '"runs-v1"'))
+    github_stub.add("GET", f"/repos/org/repo/commits/{SHA}/status", conditional({
+        "state": "success",
+        "statuses": [{"context": "ci/legacy", "state": "success", "target_url": "",
+                      "description": "ok", "created_at": "2025-01-01T00:01:00Z"}],
+    }, '"status-v1"'))
+    github_stub.add("GET", "/repos/org/repo/actions/runs", conditional({
+        "total_count": 1,
+        "workflow_runs": [{"id": 55, "name": "Tests"}],
+    }, '"actions-v1"'))
+
+    first = github_client.get_pr_status("org/repo", "7")
+    second = github_client.get_pr_status("org/repo", "7")
+    checks = github_client.get_pr_checks("org/repo", "7")
+
+    assert first == second
+    assert first["state"] == "OPEN"
+    assert first["mergeable"] == "MERGEABLE"
+    assert first["statusCheckRollup"] == {"state": "FAILURE"}
+    assert [(check["name"], check["bucket"]) for check in checks] == [
+        ("pytest", "fail"),
+        ("ci/legacy", "pass"),
+    ]
+    assert checks[0]["runId"] == "55"
+    assert checks[0]["workflow"] == "Tests"
+    revalidated = [req for req in github_stub.requests if "if-none-match" in req.headers]
+    # Everything after the first status call revalidated instead of refetching.
+    assert len(revalidated) == 8
+    assert github_client.cache.stats()["hits"] == 8
+
+
+def test_not_modified_response_skips_json_parse(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/actions/runs/1/artifacts", conditional(
+        {"artifacts": [{"id": 1, "name": "pytest-junit"}]},
+        '"artifacts-v1"',
+    ))
+
+    first = github_client.request("GET", "/repos/org/repo/actions/runs/1/artifacts",
+                                  conditional=True)
+    second = github_client.request("GET", "/repos/org/repo/actions/runs/1/artifacts",
+                                   conditional=True)
+
+    assert second is first
+    assert second.json() is first.json()
+    assert github_stub.requests[1].headers["if-none-match"] == '"artifacts-v1"'
+
+
+def test_cache_evicts_least_recently_used_within_bounds() -> None:
+    cache = ConditionalCache(max_entries=2, max_bytes=10)
+
+    def response(body: bytes) -> GitHubResponse:
+        return GitHubResponse(status=200, headers={"etag": '"x"'}, body=body)
+
+    cache.store(("cred", "a"), response(b"aaaa"))
+    cache.store(("cred", "b"), response(b"bbbb"))
+    assert cache.hit(("cred", "a")) is not None
+    cache.store(("cred", "c"), response(b"cccc"))
+    cache.store(("cred", "big"), response(b"x" * 11))
+    cache.store(("cred", "plain"), GitHubResponse(status=200, headers={}, body=b"p"))
+
+    assert cache.validators(("cred", "b")) == {}
+    assert cache.validators(("cred", "a")) == {"If-None-Match": '"x"'}
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+import time
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from temporal.github import artifact_utils
+from temporal.github.check_utils import CheckProcessor
+from temporal.github.client import GitHubClient
+from temporal.github.incremental_analysis import IncrementalAnalysis, summarize_state
+from temporal.github.test_analyzer import TestAnalyzer
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+JUNIT_FIXTURE = Path(__file__).resolve().parent / "fixtures" / "pytest_sample_junit.xml"
+
+
+def _check(name: str, bucket: str, run_id: int) -> dict:
+    return {
+        "name": name,
+        "state": "COMPLETED" if bucket != CheckProcessor.STATUS_PENDING else "IN_PROGRESS",
+        "bucket": bucket,
+        "link": f"https://github.com/org/repo/actions/runs/{run_id}",
+        "workflow": "Tests",
+    }
+
+
+def _failure(check: dict, repo_path, repo) -> dict:
+    return {
+        "check_name": check["name"],
+        "failure_reason": "due to 1 failed test case(s)",
+        "failed_tests": [f"{check['name']}::test_mutant"],
+    }
+
+
+def test_failed_checks_are_analyzed_once_while_ci_runs(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    incremental = IncrementalAnalysis(analyzer, repo_path=str(tmp_path), repo="org/repo")
+    unit_failed = _check("unit-tests", CheckProcessor.STATUS_FAIL, 1)
+    snapshots = [
+        {"checks": [_check("unit-tests", CheckProcessor.STATUS_PENDING, 1)]},
+        {"checks": [unit_failed, _check("integration-tests", CheckProcessor.STATUS_PENDING, 2)]},
+        {"checks": [unit_failed, _check("integration-tests", CheckProcessor.STATUS_FAIL, 2),
+                    dict(_check("lint", CheckProcessor.STATUS_FAIL, 3), workflow="Lint")]},
+    ]
+
+    with mock.patch.object(
+        TestAnalyzer, "analyze_failed_check", side_effect=_failure,
+    ) as analyze_mock:
+        for snapshot in snapshots:
+            incremental.observe(snapshot)
+        state = incremental.finish()
+
+    # lint is not a test check; unit-tests is analyzed once across snapshots.
+    assert sorted(call.args[0]["name"] for call in analyze_mock.call_args_list) == [
+        "integration-tests",
+        "unit-tests",
+    ]
+    progress = summarize_state(state)
+    assert progress["total_checks"] == 3
+    assert progress["failed_checks"] == 3
+    assert sorted(f["check_name"] for f in progress["test_failures"]) == [
+        "integration-tests",
+        "unit-tests",
+    ]
+
+
+def test_finish_is_bounded_and_the_state_carries_compact_failures(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    unit, integration = (
+        _check("unit-tests", CheckProcessor.STATUS_FAIL, 1),
+        _check("integration-tests", CheckProcessor.STATUS_FAIL, 2),
+    )
+    release = threading.Event()
+
+    def analyze(check: dict, repo_path, repo) -> dict:
+        if check["name"] == "integration-tests":
+            release.wait(5)
+        return dict(_failure(check, repo_path, repo), tests=[{"id": "t", "status": "failed"}])
+
+    try:
+        with mock.patch.object(TestAnalyzer, "analyze_failed_check", side_effect=analyze):
+            first = IncrementalAnalysis(analyzer, repo_path=str(tmp_path), repo="org/repo")
+            first.observe({"checks": [unit, integration]})
+            started = time.monotonic()
+            state = first.finish(timeout=0.2)
+            elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert elapsed < 2
+    # The slow analysis is left for the next poll; the finished one has no per-test list.
+    assert list(state["failures"]) == [TestAnalyzer.failure_key(unit)]
+    assert state["failures"][TestAnalyzer.failure_key(unit)] == _failure(unit, None, None)
+
+    with mock.patch.object(
+        TestAnalyzer, "analyze_failed_check", side_effect=_failure,
+    ) as analyze_mock:
+        second = IncrementalAnalysis(
+            analyzer, repo_path=str(tmp_path), repo="org/repo", state=state,
+        )
+        second.observe({"checks": [unit, integration]})
+        state = second.finish(timeout=5)
+
+    assert [call.args[0]["name"] for call in analyze_mock.call_args_list] == [
+        "integration-tests",
+    ]
+    assert len(state["failures"]) == 2
+
+
+def test_analyze_pr_results_reuses_precomputed_failures(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    failed = _check("unit-tests", CheckProcessor.STATUS_FAIL, 1)
+    pr_data = {
+        "status": {"number": 7, "url": "https://github.com/org/repo/pull/7"},
+        "checks": [failed],
+        "completed": True,
+        "incremental_analysis": {
+            "failures": {TestAnalyzer.failure_key(failed): _failure(failed, None, None)},
+        },
+    }
+
+    with mock.patch.object(TestAnalyzer, "analyze_failed_check") as analyze_mock:
+        analysis = analyzer.analyze_pr_results(pr_data, repo="org/repo")
+
+    analyze_mock.assert_not_called()
+    assert analysis["test_failures"][0]["failed_tests"] == ["unit-tests::test_mutant"]
+    assert analysis["summary"]["mutation_killed"] is True
+
+
+def test_incremental_and_full_analysis_save_the_same_tests(
+    tmp_path: Path,
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as junit_zip:
+        junit_zip.writestr("junit.xml", JUNIT_FIXTURE.read_bytes())
+    github_stub.add("GET", "/repos/org/repo/actions/runs/5/artifacts", StubResponse(
+        body={"artifacts": [{"id": 8, "name": "pytest-junit", "digest": "sha256:abc"}]},
+    ))
+    github_stub.add("GET", "/repos/org/repo/actions/artifacts/8/zip", StubResponse(
+        body=archive.getvalue(), headers={"Content-Type": "application/zip"},
+    ))
+    failed = dict(_check("pytest", CheckProcessor.STATUS_FAIL, 5), link=(
+        "https://github.com/org/repo/actions/runs/5/job/1"
+    ))
+    pr_data = {"status": {"number": 1}, "checks": [failed], "completed": True}
+
+    def saved_tests(analyzer: TestAnalyzer, data: dict, name: str) -> list:
+        analysis = analyzer.analyze_pr_results(data, repo="org/repo")
+        saved = json.loads(analyzer.save_results(analysis, name).read_text(encoding="utf-8"))
+        return saved["test_failures"][0]["tests"]
+
+    with mock.patch.object(artifact_utils, "get_shared_client", return_value=github_client):
+        incremental = IncrementalAnalysis(
+            TestAnalyzer(tmp_path, tmp_path), repo_path=str(tmp_path), repo="org/repo",
+        )
+        incremental.observe(pr_data)
+        state = incremental.finish(timeout=30)
+        assert "tests" not in next(iter(state["failures"].values()))
+        with mock.patch.object(TestAnalyzer, "analyze_failed_check") as analyze_mock:
+            reused = saved_tests(
+                TestAnalyzer(tmp_path, tmp_path),
+                dict(pr_data, incremental_analysis=state),
+                "incremental.json",
+            )
+        full = saved_tests(TestAnalyzer(tmp_path, tmp_path), pr_data, "full.json")
+
+    analyze_mock.assert_not_called()
+    assert reused == full
+    assert any(test["id"] == "tests.test_example::test_fail" for test in full)
+
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tracemalloc
+from typing import Iterator
+
+from temporal.github.client import GitHubClient
+from temporal.github.log_parser import FailedLogIndex, parse_failures
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+def _pytest_log(failures: int) -> Iterator[str]:
+    yield "============================= test session starts =============================="
+    yield "tests/test_a.py FFFF"
+    yield "=========================== short test summary info ============================"
+    for index in range(failures):
+        yield f"FAILED tests/test_a.py::test_{index} - AssertionError"
+    yield "ERROR tests/test_b.py::test_setup - fixture 'db' not found"
+    yield f"=================== {failures} failed, 1 error in 1.00s ==================="
+
+
+def test_every_summary_failure_is_returned() -> None:
+    failures = parse_failures(_pytest_log(25))
+
+    assert len(failures) == 26
+    assert failures[0] == "tests/test_a.py::test_0 - AssertionError"
+    assert failures[-1] == "tests/test_b.py::test_setup - fixture 'db' not found"
+
+
+def test_unittest_and_generic_failures_without_summary() -> None:
+    log = [
+        "======================================================================",
+        "FAIL: test_add (tests.test_math.MathTest)",
+        "----------------------------------------------------------------------",
+        "AssertionError: 3 != 4",
+        "FAILED tests/test_io.py::test_read - OSError",
+    ]
+
+    assert parse_failures(log) == [
+        "tests.test_math.MathTest::test_add",
+        "tests/test_io.py::test_read - OSError",
+    ]
+
+
+def test_unittest_headers_from_python_3_11_and_generated_names() -> None:
+    log = [
+        "FAIL: test_add (tests.test_math.MathTest.test_add)",
+        "Adding two numbers gives their sum.",
+        "ERROR: test_parse[utf-8] (tests.test_io.ParseTest.test_parse[utf-8])",
+        "FAIL: test_round-trip (tests.test_io.ParseTest)",
+    ]
+
+    assert parse_failures(log) == [
+        "tests.test_math.MathTest::test_add",
+        "tests.test_io.ParseTest::test_parse[utf-8]",
+        "tests.test_io.ParseTest::test_round-trip",
+    ]
+
+
+def test_index_splits_gh_log_by_job() -> None:
+    lines = [
+        "pytest (3.10)\tRun tests\t2025-01-01T00:00:01.0000000Z === short test summary info ===",
+        "pytest (3.10)\tRun tests\t2025-01-01T00:00:02.0000000Z FAILED tests/test_a.py::test_old",
+        "pytest (3.10)\tRun tests\t2025-01-01T00:00:03.0000000Z === 1 failed in 1s ===",
+        "build\tCompile\t2025-01-01T00:00:04.0000000Z error: linker failed",
+    ]
+    index = FailedLogIndex().feed_lines(lines)
+
+    assert index.for_job("pytest (3.10)").failed_tests == ["tests/test_a.py::test_old"]
+    build = index.for_job("build")
+    assert build.failed_tests == []
+    assert build.saw_error_keyword is True
+    # Unknown job names fall back to every job in the run.
+    assert index.for_job("pytest").failed_tests == ["tests/test_a.py::test_old"]
+    # A matrix job missing from the log never borrows a sibling's failures.
+    assert index.for_job("pytest (3.11)").failed_tests == []
+    assert not index.covers("pytest (3.11)")
+
+
+def test_large_log_is_parsed_in_bounded_memory() -> None:
+    def log() -> Iterator[str]:
+        for index in range(200_000):
+            yield f"build\tRun tests\t2025-01-01T00:00:00Z tests/test_x.py::test_{index} PASSED"
+        yield "build\tRun tests\t=== short test summary info ==="
+        yield "build\tRun tests\tFAILED tests/test_x.py::test_last - boom"
+        yield "build\tRun tests\t=== 1 failed ==="
+
+    tracemalloc.start()
+    try:
+        index = FailedLogIndex().feed_lines(log())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert index.for_job("build").failed_tests == ["tests/test_x.py::test_last - boom"]
+    assert peak < 1024 * 1024
+
+
+def test_client_streams_failed_job_logs(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    github_stub.add("GET", "/repos/org/repo/actions/runs/5/jobs", StubResponse(body={"jobs": [
+        {"id": 1, "name": "pytest", "conclusion": "failure"},
+        {"id": 2, "name": "lint", "conclusion": "success"},
+    ]}))
+    github_stub.add("GET", "/repos/org/repo/actions/jobs/1/logs", StubResponse(
+        body="2025-01-01T00:00:00Z FAILED tests/test_a.py::test_x\r\nlast line",
+        headers={"Content-Type": "text/plain"},
+    ))
+
+    lines = list(github_client.iter_failed_run_log_lines("org/repo", "5"))
+
+    assert lines == [
+        "pytest\t\t2025-01-01T00:00:00Z FAILED tests/test_a.py::test_x",
+        "pytest\t\tlast line",
+    ]
+    assert FailedLogIndex().feed_lines(lines).for_job("pytest").failed_tests == [
+        "tests/test_a.py::test_x",
+    ]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from temporal.github.client import GitHubClient, RateLimitExceeded
+from temporal.github.rate_limit import (
+    PRIORITY_BULK,
+    PRIORITY_DEFAULT,
+    PRIORITY_POLL,
+    RateLimitScheduler,
+    rate_limit_delay,
+)
+from tests.temporal.github.fixtures.github_stub import GitHubStub, StubResponse
+
+
+ARTIFACTS_PATH = "/repos/org/repo/actions/runs/1/artifacts"
+
+
+def _budget_headers(remaining: int, reset_in: int = 3600) -> dict:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def test_low_budget_is_reserved_for_polls() -> None:
+    scheduler = RateLimitScheduler()
+    scheduler.update("cred", "core", {
+        key.lower(): value for key, value in _budget_headers(remaining=300).items()
+    })
+    bucket = scheduler._buckets[("cred", "core")]
+    now = time.time()
+
+    assert bucket.delay_for(PRIORITY_POLL, now) == 0
+    assert bucket.delay_for(PRIORITY_DEFAULT, now) == 0
+    # 300 left is below the 10% kept back from bulk downloads.
+    assert bucket.delay_for(PRIORITY_BULK, now) > 3000
+    assert scheduler.acquire("cred", "core", PRIORITY_POLL) < 1
+    assert scheduler.metrics()["cred"]["core"]["remaining"] == 299
+
+
+def test_rate_limit_delay_detection() -> None:
+    assert rate_limit_delay(200, {"retry-after": "5"}) is None
+    assert rate_limit_delay(429, {"retry-after": "5"}) == 5
+    assert rate_limit_delay(403, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "160"},
+                            now=100) == 60
+    assert rate_limit_delay(403, {}, "You have exceeded a secondary rate limit") == 60
+    assert rate_limit_delay(403, {}, "Resource not accessible by integration") is None
+
+
+def test_client_waits_out_short_retry_after(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    responses = [
+        StubResponse(status=429, body={"message": "slow down"}, headers={"Retry-After": "1"}),
+        StubResponse(body={"artifacts": []}, headers=_budget_headers(remaining=4000)),
+    ]
+    github_stub.add("GET", ARTIFACTS_PATH, lambda request: responses.pop(0))
+
+    started = time.monotonic()
+    assert github_client.list_run_artifacts("org/repo", "1") == []
+
+    assert time.monotonic() - started >= 1
+    assert len(github_stub.requests) == 2
+    metrics = github_client.rate_limit_metrics()["core"]
+    assert metrics["throttled"] == 1
+    assert metrics["remaining"] == 4000
+
+
+def test_client_raises_when_budget_is_exhausted(github_stub: GitHubStub) -> None:
+    github_stub.add("GET", ARTIFACTS_PATH, StubResponse(
+        status=403,
+        body={"message": "API rate limit exceeded"},
+        headers=_budget_headers(remaining=0, reset_in=600),
+    ))
+    client = GitHubClient("test-token", api_url=github_stub.url, rate_limiter=RateLimitScheduler())
+
+    try:
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            client.list_run_artifacts("org/repo", "1")
+    finally:
+        client.close()
+
+    assert 590 <= excinfo.value.retry_after <= 600
+    assert len(github_stub.requests) == 1
+    assert client.rate_limit_metrics()["core"]["blocked_for_seconds"] > 590
+
+
+def test_reserved_budget_raises_instead_of_waiting_for_reset(github_stub: GitHubStub) -> None:
+    github_stub.add("GET", ARTIFACTS_PATH, StubResponse(body={"artifacts": []}))
+    scheduler = RateLimitScheduler()
+    client = GitHubClient("test-token", api_url=github_stub.url, rate_limiter=scheduler)
+    # 50 left is below the 2% kept back from default-priority calls.
+    scheduler.update(client.credential.credential_id, "core", {
+        key.lower(): value for key, value in _budget_headers(remaining=50, reset_in=900).items()
+    })
+
+    started = time.monotonic()
+    try:
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            client.list_run_artifacts("org/repo", "1")
+    finally:
+        client.close()
+
+    assert time.monotonic() - started < 5
+    assert 890 <= excinfo.value.retry_after <= 900
+    assert github_stub.requests == []
+
+
+def test_not_modified_responses_do_not_use_up_the_budget(
+    github_stub: GitHubStub,
+    github_client: GitHubClient,
+) -> None:
+    etag = '"artifacts-v1"'
+
+    def handler(request):
+        headers = {"ETag": etag, **_budget_headers(remaining=4000)}
+        if request.headers.get("if-none-match") == etag:
+            return StubResponse(status=304, headers=headers)
+        return StubResponse(body={"artifacts": []}, headers=headers)
+
+    github_stub.add("GET", ARTIFACTS_PATH, handler)
+    bucket_tokens = []
+    for _ in range(3):
+        github_client.request("GET", ARTIFACTS_PATH, conditional=True)
+        bucket = github_client.rate_limiter._buckets[
+            (github_client.credential.credential_id, "core")
+        ]
+        bucket_tokens.append(bucket.tokens)
+
+    metrics = github_client.rate_limit_metrics()["core"]
+    assert metrics["not_modified"] == 2
+    # Only the first (full) response took a token; refills only add to it.
+    assert bucket_tokens[2] >= bucket_tokens[1] >= bucket_tokens[0]
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+from temporal.github.repo_manager import RepoManager
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def _origin(tmp_path: Path) -> Path:
+    origin = tmp_path / "org" / "project"
+    origin.mkdir(parents=True)
+    _git("init", "--quiet", cwd=origin)
+    (origin / "module.py").write_text("VALUE = 1\n")
+    _git("add", ".", cwd=origin)
+    _git("-c", "user.name=t", "-c", "user.email=t@example.com",
+         "commit", "--quiet", "-m", "initial", cwd=origin)
+    return origin
+
+
+def test_clone_borrows_objects_from_warm_mirror(tmp_path: Path) -> None:
+    origin = _origin(tmp_path)
+    manager = RepoManager(base_dir=str(tmp_path / "clones"), mirror_dir=str(tmp_path / "mirrors"))
+
+    cold = manager.clone_repo(str(origin), dest_name="cold")
+    assert not (cold / ".git" / "objects" / "info" / "alternates").exists()
+
+    mirror = manager.update_mirror(str(origin))
+    assert mirror == tmp_path / "mirrors" / "org-project.git"
+    warm = manager.clone_repo(str(origin), dest_name="warm")
+
+    alternates = (warm / ".git" / "objects" / "info" / "alternates").read_text()
+    assert str(mirror) in alternates
+    assert _git("rev-parse", "HEAD", cwd=warm) == _git("rev-parse", "HEAD", cwd=origin)
+    # A second refresh fetches into the existing mirror.
+    assert manager.update_mirror(str(origin)) == mirror
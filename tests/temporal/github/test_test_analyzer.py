@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import io
+import tracemalloc
+import zipfile
 from pathlib import Path
 from unittest import mock
 
+from temporal.github import artifact_utils, check_utils
 from temporal.github.artifact_utils import ArtifactDownload
 from temporal.github.check_utils import CheckProcessor
 from temporal.github.test_analyzer import TestAnalyzer
@@ -40,10 +44,10 @@ def test_analyzer_prefers_junit_artifacts(tmp_path: Path) -> None:
     analyzer = TestAnalyzer(repo_path=tmp_path)
     pr_data = _build_pr_data(_build_failed_check())
 
-    archive_path = tmp_path / "pytest-junit.zip"
+    archive_path = tmp_path / "pytest-junit-3.11.zip"
     archive_path.write_bytes(b"")
     download = ArtifactDownload(
-        name="pytest-junit",
+        name="pytest-junit-3.11",
         archive_path=archive_path,
         extract_path=tmp_path,
         junit_paths=[JUNIT_FIXTURE],
@@ -77,7 +81,7 @@ def test_analyzer_prefers_junit_artifacts(tmp_path: Path) -> None:
     }
     assert failure["log_available"] is False
     assert failure["junit_artifacts"] == [
-        {"artifact": "pytest-junit", "files": [JUNIT_FIXTURE.name]}
+        {"artifact": "pytest-junit-3.11", "files": [JUNIT_FIXTURE.name]}
     ]
 
 
@@ -117,10 +121,10 @@ def test_analyzer_uses_log_fallback_on_invalid_artifacts(tmp_path: Path) -> None
     analyzer = TestAnalyzer(repo_path=tmp_path)
     pr_data = _build_pr_data(_build_failed_check())
 
-    archive_path = tmp_path / "pytest-junit.zip"
+    archive_path = tmp_path / "pytest-junit-3.11.zip"
     archive_path.write_bytes(b"")
     download = ArtifactDownload(
-        name="pytest-junit",
+        name="pytest-junit-3.11",
         archive_path=archive_path,
         extract_path=tmp_path,
         junit_paths=[tmp_path / "missing.xml"],
@@ -156,3 +160,287 @@ def test_analyzer_uses_log_fallback_on_invalid_artifacts(tmp_path: Path) -> None
     failure = failures[0]
     assert failure["failed_tests"] == log_details["failed_tests"]
     assert failure["log_available"] is True
+
+
+def _matrix_pr_data(versions: list) -> dict:
+    checks = [
+        dict(_build_failed_check(), name=f"pytest ({version})",
+             link=f"https://github.com/org/repo/actions/runs/123456/job/{index}")
+        for index, version in enumerate(versions)
+    ]
+    return dict(_build_pr_data(checks[0]), checks=checks)
+
+
+def _without_check_run_results():
+    """Skip the annotations fast path so artifacts and logs are exercised."""
+    return mock.patch.object(
+        TestAnalyzer,
+        "_extract_test_results_from_check_run",
+        return_value=None,
+    )
+
+
+def test_matrix_jobs_share_one_artifact_download(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    pr_data = _matrix_pr_data(["3.10", "3.11"])
+    downloads = [
+        ArtifactDownload(
+            name=f"junit-{version}",
+            archive_path=tmp_path / f"junit-{version}.zip",
+            extract_path=tmp_path,
+            junit_paths=[JUNIT_FIXTURE],
+        )
+        for version in ("3.10", "3.11")
+    ]
+
+    with _without_check_run_results(), mock.patch.object(
+        CheckProcessor,
+        "download_check_junit_artifacts",
+        return_value=downloads,
+    ) as download_mock, mock.patch.object(
+        TestAnalyzer,
+        "_parse_junit_file",
+        wraps=analyzer._parse_junit_file,
+    ) as parse_mock:
+        analysis = analyzer.analyze_pr_results(pr_data, repo="org/repo")
+
+    download_mock.assert_called_once()
+    assert parse_mock.call_count == 2
+    sources = [
+        [artifact["artifact"] for artifact in failure["junit_artifacts"]]
+        for failure in analysis["test_failures"]
+    ]
+    assert sources == [["junit-3.10"], ["junit-3.11"]]
+
+
+class _FakeProcess:
+    """Stands in for ``gh run view --log-failed`` streaming its stdout."""
+
+    def __init__(self, stdout: str, returncode: int = 0):
+        self.stdout = io.StringIO(stdout)
+        self.returncode = returncode
+
+    def wait(self) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+def test_matrix_jobs_share_one_failed_log_fetch(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    pr_data = _matrix_pr_data(["3.10", "3.11"])
+    log_output = "\n".join([
+        "pytest (3.10)\tRun tests\t=== short test summary info ===",
+        "pytest (3.10)\tRun tests\tFAILED tests/test_a.py::test_old - assert 1",
+        "pytest (3.10)\tRun tests\t=== 1 failed ===",
+        "pytest (3.11)\tRun tests\t=== short test summary info ===",
+        "pytest (3.11)\tRun tests\tFAILED tests/test_b.py::test_new - assert 2",
+        "pytest (3.11)\tRun tests\t=== 1 failed ===",
+    ])
+
+    with _without_check_run_results(), mock.patch.object(
+        CheckProcessor,
+        "download_check_junit_artifacts",
+        return_value=[],
+    ), mock.patch.object(
+        check_utils, "get_shared_client", return_value=None,
+    ), mock.patch.object(
+        check_utils.subprocess,
+        "Popen",
+        return_value=_FakeProcess(log_output),
+    ) as popen_mock:
+        analysis = analyzer.analyze_pr_results(pr_data, repo="org/repo")
+
+    popen_mock.assert_called_once()
+    assert [failure["failed_tests"] for failure in analysis["test_failures"]] == [
+        ["tests/test_a.py::test_old - assert 1"],
+        ["tests/test_b.py::test_new - assert 2"],
+    ]
+
+
+def _junit_report(path: Path, failing_test: str) -> Path:
+    path.write_text(
+        '<testsuite name="pytest">'
+        f'<testcase classname="tests.test_app" name="{failing_test}">'
+        '<failure message="boom">boom</failure></testcase>'
+        '</testsuite>',
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_matrix_job_finishing_later_gets_its_own_results(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    first, second = _matrix_pr_data(["3.10", "3.11"])["checks"]
+    downloads = {
+        version: ArtifactDownload(
+            name=f"junit-{version}",
+            archive_path=tmp_path / f"junit-{version}.zip",
+            extract_path=tmp_path,
+            junit_paths=[_junit_report(tmp_path / f"junit-{version}.xml", f"test_{index}")],
+        )
+        for index, version in enumerate(("3.10", "3.11"))
+    }
+    log_lines = [
+        "pytest (3.10)\tRun tests\t=== short test summary info ===",
+        "pytest (3.10)\tRun tests\tFAILED tests/test_a.py::test_old - assert 1",
+        "pytest (3.10)\tRun tests\t=== 1 failed ===",
+    ]
+    later_log_lines = log_lines + [
+        line.replace("3.10", "3.11").replace("test_old", "test_new") for line in log_lines
+    ]
+
+    # 3.10 fails while 3.11 is still running: only its artifact and log exist.
+    with _without_check_run_results(), mock.patch.object(
+        CheckProcessor,
+        "download_check_junit_artifacts",
+        side_effect=[[downloads["3.10"]], [downloads["3.10"], downloads["3.11"]]],
+    ) as download_mock:
+        early = analyzer.analyze_failed_check(first, str(tmp_path), "org/repo")
+        late = analyzer.analyze_failed_check(second, str(tmp_path), "org/repo")
+
+    assert download_mock.call_count == 2
+    assert early["failed_tests"] == ["tests.test_app::test_0"]
+    assert late["failed_tests"] == ["tests.test_app::test_1"]
+
+    with _without_check_run_results(), mock.patch.object(
+        CheckProcessor, "download_check_junit_artifacts", return_value=[],
+    ), mock.patch.object(
+        check_utils, "get_shared_client", return_value=None,
+    ), mock.patch.object(
+        check_utils.subprocess,
+        "Popen",
+        side_effect=[
+            _FakeProcess("\n".join(log_lines)),
+            _FakeProcess("\n".join(later_log_lines)),
+        ],
+    ) as popen_mock:
+        analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+        early = analyzer.analyze_failed_check(first, str(tmp_path), "org/repo")
+        late = analyzer.analyze_failed_check(second, str(tmp_path), "org/repo")
+
+    assert popen_mock.call_count == 2
+    assert early["failed_tests"] == ["tests/test_a.py::test_old - assert 1"]
+    assert late["failed_tests"] == ["tests/test_a.py::test_new - assert 1"]
+
+
+def test_analyzer_parses_junit_members_without_extracting(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path, repo_path=tmp_path)
+    archive_path = tmp_path / "pytest-junit-3.11.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("reports/junit.xml", JUNIT_FIXTURE.read_bytes())
+        archive.writestr("reports/coverage.xml", b"<coverage/>")
+    with zipfile.ZipFile(archive_path) as archive:
+        members = list(artifact_utils._discover_junit_members(archive))
+    download = ArtifactDownload(
+        name="pytest-junit-3.11",
+        archive_path=archive_path,
+        junit_members=members,
+    )
+
+    with mock.patch.object(
+        CheckProcessor,
+        "download_check_junit_artifacts",
+        return_value=[download],
+    ):
+        analysis = analyzer.analyze_pr_results(_build_pr_data(_build_failed_check()))
+
+    failure = analysis["test_failures"][0]
+    assert members == ["reports/junit.xml"]
+    assert failure["failed_tests"] == ["tests.test_example::test_fail"]
+    assert failure["junit_artifacts"] == [{"artifact": "pytest-junit-3.11", "files": ["junit.xml"]}]
+    assert failure["tests"][0]["source_file"] == "junit.xml"
+
+
+def _large_junit(passed: int) -> bytes:
+    cases = "".join(
+        f'<testcase classname="tests.big" name="test_{index}" time="0.002">'
+        f'<system-out>{"x" * 200}</system-out></testcase>'
+        for index in range(passed)
+    )
+    return (
+        '<?xml version="1.0"?><testsuites><testsuite name="big">'
+        f"{cases}"
+        '<testcase classname="tests.big" name="test_bad" time="0.5">'
+        '<failure message="boom">Traceback</failure></testcase>'
+        '<testcase classname="tests.big" name="test_later" time="0"><skipped/></testcase>'
+        "</testsuite></testsuites>"
+    ).encode()
+
+
+def test_streaming_parser_folds_passes_and_bounds_memory(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path)
+    document = _large_junit(30000)
+
+    tracemalloc.start()
+    try:
+        tests = analyzer._parse_junit_file(
+            io.BytesIO(document), artifact_name="big", source_file="junit.xml",
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert [test["status"] for test in tests] == ["failed", "skipped", "passed"]
+    assert tests[0]["id"] == "tests.big::test_bad"
+    assert tests[0]["message"] == "boom"
+    assert tests[2]["count"] == 30000
+    assert tests[2]["duration"] == 60.0
+    assert TestAnalyzer._summarize_tests(tests) == {
+        "total": 30002, "passed": 30000, "failed": 1, "errors": 0, "skipped": 1,
+    }
+    # The ~7 MB document is never held as a tree.
+    assert peak < len(document) // 10
+
+
+def test_truncated_junit_keeps_the_testcases_read_before_the_break(tmp_path: Path) -> None:
+    analyzer = TestAnalyzer(output_dir=tmp_path)
+    document = _large_junit(5)
+    # Cut inside the last testcase, as a cancelled upload would.
+    cut = document[:document.index(b'name="test_later"')]
+
+    tests = analyzer._parse_junit_file(
+        io.BytesIO(cut), artifact_name="big", source_file="junit.xml",
+    )
+
+    assert [test["status"] for test in tests] == ["failed", "passed"]
+    assert tests[0]["id"] == "tests.big::test_bad"
+    assert tests[1]["count"] == 5
+    assert all(test["truncated"] for test in tests)
+    complete = analyzer._parse_junit_file(
+        io.BytesIO(document), artifact_name="big", source_file="junit.xml",
+    )
+    assert not any("truncated" in test for test in complete)
+
+
+def test_corrupt_zip_member_keeps_reports_from_earlier_members(tmp_path: Path, capsys) -> None:
+    report = JUNIT_FIXTURE.read_bytes()
+    archive_path = tmp_path / "junit.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("a/junit.xml", report)
+        archive.writestr("b/junit.xml", report)
+        archive.writestr("c/junit.xml", report)
+    data = bytearray(archive_path.read_bytes())
+    with zipfile.ZipFile(archive_path) as archive:
+        second, third = archive.infolist()[1:]
+    # Break the second member's header and the third member's contents.
+    data[second.header_offset] ^= 0xFF
+    data[third.header_offset + 30 + len(third.filename) + 10] ^= 0xFF
+    archive_path.write_bytes(bytes(data))
+    download = ArtifactDownload(
+        name="pytest-junit",
+        archive_path=archive_path,
+        junit_members=["a/junit.xml", "b/junit.xml", "c/junit.xml"],
+    )
+
+    tests = TestAnalyzer(output_dir=tmp_path)._parse_artifact_reports(download)
+
+    single = TestAnalyzer(output_dir=tmp_path)._parse_junit_file(
+        JUNIT_FIXTURE, artifact_name="pytest-junit", source_file="junit.xml",
+    )
+    assert tests == single
+    logged = capsys.readouterr().out
+    assert "b/junit.xml" in logged
+    assert "Skipping junit report junit.xml of 'pytest-junit'" in logged
+
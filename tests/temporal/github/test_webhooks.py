@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+from temporal.github.webhooks import (
+    WatchIndex,
+    infer_event_name,
+    parse_check_event,
+    verify_signature,
+)
+
+
+WEBHOOK_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "webhooks"
+REPO = "zhengziying78/demo-httpie-cli"
+BRANCH = "mutation-test-demo-20251018-184437"
+
+
+def _replay(name: str):
+    payload = json.loads((WEBHOOK_FIXTURES / name).read_text(encoding="utf-8"))
+    return parse_check_event(infer_event_name(payload), payload)
+
+
+def test_check_suite_completion_routes_by_pr_number() -> None:
+    event = _replay("check_suite_completed.json")
+    index = WatchIndex()
+    index.add("wf-pr", REPO, pr_number="57")
+    index.add("wf-other", REPO, pr_number="58")
+
+    assert event.completed is True
+    assert event.pr_numbers == ("57",)
+    assert event.name == "GitHub Actions"
+    assert index.match(event) == ["wf-pr"]
+
+
+def test_check_run_without_pull_requests_routes_by_branch() -> None:
+    event = _replay("check_run_completed.json")
+    index = WatchIndex()
+    index.replace([
+        {"workflow_id": "wf-branch", "repo": REPO.upper(), "branch": BRANCH},
+        {"workflow_id": "wf-missing-repo", "branch": BRANCH},
+    ])
+
+    assert event.event == "check_run"
+    assert event.pr_numbers == ()
+    assert event.conclusion == "failure"
+    assert index.match(event) == ["wf-branch"]
+
+
+def test_in_progress_workflow_run_is_not_completed() -> None:
+    event = _replay("workflow_run_in_progress.json")
+
+    assert event.event == "workflow_run"
+    assert event.completed is False
+    assert event.to_signal_payload()["pr_numbers"] == ["57"]
+
+
+def test_unsupported_events_are_ignored() -> None:
+    assert parse_check_event("push", {"repository": {"full_name": REPO}}) is None
+    assert parse_check_event("check_run", {"check_run": {}}) is None
+
+
+def test_verify_signature() -> None:
+    body = (WEBHOOK_FIXTURES / "check_suite_completed.json").read_bytes()
+    digest = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+    assert verify_signature("s3cret", body, f"sha256={digest}") is True
+    assert verify_signature("wrong", body, f"sha256={digest}") is False
+    assert verify_signature("s3cret", body, None) is False
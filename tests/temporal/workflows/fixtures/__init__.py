@@ -0,0 +1,3 @@
+"""
+Fixtures used by the workflow tests.
+"""
@@ -0,0 +1,226 @@
+"""
+Time-skipping Temporal environment and activity stubs for workflow tests.
+
+The workflows run for real against the Temporal test server; every activity
+is replaced by a stub registered under the same name that records its calls
+(with the task queue it ran on) and answers with canned results.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import pytest
+from temporalio import activity
+from temporalio.exceptions import ApplicationError
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from temporal.workflows.temporal_worker import (
+    AnalyzeResultsInput,
+    AppendOutcomesInput,
+    CancelRunsInput,
+    CleanupInput,
+    CreatePullRequestInput,
+    PersistResultInput,
+    PollChecksInput,
+    PrepareCampaignInput,
+    RunMutationCampaignWorkflow,
+    RunSingleMutationWorkflow,
+    StageMutantInput,
+    WaitForChecksInput,
+)
+
+# A test server binary to use instead of downloading one (e.g. on offline CI).
+TEST_SERVER_PATH_ENV = "TEMPORAL_TEST_SERVER_PATH"
+
+REPO_CONFIG = {
+    "name": "demo-repo",
+    "url": "https://github.com/org/demo-repo.git",
+    "base_branch": "main",
+    "repo_id": "org/demo-repo",
+}
+CAMPAIGN_CLONE = "/clones/mutation-campaign"
+
+
+def mutation(mutation_id: str) -> Dict[str, Any]:
+    return {
+        "id": mutation_id,
+        "description": f"Mutation {mutation_id}",
+        "file_path": "src/app.py",
+        "line_number": 1,
+        "find_pattern": "==",
+        "replace_pattern": "!=",
+    }
+
+
+async def start_time_skipping_env() -> WorkflowEnvironment:
+    """Start the time-skipping test server, or skip when it cannot be obtained."""
+    try:
+        return await WorkflowEnvironment.start_time_skipping(
+            test_server_existing_path=os.environ.get(TEST_SERVER_PATH_ENV),
+        )
+    except RuntimeError as exc:
+        pytest.skip(f"Temporal test server unavailable: {exc}")
+
+
+@dataclass
+class MutationActivityStubs:
+    """Stand-ins for the mutation workflow activities."""
+
+    # Returned by poll_checks_activity in turn; the last one repeats.
+    poll_results: List[Dict[str, Any]] = field(default_factory=lambda: [completed_checks()])
+    # Host queue the staging stub reports, as a worker with host affinity would.
+    host_task_queue: Optional[str] = None
+    # Mutation ids whose analysis reports a surviving mutant (others are killed).
+    survivors: Set[str] = field(default_factory=set)
+    # Checkouts whose cleanup fails, which fails the child workflow.
+    failing_cleanups: Set[str] = field(default_factory=set)
+    # Set to hold every check wait until it is set (or the activity is cancelled).
+    release_waits: Optional[asyncio.Event] = None
+    calls: Dict[str, List[Any]] = field(default_factory=lambda: defaultdict(list))
+    task_queues: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    # Order in which checkouts were cleaned up.
+    cleanups: List[str] = field(default_factory=list)
+    waiting: int = 0
+    max_waiting: int = 0
+
+    def _record(self, name: str, payload: Any) -> None:
+        self.calls[name].append(payload)
+        self.task_queues[name].append(activity.info().task_queue)
+
+    def activities(self) -> List[Callable[..., Any]]:
+        pr_numbers = iter(range(100, 10_000))
+        mutation_by_path: Dict[str, str] = {}
+
+        @activity.defn(name="stage_mutant_activity")
+        async def stage_mutant(payload: StageMutantInput) -> Dict[str, Any]:
+            self._record("stage_mutant_activity", payload)
+            repo_path = f"/clones/{payload.branch_name}"
+            mutation_by_path[repo_path] = str(payload.mutation_config["id"])
+            staged: Dict[str, Any] = {
+                "repo_path": repo_path,
+                "mutation_applied": True,
+                "commit_sha": f"sha-{payload.mutation_config['id']}",
+            }
+            if self.host_task_queue:
+                staged["host_task_queue"] = self.host_task_queue
+            return staged
+
+        @activity.defn(name="prepare_campaign_clone_activity")
+        async def prepare_campaign_clone(payload: PrepareCampaignInput) -> Dict[str, str]:
+            self._record("prepare_campaign_clone_activity", payload)
+            clone = {"repo_path": CAMPAIGN_CLONE, "baseline_sha": "baseline"}
+            if self.host_task_queue:
+                clone["host_task_queue"] = self.host_task_queue
+            return clone
+
+        @activity.defn(name="create_pull_request_activity")
+        async def create_pull_request(payload: CreatePullRequestInput) -> Dict[str, Any]:
+            self._record("create_pull_request_activity", payload)
+            number = str(next(pr_numbers))
+            return {"number": number, "url": f"https://github.com/org/demo-repo/pull/{number}"}
+
+        @activity.defn(name="wait_for_checks_activity")
+        async def wait_for_checks(payload: WaitForChecksInput) -> Dict[str, Any]:
+            self._record("wait_for_checks_activity", payload)
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                if self.release_waits is not None:
+                    while not self.release_waits.is_set():
+                        activity.heartbeat()
+                        await asyncio.sleep(0.05)
+                else:
+                    # Overlap with the other mutants the campaign runs at once.
+                    await asyncio.sleep(0.05)
+            finally:
+                self.waiting -= 1
+            return completed_checks()
+
+        @activity.defn(name="poll_checks_activity")
+        async def poll_checks(payload: PollChecksInput) -> Dict[str, Any]:
+            self._record("poll_checks_activity", payload)
+            index = min(len(self.calls["poll_checks_activity"]), len(self.poll_results)) - 1
+            return dict(self.poll_results[index])
+
+        @activity.defn(name="cancel_runs_activity")
+        async def cancel_runs(payload: CancelRunsInput) -> List[str]:
+            self._record("cancel_runs_activity", payload)
+            return []
+
+        @activity.defn(name="analyze_results_activity")
+        async def analyze_results(payload: AnalyzeResultsInput) -> Dict[str, Any]:
+            self._record("analyze_results_activity", payload)
+            survived = mutation_by_path.get(payload.repo_path) in self.survivors
+            return {
+                "analysis": {
+                    "summary": {"mutation_killed": not survived, "mutation_survived": survived},
+                    "test_failures": [] if survived else [{"check_name": "pytest"}],
+                },
+                "results_file": f"{payload.repo_path}/results.json",
+            }
+
+        @activity.defn(name="cleanup_activity")
+        async def cleanup(payload: CleanupInput) -> Dict[str, Any]:
+            self._record("cleanup_activity", payload)
+            self.cleanups.append(payload.repo_path)
+            if payload.repo_path in self.failing_cleanups:
+                raise ApplicationError("cleanup failed", non_retryable=True)
+            return {"pr_closed": bool(payload.pr_number), "repo_deleted": True, "errors": []}
+
+        @activity.defn(name="persist_result_activity")
+        async def persist_result(payload: PersistResultInput) -> str:
+            self._record("persist_result_activity", payload)
+            return "/summaries/result.json"
+
+        @activity.defn(name="append_campaign_outcomes_activity")
+        async def append_outcomes(payload: AppendOutcomesInput) -> str:
+            self._record("append_campaign_outcomes_activity", payload)
+            return "/summaries/outcomes.jsonl"
+
+        return [
+            stage_mutant,
+            prepare_campaign_clone,
+            create_pull_request,
+            wait_for_checks,
+            poll_checks,
+            cancel_runs,
+            analyze_results,
+            cleanup,
+            persist_result,
+            append_outcomes,
+        ]
+
+
+def completed_checks() -> Dict[str, Any]:
+    return {
+        "completed": True,
+        "checks": [{"name": "pytest", "state": "FAILURE", "bucket": "fail"}],
+    }
+
+
+def pending_checks() -> Dict[str, Any]:
+    return {
+        "completed": False,
+        "checks": [{"name": "pytest", "state": "IN_PROGRESS", "bucket": "pending"}],
+    }
+
+
+def mutation_worker(
+    env: WorkflowEnvironment,
+    stubs: MutationActivityStubs,
+    *,
+    task_queue: Optional[str] = None,
+) -> Worker:
+    """A worker running both mutation workflows and the stubbed activities."""
+    return Worker(
+        env.client,
+        task_queue=task_queue or f"mutation-test-{uuid.uuid4()}",
+        workflows=[RunSingleMutationWorkflow, RunMutationCampaignWorkflow],
+        activities=stubs.activities(),
+    )
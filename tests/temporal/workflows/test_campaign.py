@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from temporalio.converter import DataConverter
+
+from models.mutation.context import MutationContext
+from models.mutation.result import MutationResult
+from temporal.workflows.campaign import (
+    MAX_SURVIVOR_SAMPLE,
+    STATUS_ERRORED,
+    STATUS_KILLED,
+    STATUS_NOT_APPLIED,
+    STATUS_SURVIVED,
+    STATUS_TIMED_OUT,
+    CampaignCheckpoint,
+    CampaignResult,
+    MutantOutcome,
+    MutationCampaignParams,
+    classify_flow_result,
+    compact_flow_result,
+)
+from temporal.workflows.mutation_flow import MutationFlowResult
+from temporal.workflows.start_temporal_workflow import select_mutations
+from temporal.workflows.storage import append_campaign_outcomes
+from temporal.workflows.summary import render_campaign_summary_lines
+
+
+REPO_CONFIG = {"name": "demo-httpie-cli", "url": "https://github.com/org/cli"}
+
+
+def _flow_result(**outcome) -> MutationFlowResult:
+    return MutationFlowResult(
+        context=MutationContext(
+            repo_url=REPO_CONFIG["url"],
+            branch_name="mutation-test-demo-1",
+            pr_title="Mutation Test",
+            mutation_description="Flip check",
+        ),
+        outcome=MutationResult(**outcome),
+    )
+
+
+def _analysis(killed: bool) -> dict:
+    return {
+        "summary": {"mutation_killed": killed, "mutation_survived": not killed},
+        "test_failures": [{"check_name": "pytest (3.11)"}] if killed else [],
+    }
+
+
+def test_flow_results_are_classified() -> None:
+    mutation = {"id": "flip", "description": "Flip check"}
+
+    def status(**outcome) -> str:
+        return classify_flow_result(mutation, _flow_result(**outcome)).status
+
+    assert status(mutation_applied=True, analysis=_analysis(True)) == STATUS_KILLED
+    assert status(mutation_applied=True, analysis=_analysis(False)) == STATUS_SURVIVED
+    assert status(mutation_applied=True, pr_results={"timeout": True}) == STATUS_TIMED_OUT
+    assert status(mutation_applied=False, error="nothing to commit") == STATUS_NOT_APPLIED
+    assert status(mutation_applied=True, error="push rejected") == STATUS_ERRORED
+
+    killed = classify_flow_result(
+        mutation,
+        _flow_result(mutation_applied=True, analysis=_analysis(True), pr_url="https://pr/1"),
+    )
+    assert killed.killed_by == "pytest (3.11)"
+    assert killed.pr_url == "https://pr/1"
+
+
+def test_campaign_counts_and_mutation_score() -> None:
+    result = CampaignResult(repo_url=REPO_CONFIG["url"], timestamp="20250101-000000", total=5)
+    assert result.mutation_score is None
+
+    for status in (STATUS_KILLED, STATUS_KILLED, STATUS_KILLED, STATUS_SURVIVED, STATUS_ERRORED):
+        result.record(MutantOutcome(mutation_id=status, status=status, description="d"))
+
+    assert result.progress() == {
+        "total": 5,
+        "completed": 5,
+        "killed": 3,
+        "survived": 1,
+        "timed_out": 0,
+        "not_applied": 0,
+        "errored": 1,
+        "mutation_score": 0.75,
+        "continued_runs": 0,
+    }
+    lines = render_campaign_summary_lines(REPO_CONFIG, result)
+    assert "  - Mutation score: 75.0%" in lines
+    assert "Surviving mutants:" in lines
+    assert json.loads(json.dumps(result.to_dict()))["metadata"]["timestamp"] == "20250101-000000"
+
+
+def test_campaign_keeps_a_survivor_sample_and_lists_all_from_the_outcomes_file(
+    tmp_path: Path,
+) -> None:
+    result = CampaignResult(repo_url=REPO_CONFIG["url"], timestamp="20250101-000000")
+    for index in range(MAX_SURVIVOR_SAMPLE + 5):
+        result.record(MutantOutcome(mutation_id=f"m{index}", status=STATUS_SURVIVED))
+    outcomes_file = append_campaign_outcomes(
+        {"timestamp": result.timestamp, "repo_id": "org/cli"},
+        (asdict(outcome) for outcome in result.outcomes),
+        base_dir=tmp_path,
+    )
+    result.outcomes_file = str(outcomes_file)
+    result.outcomes = []
+
+    lines = render_campaign_summary_lines(REPO_CONFIG, result)
+    sample_lines = render_campaign_summary_lines(REPO_CONFIG, result, read_outcomes_file=False)
+
+    assert result.survived == MAX_SURVIVOR_SAMPLE + 5
+    assert len(result.survivors) == MAX_SURVIVOR_SAMPLE
+    assert f"  • m{MAX_SURVIVOR_SAMPLE + 4}: " in lines
+    assert f"  • m{MAX_SURVIVOR_SAMPLE + 4}: " not in sample_lines
+    assert f"  … 5 more in {outcomes_file}" in sample_lines
+
+
+def test_select_mutations(tmp_path: Path) -> None:
+    every = select_mutations("demo-httpie-cli")
+    chosen = select_mutations("demo-httpie-cli", "none_check_logic, none_check_always_true")
+    mutations_file = tmp_path / "mutants.json"
+    mutations_file.write_text(json.dumps([{"id": "custom", "description": "x"}]))
+
+    assert len(every) == 3
+    assert [mutation["id"] for mutation in chosen] == [
+        "none_check_logic",
+        "none_check_always_true",
+    ]
+    assert select_mutations("demo-httpie-cli", mutations_file=str(mutations_file)) == [
+        {"id": "custom", "description": "x"},
+    ]
+
+
+def test_compact_child_result_keeps_the_verdict() -> None:
+    analysis = dict(_analysis(True), tests=[{"id": f"test_{i}"} for i in range(1000)])
+    flow_result = _flow_result(
+        mutation_applied=True,
+        analysis=analysis,
+        pr_results={"completed": True, "checks": [{"name": "pytest"}] * 100},
+        traceback="Traceback ...",
+    )
+
+    compact = compact_flow_result(flow_result)
+
+    assert compact.outcome.pr_results == {"completed": True}
+    assert compact.outcome.analysis == {
+        "summary": {"mutation_killed": True, "mutation_survived": False},
+        "test_failures": [{"check_name": "pytest (3.11)"}],
+    }
+    assert classify_flow_result({"id": "flip"}, compact).killed_by == "pytest (3.11)"
+
+
+def test_checkpoint_survives_continue_as_new_payload(tmp_path: Path) -> None:
+    result = CampaignResult(repo_url=REPO_CONFIG["url"], timestamp="20250101-000000", total=3,
+                            repo_id="org/cli")
+    result.record(MutantOutcome(mutation_id="a", status=STATUS_SURVIVED))
+    params = MutationCampaignParams(
+        repo_config=REPO_CONFIG,
+        mutations=[{"id": "c"}],
+        checkpoint=CampaignCheckpoint(
+            start_index=2,
+            clone={"repo_path": "/tmp/clone", "baseline_sha": "abc"},
+            result=result,
+        ),
+    )
+    converter = DataConverter.default
+
+    async def round_trip() -> MutationCampaignParams:
+        payloads = await converter.encode([params])
+        return (await converter.decode(payloads, [MutationCampaignParams]))[0]
+
+    decoded = asyncio.run(round_trip())
+    assert decoded.checkpoint.start_index == 2
+    assert decoded.checkpoint.result.survivors[0].mutation_id == "a"
+    assert decoded.checkpoint.result.completed == 1
+
+    outcomes_file = append_campaign_outcomes(
+        result.to_dict()["metadata"],
+        [{"mutation_id": "a", "status": STATUS_SURVIVED}],
+        tmp_path,
+    )
+    append_campaign_outcomes(result.to_dict()["metadata"], [{"mutation_id": "b"}], tmp_path)
+    assert outcomes_file.name == "20250101-000000_cli_campaign_outcomes.jsonl"
+    assert len(outcomes_file.read_text().splitlines()) == 2
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import Any, Dict
+
+import pytest
+from temporalio.client import WorkflowFailureError
+
+from temporal.workflows.campaign import (
+    STATUS_ERRORED,
+    STATUS_KILLED,
+    STATUS_SURVIVED,
+    MutationCampaignParams,
+)
+from temporal.workflows.temporal_worker import RunMutationCampaignWorkflow
+from tests.temporal.workflows.fixtures.workflow_env import (
+    CAMPAIGN_CLONE,
+    REPO_CONFIG,
+    MutationActivityStubs,
+    mutation,
+    mutation_worker,
+    start_time_skipping_env,
+)
+
+
+def _campaign(count: int, **overrides: Any) -> MutationCampaignParams:
+    return MutationCampaignParams(
+        repo_config=REPO_CONFIG,
+        mutations=[mutation(f"m{index}") for index in range(count)],
+        timestamp="20250101-000000",
+        **overrides,
+    )
+
+
+def _statuses(stubs: MutationActivityStubs) -> Dict[str, str]:
+    [outcomes] = stubs.calls["append_campaign_outcomes_activity"]
+    return {outcome["mutation_id"]: outcome["status"] for outcome in outcomes.outcomes}
+
+
+def test_campaign_bounds_fan_out_records_failed_children_and_cleans_up_last() -> None:
+    # The child staging m3 lands here; failing its cleanup fails that child workflow.
+    failing_checkout = "/clones/mutation-test-demo-20250101-000000-00003"
+    stubs = MutationActivityStubs(survivors={"m1"}, failing_cleanups={failing_checkout})
+
+    async def run() -> Any:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker:
+            return await env.client.execute_workflow(
+                RunMutationCampaignWorkflow.run,
+                _campaign(5, max_concurrent=2),
+                id=f"campaign-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+
+    result = asyncio.run(run())
+
+    assert stubs.max_waiting == 2
+    assert result.completed == 5
+    assert (result.killed, result.survived, result.errored) == (3, 1, 1)
+    assert _statuses(stubs) == {
+        "m0": STATUS_KILLED,
+        "m1": STATUS_SURVIVED,
+        "m2": STATUS_KILLED,
+        "m3": STATUS_ERRORED,
+        "m4": STATUS_KILLED,
+    }
+    # Every child copied the campaign clone, which is removed after all of them.
+    assert {stage.source_repo_path for stage in stubs.calls["stage_mutant_activity"]} == {
+        CAMPAIGN_CLONE,
+    }
+    assert len(stubs.cleanups) == 6
+    assert stubs.cleanups[-1] == CAMPAIGN_CLONE
+
+
+def test_cancelled_campaign_waits_for_its_children_before_removing_the_clone() -> None:
+    stubs = MutationActivityStubs(release_waits=asyncio.Event())
+
+    async def run() -> None:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker:
+            handle = await env.client.start_workflow(
+                RunMutationCampaignWorkflow.run,
+                _campaign(4, max_concurrent=2),
+                id=f"campaign-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+            while stubs.waiting < 2:
+                await asyncio.sleep(0.05)
+            await handle.cancel()
+            with pytest.raises(WorkflowFailureError):
+                await handle.result()
+
+    asyncio.run(run())
+
+    staged = [f"/clones/{stage.branch_name}" for stage in stubs.calls["stage_mutant_activity"]]
+    assert len(staged) == 2
+    # Both running children cleaned up their checkouts before the shared clone went.
+    assert sorted(stubs.cleanups[:-1]) == sorted(staged)
+    assert stubs.cleanups[-1] == CAMPAIGN_CLONE
+
+
+def test_campaign_continues_as_new_without_rerunning_finished_mutants() -> None:
+    stubs = MutationActivityStubs()
+
+    async def run() -> Any:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker:
+            return await env.client.execute_workflow(
+                RunMutationCampaignWorkflow.run,
+                # Every run is over the history bound after launching its first mutant.
+                _campaign(3, max_concurrent=1, max_history_events=1),
+                id=f"campaign-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+
+    result = asyncio.run(run())
+
+    assert result.continued_runs == 2
+    assert result.completed == 3
+    assert [stage.mutation_config["id"] for stage in stubs.calls["stage_mutant_activity"]] == [
+        "m0", "m1", "m2",
+    ]
+    # The campaign clone is made once and handed over in the checkpoint.
+    assert len(stubs.calls["prepare_campaign_clone_activity"]) == 1
+    assert stubs.cleanups.count(CAMPAIGN_CLONE) == 1
+    flushed = [
+        outcome["mutation_id"]
+        for append in stubs.calls["append_campaign_outcomes_activity"]
+        for outcome in append.outcomes
+    ]
+    assert flushed == ["m0", "m1", "m2"]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter
+
+from models.mutation.context import MutationContext
+from models.mutation.result import MutationResult
+from temporal.workflows.blob_store import BlobStore, LocalBlobStore, S3BlobStore, blob_key
+from temporal.workflows.codecs import (
+    CLAIM_CHECK_ENCODING,
+    CompressionCodec,
+    build_data_converter,
+)
+from temporal.workflows.mutation_flow import MutationFlowResult
+
+
+def _large_flow_result(tests: int) -> MutationFlowResult:
+    return MutationFlowResult(
+        context=MutationContext(
+            repo_url="https://github.com/org/cli",
+            branch_name="mutation-test-demo-1",
+            pr_title="Mutation Test",
+            mutation_description="Flip check",
+        ),
+        outcome=MutationResult(
+            mutation_applied=True,
+            analysis={"test_failures": [{
+                "check_name": "pytest",
+                "failed_tests": [f"tests/test_cli.py::test_case_{n}" for n in range(tests)],
+                "output": "AssertionError: expected 1 == 2\n" * tests,
+            }]},
+        ),
+    )
+
+
+def test_local_blob_store_is_content_addressed(tmp_path: Path) -> None:
+    store = LocalBlobStore(tmp_path)
+
+    key = store.put(b"payload")
+    assert key == blob_key(b"payload")
+    assert store.put(b"payload") == key
+    assert store.get(key) == b"payload"
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [key]
+    with pytest.raises(KeyError):
+        store.get(blob_key(b"missing"))
+
+
+def test_claim_check_round_trips_large_flow_results(tmp_path: Path) -> None:
+    converter = build_data_converter(str(tmp_path), claim_check_bytes=4096, compression="none")
+    large = _large_flow_result(500)
+    small = {"completed": True}
+
+    payloads = asyncio.run(converter.encode([large, small]))
+
+    assert payloads[0].metadata["encoding"] == CLAIM_CHECK_ENCODING
+    assert payloads[0].ByteSize() < 200
+    assert LocalBlobStore(tmp_path).exists(payloads[0].data.decode("ascii"))
+    assert payloads[1].metadata["encoding"] == b"json/plain"
+
+    decoded = asyncio.run(converter.decode(payloads, [MutationFlowResult, dict]))
+    assert decoded[0].to_dict() == large.to_dict()
+    assert decoded[1] == small
+
+
+def test_pruned_blob_names_its_key_and_store(tmp_path: Path) -> None:
+    converter = build_data_converter(str(tmp_path), claim_check_bytes=512, compression="none")
+    payload = asyncio.run(converter.encode([_large_flow_result(100)]))[0]
+    key = payload.data.decode("ascii")
+    LocalBlobStore(tmp_path).path_for(key).unlink()
+
+    with pytest.raises(RuntimeError) as excinfo:
+        asyncio.run(converter.decode([payload], [MutationFlowResult]))
+
+    assert key in str(excinfo.value) and str(tmp_path) in str(excinfo.value)
+    with pytest.raises(TypeError):
+        BlobStore()
+
+
+def test_s3_blob_store_uses_prefixed_keys() -> None:
+    class NotFound(Exception):
+        response = {"Error": {"Code": "404"}}
+
+    class FakeS3:
+        def __init__(self) -> None:
+            self.objects = {}
+
+        def head_object(self, Bucket, Key):
+            if (Bucket, Key) not in self.objects:
+                raise NotFound()
+
+        def put_object(self, Bucket, Key, Body):
+            self.objects[(Bucket, Key)] = Body
+
+        def get_object(self, Bucket, Key):
+            return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    client = FakeS3()
+    store = S3BlobStore("payloads", "mutations/", client=client)
+
+    key = store.put(b"payload")
+    assert list(client.objects) == [("payloads", f"mutations/{key}")]
+    assert store.exists(key) and not store.exists(blob_key(b"other"))
+    assert store.get(key) == b"payload"
+
+
+def test_compression_shrinks_flow_results_and_reads_old_payloads() -> None:
+    converter = build_data_converter(compression="zlib")
+    large = _large_flow_result(500)
+
+    plain = asyncio.run(DataConverter.default.encode([large]))[0]
+    compressed = asyncio.run(converter.encode([large]))[0]
+
+    assert compressed.metadata["encoding"] == b"binary/zlib"
+    assert compressed.ByteSize() * 10 < plain.ByteSize()
+    # Payloads written before compression was enabled decode unchanged.
+    decoded = asyncio.run(converter.decode([compressed, plain], [MutationFlowResult] * 2))
+    assert decoded[0].to_dict() == decoded[1].to_dict() == large.to_dict()
+
+    tiny = Payload(metadata={"encoding": b"json/plain"}, data=b"true")
+    assert asyncio.run(CompressionCodec(threshold_bytes=1).encode([tiny]))[0] == tiny
+
+
+def test_compression_is_off_by_default_but_compressed_payloads_decode() -> None:
+    large = _large_flow_result(500)
+    compressed = asyncio.run(build_data_converter(compression="zlib").encode([large]))[0]
+    converter = build_data_converter()
+
+    plain = asyncio.run(converter.encode([large]))[0]
+
+    assert plain.metadata["encoding"] == b"json/plain"
+    # A process not compressing yet still reads what upgraded peers wrote.
+    decoded = asyncio.run(converter.decode([compressed], [MutationFlowResult]))[0]
+    assert decoded.to_dict() == large.to_dict()
+
+
+def test_compressed_payloads_are_claim_checked_when_still_large(tmp_path: Path) -> None:
+    converter = build_data_converter(str(tmp_path), claim_check_bytes=512, compression="zlib")
+    large = _large_flow_result(2000)
+
+    payload = asyncio.run(converter.encode([large]))[0]
+
+    assert payload.metadata["encoding"] == CLAIM_CHECK_ENCODING
+    stored = Payload.FromString(LocalBlobStore(tmp_path).get(payload.data.decode("ascii")))
+    assert stored.metadata["encoding"] == b"binary/zlib"
+    assert asyncio.run(converter.decode([payload], [MutationFlowResult]))[0].to_dict() == (
+        large.to_dict()
+    )
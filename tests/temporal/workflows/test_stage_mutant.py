@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import uuid
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from temporal.workflows import activities
+from temporal.workflows.temporal_worker import MutationWorkflowParams, RunSingleMutationWorkflow
+from tests.temporal.workflows.fixtures.workflow_env import (
+    REPO_CONFIG,
+    MutationActivityStubs,
+    mutation,
+    mutation_worker,
+    start_time_skipping_env,
+)
+
+MUTATION = {
+    "file_path": "calc.py",
+    "line_number": 2,
+    "find_pattern": r"a \+ b",
+    "replace_pattern": "a - b",
+}
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "Mutation Bot")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "bot@example.com")
+    seed = tmp_path / "seed"
+    seed.mkdir()
+    (seed / "calc.py").write_text("def add(a, b):\n    return a + b\n", encoding="utf-8")
+    _git(seed, "init", "--quiet", "--initial-branch", "main")
+    _git(seed, "add", ".")
+    _git(seed, "commit", "--quiet", "-m", "Initial commit")
+    origin = tmp_path / "origin.git"
+    _git(tmp_path, "clone", "--quiet", "--bare", str(seed), str(origin))
+    return origin
+
+
+def test_stage_mutant_pushes_the_mutated_commit(tmp_path: Path, origin: Path) -> None:
+    staged = activities.stage_mutant(
+        str(origin),
+        "mutation-1",
+        MUTATION,
+        "Apply mutation: add subtracts",
+        base_dir=str(tmp_path / "clones"),
+        dest_name="mutant",
+    )
+
+    repo_path = Path(staged["repo_path"])
+    assert staged["mutation_applied"] is True
+    assert "a - b" in (repo_path / "calc.py").read_text(encoding="utf-8")
+    assert staged["commit_sha"] == _git(origin, "rev-parse", "refs/heads/mutation-1")
+    assert _git(origin, "log", "-1", "--format=%s", "mutation-1") == (
+        "Apply mutation: add subtracts"
+    )
+
+
+def test_stage_mutant_removes_the_checkout_when_a_step_fails(
+    tmp_path: Path, origin: Path
+) -> None:
+    clones = tmp_path / "clones"
+
+    with pytest.raises(IndexError):
+        activities.stage_mutant(
+            str(origin),
+            "mutation-2",
+            {**MUTATION, "line_number": 40},
+            "Apply mutation: out of range",
+            base_dir=str(clones),
+            dest_name="mutant",
+        )
+
+    assert not (clones / "mutant").exists()
+    assert _git(origin, "branch", "--list", "mutation-2") == ""
+
+
+def test_workflow_records_the_staged_commit_and_cleans_up_on_its_host() -> None:
+    host_queue = f"mutation-host-{uuid.uuid4()}"
+    stubs = MutationActivityStubs(host_task_queue=host_queue)
+
+    async def run() -> Any:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker, mutation_worker(
+            env, stubs, task_queue=host_queue,
+        ):
+            handle = await env.client.start_workflow(
+                RunSingleMutationWorkflow.run,
+                MutationWorkflowParams(
+                    repo_config=REPO_CONFIG,
+                    mutation_config=mutation("m1"),
+                    timestamp="20250101-000000",
+                ),
+                id=f"mutation-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+            result = await handle.result()
+            return result, worker.task_queue, await handle.fetch_history()
+
+    result, main_queue, history = asyncio.run(run())
+
+    assert result.workflow.metadata["commit_sha"] == "sha-m1"
+    assert result.outcome.mutation_applied is True
+    [stage] = stubs.calls["stage_mutant_activity"]
+    assert result.workflow.repo_path == f"/clones/{stage.branch_name}"
+    assert stubs.task_queues["stage_mutant_activity"] == [main_queue]
+    # The checkout lives on the host that staged it, so its cleanup goes there.
+    assert stubs.task_queues["cleanup_activity"] == [host_queue]
+    assert stubs.cleanups == [result.workflow.repo_path]
+    markers = [
+        event.marker_recorded_event_attributes.marker_name
+        for event in history.events
+        if event.HasField("marker_recorded_event_attributes")
+    ]
+    assert "core_patch" in markers
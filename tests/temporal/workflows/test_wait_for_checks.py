@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from temporal.github import client as client_module
+from temporal.github.check_utils import CheckProcessor
+from temporal.github.client import GitHubClient
+from temporal.github.pr_manager import PRManager
+from temporal.github.rate_limit import RateLimitScheduler
+from temporal.github.test_analyzer import TestAnalyzer
+from temporal.workflows import activities, temporal_worker
+
+
+def _snapshot(bucket: str) -> dict:
+    return {
+        "status": {"number": 7, "url": "https://github.com/org/repo/pull/7"},
+        "checks": [{
+            "name": "pytest",
+            "state": "FAILURE" if bucket == CheckProcessor.STATUS_FAIL else "PENDING",
+            "bucket": bucket,
+            "link": "https://github.com/org/repo/actions/runs/55/job/66",
+        }],
+    }
+
+
+def test_resumed_wait_keeps_its_elapsed_time_and_heartbeats(tmp_path: Path) -> None:
+    heartbeats = []
+    manager = PRManager(tmp_path)
+
+    with mock.patch.object(
+        PRManager, "get_pr_snapshot", return_value=_snapshot(CheckProcessor.STATUS_PENDING),
+    ) as snapshot_mock:
+        result = asyncio.run(manager.wait_for_checks_async(
+            "7",
+            timeout_seconds=600,
+            # A retry after 599.8 s: well under one poll interval is left.
+            resume={"elapsed_seconds": 599.8, "checks_first_seen_seconds": 12},
+            on_heartbeat=heartbeats.append,
+            heartbeat_interval=0.05,
+        ))
+
+    assert result["timeout"] is True
+    assert result["completed"] is False
+    # One poll, then the final snapshot; the 15 s delay was cut to the timeout.
+    assert snapshot_mock.call_count == 2
+    assert len(heartbeats) >= 2
+    assert all(beat["checks_first_seen_seconds"] == 12 for beat in heartbeats)
+    assert all(beat["elapsed_seconds"] >= 599 for beat in heartbeats)
+
+
+def test_resumed_activity_reuses_analyzed_failures(tmp_path: Path) -> None:
+    failed = _snapshot(CheckProcessor.STATUS_FAIL)
+    key = TestAnalyzer.failure_key(failed["checks"][0])
+    resume = {
+        "elapsed_seconds": 300,
+        "checks_first_seen_seconds": 20,
+        "incremental_analysis": {
+            "failures": {key: {"check_name": "pytest", "failed_tests": ["test_x"]}},
+            "checks": [],
+        },
+    }
+    progress = []
+
+    with mock.patch.object(
+        PRManager, "get_pr_snapshot", return_value=failed,
+    ), mock.patch.object(
+        activities, "get_shared_poller", return_value=None,
+    ), mock.patch.object(
+        TestAnalyzer, "analyze_failed_check",
+    ) as analyze_mock:
+        pr_results = asyncio.run(activities.wait_for_checks_async(
+            tmp_path,
+            "7",
+            resume=resume,
+            on_progress=progress.append,
+        ))
+
+    analyze_mock.assert_not_called()
+    assert pr_results["completed"] is True
+    assert pr_results["checks_first_seen_seconds"] == 20
+    assert pr_results["incremental_analysis"]["failures"][key]["failed_tests"] == ["test_x"]
+    # Heartbeats carry everything a retry needs to resume.
+    assert progress[-1]["elapsed_seconds"] >= 300
+    assert progress[-1]["incremental_analysis"]["failures"] == resume["incremental_analysis"][
+        "failures"
+    ]
+
+
+def test_analysis_deadline_leaves_a_margin_before_the_activity_deadline() -> None:
+    scheduled = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    info = SimpleNamespace(
+        scheduled_time=scheduled,
+        schedule_to_close_timeout=timedelta(minutes=2),
+        started_time=scheduled + timedelta(seconds=30),
+        start_to_close_timeout=None,
+    )
+
+    with mock.patch.object(temporal_worker.activity, "info", return_value=info):
+        deadline = temporal_worker._analysis_deadline()
+
+    assert deadline == scheduled + timedelta(minutes=2) - temporal_worker.ANALYSIS_DEADLINE_MARGIN
+
+
+def test_poll_result_reports_the_remaining_rate_limit_budget(tmp_path: Path, capsys) -> None:
+    scheduler = RateLimitScheduler()
+    client = GitHubClient("test-token", rate_limiter=scheduler)
+    scheduler.update(client.credential.credential_id, "graphql", {
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-remaining": "4200",
+        "x-ratelimit-reset": "4102444800",
+        "x-ratelimit-resource": "graphql",
+    })
+    pending = dict(_snapshot(CheckProcessor.STATUS_PENDING), completed=False)
+
+    try:
+        with mock.patch.object(client_module, "get_shared_client", return_value=client), \
+                mock.patch.object(PRManager, "poll_checks", return_value=pending):
+            pr_results = activities.poll_checks(tmp_path, "7", repo_id="org/repo")
+    finally:
+        client.close()
+
+    [budget] = pr_results["rate_limit"].values()
+    assert budget["graphql"]["remaining"] == 4200
+    assert budget["graphql"]["limit"] == 5000
+    assert "graphql 4200/5000" in capsys.readouterr().out
+
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+
+from temporal.github.webhooks import infer_event_name, parse_check_event
+from temporal.workflows import webhook_receiver
+from temporal.workflows.codecs import ClaimCheckCodec, CodecChain, CompressionCodec
+from temporal.workflows.temporal_worker import MutationWorkflowParams, RunSingleMutationWorkflow
+from temporal.workflows.webhook_receiver import WorkflowWatchResolver, dispatch_event
+from tests.temporal.workflows.fixtures.workflow_env import (
+    REPO_CONFIG,
+    MutationActivityStubs,
+    completed_checks,
+    mutation,
+    mutation_worker,
+    pending_checks,
+    start_time_skipping_env,
+)
+
+WEBHOOK_FIXTURES = Path(__file__).resolve().parents[1] / "github" / "fixtures" / "webhooks"
+REPO = "zhengziying78/demo-httpie-cli"
+BRANCH = "mutation-test-demo-20251018-184437"
+
+
+class FakeHandle:
+    def __init__(self, client: "FakeClient", workflow_id: str):
+        self.client = client
+        self.workflow_id = workflow_id
+
+    async def query(self, query: Any) -> Dict[str, Any]:
+        return self.client.watches[self.workflow_id]
+
+    async def signal(self, signal: Any, payload: Dict[str, Any]) -> None:
+        self.client.signals.append((self.workflow_id, payload))
+
+
+class FakeClient:
+    """The slice of ``temporalio.client.Client`` the receiver uses."""
+
+    def __init__(self, watches: Dict[str, Dict[str, Any]]):
+        self.watches = watches
+        self.signals: List[Tuple[str, Dict[str, Any]]] = []
+        self.list_calls = 0
+
+    async def list_workflows(self, query: str):
+        self.list_calls += 1
+        for workflow_id in self.watches:
+            yield SimpleNamespace(id=workflow_id, run_id=None)
+
+    def get_workflow_handle(self, workflow_id: str, run_id: Any = None) -> FakeHandle:
+        return FakeHandle(self, workflow_id)
+
+
+def _replay(name: str):
+    payload = json.loads((WEBHOOK_FIXTURES / name).read_text(encoding="utf-8"))
+    return parse_check_event(infer_event_name(payload), payload)
+
+
+def test_dispatch_signals_the_workflow_waiting_on_the_branch() -> None:
+    client = FakeClient({
+        "wf-webhook": {"repo": REPO, "branch": BRANCH, "pr_number": None, "wait_mode": "webhook"},
+        # Poll-mode workflows on the same branch do not wait for signals.
+        "wf-poll": {"repo": REPO, "branch": BRANCH, "pr_number": None, "wait_mode": "poll"},
+        "wf-other": {"repo": REPO, "branch": "other", "pr_number": None, "wait_mode": "webhook"},
+    })
+    resolver = WorkflowWatchResolver(client, refresh_interval_seconds=60)
+    event = _replay("check_run_completed.json")
+
+    first = asyncio.run(dispatch_event(client, resolver, event))
+    second = asyncio.run(dispatch_event(client, resolver, event))
+
+    assert first == second == ["wf-webhook"]
+    assert [workflow_id for workflow_id, _ in client.signals] == ["wf-webhook", "wf-webhook"]
+    assert client.signals[0][1]["branch"] == BRANCH
+    # The second delivery is routed from the index without listing workflows again.
+    assert client.list_calls == 1
+
+
+def test_dispatch_ignores_events_that_are_not_completed() -> None:
+    client = FakeClient({
+        "wf-webhook": {"repo": REPO, "branch": BRANCH, "pr_number": None, "wait_mode": "webhook"},
+    })
+    resolver = WorkflowWatchResolver(client)
+    event = _replay("workflow_run_in_progress.json")
+
+    signalled = asyncio.run(dispatch_event(client, resolver, event))
+
+    assert signalled == []
+    assert client.signals == []
+    assert client.list_calls == 0
+
+
+def test_replay_connects_with_the_workers_payload_codecs(tmp_path: Path) -> None:
+    client = FakeClient({})
+    connect = mock.AsyncMock(return_value=client)
+
+    with mock.patch.object(webhook_receiver.Client, "connect", connect):
+        asyncio.run(webhook_receiver.replay_payloads(
+            [WEBHOOK_FIXTURES / "check_run_completed.json"],
+            blob_store=str(tmp_path),
+            compression="zlib",
+        ))
+
+    codec = connect.call_args.kwargs["data_converter"].payload_codec
+    assert isinstance(codec, CodecChain)
+    assert [type(part) for part in codec.codecs] == [CompressionCodec, ClaimCheckCodec]
+    assert codec.codecs[0].algorithm == "zlib"
+    assert codec.codecs[1].store.location == str(tmp_path)
+    assert client.list_calls == 1
+
+
+def _webhook_params() -> MutationWorkflowParams:
+    return MutationWorkflowParams(
+        repo_config=REPO_CONFIG,
+        mutation_config=mutation("m1"),
+        timestamp="20250101-000000",
+        wait_mode="webhook",
+        webhook_fallback_seconds=120,
+    )
+
+
+def test_webhook_wait_polls_again_after_the_fallback_without_a_signal() -> None:
+    stubs = MutationActivityStubs(poll_results=[pending_checks(), completed_checks()])
+
+    async def run() -> Any:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker:
+            return await env.client.execute_workflow(
+                RunSingleMutationWorkflow.run,
+                _webhook_params(),
+                id=f"mutation-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+
+    result = asyncio.run(run())
+
+    polls = stubs.calls["poll_checks_activity"]
+    assert [poll.elapsed_seconds >= 120 for poll in polls] == [False, True]
+    assert result.outcome.pr_results["completed"] is True
+
+
+def test_webhook_wait_polls_as_soon_as_a_signal_arrives() -> None:
+    stubs = MutationActivityStubs(poll_results=[pending_checks(), completed_checks()])
+
+    async def run() -> Any:
+        env = await start_time_skipping_env()
+        async with env, mutation_worker(env, stubs) as worker:
+            handle = await env.client.start_workflow(
+                RunSingleMutationWorkflow.run,
+                _webhook_params(),
+                id=f"mutation-{uuid.uuid4()}",
+                task_queue=worker.task_queue,
+            )
+            while not stubs.calls["poll_checks_activity"]:
+                await asyncio.sleep(0.05)
+            await handle.signal(RunSingleMutationWorkflow.checks_updated, {"action": "completed"})
+            return await handle.result()
+
+    result = asyncio.run(run())
+
+    polls = stubs.calls["poll_checks_activity"]
+    assert len(polls) == 2
+    assert polls[1].elapsed_seconds < 120
+    assert result.outcome.pr_results["completed"] is True
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from temporal.workflows import temporal_worker
+from temporal.workflows.worker_config import (
+    ACTIVITY_MODES,
+    MODE_ALL,
+    MODE_ANALYSIS,
+    MODE_GIT,
+    MODE_POLLING,
+    MODE_WORKFLOWS,
+    WorkerOptions,
+    load_worker_config,
+    set_host_task_queue,
+)
+
+
+def test_every_activity_belongs_to_exactly_one_mode() -> None:
+    per_mode = [temporal_worker.activities_for_mode(mode) for mode in ACTIVITY_MODES]
+    names = [activity.__name__ for activities in per_mode for activity in activities]
+
+    assert len(names) == len(set(names))
+    assert sorted(names) == sorted(
+        activity.__name__ for activity in temporal_worker.activities_for_mode(MODE_ALL)
+    )
+    assert temporal_worker.activities_for_mode(MODE_WORKFLOWS) == []
+    assert temporal_worker.wait_for_checks_activity in temporal_worker.activities_for_mode(
+        MODE_POLLING
+    )
+    assert temporal_worker.analyze_results_activity in temporal_worker.activities_for_mode(
+        MODE_ANALYSIS
+    )
+
+
+def test_worker_options_queues_and_defaults() -> None:
+    default = WorkerOptions(task_queue="mutations")
+    assert default.polled_task_queue == "mutations"
+    assert default.activity_slots is None
+    assert default.executor_size is None
+
+    polling = WorkerOptions(task_queue="mutations", mode=MODE_POLLING)
+    assert polling.polled_task_queue == "mutations-polling"
+    assert polling.activity_slots == 1000
+
+    git = WorkerOptions(task_queue="mutations", mode=MODE_GIT, max_concurrent_activities=3)
+    assert git.polled_task_queue == "mutations-git"
+    assert git.executor_size == 3
+
+    with pytest.raises(ValueError):
+        WorkerOptions(task_queue="mutations", mode="gpu")
+    with pytest.raises(ValueError):
+        WorkerOptions(task_queue="mutations", mode=MODE_GIT, analysis_processes=2)
+
+
+def test_worker_options_from_config_file(tmp_path: Path) -> None:
+    config_file = tmp_path / "worker.json"
+    config_file.write_text(json.dumps({
+        "task_queue": "mutations",
+        "mode": "analysis",
+        "analysis_processes": 4,
+        "activity_threads": None,
+    }))
+
+    options = WorkerOptions.from_mapping(load_worker_config(str(config_file)))
+
+    assert options.mode == MODE_ANALYSIS
+    assert options.analysis_processes == 4
+    assert options.polled_task_queue == "mutations-analysis"
+    with pytest.raises(ValueError):
+        WorkerOptions.from_mapping({"task_queue": "mutations", "threads": 4})
+
+
+def test_host_affinity_queues_and_clone_tagging() -> None:
+    options = WorkerOptions(
+        task_queue="mutations",
+        mode=MODE_GIT,
+        host_affinity=True,
+        host_id="node-3",
+        warm_repos=["demo-httpie-cli"],
+    )
+    assert options.host_queue == "mutations-host-node-3"
+    assert options.repo_queues == ["mutations-repo-demo-httpie-cli"]
+    assert WorkerOptions(task_queue="mutations", mode=MODE_GIT).host_queue is None
+    # Clones taken from a repo queue still need their cleanup routed back here.
+    warm_only = WorkerOptions(
+        task_queue="mutations", mode=MODE_GIT, host_id="node-4", warm_repos=["demo-httpie-cli"],
+    )
+    assert warm_only.host_queue == "mutations-host-node-4"
+    with pytest.raises(ValueError):
+        WorkerOptions(task_queue="mutations", mode=MODE_POLLING, host_affinity=True)
+
+    try:
+        set_host_task_queue(options.host_queue)
+        clone = temporal_worker._with_host_queue({"repo_path": "/repos/x"})
+    finally:
+        set_host_task_queue(None)
+
+    assert clone == {"repo_path": "/repos/x", "host_task_queue": "mutations-host-node-3"}
+    assert temporal_worker._with_host_queue({"repo_path": "/repos/x"}) == {
+        "repo_path": "/repos/x",
+    }